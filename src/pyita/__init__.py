@@ -15,6 +15,20 @@ from pathlib import Path
 
 from .quotes import Quotes
 from .indicator_result import IndicatorResult
+from .resample import Resampler
+from .stream import IndicatorStream
+from .snapshot import save_state, load_state
+from .universe import Universe
+from .alignment import align
+from .process_pool import ProcessPoolRunner
+from . import rolling
+from . import multi_stream
+from . import bars
+from . import ragged
+from . import cross_section
+from . import signals
+from . import events
+from .lookback import lookback, wrap_indicator
 from .exceptions import (
     PyTAException,
     PyTAExceptionIndicatorNotFound,
@@ -53,6 +67,21 @@ __version__ = _get_version()
 __all__ = [
     'Quotes',
     'IndicatorResult',
+    'Resampler',
+    'IndicatorStream',
+    'save_state',
+    'load_state',
+    'Universe',
+    'align',
+    'ProcessPoolRunner',
+    'rolling',
+    'multi_stream',
+    'bars',
+    'ragged',
+    'cross_section',
+    'signals',
+    'events',
+    'lookback',
     'PyTAException',
     'PyTAExceptionIndicatorNotFound',
     'PyTAExceptionBadParameterValue',
@@ -72,7 +101,7 @@ def __getattr__(name):
     When an indicator is accessed (e.g., ta.bollinger_bands), this function:
     1. Checks if it's already in the cache
     2. If not, tries to import from indicators/{name}.py
-    3. Caches and returns the get_indicator_out function
+    3. Caches and returns the get_indicator_out function with the tail and resume_from options
     
     Args:
         name: Name of the indicator (e.g., 'bollinger_bands', 'sma', 'ema')
@@ -95,7 +124,7 @@ def __getattr__(name):
     
     try:
         module = importlib.import_module(f'.indicators.{name}', __package__)
-        func = module.get_indicator_out
+        func = wrap_indicator(module)
         _indicator_cache[name] = func
         return func
     except (ImportError, AttributeError) as e:
@@ -0,0 +1,198 @@
+"""Alignment of quotes of many symbols on a common time grid.
+
+Times of all symbols are merged in one compiled k-way merge pass: the grid is
+the union of times (outer join) or the times present in all symbols (inner
+join), and each symbol gets the index of its bar at each grid time. Columns
+are gathered by these indexes without intermediate tables.
+
+Example:
+    >>> btc, eth = ta.align([quotes_btc, quotes_eth], how='outer')
+    >>> time, batch = ta.align({'BTC': quotes_btc, 'ETH': quotes_eth}, batch=True)
+    >>> close = batch['close']  # (n_symbols, n_bars)
+"""
+import numpy as np
+import numba as nb
+
+from .data_series import DataSeries
+from .quotes import Quotes
+from .constants import TIME_TYPE
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+ALIGN_HOW = ('inner', 'outer')
+ALIGN_FILL = ('ffill', 'nan')
+FLAT_BAR_COLUMNS = ('open', 'high', 'low')
+
+
+@nb.njit(cache=True)
+def calc_merge(times, offsets, inner, ffill, n_out, out_time, out_indexes):
+    """Merge sorted times of symbols into a time grid.
+
+    Args:
+        times: Concatenated int64 times of symbols, strictly increasing in each symbol
+        offsets: Positions of symbols in times (n_symbols + 1 values)
+        inner: If True, the grid has times present in all symbols, else times of any symbol
+        ffill: If True, symbols without a bar at a grid time get the index of their
+            last bar before it, else -1
+        n_out: Size of outputs, 0 to count grid times only
+        out_time: Output array of grid times (n_out size)
+        out_indexes: Output array (n_symbols, n_out) of bar indexes of symbols (-1 for no bar)
+
+    Returns:
+        Number of grid times
+    """
+    n_symbols = len(offsets) - 1
+    positions = offsets[:-1].copy()
+    last = np.full(n_symbols, -1, dtype=np.int64)
+    if n_symbols == 0:
+        return 0
+
+    count = 0
+    while True:
+        t_min = np.iinfo(np.int64).max
+        t_max = np.iinfo(np.int64).min
+        n_active = 0
+        for k in range(n_symbols):
+            if positions[k] < offsets[k + 1]:
+                t = times[positions[k]]
+                t_min = min(t_min, t)
+                t_max = max(t_max, t)
+                n_active += 1
+
+        if inner:
+            if n_active < n_symbols:
+                break
+            if t_min != t_max:
+                # Skip bars before the latest head, they are not present in all symbols
+                for k in range(n_symbols):
+                    while positions[k] < offsets[k + 1] and times[positions[k]] < t_max:
+                        positions[k] += 1
+                continue
+        elif n_active == 0:
+            break
+
+        for k in range(n_symbols):
+            if positions[k] < offsets[k + 1] and times[positions[k]] == t_min:
+                last[k] = positions[k] - offsets[k]
+                positions[k] += 1
+                index = last[k]
+            else:
+                index = last[k] if ffill else -1
+            if n_out:
+                out_indexes[k, count] = index
+        if n_out:
+            out_time[count] = t_min
+        count += 1
+
+    return count
+
+
+def time_ms_of(key, series):
+    """Time of a DataSeries as int64 milliseconds, checked to be strictly increasing."""
+    if not isinstance(series, DataSeries):
+        raise PyTAExceptionBadParameterValue(f'{key}: expected Quotes object, got {type(series).__name__}')
+    time_ms = series._sorted_time().astype(TIME_TYPE).view(np.int64)
+    if len(time_ms) > 1 and np.any(time_ms[1:] == time_ms[:-1]):
+        raise PyTAExceptionBadSeriesData(f'time of {key} has duplicate values')
+    return time_ms
+
+
+def take_series(values, indexes, stale, name, is_quotes, close, out):
+    """Write values of a series at the bar indexes to out.
+
+    Missing bars get NaN (0 for integer series). Forward filled bars of quotes
+    are flat bars at the last close with zero volume.
+    """
+    if len(values):
+        np.take(values, indexes, out=out, mode='clip')
+    out[indexes < 0] = np.nan if out.dtype.kind in 'fc' else 0
+    if is_quotes and stale is not None:
+        if name in FLAT_BAR_COLUMNS:
+            out[stale] = close[indexes[stale]]
+        elif name == 'volume':
+            out[stale] = 0
+
+
+def align(quotes, how='inner', fill='ffill', batch=False):
+    """Align quotes of many symbols on a common time grid.
+
+    Args:
+        quotes: List of Quotes objects or dictionary of symbols to Quotes objects,
+            time of each must be strictly increasing
+        how: 'inner' (default) - times present in all quotes, 'outer' - times of any quotes
+        fill: Bars missing in quotes at outer grid times: 'ffill' (default) - flat bars at the
+            last close with zero volume, 'nan' - NaN bars (0 for integer series). Bars before
+            the first bar of quotes are always NaN.
+        batch: If True, return 2-D arrays (n_symbols, n_bars) of columns instead of Quotes objects
+
+    Returns:
+        List (or dictionary with the same keys) of aligned Quotes objects with the same time,
+        or tuple (time, dictionary of column names to 2-D arrays) if batch is True
+
+    Raises:
+        PyTAExceptionBadParameterValue: If how or fill is invalid or quotes are empty
+        PyTAExceptionBadSeriesData: If time is not strictly increasing or columns of
+            quotes differ (for batch)
+        PyTAExceptionDataSeriesNonFound: If quotes have no time series
+
+    Example:
+        >>> btc, eth, sol = ta.align([quotes_btc, quotes_eth, quotes_sol], how='outer')
+        >>> time, batch = ta.align(quotes_by_symbol, batch=True)
+    """
+    if how not in ALIGN_HOW:
+        raise PyTAExceptionBadParameterValue(f"how must be 'inner' or 'outer', got {how}")
+    if fill not in ALIGN_FILL:
+        raise PyTAExceptionBadParameterValue(f"fill must be 'ffill' or 'nan', got {fill}")
+    if not quotes:
+        raise PyTAExceptionBadParameterValue('quotes must not be empty')
+
+    keys = list(quotes) if isinstance(quotes, dict) else list(range(len(quotes)))
+    items = list(quotes.values()) if isinstance(quotes, dict) else list(quotes)
+    times = [time_ms_of(key, item) for key, item in zip(keys, items)]
+    for item in items:
+        item._materialize()
+
+    offsets = np.zeros(len(times) + 1, dtype=np.int64)
+    np.cumsum([len(time_ms) for time_ms in times], out=offsets[1:])
+    all_times = np.concatenate(times)
+    inner, ffill = how == 'inner', fill == 'ffill'
+
+    n_out = calc_merge(all_times, offsets, inner, ffill, 0, np.empty(0, dtype=np.int64),
+                       np.empty((0, 0), dtype=np.int64))
+    grid = np.empty(n_out, dtype=np.int64)
+    indexes = np.empty((len(items), n_out), dtype=np.int64)
+    if n_out:
+        calc_merge(all_times, offsets, inner, ffill, n_out, grid, indexes)
+    time = grid.view(TIME_TYPE)
+
+    if batch:
+        columns = [name for name in items[0]._data if name != 'time']
+        for key, item in zip(keys, items):
+            if [name for name in item._data if name != 'time'] != columns:
+                raise PyTAExceptionBadSeriesData(f'columns of {key} differ from columns of {keys[0]}')
+        arrays = {name: np.empty((len(items), n_out), dtype=items[0]._data[name].dtype) for name in columns}
+    else:
+        arrays = None
+
+    results = []
+    for k, (time_ms, item) in enumerate(zip(times, items)):
+        row_indexes = indexes[k]
+        stale = None
+        if not inner and ffill:
+            stale = (row_indexes >= 0) & (time_ms.take(row_indexes, mode='clip') != grid) if len(time_ms) else None
+        is_quotes = isinstance(item, Quotes)
+        data = {}
+        for name, values in item._data.items():
+            if name == 'time':
+                continue
+            out = arrays[name][k] if batch else np.empty(n_out, dtype=values.dtype)
+            take_series(values, row_indexes, stale, name, is_quotes, item._data.get('close'), out)
+            data[name] = out
+        if not batch:
+            data['time'] = time.copy()
+            results.append(item._create_from_dict(data))
+
+    if batch:
+        return time, arrays
+    if isinstance(quotes, dict):
+        return dict(zip(keys, results))
+    return results
@@ -0,0 +1,422 @@
+"""Bars built from trades.
+
+Trades are given as arrays of times, prices and sizes (e.g., trade prints of
+an exchange). Time bars group trades by periods of a timeframe, like
+Quotes.resample(): open is the first price, high and low are the extremes,
+close is the last price and volume is the sum of sizes. The time of a bar is
+the start of its period, periods without trades produce no bars.
+
+Information-driven bars close by the traded amount instead of time: volume
+and dollar bars when the sum of sizes (sizes by prices) reaches a threshold,
+tick and volume imbalance bars when the imbalance of signed ticks (signed
+sizes) exceeds its expected value, estimated by exponential averages over
+previous bars (Lopez de Prado, Advances in Financial Machine Learning, 2.3)
+with the expected number of trades of a bar kept within bounds.
+These builders also accept fine-grained Quotes instead of trades (each bar is
+taken as a trade at the close price with the volume of the bar, high and low
+of bars are kept). The time of an information-driven bar is the time of its
+first trade.
+
+Example:
+    >>> from pyita import bars
+    >>> quotes_1m = bars.time_bars(trade_time, trade_price, trade_size, '1m')
+    >>> aggregator = bars.TradeAggregator('1m')
+    >>> closed = aggregator.update(time_chunk, price_chunk, size_chunk)
+    >>> quotes_volume = bars.volume_bars(quotes_1m, threshold=1000)
+"""
+import numpy as np
+import numba as nb
+
+from .quotes import Quotes
+from .resample import parse_timeframe, get_origin, calc_buckets, check_sorted, calc_ohlcv_groups, aggregate, Resampler
+from .constants import TIME_TYPE
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+
+@nb.njit(cache=True)
+def calc_threshold_bar_ids(value, threshold):
+    """Number bars closed when the sum of values reaches the threshold.
+
+    Args:
+        value: Array of values of trades (sizes or sizes by prices), NaN is skipped
+        threshold: Sum of values of a bar
+
+    Returns:
+        Array of bar numbers of trades
+    """
+    n_trades = len(value)
+    bar_ids = np.empty(n_trades, dtype=np.int64)
+
+    i_bar = 0
+    total = 0.0
+    for i in range(n_trades):
+        bar_ids[i] = i_bar
+        if not np.isnan(value[i]):
+            total += value[i]
+        if total >= threshold:
+            i_bar += 1
+            total = 0.0
+
+    return bar_ids
+
+
+@nb.njit(cache=True)
+def calc_imbalance_bar_ids(price, weight, expected_ticks, alpha, min_ticks, max_ticks):
+    """Number imbalance bars by the tick rule.
+
+    The sign of a trade is the sign of the price change (the previous sign if
+    the price is not changed, 0 before the first change). A bar is closed when
+    the absolute sum of signs by weights reaches E[T] * |E[imbalance]|, where
+    E[T] and E[imbalance] are exponential averages of the number of trades and
+    the imbalance per trade of previous bars. The first bar has expected_ticks
+    trades and initializes the averages. E[T] is kept within [min_ticks, max_ticks]:
+    without bounds the estimate is unstable and bars degenerate to single
+    trades or grow without limit.
+
+    Args:
+        price: Array of trade prices
+        weight: Array of weights of trades (ones for tick imbalance, sizes for volume imbalance)
+        expected_ticks: Number of trades of the first bar (initial E[T])
+        alpha: Smoothing factor of the exponential averages
+        min_ticks: Lower bound of E[T]
+        max_ticks: Upper bound of E[T]
+
+    Returns:
+        Array of bar numbers of trades
+    """
+    n_trades = len(price)
+    bar_ids = np.empty(n_trades, dtype=np.int64)
+
+    mean_ticks = float(expected_ticks)
+    mean_imbalance = np.nan
+    sign = 0.0
+    prev_price = np.nan
+
+    i_bar = 0
+    imbalance = 0.0
+    n_ticks = 0
+    for i in range(n_trades):
+        bar_ids[i] = i_bar
+
+        value = price[i]
+        if not np.isnan(value):
+            if value > prev_price:
+                sign = 1.0
+            elif value < prev_price:
+                sign = -1.0
+            prev_price = value
+        if not np.isnan(weight[i]):
+            imbalance += sign * weight[i]
+        n_ticks += 1
+
+        if np.isnan(mean_imbalance):
+            if n_ticks < expected_ticks:
+                continue
+            mean_imbalance = imbalance / n_ticks
+        else:
+            if abs(imbalance) < mean_ticks * abs(mean_imbalance):
+                continue
+            mean_ticks = min(max(mean_ticks + alpha * (n_ticks - mean_ticks), min_ticks), max_ticks)
+            mean_imbalance += alpha * (imbalance / n_ticks - mean_imbalance)
+
+        i_bar += 1
+        imbalance = 0.0
+        n_ticks = 0
+
+    return bar_ids
+
+
+def trade_arrays(time, price, size):
+    """Convert trade arrays: time to int64 milliseconds, price and size to float64.
+
+    Integer times are milliseconds since epoch (as in CCXT trades).
+    """
+    time = np.asarray(time)
+    if np.issubdtype(time.dtype, np.datetime64):
+        time_ms = time.astype(TIME_TYPE).view(np.int64)
+    elif np.issubdtype(time.dtype, np.integer) or time.size == 0:
+        time_ms = time.astype(np.int64, copy=False)
+    else:
+        raise PyTAExceptionBadSeriesData(f'time must be datetime64 or integer milliseconds, got {time.dtype}')
+
+    price = np.asarray(price, dtype=np.float64)
+    size = np.asarray(size, dtype=np.float64)
+    if not len(time_ms) == len(price) == len(size):
+        raise PyTAExceptionBadSeriesData(
+            f'time, price and size must have the same length, got {len(time_ms)}, {len(price)}, {len(size)}'
+        )
+
+    return time_ms, price, size
+
+
+def trade_columns(price, size):
+    """OHLCV columns of trades taken as bars (open, high, low and close are the price)."""
+    return {'open': price, 'high': price, 'low': price, 'close': price, 'volume': size}
+
+
+def time_bars(time, price, size, timeframe, origin='epoch'):
+    """Aggregate trades into time bars.
+
+    Args:
+        time: Array of trade times (datetime64 or integer milliseconds since epoch), sorted
+        price: Array of trade prices
+        size: Array of trade sizes
+        timeframe: Timeframe of bars in CCXT notation ('1s', '1m', '5m', '1h', '1d', '1w', '1M')
+            or numpy.timedelta64
+        origin: Alignment of fixed timeframes - 'epoch' (default), 'start' (time of the
+            first trade) or datetime-like value
+
+    Returns:
+        Quotes object with open, high, low, close, volume and time of bars
+
+    Raises:
+        PyTAExceptionBadParameterValue: If timeframe or origin is invalid
+        PyTAExceptionBadSeriesData: If arrays are invalid or time is not sorted
+
+    Example:
+        >>> quotes = bars.time_bars(trades['time'], trades['price'], trades['amount'], '5m')
+        >>> ema = ta.ema(quotes, period=20)
+    """
+    count, unit = parse_timeframe(timeframe)
+    time_ms, price, size = trade_arrays(time, price, size)
+    origin_ms = get_origin(origin, unit, time_ms)
+
+    buckets = calc_buckets(time_ms, count, unit, origin_ms)
+    check_sorted(buckets)
+
+    result, _ = aggregate(trade_columns(price, size), buckets, count, unit, origin_ms)
+    return Quotes._from_arrays(result)
+
+
+def source_arrays(time, price, size):
+    """Arrays of trades or bars of Quotes: (time_ms, open, high, low, close, volume)."""
+    if isinstance(time, Quotes):
+        if price is not None or size is not None:
+            raise PyTAExceptionBadParameterValue('price and size must not be given with quotes')
+        quotes = time
+        return (
+            quotes['time'].view(np.int64), quotes['open'], quotes['high'], quotes['low'],
+            quotes['close'], quotes['volume'].astype(np.float64, copy=False),
+        )
+
+    if price is None or size is None:
+        raise PyTAExceptionBadParameterValue('price and size of trades must be given')
+    time_ms, price, size = trade_arrays(time, price, size)
+    return time_ms, price, price, price, price, size
+
+
+def group_bars(bar_ids, time_ms, open_, high, low, close, volume):
+    """Quotes object with bars of trades with the same bar number."""
+    first_indexes, out_open, out_high, out_low, out_close, out_volume = calc_ohlcv_groups(
+        bar_ids, open_, high, low, close, volume
+    )
+    return Quotes._from_arrays({
+        'open': out_open,
+        'high': out_high,
+        'low': out_low,
+        'close': out_close,
+        'volume': out_volume,
+        'time': time_ms[first_indexes].view(TIME_TYPE),
+    })
+
+
+def check_threshold(threshold):
+
+    if isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or not threshold > 0:
+        raise PyTAExceptionBadParameterValue(f'threshold must be a positive number, got {threshold}')
+
+
+def volume_bars(time, price=None, size=None, threshold=None):
+    """Build bars closed when the traded volume reaches the threshold.
+
+    A bar includes the trade that reaches the threshold, so bar volumes are at
+    least threshold. The last bar may be incomplete.
+
+    Args:
+        time: Array of trade times (datetime64 or integer milliseconds since epoch),
+            or Quotes object with time and volume (fine-grained bars)
+        price: Array of trade prices (not given with quotes)
+        size: Array of trade sizes (not given with quotes)
+        threshold: Volume of a bar
+
+    Returns:
+        Quotes object with open, high, low, close, volume and time of bars
+
+    Raises:
+        PyTAExceptionBadParameterValue: If threshold is invalid
+        PyTAExceptionBadSeriesData: If arrays are invalid
+
+    Example:
+        >>> quotes = bars.volume_bars(trades['time'], trades['price'], trades['amount'], threshold=50)
+        >>> quotes = bars.volume_bars(quotes_1m, threshold=5000)
+    """
+    check_threshold(threshold)
+    arrays = source_arrays(time, price, size)
+    bar_ids = calc_threshold_bar_ids(arrays[5], float(threshold))
+    return group_bars(bar_ids, *arrays)
+
+
+def dollar_bars(time, price=None, size=None, threshold=None):
+    """Build bars closed when the traded value (size by price) reaches the threshold.
+
+    The value of a bar of quotes is its volume by its close price. The last bar
+    may be incomplete.
+
+    Args:
+        time: Array of trade times (datetime64 or integer milliseconds since epoch),
+            or Quotes object with time and volume (fine-grained bars)
+        price: Array of trade prices (not given with quotes)
+        size: Array of trade sizes (not given with quotes)
+        threshold: Traded value of a bar
+
+    Returns:
+        Quotes object with open, high, low, close, volume and time of bars
+
+    Raises:
+        PyTAExceptionBadParameterValue: If threshold is invalid
+        PyTAExceptionBadSeriesData: If arrays are invalid
+
+    Example:
+        >>> quotes = bars.dollar_bars(quotes_1m, threshold=1e7)
+    """
+    check_threshold(threshold)
+    arrays = source_arrays(time, price, size)
+    bar_ids = calc_threshold_bar_ids(arrays[4] * arrays[5], float(threshold))
+    return group_bars(bar_ids, *arrays)
+
+
+def imbalance_bars(arrays, weight, expected_ticks, span, max_ratio):
+
+    if isinstance(expected_ticks, bool) or not isinstance(expected_ticks, int) or expected_ticks < 1:
+        raise PyTAExceptionBadParameterValue(f'expected_ticks must be a positive integer, got {expected_ticks}')
+    if isinstance(span, bool) or not isinstance(span, (int, float)) or not span >= 1:
+        raise PyTAExceptionBadParameterValue(f'span must be a number >= 1, got {span}')
+    if max_ratio is None:
+        min_ticks, max_ticks = 1.0, np.inf
+    elif isinstance(max_ratio, bool) or not isinstance(max_ratio, (int, float)) or not max_ratio >= 1:
+        raise PyTAExceptionBadParameterValue(f'max_ratio must be a number >= 1 or None, got {max_ratio}')
+    else:
+        min_ticks, max_ticks = expected_ticks / max_ratio, expected_ticks * max_ratio
+
+    bar_ids = calc_imbalance_bar_ids(arrays[4], weight, expected_ticks, 2 / (span + 1), min_ticks, max_ticks)
+    return group_bars(bar_ids, *arrays)
+
+
+def tick_imbalance_bars(time, price=None, size=None, expected_ticks=100, span=20, max_ratio=2):
+    """Build tick imbalance bars.
+
+    Trades are signed by the tick rule (+1 for an uptick, -1 for a downtick,
+    the previous sign for an unchanged price). A bar is closed when the absolute
+    sum of signs reaches the expected imbalance E[T] * |E[sign]|, estimated by
+    exponential averages over previous bars. The last bar may be incomplete.
+
+    Args:
+        time: Array of trade times (datetime64 or integer milliseconds since epoch),
+            or Quotes object with time and volume (fine-grained bars)
+        price: Array of trade prices (not given with quotes)
+        size: Array of trade sizes (not given with quotes)
+        expected_ticks: Number of trades of the first bar, initial E[T] (default: 100)
+        span: Span of the exponential averages in bars (default: 20)
+        max_ratio: E[T] is kept within [expected_ticks / max_ratio, expected_ticks * max_ratio]
+            (default: 2), None for unbounded E[T]
+
+    Returns:
+        Quotes object with open, high, low, close, volume and time of bars
+
+    Raises:
+        PyTAExceptionBadParameterValue: If parameters are invalid
+        PyTAExceptionBadSeriesData: If arrays are invalid
+
+    Example:
+        >>> quotes = bars.tick_imbalance_bars(trades['time'], trades['price'], trades['amount'])
+    """
+    arrays = source_arrays(time, price, size)
+    return imbalance_bars(arrays, np.ones(len(arrays[0])), expected_ticks, span, max_ratio)
+
+
+def volume_imbalance_bars(time, price=None, size=None, expected_ticks=100, span=20, max_ratio=2):
+    """Build volume imbalance bars.
+
+    Like tick imbalance bars, with trade signs weighted by sizes: a bar is
+    closed when the absolute sum of signed sizes reaches E[T] * |E[sign * size]|.
+    The last bar may be incomplete.
+
+    Args:
+        time: Array of trade times (datetime64 or integer milliseconds since epoch),
+            or Quotes object with time and volume (fine-grained bars)
+        price: Array of trade prices (not given with quotes)
+        size: Array of trade sizes (not given with quotes)
+        expected_ticks: Number of trades of the first bar, initial E[T] (default: 100)
+        span: Span of the exponential averages in bars (default: 20)
+        max_ratio: E[T] is kept within [expected_ticks / max_ratio, expected_ticks * max_ratio]
+            (default: 2), None for unbounded E[T]
+
+    Returns:
+        Quotes object with open, high, low, close, volume and time of bars
+
+    Raises:
+        PyTAExceptionBadParameterValue: If parameters are invalid
+        PyTAExceptionBadSeriesData: If arrays are invalid
+
+    Example:
+        >>> quotes = bars.volume_imbalance_bars(quotes_1m, expected_ticks=60)
+    """
+    arrays = source_arrays(time, price, size)
+    return imbalance_bars(arrays, arrays[5], expected_ticks, span, max_ratio)
+
+
+class TradeAggregator:
+    """Incremental aggregation of trades into time bars.
+
+    Trades are fed in chunks. A bar is closed when a trade of a later period
+    arrives, the bar being formed is available through the partial property.
+    Trades are aggregated by a Resampler as bars with open, high, low and
+    close equal to the price.
+
+    Example:
+        >>> aggregator = TradeAggregator('1m')
+        >>> closed = aggregator.update(time_chunk, price_chunk, size_chunk)
+        >>> print(closed.close, aggregator.partial.close)
+    """
+
+    def __init__(self, timeframe, origin='epoch'):
+        """Initialize TradeAggregator.
+
+        Args:
+            timeframe: Timeframe of bars ('1s', '1m', '5m', '1h', '1d', '1w', '1M', ...)
+            origin: 'epoch' (default), 'start' (first trade) or datetime-like value
+        """
+        self._resampler = Resampler(timeframe, origin)
+
+    def update(self, time, price, size):
+        """Add trades.
+
+        Args:
+            time: Array of trade times (datetime64 or integer milliseconds since epoch)
+            price: Array of trade prices
+            size: Array of trade sizes
+
+        Returns:
+            Quotes object with bars closed by these trades (may be empty)
+
+        Raises:
+            PyTAExceptionBadSeriesData: If arrays are invalid, time is not sorted or
+                precedes already aggregated trades
+        """
+        time_ms, price, size = trade_arrays(time, price, size)
+        data = trade_columns(price, size)
+        data['time'] = time_ms.view(TIME_TYPE)
+        return self._resampler.update(Quotes._from_arrays(data))
+
+    @property
+    def partial(self):
+        """Quotes object with the bar being formed (None if there is no bar)."""
+        return self._resampler.partial
+
+    def flush(self):
+        """Close the bar being formed and return it.
+
+        Returns:
+            Quotes object with the last bar (None if there is no bar)
+        """
+        return self._resampler.flush()
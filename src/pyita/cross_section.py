@@ -0,0 +1,284 @@
+"""Cross-sectional operators over symbols at every bar.
+
+Functions take 2-D arrays (n_symbols, n_bars) with a row per symbol, e.g.
+columns of ta.align(..., batch=True) or stacked indicator values of aligned
+quotes, and calculate values over the symbols at each bar. NaN values
+(symbols without data or in warm-up) are excluded: they get NaN (False for
+top_k), and bars with fewer than min_count valid symbols are NaN.
+
+Kernels (calc_*) are compiled with numba, functions without prefix validate
+parameters and convert values to float64.
+
+Example:
+    >>> from pyita import cross_section
+    >>> time, batch = ta.align(quotes_by_symbol, batch=True)
+    >>> momentum = batch['close'][:, 20:] / batch['close'][:, :-20] - 1
+    >>> selected = cross_section.top_k(momentum, 10)
+"""
+import numpy as np
+import numba as nb
+
+from .exceptions import PyTAExceptionBadParameterValue
+
+
+@nb.njit(cache=True)
+def sort_valid(values, j, order):
+    """Sort symbols with non-NaN values of bar j.
+
+    Args:
+        values: Array (n_symbols, n_bars)
+        j: Bar index
+        order: Buffer of n_symbols size for symbol indexes
+
+    Returns:
+        Number of valid symbols, order starts with their indexes sorted by values
+        (ties in the order of symbols)
+    """
+    n_valid = 0
+    for i in range(values.shape[0]):
+        if not np.isnan(values[i, j]):
+            order[n_valid] = i
+            n_valid += 1
+
+    keys = np.empty(n_valid, dtype=np.float64)
+    for k in range(n_valid):
+        keys[k] = values[order[k], j]
+    order[:n_valid] = order[:n_valid][np.argsort(keys, kind='mergesort')]
+    return n_valid
+
+
+@nb.njit(cache=True)
+def calc_rank(values, ascending, percent, min_count):
+    """Calculate ranks of symbols at every bar.
+
+    Args:
+        values: Array (n_symbols, n_bars)
+        ascending: If True, the smallest value has rank 1, else the largest one
+        percent: If True, return percentages (0, 100] of valid symbols with values <= the
+            value (>= for descending), else ranks from 1 (average rank for ties)
+        min_count: Minimal number of valid symbols
+
+    Returns:
+        Array (n_symbols, n_bars) of ranks
+    """
+    n_symbols, n_bars = values.shape
+    result = np.full((n_symbols, n_bars), np.nan)
+    order = np.empty(n_symbols, dtype=np.int64)
+
+    for j in range(n_bars):
+        n_valid = sort_valid(values, j, order)
+        if n_valid < min_count or n_valid == 0:
+            continue
+
+        first = 0
+        while first < n_valid:
+            last = first
+            while last + 1 < n_valid and values[order[last + 1], j] == values[order[first], j]:
+                last += 1
+            for k in range(first, last + 1):
+                if ascending:
+                    low, high = first, last
+                else:
+                    low, high = n_valid - 1 - last, n_valid - 1 - first
+                if percent:
+                    result[order[k], j] = (high + 1) / n_valid * 100
+                else:
+                    result[order[k], j] = (low + high) / 2 + 1
+            first = last + 1
+
+    return result
+
+
+@nb.njit(cache=True)
+def calc_zscore(values, ddof, min_count, scale):
+    """Calculate deviations of symbols from the mean at every bar.
+
+    Args:
+        values: Array (n_symbols, n_bars)
+        ddof: Delta degrees of freedom of the standard deviation
+        min_count: Minimal number of valid symbols
+        scale: If True, deviations are divided by the standard deviation (z-score),
+            else they are not (demeaning)
+
+    Returns:
+        Array (n_symbols, n_bars) of deviations (NaN for zero standard deviation of z-scores)
+    """
+    n_symbols, n_bars = values.shape
+    result = np.full((n_symbols, n_bars), np.nan)
+
+    for j in range(n_bars):
+        count = 0
+        total = 0.0
+        for i in range(n_symbols):
+            value = values[i, j]
+            if not np.isnan(value):
+                count += 1
+                total += value
+        if count < min_count or count == 0 or (scale and count <= ddof):
+            continue
+
+        mean = total / count
+        divider = 1.0
+        if scale:
+            m2 = 0.0
+            for i in range(n_symbols):
+                value = values[i, j]
+                if not np.isnan(value):
+                    m2 += (value - mean) ** 2
+            divider = np.sqrt(m2 / (count - ddof))
+            if divider == 0:
+                continue
+
+        for i in range(n_symbols):
+            value = values[i, j]
+            if not np.isnan(value):
+                result[i, j] = (value - mean) / divider
+
+    return result
+
+
+@nb.njit(cache=True)
+def calc_top_k(values, k, largest, min_count):
+    """Select k symbols with the largest (smallest) values at every bar.
+
+    Returns:
+        Boolean array (n_symbols, n_bars), ties are resolved in the order of symbols
+    """
+    n_symbols, n_bars = values.shape
+    result = np.zeros((n_symbols, n_bars), dtype=np.bool_)
+    order = np.empty(n_symbols, dtype=np.int64)
+
+    for j in range(n_bars):
+        n_valid = sort_valid(values, j, order)
+        if n_valid < min_count:
+            continue
+        n_selected = min(k, n_valid)
+        if largest:
+            # Descending order with ties in the order of symbols
+            first = n_valid
+            while n_selected > 0:
+                last = first - 1
+                first = last
+                while first > 0 and values[order[first - 1], j] == values[order[last], j]:
+                    first -= 1
+                n_group = last - first + 1
+                for m in range(first, first + min(n_group, n_selected)):
+                    result[order[m], j] = True
+                n_selected -= n_group
+        else:
+            for m in range(n_selected):
+                result[order[m], j] = True
+
+    return result
+
+
+def prepare_batch(values, min_count):
+    """Validate parameters and convert values to a float64 2-D array.
+
+    Raises:
+        PyTAExceptionBadParameterValue: If values are not 2-D or min_count < 1
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 2:
+        raise PyTAExceptionBadParameterValue(f'values must be 2-D array (n_symbols, n_bars), got {values.ndim}-D')
+    if isinstance(min_count, bool) or not isinstance(min_count, (int, np.integer)) or min_count < 1:
+        raise PyTAExceptionBadParameterValue(f'min_count must be a positive integer, got {min_count}')
+    return values
+
+
+def rank(values, ascending=True, min_count=1):
+    """Rank symbols at every bar.
+
+    Args:
+        values: Array (n_symbols, n_bars)
+        ascending: If True (default), the smallest value has rank 1, else the largest one
+        min_count: Minimal number of valid symbols at a bar (default: 1)
+
+    Returns:
+        numpy.ndarray: Ranks from 1 (average rank for ties), NaN for NaN values
+
+    Raises:
+        PyTAExceptionBadParameterValue: If values are not 2-D or min_count < 1
+    """
+    return calc_rank(prepare_batch(values, min_count), ascending, False, min_count)
+
+
+def percentile(values, ascending=True, min_count=1):
+    """Percentile rank of symbols at every bar.
+
+    Args:
+        values: Array (n_symbols, n_bars)
+        ascending: If True (default), percentages of valid symbols with values <= the value,
+            else with values >= the value
+        min_count: Minimal number of valid symbols at a bar (default: 1)
+
+    Returns:
+        numpy.ndarray: Percentages (0, 100], NaN for NaN values
+
+    Raises:
+        PyTAExceptionBadParameterValue: If values are not 2-D or min_count < 1
+    """
+    return calc_rank(prepare_batch(values, min_count), ascending, True, min_count)
+
+
+def zscore(values, ddof=0, min_count=2):
+    """Z-score of symbols at every bar: deviation from the mean in standard deviations.
+
+    Args:
+        values: Array (n_symbols, n_bars)
+        ddof: Delta degrees of freedom, 0 - population, 1 - sample deviation (default: 0)
+        min_count: Minimal number of valid symbols at a bar (default: 2)
+
+    Returns:
+        numpy.ndarray: Z-scores, NaN for NaN values and bars with equal values
+
+    Raises:
+        PyTAExceptionBadParameterValue: If values are not 2-D, min_count < 1 or ddof < 0
+    """
+    values = prepare_batch(values, min_count)
+    if ddof < 0:
+        raise PyTAExceptionBadParameterValue(f'ddof must be non-negative, got {ddof}')
+    return calc_zscore(values, ddof, min_count, True)
+
+
+def demean(values, min_count=1):
+    """Deviation of symbols from the mean of valid symbols at every bar.
+
+    Args:
+        values: Array (n_symbols, n_bars)
+        min_count: Minimal number of valid symbols at a bar (default: 1)
+
+    Returns:
+        numpy.ndarray: Deviations, NaN for NaN values
+
+    Raises:
+        PyTAExceptionBadParameterValue: If values are not 2-D or min_count < 1
+    """
+    return calc_zscore(prepare_batch(values, min_count), 0, min_count, False)
+
+
+def top_k(values, k, largest=True, min_count=1):
+    """Select k symbols with the largest (or smallest) values at every bar.
+
+    Args:
+        values: Array (n_symbols, n_bars)
+        k: Number of symbols to select (all valid symbols if there are fewer of them)
+        largest: If True (default), select the largest values, else the smallest ones
+        min_count: Minimal number of valid symbols at a bar, nothing is selected
+            at bars with fewer of them (default: 1)
+
+    Returns:
+        numpy.ndarray: Boolean array (n_symbols, n_bars) of selected symbols, ties are
+            resolved in the order of symbols
+
+    Raises:
+        PyTAExceptionBadParameterValue: If values are not 2-D, min_count < 1 or k < 1
+
+    Example:
+        >>> selected = cross_section.top_k(rsi_batch, 5, largest=False)
+        >>> symbols_at_last_bar = [s for s, ok in zip(symbols, selected[:, -1]) if ok]
+    """
+    values = prepare_batch(values, min_count)
+    if isinstance(k, bool) or not isinstance(k, (int, np.integer)) or k < 1:
+        raise PyTAExceptionBadParameterValue(f'k must be a positive integer, got {k}')
+    return calc_top_k(values, k, largest, min_count)
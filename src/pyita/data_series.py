@@ -12,6 +12,9 @@ except ImportError:
 
 from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData, PyTAExceptionDataSeriesNonFound
 
+# Type of packed block items
+PACKED_TYPE = np.dtype(np.float64)
+
 
 class DataSeries(abc.ABC):
     """Base class for quotes and indicator results.
@@ -24,6 +27,8 @@ class DataSeries(abc.ABC):
         [1, 2, 3]
     """
     
+    __slots__ = ('_data', '_column_types', '_packed', '_deferred', '_time_sorted', '__weakref__')
+    
     # Column validation attributes
     # Set to None to skip validation, or list of column names to validate
     REQUIRED_COLUMNS = None  # Required columns (None = skip check)
@@ -50,6 +55,8 @@ class DataSeries(abc.ABC):
         """
         # Get column types from subclass
         self._column_types = self.column_types()
+        self._packed = None
+        self._deferred = None
         
         # Initialize data dictionary
         self._data = {}
@@ -82,6 +89,86 @@ class DataSeries(abc.ABC):
         # Validate data
         self._validate_data()
     
+    @classmethod
+    def _from_arrays(cls, data_dict):
+        """Create object from already converted arrays without copying and validation.
+        
+        Args:
+            data_dict: Dictionary of column names to numpy arrays of proper types
+            
+        Returns:
+            New object of this class that uses data_dict as its storage
+        """
+        new_obj = cls.__new__(cls)
+        new_obj._column_types = new_obj.column_types()
+        new_obj._data = data_dict
+        new_obj._packed = None
+        new_obj._deferred = None
+        return new_obj
+    
+    @classmethod
+    def _from_packed_rows(cls, buffer, columns, dtypes):
+        """Create object with series as row views of a packed block.
+        
+        Args:
+            buffer: 2-D array (n_series, n_bars) with 8-byte items
+            columns: Series names in the order of rows
+            dtypes: Series data types in the order of rows
+            
+        Returns:
+            New object of this class that uses buffer as its storage
+        """
+        new_obj = cls._from_arrays({
+            name: buffer[i].view(dtype) for i, (name, dtype) in enumerate(zip(columns, dtypes))
+        })
+        new_obj._packed = buffer
+        return new_obj
+    
+    @classmethod
+    def from_packed(cls, buffer, columns, dtypes=None):
+        """Create object on a packed block without copying.
+        
+        The block can be the packed property of another object, an array loaded
+        with np.load(..., mmap_mode='r') or an array on a shared buffer.
+        
+        Args:
+            buffer: 2-D array (n_series, n_bars) of float64 (or other 8-byte type)
+            columns: Series names in the order of rows
+            dtypes: Dictionary of series names to data types for rows that are not float64
+                (default: types from column_types, e.g. datetime64[ms] for Quotes time)
+                
+        Returns:
+            New object of this class with series as views of buffer rows
+            
+        Raises:
+            PyTAExceptionBadSeriesData: If buffer shape or type does not fit columns
+            
+        Example:
+            >>> np.save('quotes.npy', quotes.pack().packed)
+            >>> columns = ['open', 'high', 'low', 'close', 'volume', 'time']
+            >>> quotes = Quotes.from_packed(np.load('quotes.npy', mmap_mode='r'), columns)
+        """
+        columns = list(columns)
+        if buffer.ndim != 2 or buffer.shape[0] != len(columns):
+            raise PyTAExceptionBadSeriesData(
+                f"Packed block shape {buffer.shape} does not match {len(columns)} columns"
+            )
+        if buffer.dtype.itemsize != PACKED_TYPE.itemsize:
+            raise PyTAExceptionBadSeriesData(f"Packed block must have 8-byte items, got {buffer.dtype}")
+        
+        column_types = cls.__new__(cls).column_types() or {}
+        dtypes = dtypes or {}
+        row_dtypes = [
+            np.dtype(dtypes.get(name, column_types.get(name, PACKED_TYPE))) for name in columns
+        ]
+        for name, dtype in zip(columns, row_dtypes):
+            if dtype.itemsize != PACKED_TYPE.itemsize:
+                raise PyTAExceptionBadSeriesData(f"Series '{name}' of type {dtype} cannot be packed")
+        
+        new_obj = cls._from_packed_rows(buffer, columns, row_dtypes)
+        new_obj._validate_data()
+        return new_obj
+    
     def _add_data(self, key, data):
         """Add data to internal dictionary with type conversion.
         
@@ -333,6 +420,8 @@ class DataSeries(abc.ABC):
         """
         if isinstance(key, str):
             if key not in self._data:
+                if self._deferred and key in self._deferred:
+                    return self._calculate_deferred(key)
                 raise PyTAExceptionDataSeriesNonFound(key)
             return self._data[key]
         
@@ -348,29 +437,237 @@ class DataSeries(abc.ABC):
             key: slice object or int index
             
         Returns:
-            New DataSeries object (same type as self) with sliced arrays
+            New DataSeries object (same type as self) with sliced arrays (views)
             
         Raises:
             IndexError: If int index is out of range
         """
-        if not self._data:
+        self._materialize()
+        data = self._data
+        if not data:
             return self._create_empty()
         
-        first_array = next(iter(self._data.values()))
-        data_len = len(first_array)
-        
         if isinstance(key, int):
+            data_len = len(next(iter(data.values())))
             if key < 0:
                 key = data_len + key
             if key < 0 or key >= data_len:
                 raise IndexError(f"Index {key} is out of range for length {data_len}")
             key = slice(key, key + 1)
         
-        sliced_data = {}
-        for col_name, arr in self._data.items():
-            sliced_data[col_name] = arr[key]
+        if self._packed is not None:
+            # Slice of the block keeps the packed layout
+            sliced = self._from_packed_rows(self._packed[:, key], data.keys(), [arr.dtype for arr in data.values()])
+        else:
+            sliced = self._create_from_dict({col_name: arr[key] for col_name, arr in data.items()})
+        
+        # Slices of sorted time are sorted
+        if 'time' in data and getattr(self, '_time_sorted', None) is data['time'] and key.step in (None, 1):
+            sliced._time_sorted = sliced._data['time']
+        return sliced
+    
+    def pack(self):
+        """Create a copy with all series in one contiguous (n_series, n_bars) block.
+        
+        Series become row views of the block, so the object is sliced, copied,
+        pickled and saved as a single array. Datetime series are stored as
+        their 8-byte representation in the float64 block.
+        
+        Returns:
+            New object of the same type with packed layout
+            
+        Raises:
+            PyTAExceptionBadSeriesData: If a series has other than 8-byte items (e.g. int8 signals)
+            
+        Example:
+            >>> packed_quotes = quotes.pack()
+            >>> block = packed_quotes.packed  # shape (n_series, n_bars)
+        """
+        self._materialize()
+        data = self._data
+        columns = list(data.keys())
+        dtypes = [arr.dtype for arr in data.values()]
+        for name, dtype in zip(columns, dtypes):
+            if dtype.itemsize != PACKED_TYPE.itemsize:
+                raise PyTAExceptionBadSeriesData(f"Series '{name}' of type {dtype} cannot be packed")
+        
+        n_bars = len(data[columns[0]]) if columns else 0
+        buffer = np.empty((len(columns), n_bars), dtype=PACKED_TYPE)
+        for i, (arr, dtype) in enumerate(zip(data.values(), dtypes)):
+            buffer[i].view(dtype)[:] = arr
+        
+        return self._from_packed_rows(buffer, columns, dtypes)
+    
+    @property
+    def packed(self):
+        """Block (n_series, n_bars) with all series as rows, or None if layout is not packed."""
+        return self._packed
+    
+    def copy(self):
+        """Create a copy of the object with copies of all series.
+        
+        Packed objects are copied as a single block.
+        
+        Returns:
+            New object of the same type
+        """
+        self._materialize()
+        if self._packed is not None:
+            return self._from_packed_rows(
+                self._packed.copy(), self._data.keys(), [arr.dtype for arr in self._data.values()]
+            )
+        return self._create_from_dict({col_name: arr.copy() for col_name, arr in self._data.items()})
+    
+    def __getstate__(self):
+        """Get state for pickling: packed objects are pickled as a single block."""
+        self._materialize()
+        if self._packed is not None:
+            return {
+                'packed': self._packed,
+                'columns': list(self._data.keys()),
+                'dtypes': [arr.dtype.str for arr in self._data.values()],
+            }
+        return {'data': self._data}
+    
+    def __setstate__(self, state):
+        """Restore state after unpickling."""
+        self._column_types = self.column_types()
+        if 'packed' in state:
+            buffer = state['packed']
+            self._data = {
+                name: buffer[i].view(dtype) for i, (name, dtype) in enumerate(zip(state['columns'], state['dtypes']))
+            }
+            self._packed = buffer
+        else:
+            self._data = state['data']
+            self._packed = None
+        self._deferred = None
+    
+    def tail(self, k):
+        """Get views of the last k values of all series.
+        
+        Lightweight alternative to slicing: no new DataSeries object is created.
+        
+        Args:
+            k: Number of last values
+            
+        Returns:
+            dict: Dictionary of series names to views of their last k values
+            
+        Raises:
+            PyTAExceptionBadParameterValue: If k < 0
+            
+        Example:
+            >>> last = ta.rsi(quotes, period=14).tail(3)
+            >>> print(last['rsi'])
+        """
+        if k < 0:
+            raise PyTAExceptionBadParameterValue(f'k must be >= 0, got {k}')
+        self._materialize()
+        key = slice(-k, None) if k else slice(0, 0)
+        return {col_name: arr[key] for col_name, arr in self._data.items()}
+    
+    def between(self, start=None, end=None):
+        """Get bars with start <= time < end.
+        
+        The sorted time series is searched by bisection in O(log n), the result
+        contains views of the series.
         
-        return self._create_from_dict(sliced_data)
+        Args:
+            start: First time (datetime, date, datetime64, string or integer milliseconds),
+                None for the first bar
+            end: Time after the last bar, None for the last bar
+            
+        Returns:
+            New object of the same type with views of the bars
+            
+        Raises:
+            PyTAExceptionDataSeriesNonFound: If there is no time series
+            PyTAExceptionBadSeriesData: If time is not sorted in ascending order
+            PyTAExceptionBadParameterValue: If start or end is not a time
+            
+        Example:
+            >>> quotes_2024 = quotes.between('2024-01-01', '2025-01-01')
+        """
+        time = self._sorted_time()
+        i_start = 0 if start is None else int(np.searchsorted(time, self._time_value(start, time), 'left'))
+        i_end = len(time) if end is None else int(np.searchsorted(time, self._time_value(end, time), 'left'))
+        return self._create_sliced(slice(i_start, max(i_start, i_end)))
+    
+    def at(self, time_value):
+        """Get the bar with the given time.
+        
+        Args:
+            time_value: Time of the bar (datetime, date, datetime64, string or integer milliseconds)
+            
+        Returns:
+            New object of the same type with a view of one bar
+            
+        Raises:
+            PyTAExceptionDataSeriesNonFound: If there is no time series
+            PyTAExceptionBadSeriesData: If time is not sorted in ascending order
+            PyTAExceptionBadParameterValue: If there is no bar with this time
+            
+        Example:
+            >>> bar = quotes.at('2024-03-01T12:00')
+        """
+        time = self._sorted_time()
+        value = self._time_value(time_value, time)
+        i = int(np.searchsorted(time, value, 'left'))
+        if i == len(time) or time[i] != value:
+            raise PyTAExceptionBadParameterValue(f'no bar at time {value}')
+        return self._create_sliced(i)
+    
+    def asof(self, time_value):
+        """Get the last bar with time <= time_value.
+        
+        Args:
+            time_value: Time (datetime, date, datetime64, string or integer milliseconds)
+            
+        Returns:
+            New object of the same type with a view of one bar
+            
+        Raises:
+            PyTAExceptionDataSeriesNonFound: If there is no time series
+            PyTAExceptionBadSeriesData: If time is not sorted in ascending order
+            PyTAExceptionBadParameterValue: If time_value precedes the first bar
+            
+        Example:
+            >>> bar = quotes.asof(signal_time)
+        """
+        time = self._sorted_time()
+        value = self._time_value(time_value, time)
+        i = int(np.searchsorted(time, value, 'right')) - 1
+        if i < 0:
+            raise PyTAExceptionBadParameterValue(f'no bar at or before time {value}')
+        return self._create_sliced(i)
+    
+    @property
+    def loc(self):
+        """Time-based indexing: loc[start:end] (both ends included) and loc[time].
+        
+        Example:
+            >>> january = quotes.loc['2024-01-01':'2024-01-31T23:00']
+            >>> bar = quotes.loc[np.datetime64('2024-02-01')]
+        """
+        return TimeIndexer(self)
+    
+    def _sorted_time(self):
+        """Time series checked to be sorted (the check is cached for the array)."""
+        time = self['time']
+        if getattr(self, '_time_sorted', None) is not time:
+            if len(time) > 1 and np.any(time[1:] < time[:-1]):
+                raise PyTAExceptionBadSeriesData('time must be sorted in ascending order')
+            self._time_sorted = time
+        return time
+    
+    def _time_value(self, value, time):
+        """Convert a time value to the type of the time series."""
+        unit = np.datetime_data(time.dtype)[0]
+        try:
+            return self._convert_single_datetime(value, unit)
+        except (ValueError, TypeError) as e:
+            raise PyTAExceptionBadParameterValue(f'bad time value: {value!r}') from e
     
     def _create_empty(self):
         """Create an empty DataSeries object of the same type.
@@ -398,6 +695,8 @@ class DataSeries(abc.ABC):
         # Set attributes directly (bypass validation since data is already valid)
         new_obj._data = data_dict
         new_obj._column_types = self._column_types
+        new_obj._packed = None
+        new_obj._deferred = None
         
         return new_obj
     
@@ -413,6 +712,7 @@ class DataSeries(abc.ABC):
             >>> print(quotes.writeable)
             True
         """
+        self._materialize()
         if not self._data:
             return None
         first_array = next(iter(self._data.values()))
@@ -430,9 +730,43 @@ class DataSeries(abc.ABC):
             >>> quotes.writeable = False
             >>> quotes.close[0] = 999  # Will raise ValueError
         """
+        self._materialize()
+        if self._packed is not None:
+            self._packed.flags.writeable = value
         for arr in self._data.values():
             arr.flags.writeable = value
     
+    def series_names(self):
+        """Get names of all series, including deferred ones (without calculating them).
+        
+        Returns:
+            list: Series names
+        """
+        names = list(self._data.keys())
+        if self._deferred:
+            names.extend(self._deferred.keys())
+        return names
+    
+    def _calculate_deferred(self, name):
+        """Calculate deferred series and move it to the data dictionary.
+        
+        Args:
+            name: Series name
+            
+        Returns:
+            numpy.ndarray: Calculated series
+        """
+        values = self._deferred[name]()
+        del self._deferred[name]
+        self._data[name] = values
+        return values
+    
+    def _materialize(self):
+        """Calculate all deferred series (before operations over all series)."""
+        if self._deferred:
+            for name in list(self._deferred.keys()):
+                self._calculate_deferred(name)
+    
     def __getattr__(self, name):
         """Get attribute from internal data dictionary.
         
@@ -452,10 +786,48 @@ class DataSeries(abc.ABC):
         try:
             return self._data[name]
         except KeyError:
+            if self._deferred and name in self._deferred:
+                return self._calculate_deferred(name)
             raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
     
     def __repr__(self):
         """String representation of DataSeries."""
-        keys = ', '.join(self._data.keys())
+        keys = ', '.join(self.series_names())
         return f"{type(self).__name__}({keys})"
 
+
+class TimeIndexer:
+    """Time-based indexer of DataSeries (see DataSeries.loc)."""
+    
+    __slots__ = ('_series',)
+    
+    def __init__(self, series):
+        """Initialize TimeIndexer.
+        
+        Args:
+            series: DataSeries object with time series
+        """
+        self._series = series
+    
+    def __getitem__(self, key):
+        """Get bars by time.
+        
+        Args:
+            key: Slice of times (start and stop included, None for open ends) or time
+            
+        Returns:
+            New object of the same type with views of the bars
+            
+        Raises:
+            PyTAExceptionBadParameterValue: If slice has a step or there is no bar with the time
+        """
+        if not isinstance(key, slice):
+            return self._series.at(key)
+        if key.step is not None:
+            raise PyTAExceptionBadParameterValue('time slices do not support step')
+        
+        series = self._series
+        time = series._sorted_time()
+        i_start = 0 if key.start is None else int(np.searchsorted(time, series._time_value(key.start, time), 'left'))
+        i_end = len(time) if key.stop is None else int(np.searchsorted(time, series._time_value(key.stop, time), 'right'))
+        return series._create_sliced(slice(i_start, max(i_start, i_end)))
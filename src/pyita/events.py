@@ -0,0 +1,155 @@
+"""Sparse events of indicators: zigzag pivots and trend flips.
+
+Indicators with rare events (zigzag pivots, flips of parabolic_sar and
+supertrend) return them as dense series of all bars. Functions of this
+module return events only: indexes of bars, times, prices and types, recorded
+by the kernels of indicators during the calculation. Dense series are
+calculated only with dense=True.
+
+Example:
+    >>> from pyita import events
+    >>> pivots = events.zigzag(quotes, delta=0.05)
+    >>> for time, price, pivot_type in zip(pivots.time, pivots.price, pivots.type):
+    ...     print(time, price, pivot_type)
+"""
+import numpy as np
+import numba as nb
+
+from .lookback import import_indicator
+
+# Initial size of buffers of flips: EVENTS_INITIAL_SIZE and an event per
+# EVENTS_BARS_PER_EVENT bars, buffers are doubled when full (see collect_flips)
+EVENTS_INITIAL_SIZE = 16
+EVENTS_BARS_PER_EVENT = 64
+
+
+class Events:
+    """Sparse events of an indicator in the order of bars.
+
+    Attributes:
+        index: Indexes of bars with events (int64)
+        time: Times of bars with events (None if quotes have no time)
+        price: Prices of events (pivot price, stop level after a flip)
+        type: Types of events (1 - high pivot or flip up, -1 - low pivot or flip down)
+        result: IndicatorResult with dense series (None unless dense=True)
+    """
+
+    __slots__ = ('index', 'time', 'price', 'type', 'result')
+
+    def __init__(self, quotes, index, price, type, result=None):
+        """Initialize Events.
+
+        Args:
+            quotes: Quotes object of the calculation (times of events are taken from it)
+            index: Indexes of bars with events
+            price: Prices of events
+            type: Types of events
+            result: IndicatorResult with dense series
+        """
+        self.index = index
+        self.time = quotes['time'][index] if 'time' in quotes._data else None
+        self.price = price
+        self.type = type
+        self.result = result
+
+    def __len__(self):
+        return len(self.index)
+
+    def __repr__(self):
+        return f'Events({len(self)} events)'
+
+
+def collect_flips(kernel, args, i_first, state, n_bars):
+    """Collect events of a kernel of flips into buffers growing between calls.
+
+    The kernel is called as kernel(*args, i_first, *state, indexes, prices,
+    types, count): it fills buffers from position count and returns
+    (count, i_next, *state) with i_next < n_bars if the buffers are full (the
+    calculation continues from bar i_next and its state), so each bar is
+    calculated once and buffers are not reallocated in the compiled loop.
+
+    Returns:
+        Tuple of ((indexes, prices, types) of events, state after the last bar)
+    """
+    size = n_bars // EVENTS_BARS_PER_EVENT + EVENTS_INITIAL_SIZE
+    indexes = np.empty(size, dtype=np.int64)
+    prices = np.empty(size, dtype=np.float64)
+    types = np.empty(size, dtype=np.int8)
+    count = 0
+    while True:
+        count, i_first, *state = kernel(*args, i_first, *state, indexes, prices, types, count)
+        if i_first >= n_bars:
+            break
+        indexes = np.concatenate((indexes, np.empty_like(indexes)))
+        prices = np.concatenate((prices, np.empty_like(prices)))
+        types = np.concatenate((types, np.empty_like(types)))
+
+    return (indexes[:count].copy(), prices[:count].copy(), types[:count].copy()), state
+
+
+@nb.njit(cache=True)
+def calc_events(types, prices):
+    """Collect events of bars with non-zero types.
+
+    Returns:
+        Tuple of (indexes, prices, types) of events
+    """
+    n_events = 0
+    for i in range(len(types)):
+        if types[i] != 0:
+            n_events += 1
+
+    event_indexes = np.empty(n_events, dtype=np.int64)
+    event_prices = np.empty(n_events, dtype=np.float64)
+    event_types = np.empty(n_events, dtype=np.int8)
+    k = 0
+    for i in range(len(types)):
+        if types[i] != 0:
+            event_indexes[k] = i
+            event_prices[k] = prices[i]
+            event_types[k] = types[i]
+            k += 1
+    return event_indexes, event_prices, event_types
+
+
+def zigzag(quotes, delta=0.02, depth=1, type='high_low', end_points=False, dense=False):
+    """Zig-zag pivots as events (see ta.zigzag).
+
+    Args:
+        quotes: Quotes object containing OHLCV data
+        delta, depth, type, end_points: Parameters of ta.zigzag
+        dense: If True, keep the dense series (pivots, pivot_types) in the result attribute
+
+    Returns:
+        Events: pivots with prices and types (1 - high, -1 - low)
+    """
+    return import_indicator('zigzag').get_events(quotes, delta, depth, type, end_points, dense)
+
+
+def parabolic_sar(quotes, start=0.02, maximum=0.2, increment=0.02, dense=False):
+    """Flips of Parabolic SAR as events (see ta.parabolic_sar).
+
+    Args:
+        quotes: Quotes object containing OHLCV data
+        start, maximum, increment: Parameters of ta.parabolic_sar
+        dense: If True, calculate the dense series (sar, signal) into the result attribute
+
+    Returns:
+        Events: bars with non-zero signal, prices are SAR values after the flips
+    """
+    return import_indicator('parabolic_sar').get_events(quotes, start, maximum, increment, dense)
+
+
+def supertrend(quotes, period=10, multipler=3, ma_type='mma', dense=False):
+    """Flips of Supertrend as events (see ta.supertrend).
+
+    Args:
+        quotes: Quotes object containing OHLCV data
+        period, multipler, ma_type: Parameters of ta.supertrend
+        dense: If True, calculate the dense series (supertrend, supertrend_mid) into the result attribute
+
+    Returns:
+        Events: bars where the trend changes (1 - up, -1 - down), prices are supertrend
+        values at the flips
+    """
+    return import_indicator('supertrend').get_events(quotes, period, multipler, ma_type, dense)
@@ -3,7 +3,15 @@
 
 class PyTAException(Exception):
     """Base exception class for all pyita errors."""
-    pass
+    
+    # Names of attributes passed to __init__ (used for pickling)
+    INIT_ATTRIBUTES = ()
+    
+    def __reduce__(self):
+        """Pickle with __init__ arguments (exceptions are passed from worker processes)."""
+        if not self.INIT_ATTRIBUTES:
+            return super().__reduce__()
+        return type(self), tuple(getattr(self, name) for name in self.INIT_ATTRIBUTES)
 
 
 class PyTAExceptionIndicatorNotFound(PyTAException):
@@ -16,6 +24,8 @@ class PyTAExceptionIndicatorNotFound(PyTAException):
         indicator_name: Name of the indicator that was not found
     """
     
+    INIT_ATTRIBUTES = ('indicator_name',)
+    
     def __init__(self, indicator_name):
         """Initialize the exception.
         
@@ -36,6 +46,8 @@ class PyTAExceptionBadParameterValue(PyTAException):
         reason: Description of why the parameter value is invalid
     """
     
+    INIT_ATTRIBUTES = ('reason',)
+    
     def __init__(self, reason):
         """Initialize the exception.
         
@@ -56,6 +68,8 @@ class PyTAExceptionBadSeriesData(PyTAException):
         reason: Description of why the series data is invalid
     """
     
+    INIT_ATTRIBUTES = ('reason',)
+    
     def __init__(self, reason):
         """Initialize the exception.
         
@@ -76,6 +90,8 @@ class PyTAExceptionTooLittleData(PyTAException):
         reason: Description of why there is insufficient data
     """
     
+    INIT_ATTRIBUTES = ('reason',)
+    
     def __init__(self, reason):
         """Initialize the exception.
         
@@ -96,6 +112,8 @@ class PyTAExceptionDataSeriesNonFound(PyTAException):
         series_name: Name of the data series that was not found
     """
     
+    INIT_ATTRIBUTES = ('series_name',)
+    
     def __init__(self, series_name):
         """Initialize the exception.
         
@@ -116,6 +134,8 @@ class PyTAExceptionMetadataParseError(PyTAException):
         reason: Description of why parsing failed
     """
     
+    INIT_ATTRIBUTES = ('indicator_name', 'reason')
+    
     def __init__(self, indicator_name, reason):
         """Initialize the exception.
         
@@ -137,6 +157,8 @@ class PyTAExceptionMetadataError(PyTAException):
         reason: Description of why the operation failed
     """
     
+    INIT_ATTRIBUTES = ('reason',)
+    
     def __init__(self, reason):
         """Initialize the exception.
         
@@ -2,6 +2,69 @@
 import numpy as np
 
 from .data_series import DataSeries
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+from .resample import align_indexes
+
+
+class Deferred:
+    """Series or intermediate array calculated on the first call.
+    
+    Used by indicators for outputs that may be not needed: a Deferred object
+    placed in the result is calculated on first access to the series.
+    
+    Arrays of quotes and other Deferred objects used by the function are
+    passed as inputs: the result pins inputs of series left for first access
+    (see pin), so changes of quotes after the indicator call do not change
+    these series.
+    
+    Example:
+        >>> std = Deferred(lambda values: calc_std(values, period), quotes.close)
+        >>> series = {'z_score': Deferred(lambda values, std: (values - mid_line) / std(), quotes.close, std)}
+    """
+    
+    __slots__ = ('_func', '_inputs', '_value')
+    
+    def __init__(self, func, *inputs):
+        """Initialize Deferred.
+        
+        Args:
+            func: Function that calculates the value from inputs
+            *inputs: Arrays and Deferred objects passed to func
+        """
+        self._func = func
+        self._inputs = inputs
+        self._value = None
+    
+    def __call__(self):
+        """Calculate the value on the first call and return it."""
+        if self._func is not None:
+            self._value = self._func(*self._inputs)
+            self._func = None
+            self._inputs = None
+        return self._value
+    
+    def pin(self, copies=None):
+        """Replace writeable input arrays with read-only copies, also in Deferred inputs.
+        
+        Args:
+            copies: Dictionary of ids of arrays to their copies, shared by Deferred
+                objects of one result so that each array is copied once
+        """
+        if self._func is None:
+            return
+        if copies is None:
+            copies = {}
+        inputs = []
+        for values in self._inputs:
+            if isinstance(values, Deferred):
+                values.pin(copies)
+            elif values.flags.writeable:
+                if id(values) not in copies:
+                    copies[id(values)] = values.copy()
+                    copies[id(values)].flags.writeable = False
+                values = copies[id(values)]
+            inputs.append(values)
+        self._inputs = tuple(inputs)
 
 
 class IndicatorResult(DataSeries):
@@ -17,6 +80,75 @@ class IndicatorResult(DataSeries):
         [1 2 3]
     """
     
+    # State of the calculation for resume_from (see resume.Calculation)
+    __slots__ = ('_state',)
+    
+    @classmethod
+    def _from_arrays(cls, data_dict, deferred=None):
+        """Create result from a dictionary of numpy arrays without copying and validation.
+        
+        Used by indicators: data_dict is owned by the result after the call.
+        
+        Args:
+            data_dict: Dictionary of series names to numpy arrays
+            deferred: Dictionary of series names to Deferred objects, calculated on first access
+            
+        Returns:
+            New IndicatorResult object
+        """
+        new_obj = cls.__new__(cls)
+        new_obj._data = data_dict
+        new_obj._column_types = None
+        new_obj._packed = None
+        new_obj._deferred = deferred or None
+        new_obj._state = None
+        return new_obj
+    
+    @classmethod
+    def _from_series(cls, series, outputs=None, eager=()):
+        """Create result from arrays and Deferred objects with selection of outputs.
+        
+        Series that are not selected are not calculated at all. Selected Deferred
+        series listed in eager are calculated at once (so calculation errors are
+        raised by the indicator call), others on first access from pinned inputs
+        (see Deferred.pin).
+        
+        Args:
+            series: Dictionary of series names to numpy arrays or Deferred objects
+            outputs: List of series names to return (default: all series)
+            eager: Names of series to calculate at once
+            
+        Returns:
+            New IndicatorResult object
+            
+        Raises:
+            PyTAExceptionBadParameterValue: If outputs contains unknown series names
+        """
+        if outputs is not None:
+            if isinstance(outputs, str):
+                outputs = [outputs]
+            unknown = [name for name in outputs if name not in series]
+            if unknown:
+                raise PyTAExceptionBadParameterValue(
+                    f'Unknown outputs {unknown}, available: {list(series.keys())}'
+                )
+            series = {name: series[name] for name in outputs}
+        
+        data = {}
+        deferred = {}
+        for name, values in series.items():
+            if not isinstance(values, Deferred):
+                data[name] = values
+            elif name in eager:
+                data[name] = values()
+            else:
+                deferred[name] = values
+        copies = {}
+        for values in deferred.values():
+            values.pin(copies)
+        
+        return cls._from_arrays(data, deferred)
+    
     def column_types(self):
         """Return None to disable type checking.
         
@@ -47,6 +179,71 @@ class IndicatorResult(DataSeries):
         # Set data directly (bypass DataSeries.__init__ logic)
         self._data = data_dict.copy()
         self._column_types = None
+        self._packed = None
+        self._deferred = None
+        self._state = None
         
         # Skip validation (REQUIRED_COLUMNS and ALLOWED_COLUMNS are None by default)
-
+    
+    def _create_from_dict(self, data_dict):
+        """Create a new result from a dictionary of arrays (slices and copies have no calculation state)."""
+        new_obj = super()._create_from_dict(data_dict)
+        new_obj._state = None
+        return new_obj
+    
+    def __setstate__(self, state):
+        """Restore state after unpickling (calculation state is not pickled)."""
+        super().__setstate__(state)
+        self._state = None
+    
+    def align_to(self, quotes_base, quotes, method='last_closed', timeframe=None):
+        """Broadcast higher timeframe results onto base timeframe bars.
+        
+        Each base bar gets the values of the last higher timeframe bar that was
+        closed at the start of the base bar, so there is no lookahead bias: values
+        of a daily bar appear on the base bars of the next day. A higher timeframe
+        bar is considered closed at the start of the next bar, or after timeframe
+        if it is given (needed to close the last bar).
+        
+        Args:
+            quotes_base: Base timeframe Quotes object (or datetime64 array of bar times)
+            quotes: Higher timeframe Quotes object this result was calculated on
+                (or datetime64 array of bar times)
+            method: 'last_closed' (default, no lookahead) or 'current' (values of the bar
+                containing the base bar, has lookahead bias)
+            timeframe: Timeframe of quotes ('1h', '1d', '1w', ...), optional
+            
+        Returns:
+            IndicatorResult object with series of base timeframe length. Base bars without
+            a closed higher timeframe bar get NaN (0 for integer series).
+            
+        Raises:
+            PyTAExceptionBadParameterValue: If method or timeframe is invalid
+            PyTAExceptionBadSeriesData: If result length does not match quotes or time is not sorted
+            PyTAExceptionDataSeriesNonFound: If time series is not found
+            
+        Example:
+            >>> quotes_1d = quotes_1m.resample('1d')
+            >>> st = ta.supertrend(quotes_1d).align_to(quotes_1m, quotes_1d, timeframe='1d')
+        """
+        self._materialize()
+        time = quotes['time'] if isinstance(quotes, DataSeries) else quotes
+        base_time = quotes_base['time'] if isinstance(quotes_base, DataSeries) else quotes_base
+        
+        for name, values in self._data.items():
+            if len(values) != len(time):
+                raise PyTAExceptionBadSeriesData(
+                    f"Series '{name}' length {len(values)} does not match quotes length {len(time)}"
+                )
+        
+        indexes = align_indexes(time, base_time, method, timeframe)
+        bx_missing = indexes < 0
+        
+        aligned = {}
+        for name, values in self._data.items():
+            # Indexes are not used for missing bars: an empty result has nothing to index
+            out = np.full(len(indexes), np.nan if values.dtype.kind in 'fc' else 0, dtype=values.dtype)
+            out[~bx_missing] = values[indexes[~bx_missing]]
+            aligned[name] = out
+        
+        return self._create_from_dict(aligned)
@@ -5,8 +5,8 @@ Accumulation/distribution line.
 Output series: adl, adl_smooth"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue
 
 
@@ -44,13 +44,19 @@ def get_indicator_out(quotes, ma_period=None, ma_type='sma'):
         if ma_period <= 0:
             raise PyTAExceptionBadParameterValue(f'ma_period must be greater than 0, got {ma_period}')
     
-    # Convert ma_type string to MA_Type enum (will raise ValueError if invalid)
+    # Validate ma_type string (MA_Type.cast raises ValueError if invalid)
     if ma_period is not None:
         try:
-            ma_type_enum = MA_Type.cast(ma_type)
+            MA_Type.cast(ma_type)
         except ValueError as e:
             raise PyTAExceptionBadParameterValue(str(e))
     
+    calc = Calculation(len(quotes.close))
+    return calc.result(calculate(calc, quotes, ma_period, ma_type))
+
+
+def calculate(calc, quotes, ma_period, ma_type):
+    """Calculate ADL series on bars of quotes (see resume.Calculation)."""
     high = quotes.high
     low = quotes.low
     close = quotes.close
@@ -62,14 +68,18 @@ def get_indicator_out(quotes, ma_period=None, ma_type='sma'):
     
     clv = ((close - low) - (high - close)) / hl_range
     clv[hl_range == 0] = 0
-    adl = np.cumsum(clv * volume)
+    adl = calc.cumsum('adl', clv * volume)
     
     result_data = {
         'adl': adl
     }
     
     if ma_period is not None:
-        result_data['adl_smooth'] = ma_calculate(adl, ma_period, ma_type_enum)
+        result_data['adl_smooth'] = calc.ma('adl_smooth', adl, ma_period, MA_Type.cast(ma_type))
     
-    return IndicatorResult(result_data)
+    return result_data
+
 
+def get_lookback(params, tolerance):
+    """Indicator depends on the whole history, lookback is not limited (see pyita.lookback)."""
+    return None
@@ -5,8 +5,8 @@ Average directional movement index.
 Output series: adx, p_di, m_di"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 from . import atr
 
@@ -47,20 +47,27 @@ def get_indicator_out(quotes, period=14, smooth=14, ma_type='mma'):
         raise PyTAExceptionBadParameterValue(f'smooth must be greater than 0, got {smooth}')
     
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(str(e))
     
-    high = quotes.high
-    low = quotes.low
-    
-    data_len = len(high)
+    data_len = len(quotes.high)
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
     
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, smooth, ma_type))
+
+
+def calculate(calc, quotes, period, smooth, ma_type):
+    """Calculate ADX series on bars of quotes (see resume.Calculation)."""
+    high = quotes.high
+    low = quotes.low
+    ma_type_enum = MA_Type.cast(ma_type)
+    
     # Calculate Directional Movement
-    p_dm = np.hstack([np.nan, np.diff(high)])
-    m_dm = np.hstack([np.nan, -np.diff(low)])
+    p_dm = high - calc.previous('high', high)
+    m_dm = -(low - calc.previous('low', low))
     
     # Zero out DM when conditions are not met
     bx_zero_p_dm = (p_dm <= m_dm) | (p_dm < 0)
@@ -69,12 +76,11 @@ def get_indicator_out(quotes, period=14, smooth=14, ma_type='mma'):
     m_dm[bx_zero_m_dm] = 0
     
     # Calculate ATR for normalization
-    atr_result = atr.get_indicator_out(quotes, smooth=period, ma_type=ma_type)
-    atr_values = atr_result.atr
+    atr_values = atr.calculate(calc.child('atr'), quotes, smooth=period, ma_type=ma_type)['atr']()
     
     # Calculate Directional Indicators (DI)
-    p_di = 100 * ma_calculate(p_dm, period, ma_type_enum) / atr_values
-    m_di = 100 * ma_calculate(m_dm, period, ma_type_enum) / atr_values
+    p_di = 100 * calc.ma('p_dm', p_dm, period, ma_type_enum) / atr_values
+    m_di = 100 * calc.ma('m_dm', m_dm, period, ma_type_enum) / atr_values
     
     # Calculate Directional Index (DX)
     np.seterr(divide='ignore', invalid='ignore')
@@ -82,11 +88,17 @@ def get_indicator_out(quotes, period=14, smooth=14, ma_type='mma'):
     dxi[p_di + m_di == 0] = 0
     
     # Calculate ADX (smoothed DX)
-    adx = ma_calculate(dxi, smooth, ma_type_enum)
+    adx = calc.ma('adx', dxi, smooth, ma_type_enum)
     
-    return IndicatorResult({
+    return {
         'adx': adx,
         'p_di': p_di,
         'm_di': m_di
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    # Directional movements and true range start from the second bar, adx smooths their ratio
+    ma_type = MA_Type.cast(params['ma_type'])
+    return ma_lookback(params['period'], ma_type, tolerance) + ma_lookback(params['smooth'], ma_type, tolerance)
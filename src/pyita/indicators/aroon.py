@@ -1,4 +1,4 @@
-"""aroon(quotes, period=14)
+"""aroon(quotes, period=14, outputs=None)
 
 Aroon oscillator.
 
@@ -6,41 +6,34 @@ Output series: up, down, oscillator"""
 import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
+from ..indicator_result import Deferred
+from ..resume import Calculation
+from ..rolling import calc_argmax, calc_argmin
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 
 
 @nb.njit(cache=True)
-def calc_aroon(high, low, period):
-    """Calculate Aroon indicator values.
+def calc_aroon_line(i_extremums, period):
+    """Calculate Aroon line (up or down) from indexes of extremums.
     
     Args:
-        high: Array of high prices
-        low: Array of low prices
+        i_extremums: Array of indexes of extremums over windows of period + 1 bars
+            (negative for windows with NaN)
         period: Period for Aroon calculation
         
     Returns:
-        Tuple of (up, down, oscillator) arrays
+        Array of Aroon line values (0-100, first period elements and windows with NaN are NaN)
     """
-    up = np.empty(len(high), dtype=np.float64)
-    down = np.empty(len(high), dtype=np.float64)
-    oscillator = np.empty(len(high), dtype=np.float64)
+    line = np.empty(len(i_extremums), dtype=np.float64)
+    line[:period] = np.nan
 
-    up[:period] = np.nan
-    down[:period] = np.nan
-    oscillator[:period] = np.nan
+    for i in range(period, len(i_extremums)):
+        line[i] = np.nan if i_extremums[i] < 0 else (i_extremums[i] - i + period) / period * 100
 
-    for i in range(period, len(high)):
-        i_max = period - high[i - period: i + 1].argmax()
-        i_min = period - low[i - period: i + 1].argmin()
-        up[i] = (period - i_max) / period * 100
-        down[i] = (period - i_min) / period * 100
-        oscillator[i] = up[i] - down[i]
+    return line
 
-    return up, down, oscillator
 
-
-def get_indicator_out(quotes, period=14):
+def get_indicator_out(quotes, period=14, outputs=None):
     """Calculate Aroon oscillator.
     
     Aroon is a technical indicator used to identify trend changes and the strength
@@ -50,6 +43,7 @@ def get_indicator_out(quotes, period=14):
     Args:
         quotes: Quotes object containing OHLCV data
         period: Period for Aroon calculation (default: 14)
+        outputs: List of series to calculate, e.g. ['up'] (default: all; oscillator is calculated on first access)
         
     Returns:
         IndicatorResult object with attributes:
@@ -58,7 +52,7 @@ def get_indicator_out(quotes, period=14):
             - oscillator: Aroon Oscillator values (up - down, range -100 to 100)
             
     Raises:
-        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionBadParameterValue: If period <= 0 or outputs is invalid
         PyTAExceptionTooLittleData: If data length is less than period
         
     Example:
@@ -70,18 +64,31 @@ def get_indicator_out(quotes, period=14):
     if period <= 0:
         raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
     
-    high = quotes.high
-    low = quotes.low
-    
-    data_len = len(high)
+    data_len = len(quotes.high)
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
     
-    up, down, oscillator = calc_aroon(high, low, period)
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period), outputs, eager=('up', 'down'))
+
+
+def calculate(calc, quotes, period):
+    """Calculate Aroon series on bars of quotes (see resume.Calculation)."""
+    # Windows of period + 1 bars, the oldest of equal extremums is taken
+    up = Deferred(lambda high: calc.window(
+        'up', lambda high: calc_aroon_line(calc_argmax(high, period + 1), period), (high,), period + 1
+    ), quotes.high)
+    down = Deferred(lambda low: calc.window(
+        'down', lambda low: calc_aroon_line(calc_argmin(low, period + 1), period), (low,), period + 1
+    ), quotes.low)
     
-    return IndicatorResult({
+    return {
         'up': up,
         'down': down,
-        'oscillator': oscillator
-    })
+        'oscillator': Deferred(lambda up, down: up() - down(), up, down)
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period'] + 1
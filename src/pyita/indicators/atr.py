@@ -1,17 +1,36 @@
-"""atr(quotes, smooth=14, ma_type='mma')
+"""atr(quotes, smooth=14, ma_type='mma', outputs=None)
 
 Average True Range.
 
 Output series: tr, atr, atrp"""
 import numpy as np
+import numba as nb
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..indicator_result import Deferred
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue
-from ..constants import PRICE_TYPE
 
 
-def get_indicator_out(quotes, smooth=14, ma_type='mma'):
+@nb.njit(cache=True, inline='always')
+def true_range(high, low, prev_close, first):
+    """True range of a bar (ranges from the previous close are 0 for the first bar)."""
+    range_current = high - low
+    if first:
+        return np.maximum(range_current, 0.0)
+    return np.maximum(range_current, np.maximum(abs(prev_close - high), abs(prev_close - low)))
+
+
+@nb.njit(cache=True)
+def calc_true_range(high, low, prev_close, n_first):
+    """Calculate true ranges of bars, the first n_first bars have no previous close."""
+    tr = np.empty(len(high), dtype=np.float64)
+    for i in range(len(high)):
+        tr[i] = true_range(high[i], low[i], prev_close[i], i < n_first)
+    return tr
+
+
+def get_indicator_out(quotes, smooth=14, ma_type='mma', outputs=None):
     """Calculate Average True Range (ATR).
     
     ATR is a volatility indicator that measures the degree of price volatility.
@@ -21,6 +40,7 @@ def get_indicator_out(quotes, smooth=14, ma_type='mma'):
         quotes: Quotes object containing OHLCV data
         smooth: Period for moving average calculation (default: 14)
         ma_type: Type of moving average - 'sma', 'ema', 'mma', 'ema0', 'mma0' (default: 'mma')
+        outputs: List of series to calculate, e.g. ['atr'] (default: all; atrp is calculated on first access)
         
     Returns:
         IndicatorResult object with attributes:
@@ -29,7 +49,7 @@ def get_indicator_out(quotes, smooth=14, ma_type='mma'):
             - atrp: ATR as percentage of close price
             
     Raises:
-        PyTAExceptionBadParameterValue: If smooth <= 0 or ma_type is invalid
+        PyTAExceptionBadParameterValue: If smooth <= 0, ma_type or outputs is invalid
         PyTAExceptionTooLittleData: If data length is insufficient
         
     Example:
@@ -42,35 +62,33 @@ def get_indicator_out(quotes, smooth=14, ma_type='mma'):
         raise PyTAExceptionBadParameterValue(f'smooth must be greater than 0, got {smooth}')
     
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(str(e))
     
+    calc = Calculation(len(quotes.close))
+    return calc.result(calculate(calc, quotes, smooth, ma_type), outputs, eager=('atr',))
+
+
+def calculate(calc, quotes, smooth, ma_type):
+    """Calculate ATR series on bars of quotes (see resume.Calculation)."""
     high = quotes.high
     low = quotes.low
     close = quotes.close
     
-    range_current = high - low
-    
-    range_prev_high = np.hstack((
-        np.zeros(1, dtype=PRICE_TYPE),
-        np.abs(close[:-1] - high[1:])
-    ))
-    
-    range_prev_low = np.hstack((
-        np.zeros(1, dtype=PRICE_TYPE),
-        np.abs(close[:-1] - low[1:])
-    ))
+    prev_close = calc.previous('close', close)
+    tr = calc_true_range(high, low, prev_close, calc.head(1))
     
-    tr = np.maximum(range_current, np.maximum(range_prev_high, range_prev_low))
+    atr = Deferred(lambda: calc.ma('atr', tr, smooth, MA_Type.cast(ma_type)))
     
-    atr = ma_calculate(tr, smooth, ma_type_enum)
-    
-    atrp = atr / close * 100
-    
-    return IndicatorResult({
+    return {
         'tr': tr,
         'atr': atr,
-        'atrp': atrp
-    })
+        'atrp': Deferred(lambda atr, close: atr() / close * 100, atr, close)
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    # One bar for the previous close of the first true range
+    return 1 + ma_lookback(params['smooth'], MA_Type.cast(params['ma_type']), tolerance)
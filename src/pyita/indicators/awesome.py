@@ -5,8 +5,8 @@ Awesome oscillator.
 Output series: awesome"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 
 
@@ -46,26 +46,29 @@ def get_indicator_out(quotes, period_fast=5, period_slow=34, ma_type_fast='sma',
         raise PyTAExceptionBadParameterValue(f'period_slow ({period_slow}) must be greater than period_fast ({period_fast})')
     
     try:
-        ma_type_fast_enum = MA_Type.cast(ma_type_fast)
+        MA_Type.cast(ma_type_fast)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(f'ma_type_fast: {str(e)}')
     
     try:
-        ma_type_slow_enum = MA_Type.cast(ma_type_slow)
+        MA_Type.cast(ma_type_slow)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(f'ma_type_slow: {str(e)}')
     
-    high = quotes.high
-    low = quotes.low
-    
-    data_len = len(high)
+    data_len = len(quotes.high)
     if data_len < period_slow:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period_slow}')
     
-    median_price = (high + low) / 2
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period_fast, period_slow, ma_type_fast, ma_type_slow, normalized))
+
+
+def calculate(calc, quotes, period_fast, period_slow, ma_type_fast, ma_type_slow, normalized):
+    """Calculate Awesome Oscillator series on bars of quotes (see resume.Calculation)."""
+    median_price = (quotes.high + quotes.low) / 2
     
-    ma_fast = ma_calculate(median_price, period_fast, ma_type_fast_enum)
-    ma_slow = ma_calculate(median_price, period_slow, ma_type_slow_enum)
+    ma_fast = calc.ma('fast', median_price, period_fast, MA_Type.cast(ma_type_fast))
+    ma_slow = calc.ma('slow', median_price, period_slow, MA_Type.cast(ma_type_slow))
     
     awesome = ma_fast - ma_slow
     
@@ -73,7 +76,12 @@ def get_indicator_out(quotes, period_fast=5, period_slow=34, ma_type_fast='sma',
         np.seterr(divide='ignore', invalid='ignore')
         awesome = awesome / median_price
     
-    return IndicatorResult({
+    return {
         'awesome': awesome
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return max(ma_lookback(params['period_fast'], MA_Type.cast(params['ma_type_fast']), tolerance),
+               ma_lookback(params['period_slow'], MA_Type.cast(params['ma_type_slow']), tolerance))
@@ -1,4 +1,4 @@
-"""bollinger_bands(quotes, period=20, deviation=2, ma_type='sma', value='close')
+"""bollinger_bands(quotes, period=20, deviation=2, ma_type='sma', value='close', outputs=None)
 
 Bollinger bands.
 
@@ -7,33 +7,28 @@ Output series: mid_line (price), up_line (price), down_line (price), z_score"""
 import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..indicator_result import Deferred
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue
 
 
+@nb.njit(cache=True, inline='always')
+def z_score(value, mid, std):
+    """Distance of value from the middle line in standard deviations (0 if std is 0)."""
+    return 0.0 if std == 0 else (value - mid) / std
+
+
 @nb.njit(cache=True)
-def calc_std_deviations(values, period):
-    """Calculate rolling standard deviations.
-    
-    Args:
-        values: Array of price values
-        period: Period for standard deviation calculation
-        
-    Returns:
-        Array of standard deviations
-    """
-    values_len = len(values)
-    result = np.empty(values_len)
-    result[:period - 1] = np.nan
-    
-    for i in range(period, values_len + 1):
-        result[i - 1] = values[i - period: i].std()
-    
-    return result
+def calc_z_score(values, mid_line, std_deviations):
+    """Calculate z-scores of values."""
+    out = np.empty(len(values), dtype=np.float64)
+    for i in range(len(values)):
+        out[i] = z_score(values[i], mid_line[i], std_deviations[i])
+    return out
 
 
-def get_indicator_out(quotes, period=20, deviation=2, ma_type='sma', value='close'):
+def get_indicator_out(quotes, period=20, deviation=2, ma_type='sma', value='close', outputs=None):
     """Calculate Bollinger Bands indicator.
     
     Bollinger Bands consist of a middle line (moving average) and two bands
@@ -45,6 +40,8 @@ def get_indicator_out(quotes, period=20, deviation=2, ma_type='sma', value='clos
         deviation: Number of standard deviations for bands (default: 2)
         ma_type: Type of moving average - 'sma', 'ema', 'mma', 'ema0', 'mma0' (default: 'sma')
         value: Price field to use - 'open', 'high', 'low', or 'close' (default: 'close')
+        outputs: List of series to calculate, e.g. ['up_line', 'down_line']
+            (default: all; z_score is calculated on first access)
         
     Returns:
         IndicatorResult object with attributes:
@@ -77,37 +74,39 @@ def get_indicator_out(quotes, period=20, deviation=2, ma_type='sma', value='clos
     if value not in valid_values:
         raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
     
-    # Get source values from quotes
-    source_values = quotes[value]
-    
-    # Convert ma_type string to MA_Type enum (will raise ValueError if invalid)
+    # Validate ma_type string (MA_Type.cast raises ValueError if invalid)
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(str(e))
     
-    # Calculate middle line (moving average)
-    mid_line = ma_calculate(source_values, period, ma_type_enum)
-    
-    # Calculate standard deviations
-    std_deviations = calc_std_deviations(source_values, period)
+    calc = Calculation(len(quotes[value]))
+    return calc.result(calculate(calc, quotes, period, deviation, ma_type, value), outputs, eager=('up_line', 'down_line'))
+
+
+def calculate(calc, quotes, period, deviation, ma_type, value):
+    """Calculate Bollinger Bands series on bars of quotes (see resume.Calculation)."""
+    # Get source values from quotes
+    source_values = quotes[value]
     
-    # Calculate deviations (standard deviations * deviation multiplier)
-    deviations = std_deviations * deviation
+    # Calculate middle line (moving average)
+    mid_line = calc.ma('mid_line', source_values, period, MA_Type.cast(ma_type))
     
-    # Calculate bands
-    up_line = mid_line + deviations
-    down_line = mid_line - deviations
+    # Standard deviations and deviations of bands are calculated only for selected outputs
+    std_deviations = Deferred(lambda source_values: calc.std('std', source_values, period), source_values)
+    deviations = Deferred(lambda std_deviations: std_deviations() * deviation, std_deviations)
     
-    # Calculate z-score with division by zero handling
-    np.seterr(divide='ignore', invalid='ignore')
-    z_score = (source_values - mid_line) / std_deviations
-    z_score[std_deviations == 0] = 0
+    def z_scores(source_values, std_deviations):
+        return calc_z_score(source_values, mid_line, std_deviations())
     
-    return IndicatorResult({
+    return {
         'mid_line': mid_line,
-        'up_line': up_line,
-        'down_line': down_line,
-        'z_score': z_score
-    })
+        'up_line': Deferred(lambda deviations: mid_line + deviations(), deviations),
+        'down_line': Deferred(lambda deviations: mid_line - deviations(), deviations),
+        'z_score': Deferred(z_scores, source_values, std_deviations)
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return max(params['period'], ma_lookback(params['period'], MA_Type.cast(params['ma_type']), tolerance))
@@ -6,10 +6,14 @@ Output series: cci"""
 import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type
+from ..rolling import chunk_length, rank_chunk, tree_add, tree_prefix
+from ..resume import Calculation, ResumeNotPossible
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 
+# Minimal period for MAD calculation with the sorted window
+MAD_SORTED_MIN_PERIOD = 160
+
 
 @nb.njit(cache=True)
 def calc_mad(typical_price, sma_typical_price, period):
@@ -33,6 +37,55 @@ def calc_mad(typical_price, sma_typical_price, period):
     return mad
 
 
+@nb.njit(cache=True)
+def calc_mad_sorted(typical_price, sma_typical_price, period):
+    """Calculate Mean Absolute Deviation (MAD) with an order statistic window.
+    
+    Values of the window are kept in Fenwick trees (counts and sums) indexed by
+    value rank. As the center is the mean of the window,
+    sum(|v - mean|) = 2 * sum(mean - v) over values v <= mean, which needs one
+    binary search and one prefix query. Ranks are calculated for chunks of
+    several periods (see rolling.rank_chunk): O(log period) per bar.
+    
+    Args:
+        typical_price: Array of typical prices (without NaN)
+        sma_typical_price: Array of SMA values of typical prices
+        period: Period for MAD calculation
+        
+    Returns:
+        Array of MAD values
+    """
+    values_len = len(typical_price)
+
+    mad = np.empty(values_len, dtype=np.float64)
+    mad[:period - 1] = 0
+    for chunk_start in range(period - 1, values_len, chunk_length(period)):
+        first, segment, sorted_values, ranks = rank_chunk(typical_price, period, chunk_start)
+        segment_len = len(segment)
+
+        # Sums are kept relative to the median to reduce rounding errors
+        base = sorted_values[segment_len // 2]
+
+        tree_counts = np.zeros(segment_len + 1, dtype=np.int64)
+        tree_sums = np.zeros(segment_len + 1, dtype=np.float64)
+        for k in range(segment_len):
+            tree_add(tree_counts, ranks[k], 1)
+            tree_add(tree_sums, ranks[k], segment[k] - base)
+            if k >= period:
+                tree_add(tree_counts, ranks[k - period], -1)
+                tree_add(tree_sums, ranks[k - period], base - segment[k - period])
+            if k < period - 1:
+                continue
+
+            center = sma_typical_price[first + k]
+            j = np.searchsorted(sorted_values, center, side='right')
+            count_below = tree_prefix(tree_counts, j)
+            sum_below = tree_prefix(tree_sums, j)
+            mad[first + k] = max(2 * (count_below * (center - base) - sum_below), 0.0) / period
+
+    return mad
+
+
 def get_indicator_out(quotes, period=20):
     """Calculate Commodity Channel Index (CCI).
     
@@ -60,24 +113,74 @@ def get_indicator_out(quotes, period=20):
     if period <= 0:
         raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
     
-    # Get OHLC data from quotes
-    high = quotes.high
-    low = quotes.low
-    close = quotes.close
-    
     # Check minimum data requirement
-    data_len = len(high)
+    data_len = len(quotes.high)
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
     
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period))
+
+
+def calc_mad_sorted_resumed(calc, typical_price, sma_typical_price, period):
+    """Calculate MAD with the sorted window from the start of the last chunk.
+    
+    Values of a chunk depend on all values of it, so the last chunk of the previous
+    calculation is calculated again when bars are appended (its values are revised).
+    Provisional calculations (bars being formed) calculate MAD over the windows of
+    new bars directly, without ranking the chunk.
+    
+    Returns:
+        Tuple of (typical_price, sma_typical_price, mad) from the first calculated bar
+    """
+    if calc.resumed:
+        typical_price = np.concatenate((calc.load('mad.typical_price'), typical_price))
+        sma_typical_price = np.concatenate((calc.load('mad.sma'), sma_typical_price))
+    
+    # Keep values from period - 1 bars before the start of the last chunk
+    chunk_len = chunk_length(period)
+    first = (len(typical_price) - period) // chunk_len * chunk_len
+    calc.save('mad.typical_price', typical_price[first:].copy())
+    calc.save('mad.sma', sma_typical_price[first:].copy())
+    
+    if calc.provisional:
+        n_new = calc.n_bars - calc.start
+        n_windows = n_new + period - 1
+        mad = calc_mad(typical_price[-n_windows:], sma_typical_price[-n_windows:], period)
+        return typical_price[-n_new:], sma_typical_price[-n_new:], mad[period - 1:]
+    
+    mad = calc_mad_sorted(typical_price, sma_typical_price, period)
+    
+    n_skip = period - 1 if calc.resumed else 0
+    return typical_price[n_skip:], sma_typical_price[n_skip:], mad[n_skip:]
+
+
+def calculate(calc, quotes, period):
+    """Calculate CCI series on bars of quotes (see resume.Calculation)."""
     # Calculate typical price
-    typical_price = (high + low + close) / 3
+    typical_price = (quotes.high + quotes.low + quotes.close) / 3
     
     # Calculate SMA of typical price
-    sma_typical_price = ma_calculate(typical_price, period, MA_Type.sma)
+    sma_typical_price = calc.ma('sma', typical_price, period, MA_Type.sma)
     
     # Calculate Mean Absolute Deviation (MAD)
-    mad = calc_mad(typical_price, sma_typical_price, period)
+    # Direct summation is faster for short windows, the sorted window is used for longer ones
+    has_nans = np.isnan(typical_price).any()
+    if calc.resumed:
+        use_sorted = calc.load('sorted')
+        if use_sorted and has_nans:
+            raise ResumeNotPossible('sorted')
+    else:
+        use_sorted = period >= MAD_SORTED_MIN_PERIOD and not has_nans
+    calc.save('sorted', use_sorted)
+    
+    if use_sorted:
+        typical_price, sma_typical_price, mad = calc_mad_sorted_resumed(calc, typical_price, sma_typical_price, period)
+    else:
+        mad = calc.window(
+            'mad', lambda typical_price, sma: calc_mad(typical_price, sma, period),
+            (typical_price, sma_typical_price), period
+        )
     
     # Calculate CCI
     # CCI = (typical_price - sma_typical_price) / (mad * 0.015)
@@ -86,7 +189,11 @@ def get_indicator_out(quotes, period=20):
     # Handle division by zero
     cci[mad == 0] = 0
     
-    return IndicatorResult({
+    return {
         'cci': cci
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period']
@@ -3,37 +3,29 @@
 Chandelier Exit.
 
 Output series: exit_short (price), exit_long (price)"""
-import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
+from ..resume import Calculation
+from ..rolling import calc_max, calc_min
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 from . import atr
 
 
 @nb.njit(cache=True)
-def calc_chandelier(high, low, atr_values, period, multiplier):
+def calc_chandelier(max_high, min_low, atr_values, multiplier):
     """Calculate Chandelier Exit values.
     
     Args:
-        high: Array of high prices
-        low: Array of low prices
+        max_high: Array of highest high prices of the period
+        min_low: Array of lowest low prices of the period
         atr_values: Array of ATR values
-        period: Period for finding extremes
         multiplier: Multiplier for ATR
         
     Returns:
         Tuple of (exit_short, exit_long) arrays
     """
-    n_bars = len(high)
-    exit_short = np.empty(n_bars, dtype=np.float64)
-    exit_long = np.empty(n_bars, dtype=np.float64)
-
-    exit_long[:period - 1] = np.nan
-    exit_short[:period - 1] = np.nan
-    for i in range(period, n_bars + 1):
-        exit_long[i - 1] = high[i - period: i].max() - atr_values[i - 1] * multiplier
-        exit_short[i - 1] = low[i - period: i].min() + atr_values[i - 1] * multiplier
+    exit_long = max_high - atr_values * multiplier
+    exit_short = min_low + atr_values * multiplier
 
     return exit_short, exit_long
 
@@ -82,9 +74,16 @@ def get_indicator_out(quotes, period=22, multiplier=3, use_close=False):
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
     
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, multiplier, use_close))
+
+
+def calculate(calc, quotes, period, multiplier, use_close):
+    """Calculate Chandelier Exit series on bars of quotes (see resume.Calculation)."""
+    close = quotes.close
+    
     # Calculate ATR
-    atr_result = atr.get_indicator_out(quotes, smooth=period, ma_type='mma')
-    atr_values = atr_result.atr
+    atr_values = atr.calculate(calc.child('atr'), quotes, smooth=period, ma_type='mma')['atr']()
     
     # Determine high and low based on use_close parameter
     if use_close:
@@ -95,10 +94,17 @@ def get_indicator_out(quotes, period=22, multiplier=3, use_close=False):
         low = quotes.low
     
     # Calculate Chandelier Exit
-    exit_short, exit_long = calc_chandelier(high, low, atr_values, period, multiplier)
+    max_high, min_low = calc.window(
+        'extremums', lambda high, low: (calc_max(high, period), calc_min(low, period)), (high, low), period
+    )
+    exit_short, exit_long = calc_chandelier(max_high, min_low, atr_values, multiplier)
     
-    return IndicatorResult({
+    return {
         'exit_short': exit_short,
         'exit_long': exit_long
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return max(params['period'], atr.get_lookback({'smooth': params['period'], 'ma_type': 'mma'}, tolerance))
@@ -0,0 +1,134 @@
+"""correlation(quotes, other, period=20, value='close', returns=True)
+
+Rolling correlation, covariance and beta of two instruments.
+
+Output series: correlation, covariance, beta"""
+import numpy as np
+
+from ..data_series import DataSeries
+from ..resume import Calculation
+from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData, PyTAExceptionTooLittleData
+
+# Parameters with series of bars (sliced together with quotes, see resume module)
+SERIES_PARAMS = ('other',)
+
+
+def get_indicator_out(quotes, other, period=20, value='close', returns=True):
+    """Calculate rolling Correlation, Covariance and Beta of two instruments.
+
+    Co-moments of the windows are updated in O(1) per bar. Beta is the
+    covariance divided by the variance of other, so it is the hedge ratio of
+    quotes against other (other is the benchmark).
+
+    Args:
+        quotes: Quotes object containing OHLCV data
+        other: Quotes object of the second instrument with the same bars (see ta.align),
+            or an array of values of the same length
+        period: Number of bars in the window (default: 20)
+        value: Series to use - 'open', 'high', 'low', 'close' or 'volume' (default: 'close')
+        returns: If True (default), use simple returns of values (value / previous value - 1),
+            else values themselves
+
+    Returns:
+        IndicatorResult object with attributes:
+            - correlation: Pearson correlation in [-1, 1] (NaN if a series is constant in the window)
+            - covariance: Population covariance
+            - beta: Covariance divided by the variance of other (NaN if other is constant)
+            First period-1 elements (period elements for returns) are NaN.
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0 or value is invalid
+        PyTAExceptionBadSeriesData: If lengths or times of quotes and other differ
+        PyTAExceptionDataSeriesNonFound: If the specified value series is not found
+        PyTAExceptionTooLittleData: If data length is less than period
+
+    Example:
+        >>> btc, eth = ta.align([quotes_btc, quotes_eth])
+        >>> beta = ta.correlation(eth, btc, period=50).beta
+    """
+    if period <= 0:
+        raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
+
+    valid_values = ['open', 'high', 'low', 'close', 'volume']
+    if value not in valid_values:
+        raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
+
+    source_values, _ = pair_values(quotes, other, value)
+
+    data_len = len(source_values)
+    if data_len < period:
+        raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
+
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, other, period, value, returns))
+
+
+def pair_values(quotes, other, value):
+    """Values of quotes and other with the same bars.
+
+    Args:
+        quotes: Quotes object
+        other: Quotes object or array of values
+        value: Series name
+
+    Returns:
+        Tuple of (values of quotes, values of other)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If other is not a 1-D series
+        PyTAExceptionBadSeriesData: If lengths or times of quotes and other differ
+    """
+    source_values = quotes[value]
+    if isinstance(other, DataSeries):
+        other_values = other[value]
+        if 'time' in quotes._data and 'time' in other._data and not np.array_equal(quotes['time'], other['time']):
+            raise PyTAExceptionBadSeriesData('time of quotes and other differ, align them with ta.align()')
+    else:
+        other_values = np.asarray(other, dtype=np.float64)
+        if other_values.ndim != 1:
+            raise PyTAExceptionBadParameterValue(f'other must be Quotes or 1-D array, got {other_values.ndim}-D array')
+
+    if len(other_values) != len(source_values):
+        raise PyTAExceptionBadSeriesData(
+            f'length of other {len(other_values)} does not match quotes length {len(source_values)}'
+        )
+    return source_values, other_values
+
+
+def simple_returns(calc, key, values):
+    """Simple returns of values (NaN for the first bar, 0 after zero values)."""
+    values = values.astype(np.float64, copy=False)
+    previous = calc.previous(key, values)
+
+    np.seterr(divide='ignore', invalid='ignore')
+    result = values / previous - 1
+    result[previous == 0] = 0
+    return result
+
+
+def calculate(calc, quotes, other, period, value, returns):
+    """Calculate Correlation series on bars of quotes (see resume.Calculation)."""
+    x, y = pair_values(quotes, other, value)
+    if returns:
+        x = simple_returns(calc, 'previous_x', x)
+        y = simple_returns(calc, 'previous_y', y)
+
+    c_xy, m2_x, m2_y = calc.comoments('comoments', x.astype(np.float64, copy=False),
+                                      y.astype(np.float64, copy=False), period)
+
+    np.seterr(divide='ignore', invalid='ignore')
+    correlation = np.clip(c_xy / np.sqrt(m2_x * m2_y), -1.0, 1.0)
+    correlation[(m2_x == 0) | (m2_y == 0)] = np.nan
+    beta = c_xy / m2_y
+    beta[m2_y == 0] = np.nan
+
+    return {
+        'correlation': correlation,
+        'covariance': c_xy / period,
+        'beta': beta
+    }
+
+
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period'] + (1 if params['returns'] else 0)
@@ -3,8 +3,8 @@
 Exponential moving average.
 
 Output series: ema (as source)"""
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue
 
 
@@ -40,13 +40,17 @@ def get_indicator_out(quotes, period, value='close'):
     if value not in valid_values:
         raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
     
-    # Get source values from quotes
-    source_values = quotes[value]
-    
-    # Calculate EMA
-    ema_values = ma_calculate(source_values, period, MA_Type.ema)
-    
-    return IndicatorResult({
-        'ema': ema_values
-    })
+    calc = Calculation(len(quotes[value]))
+    return calc.result(calculate(calc, quotes, period, value))
+
+
+def calculate(calc, quotes, period, value):
+    """Calculate EMA series on bars of quotes (see resume.Calculation)."""
+    return {
+        'ema': calc.ma('ema', quotes[value], period, MA_Type.ema)
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return ma_lookback(params['period'], MA_Type.ema, tolerance)
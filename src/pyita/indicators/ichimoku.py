@@ -1,4 +1,4 @@
-"""ichimoku(quotes, period_short=9, period_mid=26, period_long=52, offset_senkou=26, offset_chikou=26)
+"""ichimoku(quotes, period_short=9, period_mid=26, period_long=52, offset_senkou=26, offset_chikou=26, outputs=None)
 
 Ichimoku indicator.
 
@@ -6,7 +6,9 @@ Output series: tenkan (price), kijun (price), senkou_a (price), senkou_b (price)
 import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
+from ..indicator_result import Deferred
+from ..resume import Calculation
+from ..rolling import calc_max, calc_min
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 from ..constants import PRICE_TYPE
 
@@ -23,15 +25,7 @@ def calc_av_min_max(high, low, period):
     Returns:
         Array of average (max + min) / 2 values
     """
-    n_bars = len(high)
-
-    av_min_max = np.empty(n_bars, dtype=np.float64)
-
-    av_min_max[:period - 1] = np.nan
-    for t in range(period - 1, n_bars):
-        av_min_max[t] = (high[t - period + 1: t + 1].max() + low[t - period + 1: t + 1].min()) / 2
-
-    return av_min_max
+    return (calc_max(high, period) + calc_min(low, period)) / 2
 
 
 def offset_ahead(series, period):
@@ -48,7 +42,19 @@ def offset_ahead(series, period):
         series[:period] = np.nan
 
 
-def get_indicator_out(quotes, period_short=9, period_mid=26, period_long=52, offset_senkou=26, offset_chikou=26):
+def offset_ahead_calculated(calc, key, series, period):
+    """Shift series of calculated bars forward by period bars (see resume.Calculation).
+    
+    Returns:
+        Shifted array (series itself when calculated over all bars)
+    """
+    extended = calc.extend(key, series, period)
+    offset_ahead(extended, period)
+    return extended[len(extended) - len(series):]
+
+
+def get_indicator_out(quotes, period_short=9, period_mid=26, period_long=52, offset_senkou=26, offset_chikou=26,
+                      outputs=None):
     """Calculate Ichimoku Cloud indicator.
     
     Ichimoku is a comprehensive technical analysis system that provides support and
@@ -66,6 +72,8 @@ def get_indicator_out(quotes, period_short=9, period_mid=26, period_long=52, off
         period_long: Period for Senkou Span B calculation (default: 52)
         offset_senkou: Offset for shifting Senkou spans forward (default: 26)
         offset_chikou: Offset for shifting Chikou span backward (default: 26)
+        outputs: List of series to calculate, e.g. ['tenkan', 'kijun']
+            (default: all; senkou_a, senkou_b and chikou are calculated on first access)
         
     Returns:
         IndicatorResult object with attributes:
@@ -76,7 +84,7 @@ def get_indicator_out(quotes, period_short=9, period_mid=26, period_long=52, off
             - chikou: Chikou Span (Lagging Span) values
             
     Raises:
-        PyTAExceptionBadParameterValue: If any period <= 0 or offset < 0
+        PyTAExceptionBadParameterValue: If any period <= 0, offset < 0 or outputs is invalid
         PyTAExceptionTooLittleData: If data length is insufficient
         
     Example:
@@ -98,46 +106,57 @@ def get_indicator_out(quotes, period_short=9, period_mid=26, period_long=52, off
     if offset_chikou < 0:
         raise PyTAExceptionBadParameterValue(f'offset_chikou must be >= 0, got {offset_chikou}')
     
-    # Get OHLC data from quotes
-    high = quotes.high
-    low = quotes.low
-    close = quotes.close
-    
     # Check minimum data requirement
     max_period = max(period_short, period_mid, period_long)
-    data_len = len(high)
+    data_len = len(quotes.high)
     if data_len < max_period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {max_period}')
     
+    calc = Calculation(data_len)
+    return calc.result(
+        calculate(calc, quotes, period_short, period_mid, period_long, offset_senkou, offset_chikou),
+        outputs, eager=('tenkan', 'kijun')
+    )
+
+
+def calculate(calc, quotes, period_short, period_mid, period_long, offset_senkou, offset_chikou):
+    """Calculate Ichimoku series on bars of quotes (see resume.Calculation)."""
+    high = quotes.high
+    low = quotes.low
+    
+    def calc_av_min_max_calculated(key, period, high, low):
+        return calc.window(key, lambda high, low: calc_av_min_max(high, low, period), (high, low), period)
+    
     # Calculate Tenkan-sen and Kijun-sen
-    tenkan = calc_av_min_max(high, low, period_short)
-    kijun = calc_av_min_max(high, low, period_mid)
+    tenkan = Deferred(lambda high, low: calc_av_min_max_calculated('tenkan', period_short, high, low), high, low)
+    kijun = Deferred(lambda high, low: calc_av_min_max_calculated('kijun', period_mid, high, low), high, low)
     
-    # Calculate Senkou Span A (average of Tenkan and Kijun, shifted forward)
-    senkou_a = np.vstack((tenkan, kijun)).sum(0) / 2
-    # Make a copy before shifting to avoid modifying the original
-    senkou_a = senkou_a.copy()
-    offset_ahead(senkou_a, offset_senkou)
+    def calc_senkou_a(tenkan, kijun):
+        # Calculate Senkou Span A (average of Tenkan and Kijun, shifted forward)
+        senkou_a = np.vstack((tenkan(), kijun())).sum(0) / 2
+        return offset_ahead_calculated(calc, 'senkou_a', senkou_a, offset_senkou)
     
-    # Calculate Senkou Span B (average max/min over period_long, shifted forward)
-    senkou_b = calc_av_min_max(high, low, period_long)
-    # Make a copy before shifting
-    senkou_b = senkou_b.copy()
-    offset_ahead(senkou_b, offset_senkou)
+    def calc_senkou_b(high, low):
+        # Calculate Senkou Span B (average max/min over period_long, shifted forward)
+        senkou_b = calc_av_min_max_calculated('senkou_b', period_long, high, low)
+        return offset_ahead_calculated(calc, 'senkou_b.offset', senkou_b, offset_senkou)
     
-    # Calculate Chikou Span (close shifted backward)
-    chikou = np.empty(len(high), dtype=PRICE_TYPE)
-    if offset_chikou > 0:
-        chikou[:-offset_chikou] = close[offset_chikou:]
-        chikou[-offset_chikou:] = np.nan
-    else:
-        chikou[:] = close
+    def calc_chikou(close):
+        # Calculate Chikou Span (close shifted backward)
+        # When resumed, the last offset_chikou values of the previous calculation get closes of new bars
+        chikou = np.concatenate((close, np.full(offset_chikou, np.nan, dtype=PRICE_TYPE)))
+        return chikou[max(offset_chikou - calc.start, 0):]
     
-    return IndicatorResult({
+    return {
         'tenkan': tenkan,
         'kijun': kijun,
-        'senkou_a': senkou_a,
-        'senkou_b': senkou_b,
-        'chikou': chikou
-    })
+        'senkou_a': Deferred(calc_senkou_a, tenkan, kijun),
+        'senkou_b': Deferred(calc_senkou_b, high, low),
+        'chikou': Deferred(calc_chikou, quotes.close)
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    # Senkou lines are shifted ahead by offset_senkou bars
+    return max(params['period_short'], params['period_mid'], params['period_long']) + params['offset_senkou']
@@ -1,17 +1,19 @@
-"""keltner(quotes, period=10, multiplier=1, period_atr=10, ma_type='ema', ma_type_atr='mma')
+"""keltner(quotes, period=10, multiplier=1, period_atr=10, ma_type='ema', ma_type_atr='mma', outputs=None)
 
 Keltner channel.
 
 Output series: mid_line (price), up_line (price), down_line (price), width"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..indicator_result import Deferred
+from ..quotes import Quotes
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 from . import atr
 
 
-def get_indicator_out(quotes, period=10, multiplier=1, period_atr=10, ma_type='ema', ma_type_atr='mma'):
+def get_indicator_out(quotes, period=10, multiplier=1, period_atr=10, ma_type='ema', ma_type_atr='mma', outputs=None):
     """Calculate Keltner Channel.
     
     Keltner Channel is a volatility-based indicator that uses ATR to set channel
@@ -27,6 +29,7 @@ def get_indicator_out(quotes, period=10, multiplier=1, period_atr=10, ma_type='e
         period_atr: Period for ATR calculation (default: 10)
         ma_type: Type of moving average for middle line - 'sma', 'ema', 'mma', 'ema0', 'mma0' (default: 'ema')
         ma_type_atr: Type of moving average for ATR - 'sma', 'ema', 'mma', 'ema0', 'mma0' (default: 'mma')
+        outputs: List of series to calculate, e.g. ['mid_line'] (default: all; width is calculated on first access)
         
     Returns:
         IndicatorResult object with attributes:
@@ -57,14 +60,14 @@ def get_indicator_out(quotes, period=10, multiplier=1, period_atr=10, ma_type='e
     if period_atr <= 0:
         raise PyTAExceptionBadParameterValue(f'period_atr must be greater than 0, got {period_atr}')
     
-    # Convert ma_type strings to MA_Type enums (will raise ValueError if invalid)
+    # Validate ma_type strings (MA_Type.cast raises ValueError if invalid)
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(f'ma_type: {str(e)}')
     
     try:
-        ma_type_atr_enum = MA_Type.cast(ma_type_atr)
+        MA_Type.cast(ma_type_atr)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(f'ma_type_atr: {str(e)}')
     
@@ -77,27 +80,44 @@ def get_indicator_out(quotes, period=10, multiplier=1, period_atr=10, ma_type='e
     if data_len < max_period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {max_period}')
     
-    # Calculate ATR
-    atr_result = atr.get_indicator_out(quotes, smooth=period_atr, ma_type=ma_type_atr)
-    atr_values = atr_result.atr
-    
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, multiplier, period_atr, ma_type, ma_type_atr),
+                       outputs, eager=('up_line', 'down_line'))
+
+
+def calculate(calc, quotes, period, multiplier, period_atr, ma_type, ma_type_atr):
+    """Calculate Keltner Channel series on bars of quotes (see resume.Calculation)."""
     # Calculate middle line (moving average of close)
-    mid_line = ma_calculate(close, period, ma_type_enum)
+    mid_line = calc.ma('mid_line', quotes.close, period, MA_Type.cast(ma_type))
+    
+    # ATR is calculated only if channel lines are selected
+    def calc_deviations(high, low, close):
+        atr_quotes = Quotes._from_arrays({'high': high, 'low': low, 'close': close})
+        return atr.calculate(calc.child('atr'), atr_quotes, smooth=period_atr, ma_type=ma_type_atr)['atr']() * multiplier
+    
+    deviations = Deferred(calc_deviations, quotes.high, quotes.low, quotes.close)
     
     # Calculate channel lines
-    up_line = mid_line + atr_values * multiplier
-    down_line = mid_line - atr_values * multiplier
+    up_line = Deferred(lambda deviations: mid_line + deviations(), deviations)
+    down_line = Deferred(lambda deviations: mid_line - deviations(), deviations)
     
-    # Calculate width (channel width as percentage of middle line)
-    np.seterr(divide='ignore', invalid='ignore')
-    width = (up_line - down_line) / mid_line
-    # Handle division by zero
-    width[mid_line == 0] = 0
+    def calc_width(up_line, down_line):
+        # Calculate width (channel width as percentage of middle line)
+        np.seterr(divide='ignore', invalid='ignore')
+        width = (up_line() - down_line()) / mid_line
+        # Handle division by zero
+        width[mid_line == 0] = 0
+        return width
     
-    return IndicatorResult({
+    return {
         'mid_line': mid_line,
         'up_line': up_line,
         'down_line': down_line,
-        'width': width
-    })
+        'width': Deferred(calc_width, up_line, down_line)
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    n_atr = atr.get_lookback({'smooth': params['period_atr'], 'ma_type': params['ma_type_atr']}, tolerance)
+    return max(ma_lookback(params['period'], MA_Type.cast(params['ma_type']), tolerance), n_atr)
@@ -3,8 +3,8 @@
 Moving average of different types: 'sma', 'ema', 'mma', 'ema0', 'mma0', 'emaw', 'mmaw'.
 
 Output series: move_average (as source)"""
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 
 
@@ -48,9 +48,9 @@ def get_indicator_out(quotes, period, value='close', ma_type='sma'):
     if value not in valid_values:
         raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
     
-    # Convert ma_type string to MA_Type enum (will raise ValueError if invalid)
+    # Validate ma_type string (MA_Type.cast raises ValueError if invalid)
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(str(e))
     
@@ -62,10 +62,17 @@ def get_indicator_out(quotes, period, value='close', ma_type='sma'):
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
     
-    # Calculate moving average
-    out = ma_calculate(source_values, period, ma_type_enum)
-    
-    return IndicatorResult({
-        'move_average': out
-    })
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, value, ma_type))
+
+
+def calculate(calc, quotes, period, value, ma_type):
+    """Calculate moving average series on bars of quotes (see resume.Calculation)."""
+    return {
+        'move_average': calc.ma('move_average', quotes[value], period, MA_Type.cast(ma_type))
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return ma_lookback(params['period'], MA_Type.cast(params['ma_type']), tolerance)
@@ -3,8 +3,8 @@
 Moving Average Convergence/Divergence.
 
 Output series: macd, signal, hist"""
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 
 
@@ -61,14 +61,14 @@ def get_indicator_out(quotes, period_short, period_long, period_signal,
     if value not in valid_values:
         raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
     
-    # Convert ma_type strings to MA_Type enums (will raise ValueError if invalid)
+    # Validate ma_type strings (MA_Type.cast raises ValueError if invalid)
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(f'ma_type: {str(e)}')
     
     try:
-        ma_type_signal_enum = MA_Type.cast(ma_type_signal)
+        MA_Type.cast(ma_type_signal)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(f'ma_type_signal: {str(e)}')
     
@@ -80,22 +80,38 @@ def get_indicator_out(quotes, period_short, period_long, period_signal,
     if data_len < period_long:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period_long}')
     
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period_short, period_long, period_signal, ma_type, ma_type_signal, value))
+
+
+def calculate(calc, quotes, period_short, period_long, period_signal, ma_type, ma_type_signal, value):
+    """Calculate MACD series on bars of quotes (see resume.Calculation)."""
+    source_values = quotes[value]
+    ma_type_enum = MA_Type.cast(ma_type)
+    
     # Calculate short and long moving averages
-    ema_short = ma_calculate(source_values, period_short, ma_type_enum)
-    ema_long = ma_calculate(source_values, period_long, ma_type_enum)
+    ema_short = calc.ma('short', source_values, period_short, ma_type_enum)
+    ema_long = calc.ma('long', source_values, period_long, ma_type_enum)
     
     # Calculate MACD line (difference between short and long MAs)
     macd = ema_short - ema_long
     
     # Calculate signal line (moving average of MACD)
-    signal = ma_calculate(macd, period_signal, ma_type_signal_enum)
+    signal = calc.ma('signal', macd, period_signal, MA_Type.cast(ma_type_signal))
     
     # Calculate histogram (MACD - Signal)
     macd_hist = macd - signal
     
-    return IndicatorResult({
+    return {
         'macd': macd,
         'signal': signal,
         'hist': macd_hist
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    ma_type = MA_Type.cast(params['ma_type'])
+    n_macd = max(ma_lookback(params['period_short'], ma_type, tolerance),
+                 ma_lookback(params['period_long'], ma_type, tolerance))
+    return n_macd + ma_lookback(params['period_signal'], MA_Type.cast(params['ma_type_signal']), tolerance) - 1
@@ -0,0 +1,77 @@
+"""median_bands(quotes, period=20, quantile=0.25, value='close')
+
+Median bands.
+
+Output series: mid_line (as source), up_line (as source), down_line (as source)"""
+import numpy as np
+
+from ..resume import Calculation
+from ..rolling import calc_quantiles
+from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
+
+
+def get_indicator_out(quotes, period=20, quantile=0.25, value='close'):
+    """Calculate Median Bands.
+    
+    Robust alternative to Bollinger Bands: the middle line is the rolling median
+    and the bands are rolling quantiles, so single outliers do not widen the bands.
+    
+    Args:
+        quotes: Quotes object containing OHLCV data
+        period: Period for rolling median and quantiles (default: 20)
+        quantile: Quantile of the lower band, the upper band uses 1 - quantile (default: 0.25)
+        value: Price field to use - 'open', 'high', 'low', or 'close' (default: 'close')
+        
+    Returns:
+        IndicatorResult object with attributes:
+            - mid_line: Rolling median
+            - up_line: Rolling (1 - quantile) quantile
+            - down_line: Rolling quantile
+            
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0, quantile is not in [0, 0.5] or value is invalid
+        PyTAExceptionDataSeriesNonFound: If the specified value series is not found
+        PyTAExceptionTooLittleData: If data length is less than period
+        
+    Example:
+        >>> bands = median_bands(quotes, period=20, quantile=0.1)
+        >>> print(bands.mid_line)
+        >>> print(bands.up_line)
+    """
+    if period <= 0:
+        raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
+    
+    if not 0 <= quantile <= 0.5:
+        raise PyTAExceptionBadParameterValue(f'quantile must be in [0, 0.5], got {quantile}')
+    
+    valid_values = ['open', 'high', 'low', 'close']
+    if value not in valid_values:
+        raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
+    
+    source_values = quotes[value]
+    
+    data_len = len(source_values)
+    if data_len < period:
+        raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
+    
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, quantile, value))
+
+
+def calculate(calc, quotes, period, quantile, value):
+    """Calculate Median Bands series on bars of quotes (see resume.Calculation)."""
+    quantiles = np.array([0.5, 1 - quantile, quantile])
+    mid_line, up_line, down_line = calc.window(
+        'quantiles', lambda values: tuple(calc_quantiles(values, period, quantiles)), (quotes[value],), period
+    )
+    
+    return {
+        'mid_line': mid_line,
+        'up_line': up_line,
+        'down_line': down_line
+    }
+
+
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period']
@@ -5,7 +5,7 @@ Money flow index.
 Output series: mfi"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData, PyTAExceptionDataSeriesNonFound
 
 
@@ -38,28 +38,31 @@ def get_indicator_out(quotes, period=14):
     if period <= 0:
         raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
     
-    # Get OHLCV data from quotes
-    high = quotes.high
-    low = quotes.low
-    close = quotes.close
-    
     # Check if volume is present
-    volume = quotes['volume']
+    quotes['volume']
     
     # Check minimum data requirement
-    n_bars = len(high)
+    n_bars = len(quotes.high)
     if n_bars < period:
         raise PyTAExceptionTooLittleData(f'data length {n_bars} < {period}')
     
+    calc = Calculation(n_bars)
+    return calc.result(calculate(calc, quotes, period))
+
+
+def calculate(calc, quotes, period):
+    """Calculate MFI series on bars of quotes (see resume.Calculation)."""
+    volume = quotes['volume']
+    n_bars = len(volume)
+    
     # Calculate typical price
-    typical_price = (high + low + close) / 3
+    typical_price = (quotes.high + quotes.low + quotes.close) / 3
     
     # Calculate money flow
     mf = typical_price * volume
     
-    # Calculate sign of typical price change
-    # np.diff with prepend adds the first element to maintain length
-    mfz = np.sign(np.diff(typical_price, prepend=typical_price[0]))
+    # Calculate sign of typical price change (no change for the first bar)
+    mfz = np.sign(typical_price - calc.previous('typical_price', typical_price, typical_price[0]))
     
     # Separate positive and negative money flow
     bx_p = mfz > 0
@@ -70,11 +73,9 @@ def get_indicator_out(quotes, period=14):
     mf_m = np.zeros(n_bars, dtype=np.float64)
     mf_m[bx_m] = mf[bx_m]
     
-    # Calculate sum of positive and negative money flow over period using convolution
-    # np.convolve with default mode='full' returns len(a) + len(b) - 1, then we take [:n_bars]
-    weights = np.ones(period, dtype=np.float64)
-    mf_sum_p = np.convolve(mf_p, weights)[:n_bars]
-    mf_sum_m = np.convolve(mf_m, weights)[:n_bars]
+    # Calculate sum of positive and negative money flow over period
+    mf_sum_p = calc.sum('mf_p', mf_p, period)
+    mf_sum_m = calc.sum('mf_m', mf_m, period)
     
     # Calculate MFI
     np.seterr(divide='ignore', invalid='ignore')
@@ -82,9 +83,14 @@ def get_indicator_out(quotes, period=14):
     # Handle division by zero
     mfi[mf_sum_p + mf_sum_m == 0] = 0
     # Set first period elements to NaN
-    mfi[:period] = np.nan
+    mfi[:calc.head(period)] = np.nan
     
-    return IndicatorResult({
+    return {
         'mfi': mfi
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    # One bar for the first change of typical price
+    return params['period'] + 1
@@ -5,7 +5,7 @@ On Balance Volume.
 Output series: obv"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionDataSeriesNonFound, PyTAExceptionTooLittleData
 
 
@@ -31,28 +31,39 @@ def get_indicator_out(quotes):
         >>> obv_result = obv(quotes)
         >>> print(obv_result.obv)
     """
-    # Get OHLCV data from quotes
-    close = quotes.close
-    
     # Check if volume is present
-    volume = quotes['volume']
+    quotes['volume']
     
     # Check minimum data requirement (at least 1 bar)
-    data_len = len(close)
+    data_len = len(quotes.close)
     if data_len < 1:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < 1')
     
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes))
+
+
+def calculate(calc, quotes):
+    """Calculate OBV series on bars of quotes (see resume.Calculation)."""
+    close = quotes.close
+    volume = quotes['volume']
+    
     # Calculate sign of price change
     # signs[0] = 0, signs[i] = sign(close[i] - close[i-1]) for i > 0
-    signs = np.hstack((0, np.sign(close[1:] - close[:-1])))
+    signs = np.sign(close - calc.previous('close', close))
+    signs[:calc.head(1)] = 0
     
     # Multiply volume by sign (positive for up days, negative for down days, zero for unchanged)
     sign_volume = volume * signs
     
     # Calculate OBV as cumulative sum
-    obv = np.cumsum(sign_volume)
+    obv = calc.cumsum('obv', sign_volume)
     
-    return IndicatorResult({
+    return {
         'obv': obv
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Indicator depends on the whole history, lookback is not limited (see pyita.lookback)."""
+    return None
@@ -6,79 +6,159 @@ Output series: sar (price), signal"""
 import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
+from ..resume import Calculation
+from ..events import Events, calc_events, collect_flips
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 from ..constants import PRICE_TYPE
 
+# State of the calculation after the last bar (see calc_paraboic)
+PARABOLIC_STATE = ('is_bullish', 'acceleration_factor', 'sar', 'extreme', 'signaled')
+
+
+@nb.njit(cache=True, inline='always')
+def parabolic_step(high, low, high_1, high_2, low_1, low_2, has_previous,
+                   start, maximum, increment, is_bullish, acceleration_factor, sar, extreme):
+    """Calculate Parabolic SAR of a bar from the state after the previous bar.
+    
+    Prices of the bar and of the previous two bars are passed as numbers
+    (the step is inlined into kernels without passing arrays).
+    
+    Args:
+        high, low: Prices of the bar
+        high_1, high_2, low_1, low_2: Prices of the previous two bars
+        has_previous: True if the previous two bars are used (not for the second bar)
+        start, maximum, increment: Parameters of the acceleration factor
+        is_bullish, acceleration_factor, sar, extreme: State after the previous bar
+    
+    Returns:
+        Tuple of (signal, is_bullish, acceleration_factor, sar, extreme), signal is
+        1 for a flip to the bullish trend, -1 for a flip to the bearish trend, 0 otherwise
+    """
+    signal = 0
+    sar += acceleration_factor * (extreme - sar)
+
+    if is_bullish:
+
+        if has_previous:
+            sar = min(sar, low_1, low_2)
+
+        if low < sar:
+            is_bullish = False
+            signal = -1
+            sar = extreme
+            acceleration_factor = start
+            extreme = low
+        else:
+            if high > extreme:
+                extreme = high
+                acceleration_factor = min(acceleration_factor + increment, maximum)
+
+    else:
+
+        if has_previous:
+            sar = max(sar, high_1, high_2)
+
+        if high > sar:
+            is_bullish = True
+            signal = 1
+            sar = extreme
+            acceleration_factor = start
+            extreme = high
+        else:
+            if low < extreme:
+                extreme = low
+                acceleration_factor = min(acceleration_factor + increment, maximum)
+
+    return signal, is_bullish, acceleration_factor, sar, extreme
+
 
 @nb.njit(cache=True)
-def calc_paraboic(highs, lows, start, maximum, increment):
+def calc_paraboic(highs, lows, start, maximum, increment,
+                  i_first, is_bullish, acceleration_factor, sar, extreme, signaled):
     """Calculate Parabolic SAR values.
     
+    Calculation starts at bar i_first from the state after the previous bar
+    (bars before i_first give lows and highs of the previous two bars).
+    
     Args:
         highs: Array of high prices
         lows: Array of low prices
         start: Starting acceleration factor
         maximum: Maximum acceleration factor
         increment: Increment for acceleration factor
+        i_first: Index of the first calculated bar
+        is_bullish: True for the bullish trend
+        acceleration_factor: Current acceleration factor
+        sar: Current SAR value
+        extreme: Extreme price of the trend
+        signaled: True if there was a signal before i_first
         
     Returns:
-        Tuple of (sars, signals) arrays
+        Tuple of (sars, signals, is_bullish, acceleration_factor, sar, extreme, signaled),
+        values of bars before i_first are not defined
     """
     sars = np.empty(len(highs), dtype=np.float64)
     signals = np.zeros(len(highs), dtype=np.int8)
 
-    is_bullish = True
-    acceleration_factor = start
-    sar = lows[0]
-    extreme = highs[0]
-
-    for i in range(1, len(highs)):
-
-        sar += acceleration_factor * (extreme - sar)
-
-        if is_bullish:
-
-            if i > 1:
-                sar = min(sar, lows[i - 1], lows[i - 2])
-
-            if lows[i] < sar:
-                is_bullish = False
-                signals[i] = -1
-                sar = extreme
-                acceleration_factor = start
-                extreme = lows[i]
-            else:
-                if highs[i] > extreme:
-                    extreme = highs[i]
-                    acceleration_factor = min(acceleration_factor + increment, maximum)
+    for i in range(i_first, len(highs)):
+        signal, is_bullish, acceleration_factor, sar, extreme = parabolic_step(
+            highs[i], lows[i], highs[i - 1], highs[i - 2], lows[i - 1], lows[i - 2], i > 1,
+            start, maximum, increment, is_bullish, acceleration_factor, sar, extreme
+        )
+        signals[i] = signal
+        sars[i] = sar
 
-        else:
+    # Set first elements to NaN until first signal
+    if not signaled:
+        for i, signal in enumerate(signals):
+            sars[i] = np.nan
+            signals[i] = 0
+            if signal != 0:
+                signaled = True
+                break
 
-            if i > 1:
-                sar = max(sar, highs[i - 1], highs[i - 2])
+    return sars, signals, is_bullish, acceleration_factor, sar, extreme, signaled
 
-            if highs[i] > sar:
-                is_bullish = True
-                signals[i] = 1
-                sar = extreme
-                acceleration_factor = start
-                extreme = highs[i]
-            else:
-                if lows[i] < extreme:
-                    extreme = lows[i]
-                    acceleration_factor = min(acceleration_factor + increment, maximum)
 
-        sars[i] = sar
+@nb.njit(cache=True)
+def calc_paraboic_flips(highs, lows, start, maximum, increment,
+                        i_first, is_bullish, acceleration_factor, sar, extreme, signaled,
+                        indexes, prices, types, count):
+    """Calculate flips of Parabolic SAR without series of all bars.
+    
+    Flips are the non-zero signals of calc_paraboic (the first flip only sets
+    signaled). The calculation stops at a bar when the outputs are full and
+    continues from it and the returned state (see events.collect_flips).
+    
+    Args:
+        highs, lows, start, maximum, increment: As in calc_paraboic
+        i_first, is_bullish, acceleration_factor, sar, extreme, signaled: As in calc_paraboic
+        indexes, prices, types: Outputs of bar indexes, SAR values after the flips and signals
+        count: Number of flips in the outputs
+        
+    Returns:
+        Tuple of (count, i_next, is_bullish, acceleration_factor, sar, extreme, signaled),
+        i_next - the first bar not calculated (len(highs) if all bars are calculated)
+    """
+    for i in range(i_first, len(highs)):
+        if count == len(indexes):
+            return count, i, is_bullish, acceleration_factor, sar, extreme, signaled
 
-    # Set first elements to NaN until first signal
-    for i, signal in enumerate(signals):
-        sars[i] = np.nan
-        signals[i] = 0
-        if signal != 0:
-            break
+        signal, is_bullish, acceleration_factor, sar, extreme = parabolic_step(
+            highs[i], lows[i], highs[i - 1], highs[i - 2], lows[i - 1], lows[i - 2], i > 1,
+            start, maximum, increment, is_bullish, acceleration_factor, sar, extreme
+        )
+        if signal == 0:
+            continue
+        if not signaled:
+            signaled = True
+            continue
+        indexes[count] = i
+        prices[count] = sar
+        types[count] = signal
+        count += 1
 
-    return sars, signals
+    return count, len(highs), is_bullish, acceleration_factor, sar, extreme, signaled
 
 
 def get_indicator_out(quotes, start=0.02, maximum=0.2, increment=0.02):
@@ -109,7 +189,37 @@ def get_indicator_out(quotes, start=0.02, maximum=0.2, increment=0.02):
         >>> print(sar_result.sar)
         >>> print(sar_result.signal)
     """
-    # Validate parameters
+    data_len = check_params(quotes, start, maximum, increment)
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, start, maximum, increment))
+
+
+def get_events(quotes, start=0.02, maximum=0.2, increment=0.02, dense=False):
+    """Calculate flips of Parabolic SAR as sparse events (see pyita.events).
+    
+    Without dense, flips are recorded by calc_paraboic_flips and series of all
+    bars are not allocated.
+    
+    Returns:
+        Events object: bars with non-zero signal, prices are SAR values after the flips
+    """
+    data_len = check_params(quotes, start, maximum, increment)
+    calc = Calculation(data_len)
+    if dense:
+        series = calculate(calc, quotes, start, maximum, increment)
+        indexes, prices, types = calc_events(series['signal'], series['sar'])
+        return Events(quotes, indexes, prices, types, calc.result(series))
+
+    high, low, i_first, state = initial_state(calc, quotes, start)
+    (indexes, prices, types), state = collect_flips(
+        calc_paraboic_flips, (high, low, start, maximum, increment), i_first, state, len(high)
+    )
+    save_state(calc, state)
+    return Events(quotes, indexes, prices, types)
+
+
+def check_params(quotes, start, maximum, increment):
+    """Validate parameters and return the data length."""
     if start <= 0:
         raise PyTAExceptionBadParameterValue(f'start must be greater than 0, got {start}')
     if maximum <= 0:
@@ -119,21 +229,50 @@ def get_indicator_out(quotes, start=0.02, maximum=0.2, increment=0.02):
     if maximum < start:
         raise PyTAExceptionBadParameterValue(f'maximum ({maximum}) must be >= start ({start})')
     
-    # Get OHLC data from quotes
-    high = quotes.high
-    low = quotes.low
-    
     # Check minimum data requirement
-    data_len = len(high)
+    data_len = len(quotes.high)
     min_data_len = 3
     if data_len < min_data_len:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {min_data_len}')
+    return data_len
+
+
+def calculate(calc, quotes, start, maximum, increment):
+    """Calculate Parabolic SAR series on bars of quotes (see resume.Calculation)."""
+    high, low, i_first, state = initial_state(calc, quotes, start)
     
     # Calculate Parabolic SAR
-    parabolic_sar, signals = calc_paraboic(high, low, start, maximum, increment)
+    parabolic_sar, signals, *state = calc_paraboic(high, low, start, maximum, increment, i_first, *state)
+    save_state(calc, state)
     
-    return IndicatorResult({
-        'sar': parabolic_sar,
-        'signal': signals
-    })
+    n_skip = i_first if calc.resumed else 0
+    return {
+        'sar': parabolic_sar[n_skip:],
+        'signal': signals[n_skip:]
+    }
+
+
+def initial_state(calc, quotes, start):
+    """Highs and lows with the previous two bars, the first calculated bar and the state before it."""
+    # Lows and highs of the previous two bars are used for the first bars
+    high = calc.extend('high', quotes.high, 2)
+    low = calc.extend('low', quotes.low, 2)
+    
+    if calc.resumed:
+        i_first = len(high) - len(quotes.high)
+        state = tuple(calc.load(name) for name in PARABOLIC_STATE)
+    else:
+        i_first = 1
+        state = (True, start, low[0], high[0], False)
+    return high, low, i_first, state
+
+
+def save_state(calc, state):
+    """Save the state after the last bar (see PARABOLIC_STATE)."""
+    for name, value in zip(PARABOLIC_STATE, state):
+        calc.save(name, value)
+
 
+def get_lookback(params, tolerance):
+    """Indicator depends on the whole history, lookback is not limited (see pyita.lookback)."""
+    return None
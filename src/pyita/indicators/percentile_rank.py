@@ -0,0 +1,63 @@
+"""percentile_rank(quotes, period=100, value='close')
+
+Percentile rank.
+
+Output series: percentile_rank"""
+from ..resume import Calculation
+from ..rolling import calc_percentile_rank
+from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
+
+
+def get_indicator_out(quotes, period=100, value='close'):
+    """Calculate Percentile Rank.
+    
+    Percentage of the last period values (including the current one) that are
+    less than or equal to the current value.
+    
+    Args:
+        quotes: Quotes object containing OHLCV data
+        period: Period for calculation (default: 100)
+        value: Series to use - 'open', 'high', 'low', 'close' or 'volume' (default: 'close')
+        
+    Returns:
+        IndicatorResult object with attribute:
+            - percentile_rank: Percentile rank values (0-100], first period-1 elements are NaN)
+            
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0 or value is invalid
+        PyTAExceptionDataSeriesNonFound: If the specified value series is not found
+        PyTAExceptionTooLittleData: If data length is less than period
+        
+    Example:
+        >>> rank = percentile_rank(quotes, period=100, value='volume')
+        >>> print(rank.percentile_rank)
+    """
+    if period <= 0:
+        raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
+    
+    valid_values = ['open', 'high', 'low', 'close', 'volume']
+    if value not in valid_values:
+        raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
+    
+    source_values = quotes[value]
+    
+    data_len = len(source_values)
+    if data_len < period:
+        raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
+    
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, value))
+
+
+def calculate(calc, quotes, period, value):
+    """Calculate Percentile Rank series on bars of quotes (see resume.Calculation)."""
+    return {
+        'percentile_rank': calc.window(
+            'percentile_rank', lambda values: calc_percentile_rank(values, period), (quotes[value],), period
+        )
+    }
+
+
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period']
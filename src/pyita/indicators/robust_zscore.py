@@ -0,0 +1,80 @@
+"""robust_zscore(quotes, period=20, value='close')
+
+Robust z-score.
+
+Output series: z_score"""
+import numpy as np
+
+from ..resume import Calculation
+from ..rolling import calc_quantiles
+from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
+
+# Interquartile range of the standard normal distribution
+NORMAL_IQR = 1.3489795003921634
+
+
+def get_indicator_out(quotes, period=20, value='close'):
+    """Calculate Robust Z-Score.
+    
+    Distance of the value from the rolling median in units of the rolling
+    interquartile range scaled to the standard deviation of normal distribution:
+    z = (value - median) / (IQR / 1.349). Unlike the usual z-score it is not
+    distorted by outliers in the window.
+    
+    Args:
+        quotes: Quotes object containing OHLCV data
+        period: Period for calculation (default: 20)
+        value: Series to use - 'open', 'high', 'low', 'close' or 'volume' (default: 'close')
+        
+    Returns:
+        IndicatorResult object with attribute:
+            - z_score: Robust z-score values (0 if the interquartile range is 0,
+              first period-1 elements are NaN)
+            
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0 or value is invalid
+        PyTAExceptionDataSeriesNonFound: If the specified value series is not found
+        PyTAExceptionTooLittleData: If data length is less than period
+        
+    Example:
+        >>> z = robust_zscore(quotes, period=50, value='volume')
+        >>> anomalies = np.abs(z.z_score) > 5
+    """
+    if period <= 0:
+        raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
+    
+    valid_values = ['open', 'high', 'low', 'close', 'volume']
+    if value not in valid_values:
+        raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
+    
+    source_values = quotes[value]
+    
+    data_len = len(source_values)
+    if data_len < period:
+        raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
+    
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, value))
+
+
+def calculate(calc, quotes, period, value):
+    """Calculate Robust Z-Score series on bars of quotes (see resume.Calculation)."""
+    source_values = quotes[value]
+    median, quartile_1, quartile_3 = calc.window(
+        'quantiles', lambda values: tuple(calc_quantiles(values, period, np.array([0.5, 0.25, 0.75]))),
+        (source_values,), period
+    )
+    scale = (quartile_3 - quartile_1) / NORMAL_IQR
+    
+    np.seterr(divide='ignore', invalid='ignore')
+    z_score = (source_values - median) / scale
+    z_score[scale == 0] = 0
+    
+    return {
+        'z_score': z_score
+    }
+
+
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period']
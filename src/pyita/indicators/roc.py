@@ -5,8 +5,8 @@ Rate of Change.
 Output series: roc, smooth_roc"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 from ..constants import PRICE_TYPE
 
@@ -50,7 +50,7 @@ def get_indicator_out(quotes, period=14, ma_period=14, ma_type='sma', value='clo
         raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
     
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(str(e))
     
@@ -60,17 +60,34 @@ def get_indicator_out(quotes, period=14, ma_period=14, ma_type='sma', value='clo
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
     
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, ma_period, ma_type, value))
+
+
+def roc_calculate(source_values, period):
+    """Rate of change of source values from period values before (for values from period on)."""
     roc = (source_values[period:] - source_values[:-period]) / source_values[:-period] * 100
     
     np.seterr(divide='ignore', invalid='ignore')
     roc[source_values[:-period] == 0] = 0
     
-    smooth_roc = ma_calculate(roc, ma_period, ma_type_enum)
+    return roc
+
+
+def calculate(calc, quotes, period, ma_period, ma_type, value):
+    """Calculate ROC series on bars of quotes (see resume.Calculation)."""
+    roc = calc.window('roc', lambda values: roc_calculate(values, period), (quotes[value],), period + 1)
+    
+    smooth_roc = calc.ma('smooth_roc', roc, ma_period, MA_Type.cast(ma_type))
     
-    begin = np.array([np.nan] * period, dtype=PRICE_TYPE)
+    begin = np.array([np.nan] * calc.head(period), dtype=PRICE_TYPE)
     
-    return IndicatorResult({
+    return {
         'roc': np.hstack((begin, roc)),
         'smooth_roc': np.hstack((begin, smooth_roc))
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period'] + ma_lookback(params['ma_period'], MA_Type.cast(params['ma_type']), tolerance)
@@ -5,37 +5,39 @@ Relative Strength Index.
 Output series: rsi"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue
 from ..constants import PRICE_TYPE
 
 
-def rsi_calculate(source_values, period, ma_type):
+def rsi_calculate(calc, source_values, period, ma_type):
     """Calculate RSI from source values.
     
     Args:
-        source_values: Array of price values
+        calc: Calculation object (see resume.Calculation)
+        source_values: Array of price values of calculated bars
         period: Period for RSI calculation
         ma_type: MA_Type enum for smoothing
         
     Returns:
-        Array with RSI values (first element is NaN)
+        Array with RSI values (NaN for the first bar)
     """
-    U = np.diff(source_values)
+    # Price changes start from the second bar
+    U = (source_values - calc.previous('value', source_values))[calc.head(1):]
     D = -U
 
     U[U < 0] = 0
     D[D < 0] = 0
 
-    U_smooth = ma_calculate(U, period, ma_type)
-    D_smooth = ma_calculate(D, period, ma_type)
+    U_smooth = calc.ma('up', U, period, ma_type)
+    D_smooth = calc.ma('down', D, period, ma_type)
 
     divider = U_smooth + D_smooth
     res = U_smooth / divider * 100
     res[divider == 0] = 100
 
-    return np.hstack((np.nan, res))
+    return np.hstack((np.full(calc.head(1), np.nan), res))
 
 
 def get_indicator_out(quotes, period, ma_type='mma', value='close'):
@@ -72,18 +74,29 @@ def get_indicator_out(quotes, period, ma_type='mma', value='close'):
         raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
     
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(str(e))
     
+    calc = Calculation(len(quotes[value]))
+    return calc.result(calculate(calc, quotes, period, ma_type, value))
+
+
+def calculate(calc, quotes, period, ma_type, value):
+    """Calculate RSI series on bars of quotes (see resume.Calculation)."""
     source_values = quotes[value]
     
     if len(source_values) == 0:
         out = np.zeros(0, dtype=PRICE_TYPE)
     else:
-        out = rsi_calculate(source_values, period, ma_type_enum)
+        out = rsi_calculate(calc, source_values, period, MA_Type.cast(ma_type))
     
-    return IndicatorResult({
+    return {
         'rsi': out
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    # One bar for the first price change
+    return 1 + ma_lookback(params['period'], MA_Type.cast(params['ma_type']), tolerance)
@@ -3,8 +3,8 @@
 Simple moving average.
 
 Output series: sma (as source)"""
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue
 
 
@@ -38,11 +38,17 @@ def get_indicator_out(quotes, period, value='close'):
     if value not in valid_values:
         raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
     
-    source_values = quotes[value]
-    
-    sma_values = ma_calculate(source_values, period, MA_Type.sma)
-    
-    return IndicatorResult({
-        'sma': sma_values
-    })
+    calc = Calculation(len(quotes[value]))
+    return calc.result(calculate(calc, quotes, period, value))
+
+
+def calculate(calc, quotes, period, value):
+    """Calculate SMA series on bars of quotes (see resume.Calculation)."""
+    return {
+        'sma': calc.ma('sma', quotes[value], period, MA_Type.sma)
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return ma_lookback(params['period'], MA_Type.sma, tolerance)
@@ -0,0 +1,98 @@
+"""spread_zscore(quotes, other, period=20, value='close', method='ratio', hedge_ratio=1.0)
+
+Z-score of the spread or ratio of two instruments.
+
+Output series: spread, z_score"""
+import numpy as np
+
+from .correlation import pair_values
+from ..resume import Calculation
+from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
+
+# Parameters with series of bars (sliced together with quotes, see resume module)
+SERIES_PARAMS = ('other',)
+
+
+def get_indicator_out(quotes, other, period=20, value='close', method='ratio', hedge_ratio=1.0):
+    """Calculate Z-Score of the spread of two instruments.
+
+    The spread is the ratio of values, the logarithm of the ratio or the
+    difference of values with the hedge ratio. The z-score is the distance of
+    the spread from its rolling mean in rolling standard deviations (as z_score
+    of Bollinger Bands), typical for pair trading entries and exits.
+
+    Args:
+        quotes: Quotes object containing OHLCV data
+        other: Quotes object of the second instrument with the same bars (see ta.align),
+            or an array of values of the same length
+        period: Number of bars in the window (default: 20)
+        value: Price field to use - 'open', 'high', 'low', or 'close' (default: 'close')
+        method: 'ratio' - quotes / other (default), 'log_ratio' - log(quotes / other),
+            'spread' - quotes - hedge_ratio * other
+        hedge_ratio: Multiplier of other for method 'spread' (default: 1.0)
+
+    Returns:
+        IndicatorResult object with attributes:
+            - spread: Spread (ratio) values
+            - z_score: Z-score of the spread (0 if the spread is constant in the window,
+              first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0, value or method is invalid
+        PyTAExceptionBadSeriesData: If lengths or times of quotes and other differ
+        PyTAExceptionDataSeriesNonFound: If the specified value series is not found
+        PyTAExceptionTooLittleData: If data length is less than period
+
+    Example:
+        >>> btc, eth = ta.align([quotes_btc, quotes_eth])
+        >>> z = ta.spread_zscore(eth, btc, period=100, method='log_ratio').z_score
+        >>> entries = np.abs(z) > 2
+    """
+    if period <= 0:
+        raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
+
+    valid_values = ['open', 'high', 'low', 'close']
+    if value not in valid_values:
+        raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
+
+    valid_methods = ['ratio', 'log_ratio', 'spread']
+    if method not in valid_methods:
+        raise PyTAExceptionBadParameterValue(f'method must be one of {valid_methods}, got {method}')
+
+    source_values, _ = pair_values(quotes, other, value)
+
+    data_len = len(source_values)
+    if data_len < period:
+        raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
+
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, other, period, value, method, hedge_ratio))
+
+
+def calculate(calc, quotes, other, period, value, method, hedge_ratio):
+    """Calculate Spread Z-Score series on bars of quotes (see resume.Calculation)."""
+    x, y = pair_values(quotes, other, value)
+
+    np.seterr(divide='ignore', invalid='ignore')
+    if method == 'spread':
+        spread = x - hedge_ratio * y
+    elif method == 'ratio':
+        spread = x / y
+    else:
+        spread = np.log(x / y)
+    spread = spread.astype(np.float64, copy=False)
+
+    mean = calc.mean('mean', spread, period)
+    std = calc.std('std', spread, period)
+    z_score = (spread - mean) / std
+    z_score[std == 0] = 0
+
+    return {
+        'spread': spread,
+        'z_score': z_score
+    }
+
+
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period']
@@ -6,8 +6,9 @@ Output series: oscillator, value_k, value_d"""
 import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
+from ..rolling import calc_max, calc_min
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 
 
@@ -24,13 +25,14 @@ def calc_k(high, low, close, period):
     Returns:
         Array of %K values (0-100, first period-1 elements are NaN)
     """
+    v_high = calc_max(high, period)
+    v_low = calc_min(low, period)
+
     value_k = np.empty(len(close), dtype=np.float64)
     value_k[:period - 1] = np.nan
 
     for i in range(period - 1, len(close)):
-        v_high = high[i - period + 1: i + 1].max()
-        v_low = low[i - period + 1: i + 1].min()
-        value_k[i] = 0 if v_high == v_low else (close[i] - v_low) / (v_high - v_low) * 100
+        value_k[i] = 0 if v_high[i] == v_low[i] else (close[i] - v_low[i]) / (v_high[i] - v_low[i]) * 100
 
     return value_k
 
@@ -75,27 +77,40 @@ def get_indicator_out(quotes, period=5, period_d=3, smooth=3, ma_type='sma'):
         raise PyTAExceptionBadParameterValue(f'smooth must be greater than 0, got {smooth}')
     
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(str(e))
     
-    high = quotes.high
-    low = quotes.low
-    close = quotes.close
-    
-    data_len = len(close)
+    data_len = len(quotes.close)
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
     
-    oscillator = calc_k(high, low, close, period)
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, period_d, smooth, ma_type))
+
+
+def calculate(calc, quotes, period, period_d, smooth, ma_type):
+    """Calculate Stochastic Oscillator series on bars of quotes (see resume.Calculation)."""
+    ma_type_enum = MA_Type.cast(ma_type)
+    
+    oscillator = calc.window(
+        'oscillator', lambda high, low, close: calc_k(high, low, close, period),
+        (quotes.high, quotes.low, quotes.close), period
+    )
     
-    value_k = ma_calculate(oscillator, smooth, ma_type_enum)
+    value_k = calc.ma('value_k', oscillator, smooth, ma_type_enum)
     
-    value_d = ma_calculate(value_k, period_d, ma_type_enum)
+    value_d = calc.ma('value_d', value_k, period_d, ma_type_enum)
     
-    return IndicatorResult({
+    return {
         'oscillator': oscillator,
         'value_k': value_k,
         'value_d': value_d
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    ma_type = MA_Type.cast(params['ma_type'])
+    return params['period'] + ma_lookback(params['smooth'], ma_type, tolerance) + \
+        ma_lookback(params['period_d'], ma_type, tolerance) - 2
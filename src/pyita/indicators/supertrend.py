@@ -6,14 +6,72 @@ Output series: supertrend (price), supertrend_mid (price)"""
 import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
+from ..resume import Calculation, ResumeNotPossible
+from ..events import Events, collect_flips
 from ..move_average import MA_Type
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 from . import atr
 
+# State of the calculation after the last bar (see calc_supertrend)
+SUPERTREND_STATE = ('prev_close', 'upper_band', 'lower_band', 'trend_up')
+
+
+@nb.njit(cache=True, inline='always')
+def init_bands(close, high, low, atr_value, multiplier):
+    """Calculate bands and trend of the first calculated bar from its prices and ATR.
+    
+    Returns:
+        Tuple of (upper_band, lower_band, trend_up)
+    """
+    mid = (high + low) / 2.0
+    return mid + (multiplier * atr_value), mid - (multiplier * atr_value), close >= mid
+
+
+@nb.njit(cache=True)
+def init_supertrend(close, high, low, atr_values, multiplier, period):
+    """Calculate the state of Supertrend before the first calculated bar (period - 1).
+    
+    Returns:
+        Tuple of (prev_close, upper_band, lower_band, trend_up)
+    """
+    start_calculation = period - 1
+
+    upper_band, lower_band, trend_up = init_bands(
+        close[start_calculation], high[start_calculation], low[start_calculation],
+        atr_values[start_calculation], multiplier
+    )
+
+    return close[start_calculation - 1], upper_band, lower_band, trend_up
+
+
+@nb.njit(cache=True, inline='always')
+def supertrend_step(close, high, low, atr_value, multiplier, prev_close, upper_band, lower_band, trend_up):
+    """Calculate Supertrend of a bar from the state after the previous bar.
+    
+    Prices of the bar are passed as numbers (the step is inlined into kernels
+    without passing arrays).
+    
+    Returns:
+        Tuple of (supertrend, mid, upper_band, lower_band, trend_up)
+    """
+    mid = (high + low) / 2.0
+    base_upper = mid + (multiplier * atr_value)
+    base_lower = mid - (multiplier * atr_value)
+
+    if base_upper < upper_band or prev_close > upper_band:
+        upper_band = base_upper
+
+    if base_lower > lower_band or prev_close < lower_band:
+        lower_band = base_lower
+
+    if close <= (lower_band if trend_up else upper_band):
+        return upper_band, mid, upper_band, lower_band, False
+    return lower_band, mid, upper_band, lower_band, True
+
 
 @nb.njit(cache=True)
-def calc_supertrend(close, high, low, atr_values, multiplier, period):
+def calc_supertrend(close, high, low, atr_values, multiplier, start_calculation,
+                    prev_close, upper_band, lower_band, trend_up):
     """Calculate Supertrend values.
     
     Args:
@@ -22,12 +80,12 @@ def calc_supertrend(close, high, low, atr_values, multiplier, period):
         low: Array of low prices
         atr_values: Array of ATR values
         multiplier: Multiplier for ATR
-        period: Period for calculation
+        start_calculation: Index of the first calculated bar (values before it are NaN)
+        prev_close, upper_band, lower_band, trend_up: State before the first calculated bar
         
     Returns:
-        Tuple of (supertrend, supertrend_mid) arrays
+        Tuple of (supertrend, supertrend_mid, prev_close, upper_band, lower_band, trend_up)
     """
-    start_calculation = period - 1
     data_length = len(close)
 
     super_trend = np.empty(data_length, dtype=np.float64)
@@ -35,32 +93,50 @@ def calc_supertrend(close, high, low, atr_values, multiplier, period):
     super_trend[:start_calculation] = np.nan
     super_trand_mid[:start_calculation] = np.nan
 
-    mid = (high[start_calculation] + low[start_calculation]) / 2.0
-    upper_band = mid + (multiplier * atr_values[start_calculation])
-    lower_band = mid - (multiplier * atr_values[start_calculation])
-    trend_up = close[start_calculation] >= mid
-
     for i in range(start_calculation, len(close)):
+        super_trend[i], super_trand_mid[i], upper_band, lower_band, trend_up = supertrend_step(
+            close[i], high[i], low[i], atr_values[i], multiplier, prev_close, upper_band, lower_band, trend_up
+        )
+        prev_close = close[i]
 
-        mid = (high[i] + low[i]) / 2.0
-        super_trand_mid[i] = mid
-        base_upper = mid + (multiplier * atr_values[i])
-        base_lower = mid - (multiplier * atr_values[i])
+    return super_trend, super_trand_mid, prev_close, upper_band, lower_band, trend_up
 
-        if base_upper < upper_band or close[i - 1] > upper_band:
-            upper_band = base_upper
 
-        if base_lower > lower_band or close[i - 1] < lower_band:
-            lower_band = base_lower
+@nb.njit(cache=True)
+def calc_supertrend_flips(close, high, low, atr_values, multiplier, start_calculation,
+                          prev_close, upper_band, lower_band, trend_up, indexes, prices, types, count):
+    """Calculate flips of Supertrend without series of all bars.
+    
+    A flip is a change of the trend, its price is the supertrend value of the
+    bar. The calculation stops at a bar when the outputs are full and continues
+    from it and the returned state (see events.collect_flips).
+    
+    Args:
+        close, high, low, atr_values, multiplier, start_calculation: As in calc_supertrend
+        prev_close, upper_band, lower_band, trend_up: State before the first calculated bar
+        indexes, prices, types: Outputs of bar indexes, supertrend values and trends (1 - up, -1 - down)
+        count: Number of flips in the outputs
+        
+    Returns:
+        Tuple of (count, i_next, prev_close, upper_band, lower_band, trend_up),
+        i_next - the first bar not calculated (len(close) if all bars are calculated)
+    """
+    for i in range(start_calculation, len(close)):
+        if count == len(indexes):
+            return count, i, prev_close, upper_band, lower_band, trend_up
 
-        if close[i] <= (lower_band if trend_up else upper_band):
-            super_trend[i] = upper_band
-            trend_up = False
-        else:
-            super_trend[i] = lower_band
-            trend_up = True
+        was_up = trend_up
+        line, _, upper_band, lower_band, trend_up = supertrend_step(
+            close[i], high[i], low[i], atr_values[i], multiplier, prev_close, upper_band, lower_band, trend_up
+        )
+        prev_close = close[i]
+        if trend_up != was_up:
+            indexes[count] = i
+            prices[count] = line
+            types[count] = 1 if trend_up else -1
+            count += 1
 
-    return super_trend, super_trand_mid
+    return count, len(close), prev_close, upper_band, lower_band, trend_up
 
 
 def get_indicator_out(quotes, period=10, multipler=3, ma_type='mma'):
@@ -89,6 +165,41 @@ def get_indicator_out(quotes, period=10, multipler=3, ma_type='mma'):
         >>> print(supertrend_result.supertrend)
         >>> print(supertrend_result.supertrend_mid)
     """
+    data_len = check_params(quotes, period, multipler, ma_type)
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, multipler, ma_type))
+
+
+def get_events(quotes, period=10, multipler=3, ma_type='mma', dense=False):
+    """Calculate flips of Supertrend as sparse events (see pyita.events).
+    
+    Flips are recorded by calc_supertrend_flips, series of all bars (except
+    ATR) are calculated only if dense is True.
+    
+    Returns:
+        Events object: bars where the trend changes (1 - up, -1 - down), prices are
+        supertrend values at the flips
+    """
+    data_len = check_params(quotes, period, multipler, ma_type)
+    calc = Calculation(data_len)
+    args, start_calculation, state = initial_state(calc, quotes, period, multipler, ma_type)
+    (indexes, prices, types), end_state = collect_flips(
+        calc_supertrend_flips, args, start_calculation, state, data_len
+    )
+    save_state(calc, end_state)
+    
+    result = None
+    if dense:
+        supertrend, supertrend_mid, *_ = calc_supertrend(*args, start_calculation, *state)
+        result = calc.result({
+            'supertrend': supertrend,
+            'supertrend_mid': supertrend_mid
+        })
+    return Events(quotes, indexes, prices, types, result)
+
+
+def check_params(quotes, period, multipler, ma_type):
+    """Validate parameters and return the data length."""
     if period <= 0:
         raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
     
@@ -96,25 +207,55 @@ def get_indicator_out(quotes, period=10, multipler=3, ma_type='mma'):
         raise PyTAExceptionBadParameterValue(f'multipler must be greater than 0, got {multipler}')
     
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(str(e))
     
-    high = quotes.high
-    low = quotes.low
-    close = quotes.close
-    
-    data_len = len(close)
+    data_len = len(quotes.close)
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
+    return data_len
+
+
+def calculate(calc, quotes, period, multipler, ma_type):
+    """Calculate Supertrend series on bars of quotes (see resume.Calculation)."""
+    args, start_calculation, state = initial_state(calc, quotes, period, multipler, ma_type)
     
-    atr_result = atr.get_indicator_out(quotes, smooth=period, ma_type=ma_type)
-    atr_values = atr_result.atr
-    
-    supertrend, supertrend_mid = calc_supertrend(close, high, low, atr_values, multipler, period)
+    supertrend, supertrend_mid, *state = calc_supertrend(*args, start_calculation, *state)
+    save_state(calc, state)
     
-    return IndicatorResult({
+    return {
         'supertrend': supertrend,
         'supertrend_mid': supertrend_mid
-    })
+    }
+
+
+def initial_state(calc, quotes, period, multipler, ma_type):
+    """Arguments of kernels, the first calculated bar and the state before it."""
+    high = quotes.high
+    low = quotes.low
+    close = quotes.close
+    
+    atr_values = atr.calculate(calc.child('atr'), quotes, smooth=period, ma_type=ma_type)['atr']()
+    
+    if calc.resumed:
+        # With period 1 the state of the first bar depends on the last close
+        if period == 1:
+            raise ResumeNotPossible('period')
+        start_calculation = 0
+        state = tuple(calc.load(name) for name in SUPERTREND_STATE)
+    else:
+        start_calculation = period - 1
+        state = init_supertrend(close, high, low, atr_values, multipler, period)
+    return (close, high, low, atr_values, multipler), start_calculation, state
+
+
+def save_state(calc, state):
+    """Save the state after the last bar (see SUPERTREND_STATE)."""
+    for name, value in zip(SUPERTREND_STATE, state):
+        calc.save(name, value)
+
 
+def get_lookback(params, tolerance):
+    """Indicator depends on the whole history, lookback is not limited (see pyita.lookback)."""
+    return None
@@ -3,8 +3,8 @@
 Triple Exponential Moving Average.
 
 Output series: tema (price)"""
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue
 
 
@@ -40,15 +40,25 @@ def get_indicator_out(quotes, period, value='close'):
     if value not in valid_values:
         raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
     
-    source_values = quotes[value]
-    
-    ema1 = ma_calculate(source_values, period, MA_Type.ema)
-    ema2 = ma_calculate(ema1, period, MA_Type.ema0)
-    ema3 = ma_calculate(ema2, period, MA_Type.ema0)
+    calc = Calculation(len(quotes[value]))
+    return calc.result(calculate(calc, quotes, period, value))
+
+
+def calculate(calc, quotes, period, value):
+    """Calculate TEMA series on bars of quotes (see resume.Calculation)."""
+    ema1 = calc.ma('ema1', quotes[value], period, MA_Type.ema)
+    ema2 = calc.ma('ema2', ema1, period, MA_Type.ema0)
+    ema3 = calc.ma('ema3', ema2, period, MA_Type.ema0)
     
     tema = (ema1 * 3) - (ema2 * 3) + ema3
     
-    return IndicatorResult({
+    return {
         'tema': tema
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    # Second and third averages start from the first value of the previous one
+    return ma_lookback(params['period'], MA_Type.ema, tolerance) + \
+        2 * (ma_lookback(params['period'], MA_Type.ema0, tolerance) - 1)
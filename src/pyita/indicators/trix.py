@@ -5,8 +5,8 @@ Triple Exponential Average Oscillator.
 Output series: trix"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue
 
 
@@ -44,16 +44,27 @@ def get_indicator_out(quotes, period, value='close'):
     if value not in valid_values:
         raise PyTAExceptionBadParameterValue(f'value must be one of {valid_values}, got {value}')
     
-    source_values = quotes[value]
-    
-    ema1 = ma_calculate(source_values, period, MA_Type.ema)
-    ema2 = ma_calculate(ema1, period, MA_Type.ema0)
-    ema3 = ma_calculate(ema2, period, MA_Type.ema0)
+    calc = Calculation(len(quotes[value]))
+    return calc.result(calculate(calc, quotes, period, value))
+
+
+def calculate(calc, quotes, period, value):
+    """Calculate TRIX series on bars of quotes (see resume.Calculation)."""
+    ema1 = calc.ma('ema1', quotes[value], period, MA_Type.ema)
+    ema2 = calc.ma('ema2', ema1, period, MA_Type.ema0)
+    ema3 = calc.ma('ema3', ema2, period, MA_Type.ema0)
     
     np.seterr(divide='ignore', invalid='ignore')
-    trix = np.diff(ema3) / ema3[:-1] * 100
+    prev_ema3 = calc.previous('ema3', ema3)
+    trix = (ema3 - prev_ema3) / prev_ema3 * 100
     
-    return IndicatorResult({
-        'trix': np.hstack([np.nan, trix])
-    })
+    return {
+        'trix': trix
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    # Second and third averages start from the first value of the previous one, plus one bar of difference
+    return ma_lookback(params['period'], MA_Type.ema, tolerance) + \
+        2 * (ma_lookback(params['period'], MA_Type.ema0, tolerance) - 1) + 1
@@ -5,8 +5,8 @@ Volume oscillator.
 Output series: osc"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
-from ..move_average import ma_calculate, MA_Type
+from ..move_average import MA_Type, ma_lookback
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData, PyTAExceptionDataSeriesNonFound
 
 
@@ -46,7 +46,7 @@ def get_indicator_out(quotes, period_short=5, period_long=10, ma_type='ema'):
         raise PyTAExceptionBadParameterValue(f'period_long ({period_long}) must be greater than period_short ({period_short})')
     
     try:
-        ma_type_enum = MA_Type.cast(ma_type)
+        MA_Type.cast(ma_type)
     except ValueError as e:
         raise PyTAExceptionBadParameterValue(str(e))
     
@@ -58,13 +58,28 @@ def get_indicator_out(quotes, period_short=5, period_long=10, ma_type='ema'):
     if data_len < period_long:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period_long}')
     
-    vol_short = ma_calculate(volume, period_short, ma_type_enum)
-    vol_long = ma_calculate(volume, period_long, ma_type_enum)
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period_short, period_long, ma_type))
+
+
+def calculate(calc, quotes, period_short, period_long, ma_type):
+    """Calculate Volume Oscillator series on bars of quotes (see resume.Calculation)."""
+    volume = quotes['volume']
+    ma_type_enum = MA_Type.cast(ma_type)
+    
+    vol_short = calc.ma('short', volume, period_short, ma_type_enum)
+    vol_long = calc.ma('long', volume, period_long, ma_type_enum)
     
     np.seterr(divide='ignore', invalid='ignore')
     osc = (vol_short - vol_long) / vol_long * 100
     
-    return IndicatorResult({
+    return {
         'osc': osc
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    ma_type = MA_Type.cast(params['ma_type'])
+    return max(ma_lookback(params['period_short'], ma_type, tolerance),
+               ma_lookback(params['period_long'], ma_type, tolerance))
@@ -5,7 +5,7 @@ Volume Weighted Average Price.
 Output series: vwap (price)"""
 import numpy as np
 
-from ..indicator_result import IndicatorResult
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionDataSeriesNonFound, PyTAExceptionTooLittleData
 
 
@@ -32,29 +32,36 @@ def get_indicator_out(quotes):
         >>> vwap_result = vwap(quotes)
         >>> print(vwap_result.vwap)
     """
-    # Get OHLCV data from quotes
-    high = quotes.high
-    low = quotes.low
-    close = quotes.close
-    
     # Check if volume is present
-    volume = quotes['volume']
+    quotes['volume']
     
     # Check minimum data requirement (at least 1 bar)
-    data_len = len(close)
+    data_len = len(quotes.close)
     if data_len < 1:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < 1')
     
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes))
+
+
+def calculate(calc, quotes):
+    """Calculate VWAP series on bars of quotes (see resume.Calculation)."""
+    volume = quotes['volume']
+    
     # Calculate typical price
-    typical_price = (high + low + close) / 3
+    typical_price = (quotes.high + quotes.low + quotes.close) / 3
     
     # Calculate VWAP
     np.seterr(divide='ignore', invalid='ignore')
     typical_price_volume = typical_price * volume
-    volume_sum = np.cumsum(volume)
-    vwap = np.cumsum(typical_price_volume) / volume_sum
+    volume_sum = calc.cumsum('volume', volume)
+    vwap = calc.cumsum('typical_price_volume', typical_price_volume) / volume_sum
     
-    return IndicatorResult({
+    return {
         'vwap': vwap
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Indicator depends on the whole history, lookback is not limited (see pyita.lookback)."""
+    return None
@@ -4,40 +4,11 @@ Volume Weighted Moving Average.
 
 Output series: vwma (price)"""
 import numpy as np
-import numba as nb
 
-from ..indicator_result import IndicatorResult
+from ..resume import Calculation
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData, PyTAExceptionDataSeriesNonFound
 
 
-@nb.njit(cache=True)
-def vwma_calculate(values, volume, period):
-    """Calculate Volume Weighted Moving Average.
-    
-    Args:
-        values: Array of price values
-        volume: Array of volume values
-        period: Period for VWMA calculation
-        
-    Returns:
-        Array of VWMA values (first period-1 elements are NaN)
-    """
-    vwma = np.empty(len(values), dtype=np.float64)
-    vwma[: period - 1] = np.nan
-
-    volume_sum = volume[: period].sum()
-    vwsum = (values[: period] * volume[: period]).sum()
-    vwma[period - 1] = vwsum / volume_sum
-    for i in range(period, len(values)):
-        vwsum -= values[i - period] * volume[i - period]
-        vwsum += values[i] * volume[i]
-        volume_sum -= volume[i - period]
-        volume_sum += volume[i]
-        vwma[i] = vwsum / volume_sum
-
-    return vwma
-
-
 def get_indicator_out(quotes, period, value='close'):
     """Calculate Volume Weighted Moving Average (VWMA).
     
@@ -73,17 +44,30 @@ def get_indicator_out(quotes, period, value='close'):
     source_values = quotes[value]
     
     # Check if volume is present
-    volume = quotes['volume']
+    quotes['volume']
     
     # Check minimum data requirement
     data_len = len(source_values)
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
     
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period, value))
+
+
+def calculate(calc, quotes, period, value):
+    """Calculate VWMA series on bars of quotes (see resume.Calculation)."""
+    source_values = quotes[value]
+    volume = quotes['volume']
+    
     np.seterr(divide='ignore', invalid='ignore')
-    vwma = vwma_calculate(source_values, volume, period)
+    vwma = calc.sum('value_volume', source_values * volume, period) / calc.sum('volume', volume, period)
     
-    return IndicatorResult({
+    return {
         'vwma': vwma
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period']
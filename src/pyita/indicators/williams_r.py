@@ -6,7 +6,8 @@ Output series: williams_r"""
 import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
+from ..resume import Calculation
+from ..rolling import calc_max, calc_min
 from ..exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
 
 
@@ -25,13 +26,14 @@ def calc_williams(high, low, close, period):
     """
     n_bars = len(high)
 
+    high_max = calc_max(high, period)
+    low_min = calc_min(low, period)
+
     williams_r = np.empty(n_bars, dtype=float)
 
     williams_r[: period - 1] = np.nan
     for t in range(period - 1, n_bars):
-        high_max = high[t - period + 1: t + 1].max()
-        low_min = low[t - period + 1: t + 1].min()
-        williams_r[t] = 0 if high_max == low_min else (close[t] - high_max) / (high_max - low_min) * 100
+        williams_r[t] = 0 if high_max[t] == low_min[t] else (close[t] - high_max[t]) / (high_max[t] - low_min[t]) * 100
 
     return williams_r
 
@@ -63,17 +65,26 @@ def get_indicator_out(quotes, period=14):
     if period <= 0:
         raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
     
-    high = quotes.high
-    low = quotes.low
-    close = quotes.close
-    
-    data_len = len(close)
+    data_len = len(quotes.close)
     if data_len < period:
         raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
     
-    williams_r = calc_williams(high, low, close, period)
+    calc = Calculation(data_len)
+    return calc.result(calculate(calc, quotes, period))
+
+
+def calculate(calc, quotes, period):
+    """Calculate Williams %R series on bars of quotes (see resume.Calculation)."""
+    williams_r = calc.window(
+        'williams_r', lambda high, low, close: calc_williams(high, low, close, period),
+        (quotes.high, quotes.low, quotes.close), period
+    )
     
-    return IndicatorResult({
+    return {
         'williams_r': williams_r
-    })
+    }
+
 
+def get_lookback(params, tolerance):
+    """Number of bars needed for the last value (see pyita.lookback)."""
+    return params['period']
@@ -6,7 +6,8 @@ Output series: pivots (price), pivot_types"""
 import numpy as np
 import numba as nb
 
-from ..indicator_result import IndicatorResult
+from ..resume import Calculation, ResumeNotPossible
+from ..events import Events, calc_events
 from ..exceptions import PyTAExceptionBadParameterValue
 from ..constants import PRICE_TYPE
 
@@ -78,9 +79,12 @@ def find_down_corner(i_point, high, low, delta, depth):
 
 
 @nb.njit(cache=True)
-def calc_pivots(direction, high, low, delta, pivots, pivot_types, depth, checking):
+def calc_pivots(direction, high, low, delta, pivots, pivot_types, depth, checking, i_point=0):
     """Calculate zigzag pivots.
     
+    A pivot is final if it was found with complete search windows (of depth bars),
+    so it does not change when bars are appended.
+    
     Args:
         direction: Initial direction (1 for up, -1 for down)
         high: Array of high prices
@@ -90,13 +94,21 @@ def calc_pivots(direction, high, low, delta, pivots, pivot_types, depth, checkin
         pivot_types: Output array for pivot types (modified in place)
         depth: Minimum distance between pivots
         checking: If True, return index of first valid pivot
+        i_point: Index to start the search from
         
     Returns:
-        Index of first valid pivot if checking=True, None otherwise
+        Tuple of (i_valid, valid_final, i_next, next_direction, i_final_pivot):
+            i_valid - index of first valid pivot if checking=True (-1 if not found),
+            valid_final - True if i_valid was found with complete search windows,
+            i_next, next_direction - start of the search after the last final pivot,
+            i_final_pivot - index of the last final pivot (-1 if not found)
     """
     n_bars = len(high)
 
-    i_point = 0
+    i_next = i_point
+    next_direction = direction
+    i_final_pivot = -1
+    is_final = True
     while i_point < n_bars:
 
         if direction > 0:
@@ -105,13 +117,15 @@ def calc_pivots(direction, high, low, delta, pivots, pivot_types, depth, checkin
             if i_point >= n_bars:
                 break
 
+            is_final = is_final and i_point + depth <= n_bars
             if checking and pivot_types[i_up_corner] == 1:
-                return i_up_corner
+                return i_up_corner, is_final, i_next, next_direction, i_final_pivot
 
             pivot_types[i_up_corner] = 1
             up_corner = high[i_up_corner]
             pivots[i_up_corner] = up_corner
             direction = -1
+            i_corner = i_up_corner
 
         else:
 
@@ -119,15 +133,22 @@ def calc_pivots(direction, high, low, delta, pivots, pivot_types, depth, checkin
             if i_point >= n_bars:
                 break
 
+            is_final = is_final and i_point + depth <= n_bars
             if checking and pivot_types[i_down_corner] == -1:
-                return i_down_corner
+                return i_down_corner, is_final, i_next, next_direction, i_final_pivot
 
             pivot_types[i_down_corner] = -1
             down_corner = low[i_down_corner]
             pivots[i_down_corner] = down_corner
             direction = 1
+            i_corner = i_down_corner
 
-    return None
+        if is_final:
+            i_next = i_point
+            next_direction = direction
+            i_final_pivot = i_corner
+
+    return -1, False, i_next, next_direction, i_final_pivot
 
 
 @nb.njit(cache=True)
@@ -224,6 +245,29 @@ def get_indicator_out(quotes, delta=0.02, depth=1, type='high_low', end_points=F
         >>> print(zigzag_result.pivots)
         >>> print(zigzag_result.pivot_types)
     """
+    check_params(delta, depth, type)
+    calc = Calculation(len(quotes.close))
+    return calc.result(calculate(calc, quotes, delta, depth, type, end_points))
+
+
+def get_events(quotes, delta=0.02, depth=1, type='high_low', end_points=False, dense=False):
+    """Calculate Zig-Zag pivots as sparse events (see pyita.events).
+    
+    The pivot search revises marks of bars, so pivots are collected from them
+    by a compiled pass, and the dense series are kept only if dense is True.
+    
+    Returns:
+        Events object: pivots with prices and types (1 - high, -1 - low)
+    """
+    check_params(delta, depth, type)
+    calc = Calculation(len(quotes.close))
+    series = calculate(calc, quotes, delta, depth, type, end_points)
+    indexes, prices, types = calc_events(series['pivot_types'], series['pivots'])
+    return Events(quotes, indexes, prices, types, calc.result(series) if dense else None)
+
+
+def check_params(delta, depth, type):
+    """Validate parameters."""
     if delta <= 0:
         raise PyTAExceptionBadParameterValue(f'delta must be greater than 0, got {delta}')
     
@@ -233,42 +277,93 @@ def get_indicator_out(quotes, delta=0.02, depth=1, type='high_low', end_points=F
     valid_types = {'high_low', 'open', 'high', 'low', 'close'}
     if type not in valid_types:
         raise PyTAExceptionBadParameterValue(f'type must be one of {valid_types}, got {type}')
+
+
+def calculate(calc, quotes, delta, depth, type, end_points):
+    """Calculate Zig-Zag series on bars of quotes (see resume.Calculation).
     
+    The state is kept from the last final pivot: when bars are appended, the
+    search continues after it and pivots after it are revised.
+    """
     close = quotes.close
 
     if type == 'high_low':
         high, low = quotes.high, quotes.low
-    elif type in {'open', 'high', 'low', 'close'}:
+    else:
         high = low = quotes[type]
+
+    if calc.resumed:
+        # Segment of bars from the last final pivot
+        if not calc.load('valid_final'):
+            raise ResumeNotPossible('valid_final')
+        i_segment = calc.load('i_segment')
+        high = np.concatenate((calc.load('segment.high'), high))
+        low = np.concatenate((calc.load('segment.low'), low))
+        close = np.concatenate((calc.load('segment.close'), close))
+        direction = calc.load('next_direction')
+        i_point = calc.load('i_next') - i_segment
     else:
-        raise PyTAExceptionBadParameterValue(f'type = {type}')
+        i_segment = 0
+        direction = -1
+        i_point = 0
 
     n_bars = len(close)
     pivots = np.ndarray(n_bars, dtype=PRICE_TYPE)
     pivot_types = np.zeros(n_bars, dtype=np.int8)
     pivots[:] = np.nan
 
-    calc_pivots(-1, high, low, delta, pivots, pivot_types, depth, False)
-    i_valid = calc_pivots(1, high, low, delta, pivots, pivot_types, depth, True)
-
-    if not end_points and i_valid is not None:
-        if pivot_types[i_valid] > 0:
-            prev_min = low[: i_valid].min()
-            if (pivots[i_valid] - prev_min) / prev_min < delta:
-                i_valid += 1
-        else:
-            prev_max = high[: i_valid].max()
-            if (prev_max - pivots[i_valid]) / prev_max < delta:
-                i_valid += 1
-
-        pivots[: i_valid] = np.nan
-        pivot_types[: i_valid] = 0
+    if calc.resumed:
+        pivots[0] = calc.load('pivot')
+        pivot_types[0] = calc.load('pivot_type')
+
+    _, _, i_next, next_direction, i_pivot = calc_pivots(
+        direction, high, low, delta, pivots, pivot_types, depth, False, i_point
+    )
+    if calc.resumed and i_pivot < 0:
+        i_pivot = 0
+
+    valid_final = i_pivot >= 0
+    if valid_final:
+        calc.save('i_segment', i_segment + i_pivot)
+        calc.save('segment.high', high[i_pivot:].copy())
+        calc.save('segment.low', low[i_pivot:].copy())
+        calc.save('segment.close', close[i_pivot:].copy())
+        calc.save('pivot', pivots[i_pivot])
+        calc.save('pivot_type', pivot_types[i_pivot])
+        calc.save('i_next', i_segment + i_next)
+        calc.save('next_direction', next_direction)
+
+    if not calc.resumed:
+        i_valid, is_final, _, _, _ = calc_pivots(1, high, low, delta, pivots, pivot_types, depth, True)
+        # Pivots before the first valid pivot are final if it is one of final pivots
+        valid_final = valid_final and is_final and 0 <= i_valid <= i_pivot
+
+        if not end_points and i_valid >= 0:
+            if pivot_types[i_valid] > 0:
+                prev_min = low[: i_valid].min()
+                if (pivots[i_valid] - prev_min) / prev_min < delta:
+                    i_valid += 1
+            else:
+                prev_max = high[: i_valid].max()
+                if (prev_max - pivots[i_valid]) / prev_max < delta:
+                    i_valid += 1
+
+            pivots[: i_valid] = np.nan
+            pivot_types[: i_valid] = 0
+
+    calc.save('valid_final', valid_final)
 
     if end_points:
         add_last_point(pivot_types, pivots, high, low, close, delta, depth)
 
-    return IndicatorResult({
-        'pivots': pivots,
-        'pivot_types': pivot_types
-    })
+    # The first bar of the segment is the last final pivot of the previous calculation
+    n_skip = 1 if calc.resumed else 0
+    return {
+        'pivots': pivots[n_skip:],
+        'pivot_types': pivot_types[n_skip:]
+    }
 
+
+def get_lookback(params, tolerance):
+    """Indicator depends on the whole history, lookback is not limited (see pyita.lookback)."""
+    return None
@@ -0,0 +1,149 @@
+"""Lookback of indicators and calculation of last values only.
+
+Each indicator module may define get_lookback(params, tolerance) returning the
+number of bars needed for the last value of the indicator: exact for window
+indicators, within tolerance for indicators based on exponential averages.
+Indicators depending on the whole history (cumulative sums, trailing states)
+return None.
+
+Example:
+    >>> ta.lookback('macd', period_short=12, period_long=26, period_signal=9)
+    >>> last = ta.ema(quotes, period=20, tail=5)
+"""
+import functools
+import importlib
+import inspect
+
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionIndicatorNotFound
+from .resume import calculate_resumed, state_params, slice_series_params
+
+LOOKBACK_TOLERANCE = 1e-6
+NOT_INDICATOR_PARAMS = ('quotes', 'outputs')
+
+
+def import_indicator(name):
+
+    try:
+        return importlib.import_module(f'.indicators.{name}', __package__)
+    except ImportError as e:
+        raise PyTAExceptionIndicatorNotFound(name) from e
+
+
+def bind_params(signature, args, kwargs):
+    """Return dictionary of all indicator parameters with defaults applied.
+
+    Args:
+        signature: inspect.Signature of get_indicator_out of the indicator
+        args, kwargs: Arguments of the indicator call after quotes
+    """
+    try:
+        bound = signature.bind(None, *args, **kwargs)
+    except TypeError as e:
+        raise PyTAExceptionBadParameterValue(str(e)) from e
+
+    bound.apply_defaults()
+    return {name: value for name, value in bound.arguments.items() if name not in NOT_INDICATOR_PARAMS}
+
+
+def module_lookback(module, params, tolerance):
+
+    get_lookback = getattr(module, 'get_lookback', None)
+    if get_lookback is None:
+        return None
+
+    try:
+        return get_lookback(params, tolerance)
+    except ValueError as e:
+        raise PyTAExceptionBadParameterValue(str(e)) from e
+
+
+def lookback(name, tolerance=LOOKBACK_TOLERANCE, **params):
+    """Number of bars needed to calculate the last value of an indicator.
+
+    For window indicators the last value calculated on lookback bars is equal to
+    the value calculated on the whole history. For indicators based on exponential
+    averages (ema, mma and cascades of them like macd, tema, trix, adx) the weight
+    of bars before the lookback is not greater than tolerance.
+
+    Args:
+        name: Name of the indicator (e.g., 'sma', 'macd')
+        tolerance: Allowed weight of history before the lookback for exponential
+            averages (default: 1e-6)
+        **params: Parameters of the indicator
+
+    Returns:
+        Number of bars, or None if the indicator depends on the whole history
+        (obv, adl, vwap, zigzag, parabolic_sar, supertrend)
+
+    Raises:
+        PyTAExceptionIndicatorNotFound: If the indicator is not found
+        PyTAExceptionBadParameterValue: If parameters are invalid
+
+    Example:
+        >>> n_bars = ta.lookback('ema', period=20, tolerance=1e-8)
+        >>> ema = ta.ema(quotes[-n_bars:], period=20).ema[-1]
+    """
+    module = import_indicator(name)
+    # Series parameters (e.g. other quotes of pair indicators) are not needed for lookback
+    series_params = {param: None for param in getattr(module, 'SERIES_PARAMS', ())}
+    signature = inspect.signature(module.get_indicator_out)
+    return module_lookback(module, bind_params(signature, (), {**series_params, **params}), tolerance)
+
+
+def calculate_tail(module, signature, quotes, args, kwargs, tail):
+    """Calculate last tail values of the indicator on the lookback part of quotes."""
+    if not isinstance(tail, int) or tail <= 0:
+        raise PyTAExceptionBadParameterValue(f'tail must be a positive integer, got {tail}')
+
+    func = module.get_indicator_out
+    n_bars = module_lookback(module, bind_params(signature, args, kwargs), LOOKBACK_TOLERANCE)
+    if n_bars is None:
+        return func(quotes, *args, **kwargs)[-tail:]
+
+    last_bars = slice(-(n_bars + tail - 1), None)
+    if getattr(module, 'SERIES_PARAMS', ()):
+        # Series parameters are sliced together with quotes
+        bound = signature.bind(quotes, *args, **kwargs)
+        bound.arguments.update(slice_series_params(module, dict(bound.arguments), last_bars))
+        args, kwargs = bound.args[1:], bound.kwargs
+    return func(quotes[last_bars], *args, **kwargs)[-tail:]
+
+
+def wrap_indicator(module):
+    """Wrap get_indicator_out of the module with the tail and resume_from options.
+
+    With tail=k the indicator is calculated on the last lookback + k - 1 bars
+    only, and the last k values are returned. With resume_from=result the
+    calculation continues from the state of the result over the bars appended
+    to quotes after it (see resume module).
+
+    Parameters of the call are saved in the state of the result for resume_from
+    and streams, they are bound from the arguments only when used (binding
+    costs more than calculation of short series).
+    """
+    func = module.get_indicator_out
+    signature = inspect.signature(func)
+    series_params = getattr(module, 'SERIES_PARAMS', ())
+
+    @functools.wraps(func)
+    def indicator(quotes, *args, tail=None, resume_from=None, **kwargs):
+        if resume_from is not None:
+            if tail is not None:
+                raise PyTAExceptionBadParameterValue('tail and resume_from cannot be used together')
+            return calculate_resumed(module, quotes, args, kwargs, bind_params(signature, args, kwargs), resume_from)
+
+        if tail is not None:
+            return calculate_tail(module, signature, quotes, args, kwargs, tail)
+
+        result = func(quotes, *args, **kwargs)
+        state = result._state
+        if state is not None:
+            state.indicator = module
+            if series_params:
+                # Series parameters are not kept alive by the state
+                state.params = state_params(module, bind_params(signature, args, kwargs))
+            else:
+                state.bind_later(lambda: bind_params(signature, args, kwargs))
+        return result
+
+    return indicator
@@ -1,7 +1,10 @@
+import math
+
 import numpy as np
 from numba import njit
 from enum import Enum
-from .exceptions import PyTAExceptionTooLittleData
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
+from .rolling import calc_mean
 
 
 class MA_Type(Enum):
@@ -72,33 +75,17 @@ def ema_calculate(source_values, alpha, first_value=np.nan, start=0):
     return result
 
 
-def sma_calculate(source_values, period):
-
-    if period == 1:
-        return source_values
-
-    data_len = len(source_values)
-    if data_len < period:
-        raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
-
-    weights = np.ones(period, dtype=source_values.dtype) / period
-
-    out = np.convolve(source_values, weights)[:-period+1]
-    out[:period - 1] = np.nan
-
-    return out
-
-
-def iema_calculate(source_values, period, alpha):
+@njit(cache=True)
+def ema_continue(source_values, alpha, ema_value):
 
-    start = get_first_index_not_nan(source_values)
+    alpha_n = 1.0 - alpha
 
-    data_len = len(source_values)
-    if data_len < start + period:
-        raise PyTAExceptionTooLittleData(f'data length {data_len} < {start + period}')
+    result = np.empty(len(source_values), dtype=float)
+    for i in range(len(source_values)):
+        ema_value = source_values[i] * alpha + ema_value * alpha_n
+        result[i] = ema_value
 
-    first_value = source_values[start: start + period].sum() / period
-    return ema_calculate(source_values, alpha, first_value, start + period - 1)
+    return result
 
 
 @njit(cache=True)
@@ -113,46 +100,106 @@ def ema_warmup_init(source_values, period, start):
     return init_ema
 
 
-def ema_warmup_calculate(source_values, period, alpha):
+def ma_alpha(period, ma_type):
 
-    start = get_first_index_not_nan(source_values)
-    if start >= len(source_values):
-        result = np.empty_like(source_values)
-        result[:] = np.nan
-        return result
+    if ma_type in (MA_Type.ema, MA_Type.ema0, MA_Type.ema_warmup):
+        return 2.0 / (period + 1)
+    return 1.0 / period
+
+
+def ma_calculate(source_values, period, ma_type):
+
+    if ma_type == MA_Type.sma:
+        if period == 1:
+            return source_values
+        min_length = period
+    elif ma_type in (MA_Type.ema0, MA_Type.mma0):
+        min_length = 0
+    elif ma_type in (MA_Type.ema, MA_Type.mma, MA_Type.ema_warmup, MA_Type.mma_warmup):
+        # Averages initialized with period values after leading NaN values (warm-up averages of NaN only are NaN)
+        start = get_first_index_not_nan(source_values)
+        min_length = 0 if ma_type in (MA_Type.ema_warmup, MA_Type.mma_warmup) and start == len(source_values) \
+            else start + period
+    else:
+        raise ValueError(f'Bad ma_type value: {ma_type}')
 
     data_len = len(source_values)
-    if data_len < start + period:
-        raise PyTAExceptionTooLittleData(f'data length {data_len} < {start + period}')
+    if data_len < min_length:
+        raise PyTAExceptionTooLittleData(f'data length {data_len} < {min_length}')
 
-    prev_ema = ema_warmup_init(source_values, period, start)
+    return ma_calculate_code(source_values.astype(np.float64, copy=False), period, ma_type.value)
 
-    result = ema_calculate(source_values, alpha, prev_ema, start + period - 1)
 
-    return result
+@njit(cache=True)
+def ma_calculate_code(source_values, period, ma_code):
+    """Moving average of the type with code ma_code (value of MA_Type).
+
+    The implementation of ma_calculate, also called by compiled code (e.g.
+    kernels of ragged series): too short data gives NaN instead of an exception.
+
+    Args:
+        source_values: Array of values
+        period: Period of moving average
+        ma_code: Value of MA_Type
+
+    Returns:
+        Array of moving average values
+    """
+    n = len(source_values)
+    if ma_code == MA_Type.sma.value:
+        if period == 1:
+            return source_values.copy()
+        if n >= period:
+            return calc_mean(source_values, period)
+        return np.full(n, np.nan)
+
+    is_ema = ma_code in (MA_Type.ema.value, MA_Type.ema0.value, MA_Type.ema_warmup.value)
+    alpha = 2.0 / (period + 1) if is_ema else 1.0 / period
+    if ma_code in (MA_Type.ema0.value, MA_Type.mma0.value):
+        if n == 0:
+            return np.empty(0, dtype=np.float64)
+        return ema_calculate(source_values, alpha)
 
+    start = get_first_index_not_nan(source_values)
+    if n < start + period:
+        return np.full(n, np.nan)
+    if ma_code in (MA_Type.ema.value, MA_Type.mma.value):
+        first_value = source_values[start: start + period].sum() / period
+    else:
+        first_value = ema_warmup_init(source_values, period, start)
+    return ema_calculate(source_values, alpha, first_value, start + period - 1)
 
-def ma_calculate(source_values, period, ma_type):
+
+def ma_lookback(period, ma_type, tolerance):
+    """Number of bars for the last moving average value.
+    
+    SMA is exact on period bars. Exponential averages depend on the whole history,
+    the weight of bars before the lookback is (1 - alpha) ** k, so k is chosen to
+    make it not greater than tolerance.
+    
+    Args:
+        period: Period of moving average
+        ma_type: MA_Type enum
+        tolerance: Allowed weight of history before the lookback, 0 < tolerance < 1
+        
+    Returns:
+        Number of bars
+        
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0 or tolerance is out of range
+    """
+    if period <= 0:
+        raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
+    if not 0 < tolerance < 1:
+        raise PyTAExceptionBadParameterValue(f'tolerance must be between 0 and 1, got {tolerance}')
 
     if ma_type == MA_Type.sma:
-        return sma_calculate(source_values, period)
-    if ma_type == MA_Type.ema0:
-        alpha = 2.0 / (period + 1)
-        return ema_calculate(source_values, alpha)
-    if ma_type == MA_Type.mma0:
-        alpha = 1.0 / period
-        return ema_calculate(source_values, alpha)
-    if ma_type == MA_Type.ema:
-        alpha = 2.0 / (period + 1)
-        return iema_calculate(source_values, period, alpha)
-    if ma_type == MA_Type.mma:
-        alpha = 1.0 / period
-        return iema_calculate(source_values, period, alpha)
-    if ma_type == MA_Type.ema_warmup:
-        alpha = 2.0 / (period + 1)
-        return ema_warmup_calculate(source_values, period, alpha)
-    if ma_type == MA_Type.mma_warmup:
-        alpha = 1.0 / period
-        return ema_warmup_calculate(source_values, period, alpha)
-
-    raise ValueError(f'Bad ma_type value: {ma_type}')
+        return period
+
+    alpha = ma_alpha(period, ma_type)
+    n_converge = 0 if alpha >= 1 else math.ceil(math.log(tolerance) / math.log(1.0 - alpha))
+
+    # ema0 and mma0 start from the first element, others from the average of period elements
+    if ma_type in (MA_Type.ema0, MA_Type.mma0):
+        return 1 + n_converge
+    return period + n_converge
@@ -0,0 +1,580 @@
+"""Streaming indicators for many symbols with struct-of-arrays state.
+
+The state of N symbols is kept in one contiguous matrix (a row of state
+values per symbol), and update() advances all symbols by one bar in one compiled call.
+Symbols without a new bar are excluded with a boolean mask: their state and
+values are not changed.
+
+Indicators start from empty state and give the same values as indicator
+functions calculated on all bars of each symbol (within floating point
+rounding of the warm-up averages): NaN during warm-up, leading NaN values are
+skipped by exponential averages.
+
+Example:
+    >>> from pyita import multi_stream
+    >>> ema = multi_stream.EMAState(n_symbols=500, period=20)
+    >>> values = ema.update(close_vector)['ema']
+    >>> values = ema.update(close_vector, mask=has_new_bar)['ema']
+"""
+import numpy as np
+import numba as nb
+
+from .move_average import MA_Type, ma_alpha
+from .rolling import sum_step, var_add, window_moments
+from .indicators.atr import true_range
+from .indicators.bollinger_bands import z_score
+from .indicators.supertrend import init_bands, supertrend_step
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+
+@nb.njit(cache=True, inline='always')
+def divide(a, b):
+    """Division with numpy semantics for zero divisor (inf or NaN)."""
+    if b == 0.0:
+        if np.isnan(a) or a == 0.0:
+            return np.nan
+        return np.inf if (a > 0.0) == (not np.signbit(b)) else -np.inf
+    return a / b
+
+
+@nb.njit(cache=True, inline='always')
+def ma_update(value, i, state, ma):
+    """Add value to the moving average of symbol i and return the average.
+
+    The state of the average is in columns of state starting from the offset:
+    count of added values (exponential averages: after leading NaN values),
+    average (during warm-up: sum or warm-up average; sma: window sum), number
+    of NaN values in the window and the last period values (sma only).
+
+    Args:
+        value: New value
+        i: Index of the symbol
+        state: State matrix (symbols x columns)
+        ma: Tuple of (ma_code, period, alpha, offset), see SymbolsState._ma
+    """
+    ma_code, period, alpha, offset = ma
+    n = int(state[i, offset])
+    state[i, offset] = n + 1
+
+    if ma_code == MA_Type.sma.value:
+        if period == 1:
+            return value
+        # The window is read only when the sum is recalculated (n + 1 is a multiple of period),
+        # then the values are in the order of slots
+        slot = offset + 3 + n % period
+        old_value = state[i, slot]
+        state[i, slot] = value
+        ready, state[i, offset + 1], state[i, offset + 2] = sum_step(
+            state[i], slot, old_value, n, period, state[i, offset + 1], state[i, offset + 2]
+        )
+        return state[i, offset + 1] / period if ready else np.nan
+
+    # Exponential averages start from the first value that is not NaN
+    if n == 0 and np.isnan(value):
+        state[i, offset] = 0
+        return np.nan
+
+    no_warmup = ma_code == MA_Type.ema0.value or ma_code == MA_Type.mma0.value
+    if n == 0:
+        ma_value = value
+    elif no_warmup or n >= period:
+        ma_value = value * alpha + state[i, offset + 1] * (1.0 - alpha)
+    elif ma_code == MA_Type.ema.value or ma_code == MA_Type.mma.value:
+        # Initialization with the average of the first period values
+        ma_value = state[i, offset + 1] + value
+        if n == period - 1:
+            ma_value /= period
+    else:  # ema_warmup, mma_warmup: dynamic alpha
+        k = 1.0 / (n + 1)
+        ma_value = value * k + state[i, offset + 1] * (1.0 - k)
+    state[i, offset + 1] = ma_value
+
+    if n < period - 1 and not no_warmup:
+        return np.nan
+    return ma_value
+
+
+@nb.njit(cache=True, inline='always')
+def var_update(value, i, state, var):
+    """Add value to the rolling variance of symbol i and return the variance (see rolling.calc_var_state).
+
+    The state is in columns of state starting from the offset: index, count,
+    mean, m2, number of NaN values, length of the run of equal values and the
+    last period values.
+
+    Args:
+        value: New value
+        i: Index of the symbol
+        state: State matrix (symbols x columns)
+        var: Tuple of (period, offset), see SymbolsState._var
+    """
+    period, offset = var
+    n = int(state[i, offset])
+    window = offset + 6
+    slot = window + n % period
+    prev_value = state[i, window + (n - 1) % period]
+    old_value = state[i, slot]
+    state[i, slot] = value
+    state[i, offset] = n + 1
+
+    n_equal = state[i, offset + 5] + 1 if n > 0 and value == prev_value else 1
+    count, mean, m2, n_nans = var_add(value, old_value, n >= period,
+                                      state[i, offset + 1], state[i, offset + 2], state[i, offset + 3], state[i, offset + 4])
+
+    result = np.nan
+    if n >= period - 1 and n_nans == 0:
+        if n_equal >= period:
+            count = period
+            mean = value
+            m2 = 0.0
+        elif (n + 1) % period == 0:
+            # The last slot is the last value, the window is in the order of slots
+            mean, m2 = window_moments(state[i], window + period - 1, period)
+        result = (m2 if m2 > 0.0 else 0.0) / period
+
+    state[i, offset + 1] = count
+    state[i, offset + 2] = mean
+    state[i, offset + 3] = m2
+    state[i, offset + 4] = n_nans
+    state[i, offset + 5] = n_equal
+    return result
+
+
+@nb.njit(cache=True, inline='always')
+def atr_update(i, high, low, close, state, ma):
+    """Add bar to the ATR of symbol i, return (tr, atr).
+
+    Columns 0 and 1 of state are the number of bars and the previous close.
+    """
+    n = state[i, 0]
+    tr = true_range(high, low, state[i, 1], n == 0)
+    state[i, 0] = n + 1
+    state[i, 1] = close
+    return tr, ma_update(tr, i, state, ma)
+
+
+@nb.njit(cache=True)
+def update_ema(values, mask, state, ma, out):
+
+    for i in range(len(values)):
+        if mask[i]:
+            out[i] = ma_update(values[i], i, state, ma)
+
+
+@nb.njit(cache=True)
+def update_rsi(values, mask, state, up, down, out):
+
+    for i in range(len(values)):
+        if not mask[i]:
+            continue
+
+        # Columns 0 and 1: number of bars and the previous value
+        value = values[i]
+        n = state[i, 0]
+        last_value = state[i, 1]
+        state[i, 0] = n + 1
+        state[i, 1] = value
+        if n == 0:
+            out[i] = np.nan
+            continue
+
+        # Price changes start from the second bar
+        change_up = value - last_value
+        change_down = -change_up
+        if change_up < 0:
+            change_up = 0.0
+        if change_down < 0:
+            change_down = 0.0
+
+        up_smooth = ma_update(change_up, i, state, up)
+        down_smooth = ma_update(change_down, i, state, down)
+
+        divider = up_smooth + down_smooth
+        out[i] = 100.0 if divider == 0 else up_smooth / divider * 100
+
+
+@nb.njit(cache=True)
+def update_atr(high, low, close, mask, state, ma, out_tr, out_atr, out_atrp):
+
+    for i in range(len(close)):
+        if mask[i]:
+            tr, atr = atr_update(i, high[i], low[i], close[i], state, ma)
+            out_tr[i] = tr
+            out_atr[i] = atr
+            out_atrp[i] = divide(atr, close[i]) * 100
+
+
+@nb.njit(cache=True)
+def update_adx(high, low, close, mask, state, atr, p_dm, m_dm, adx, out_adx, out_p_di, out_m_di):
+
+    for i in range(len(close)):
+        if not mask[i]:
+            continue
+
+        # Columns 2 and 3: previous high and low
+        first = state[i, 0] == 0
+        _, atr_value = atr_update(i, high[i], low[i], close[i], state, atr)
+
+        # Directional movement starts from the second bar
+        p_move = np.nan if first else high[i] - state[i, 2]
+        m_move = np.nan if first else -(low[i] - state[i, 3])
+        state[i, 2] = high[i]
+        state[i, 3] = low[i]
+        p_move_zeroed = 0.0 if p_move <= m_move or p_move < 0 else p_move
+        m_move_zeroed = 0.0 if m_move <= p_move or m_move < 0 else m_move
+
+        p_di = divide(100 * ma_update(p_move_zeroed, i, state, p_dm), atr_value)
+        m_di = divide(100 * ma_update(m_move_zeroed, i, state, m_dm), atr_value)
+        di_sum = p_di + m_di
+        dxi = 0.0 if di_sum == 0 else divide(100 * abs(p_di - m_di), di_sum)
+
+        out_adx[i] = ma_update(dxi, i, state, adx)
+        out_p_di[i] = p_di
+        out_m_di[i] = m_di
+
+
+@nb.njit(cache=True)
+def update_supertrend(high, low, close, mask, period, multiplier, state, atr, out_supertrend, out_mid):
+
+    for i in range(len(close)):
+        if not mask[i]:
+            continue
+
+        # Columns 2, 3, 4: upper band, lower band, trend is up
+        n = state[i, 0]
+        last_close = state[i, 1]
+        _, atr_value = atr_update(i, high[i], low[i], close[i], state, atr)
+
+        if n < period - 1:
+            out_supertrend[i] = np.nan
+            out_mid[i] = np.nan
+            continue
+
+        if n == period - 1:  # see supertrend.init_supertrend
+            state[i, 2], state[i, 3], state[i, 4] = init_bands(close[i], high[i], low[i], atr_value, multiplier)
+
+        out_supertrend[i], out_mid[i], state[i, 2], state[i, 3], state[i, 4] = supertrend_step(
+            close[i], high[i], low[i], atr_value, multiplier, last_close, state[i, 2], state[i, 3], state[i, 4] != 0
+        )
+
+
+@nb.njit(cache=True)
+def update_bollinger(values, mask, deviation, state, ma, var, out_mid, out_up, out_down, out_z_score):
+
+    for i in range(len(values)):
+        if not mask[i]:
+            continue
+
+        value = values[i]
+        mid = ma_update(value, i, state, ma)
+        std = np.sqrt(var_update(value, i, state, var))
+        band = std * deviation
+
+        out_mid[i] = mid
+        out_up[i] = mid + band
+        out_down[i] = mid - band
+        out_z_score[i] = z_score(value, mid, std)
+
+
+class SymbolsState:
+    """Base class of streaming indicator states of many symbols.
+
+    The state of each symbol is a row of the state matrix. Subclasses define
+    OUTPUTS (names of series), allocate columns of their values and moving
+    averages in __init__ and call _allocate(), update() advances symbols selected
+    by the mask and writes their values to self._out.
+    """
+
+    OUTPUTS = ()
+
+    def __init__(self, n_symbols, n_columns=0):
+        """Initialize SymbolsState.
+
+        Args:
+            n_symbols: Number of symbols
+            n_columns: Number of columns of the state for values of the subclass
+
+        Raises:
+            PyTAExceptionBadParameterValue: If n_symbols <= 0
+        """
+        if n_symbols <= 0:
+            raise PyTAExceptionBadParameterValue(f'n_symbols must be greater than 0, got {n_symbols}')
+
+        self.n_symbols = n_symbols
+        self._n_columns = n_columns
+        self._state = None
+        self._all = np.ones(n_symbols, dtype=np.bool_)
+        self._out = {name: np.full(n_symbols, np.nan) for name in self.OUTPUTS}
+
+    def _columns(self, n_columns):
+        """Allocate n_columns columns of the state, return the first one."""
+        offset = self._n_columns
+        self._n_columns += n_columns
+        return offset
+
+    def _ma(self, period, ma_type):
+        """Allocate columns of a moving average, return its parameters for ma_update."""
+        if period <= 0:
+            raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
+        try:
+            ma_type = MA_Type.cast(ma_type)
+        except ValueError as e:
+            raise PyTAExceptionBadParameterValue(str(e))
+
+        window = period if ma_type == MA_Type.sma else 0
+        return ma_type.value, period, ma_alpha(period, ma_type), self._columns(3 + window)
+
+    def _var(self, period):
+        """Allocate columns of a rolling variance, return its parameters for var_update."""
+        return period, self._columns(6 + period)
+
+    def _allocate(self):
+        self._state = np.zeros((self.n_symbols, self._n_columns), dtype=np.float64)
+
+    def _vectors(self, arrays, mask):
+        """Convert value vectors and the mask of updated symbols."""
+        vectors = []
+        for values in arrays:
+            values = np.asarray(values, dtype=np.float64)
+            if values.shape != (self.n_symbols,):
+                raise PyTAExceptionBadSeriesData(f'values must have shape ({self.n_symbols},), got {values.shape}')
+            vectors.append(values)
+
+        if mask is None:
+            return vectors, self._all
+        mask = np.asarray(mask, dtype=np.bool_)
+        if mask.shape != (self.n_symbols,):
+            raise PyTAExceptionBadSeriesData(f'mask must have shape ({self.n_symbols},), got {mask.shape}')
+        return vectors, mask
+
+    @property
+    def values(self):
+        """Dictionary of series names to arrays of the last values of symbols."""
+        return {name: values.copy() for name, values in self._out.items()}
+
+
+class EMAState(SymbolsState):
+    """Exponential moving average of many symbols (see indicators.ema).
+
+    Example:
+        >>> state = EMAState(n_symbols=3, period=20)
+        >>> state.update(np.array([1.0, 2.0, 3.0]))['ema']
+    """
+
+    OUTPUTS = ('ema',)
+
+    def __init__(self, n_symbols, period):
+        """Initialize EMAState.
+
+        Args:
+            n_symbols: Number of symbols
+            period: Period for moving average calculation
+        """
+        super().__init__(n_symbols)
+        self._ema = self._ma(period, 'ema')
+        self._allocate()
+
+    def update(self, values, mask=None):
+        """Add a bar to symbols.
+
+        Args:
+            values: Array of prices of symbols (shape (n_symbols,))
+            mask: Boolean array of symbols with a new bar (default: all symbols)
+
+        Returns:
+            Dictionary {'ema': array of values of symbols}
+        """
+        (values,), mask = self._vectors((values,), mask)
+        update_ema(values, mask, self._state, self._ema, self._out['ema'])
+        return self.values
+
+
+class RSIState(SymbolsState):
+    """Relative Strength Index of many symbols (see indicators.rsi)."""
+
+    OUTPUTS = ('rsi',)
+
+    def __init__(self, n_symbols, period, ma_type='mma'):
+        """Initialize RSIState.
+
+        Args:
+            n_symbols: Number of symbols
+            period: Period for RSI calculation
+            ma_type: Type of moving average (default: 'mma')
+        """
+        # Columns: number of bars, previous value
+        super().__init__(n_symbols, 2)
+        self._up = self._ma(period, ma_type)
+        self._down = self._ma(period, ma_type)
+        self._allocate()
+
+    def update(self, values, mask=None):
+        """Add a bar to symbols.
+
+        Args:
+            values: Array of prices of symbols (shape (n_symbols,))
+            mask: Boolean array of symbols with a new bar (default: all symbols)
+
+        Returns:
+            Dictionary {'rsi': array of values of symbols}
+        """
+        (values,), mask = self._vectors((values,), mask)
+        update_rsi(values, mask, self._state, self._up, self._down, self._out['rsi'])
+        return self.values
+
+
+class ATRState(SymbolsState):
+    """Average True Range of many symbols (see indicators.atr)."""
+
+    OUTPUTS = ('tr', 'atr', 'atrp')
+
+    def __init__(self, n_symbols, smooth=14, ma_type='mma'):
+        """Initialize ATRState.
+
+        Args:
+            n_symbols: Number of symbols
+            smooth: Period for moving average calculation (default: 14)
+            ma_type: Type of moving average (default: 'mma')
+        """
+        # Columns: number of bars, previous close
+        super().__init__(n_symbols, 2)
+        self._atr = self._ma(smooth, ma_type)
+        self._allocate()
+
+    def update(self, high, low, close, mask=None):
+        """Add a bar to symbols.
+
+        Args:
+            high, low, close: Arrays of prices of symbols (shape (n_symbols,))
+            mask: Boolean array of symbols with a new bar (default: all symbols)
+
+        Returns:
+            Dictionary with arrays 'tr', 'atr', 'atrp' of values of symbols
+        """
+        (high, low, close), mask = self._vectors((high, low, close), mask)
+        update_atr(high, low, close, mask, self._state, self._atr,
+                   self._out['tr'], self._out['atr'], self._out['atrp'])
+        return self.values
+
+
+class ADXState(SymbolsState):
+    """Average Directional Movement Index of many symbols (see indicators.adx)."""
+
+    OUTPUTS = ('adx', 'p_di', 'm_di')
+
+    def __init__(self, n_symbols, period=14, smooth=14, ma_type='mma'):
+        """Initialize ADXState.
+
+        Args:
+            n_symbols: Number of symbols
+            period: Period for Directional Indicators (default: 14)
+            smooth: Period for ADX smoothing (default: 14)
+            ma_type: Type of moving average (default: 'mma')
+        """
+        # Columns: number of bars, previous close, previous high, previous low
+        super().__init__(n_symbols, 4)
+        self._atr = self._ma(period, ma_type)
+        self._p_dm = self._ma(period, ma_type)
+        self._m_dm = self._ma(period, ma_type)
+        if smooth <= 0:
+            raise PyTAExceptionBadParameterValue(f'smooth must be greater than 0, got {smooth}')
+        self._adx = self._ma(smooth, ma_type)
+        self._allocate()
+
+    def update(self, high, low, close, mask=None):
+        """Add a bar to symbols.
+
+        Args:
+            high, low, close: Arrays of prices of symbols (shape (n_symbols,))
+            mask: Boolean array of symbols with a new bar (default: all symbols)
+
+        Returns:
+            Dictionary with arrays 'adx', 'p_di', 'm_di' of values of symbols
+        """
+        (high, low, close), mask = self._vectors((high, low, close), mask)
+        update_adx(high, low, close, mask, self._state, self._atr, self._p_dm, self._m_dm, self._adx,
+                   self._out['adx'], self._out['p_di'], self._out['m_di'])
+        return self.values
+
+
+class SupertrendState(SymbolsState):
+    """Supertrend of many symbols (see indicators.supertrend)."""
+
+    OUTPUTS = ('supertrend', 'supertrend_mid')
+
+    def __init__(self, n_symbols, period=10, multipler=3, ma_type='mma'):
+        """Initialize SupertrendState.
+
+        Args:
+            n_symbols: Number of symbols
+            period: Period for ATR calculation (default: 10), at least 2
+            multipler: Multiplier for ATR (default: 3)
+            ma_type: Type of moving average for ATR (default: 'mma')
+        """
+        # Columns: number of bars, previous close, upper band, lower band, trend is up
+        super().__init__(n_symbols, 5)
+        # With period 1 the first value of the indicator depends on the last close of all bars
+        if period < 2:
+            raise PyTAExceptionBadParameterValue(f'period must be at least 2, got {period}')
+        if multipler <= 0:
+            raise PyTAExceptionBadParameterValue(f'multipler must be greater than 0, got {multipler}')
+
+        self._period = period
+        self._multiplier = float(multipler)
+        self._atr = self._ma(period, ma_type)
+        self._allocate()
+
+    def update(self, high, low, close, mask=None):
+        """Add a bar to symbols.
+
+        Args:
+            high, low, close: Arrays of prices of symbols (shape (n_symbols,))
+            mask: Boolean array of symbols with a new bar (default: all symbols)
+
+        Returns:
+            Dictionary with arrays 'supertrend', 'supertrend_mid' of values of symbols
+        """
+        (high, low, close), mask = self._vectors((high, low, close), mask)
+        update_supertrend(high, low, close, mask, self._period, self._multiplier, self._state, self._atr,
+                          self._out['supertrend'], self._out['supertrend_mid'])
+        return self.values
+
+
+class BollingerState(SymbolsState):
+    """Bollinger Bands of many symbols (see indicators.bollinger_bands)."""
+
+    OUTPUTS = ('mid_line', 'up_line', 'down_line', 'z_score')
+
+    def __init__(self, n_symbols, period=20, deviation=2, ma_type='sma'):
+        """Initialize BollingerState.
+
+        Args:
+            n_symbols: Number of symbols
+            period: Period for moving average and standard deviation (default: 20)
+            deviation: Number of standard deviations for bands (default: 2)
+            ma_type: Type of moving average (default: 'sma')
+        """
+        super().__init__(n_symbols)
+        if deviation <= 0:
+            raise PyTAExceptionBadParameterValue(f'deviation must be greater than 0, got {deviation}')
+
+        self._deviation = float(deviation)
+        self._mid = self._ma(period, ma_type)
+        self._std = self._var(period)
+        self._allocate()
+
+    def update(self, values, mask=None):
+        """Add a bar to symbols.
+
+        Args:
+            values: Array of prices of symbols (shape (n_symbols,))
+            mask: Boolean array of symbols with a new bar (default: all symbols)
+
+        Returns:
+            Dictionary with arrays 'mid_line', 'up_line', 'down_line', 'z_score' of values of symbols
+        """
+        (values,), mask = self._vectors((values,), mask)
+        update_bollinger(values, mask, self._deviation, self._state, self._mid, self._std,
+                         self._out['mid_line'], self._out['up_line'], self._out['down_line'],
+                         self._out['z_score'])
+        return self.values
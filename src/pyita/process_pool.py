@@ -0,0 +1,266 @@
+"""Process pool runner with quotes and results in shared memory."""
+import importlib
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .indicator_result import IndicatorResult
+from .quotes import Quotes
+
+# Alignment of columns in a block (cache line)
+BLOCK_ALIGNMENT = 64
+
+
+def block_layout(data):
+    """Calculate layout of arrays in a shared memory block.
+
+    Args:
+        data: Dictionary of column names to 1-D numpy arrays
+
+    Returns:
+        tuple: (layout, size) where layout is a list of (name, dtype, offset, length)
+    """
+    layout = []
+    offset = 0
+    for name, values in data.items():
+        offset = (offset + BLOCK_ALIGNMENT - 1) // BLOCK_ALIGNMENT * BLOCK_ALIGNMENT
+        layout.append((name, values.dtype.str, offset, len(values)))
+        offset += values.nbytes
+    return layout, offset
+
+
+def create_block(data):
+    """Create shared memory block and copy arrays to it.
+
+    Args:
+        data: Dictionary of column names to 1-D numpy arrays
+
+    Returns:
+        tuple: (SharedMemory, descriptor), descriptor is (block name, layout)
+    """
+    layout, size = block_layout(data)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        for name, dtype, offset, length in layout:
+            target = np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=offset)
+            target[:] = data[name]
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return shm, (shm.name, layout)
+
+
+def map_block(shm):
+    """Create a byte array on a block that keeps the block handle open.
+
+    The handle is closed by a finalizer of the memoryview held by the array,
+    after the array and all arrays created on it are released.
+
+    Args:
+        shm: SharedMemory object
+
+    Returns:
+        numpy.ndarray: uint8 array on the block buffer
+    """
+    buffer = np.frombuffer(shm.buf, dtype=np.uint8)
+    weakref.finalize(buffer.base, shm.close)
+    return buffer
+
+
+def block_arrays(buffer, layout):
+    """Create arrays on a block buffer without copying.
+
+    Args:
+        buffer: Block buffer
+        layout: List of (name, dtype, offset, length)
+
+    Returns:
+        dict: Dictionary of column names to numpy arrays
+    """
+    return {
+        name: np.ndarray(length, dtype=dtype, buffer=buffer, offset=offset)
+        for name, dtype, offset, length in layout
+    }
+
+
+def attach_block(descriptor, unlink=False):
+    """Attach to a shared memory block.
+
+    Args:
+        descriptor: (block name, layout)
+        unlink: If True, remove the block name, the memory is released when arrays are dropped
+
+    Returns:
+        dict: Dictionary of column names to numpy arrays
+    """
+    name, layout = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    if unlink:
+        shm.unlink()
+    return block_arrays(map_block(shm), layout)
+
+
+def run_indicator(indicator_name, descriptor, params):
+    """Calculate indicator in a worker process.
+
+    Args:
+        indicator_name: Name of the indicator
+        descriptor: Descriptor of the shared quotes block
+        params: Indicator parameters
+
+    Returns:
+        Descriptor of the shared block with result series
+    """
+    pyita = importlib.import_module(__package__)
+    quotes = Quotes._from_arrays(attach_block(descriptor))
+    result = getattr(pyita, indicator_name)(quotes, **params)
+    result._materialize()
+
+    shm, result_descriptor = create_block(result._data)
+    shm.close()
+    return result_descriptor
+
+
+class SharedQuotes:
+    """Quotes placed in a shared memory block.
+
+    Only the descriptor of the block is sent to worker processes.
+    The block is released by release() or when the runner is closed.
+    """
+
+    def __init__(self, quotes):
+        """Copy quotes to a new shared memory block.
+
+        Args:
+            quotes: Quotes object
+        """
+        self._shm, self.descriptor = create_block(quotes._data)
+        self._buffer = map_block(self._shm)
+        self._quotes = None
+
+    @property
+    def quotes(self):
+        """Quotes object on the shared block (without copying)."""
+        if self._quotes is None:
+            self._quotes = Quotes._from_arrays(block_arrays(self._buffer, self.descriptor[1]))
+        return self._quotes
+
+    @property
+    def released(self):
+        """True if the block is released."""
+        return self._buffer is None
+
+    def release(self):
+        """Remove the block. Memory is freed when quotes views are dropped."""
+        if self._buffer is None:
+            return
+        self._shm.unlink()
+        self._buffer = None
+        self._quotes = None
+
+
+class ProcessPoolRunner:
+    """Calculates indicators in worker processes with data in shared memory.
+
+    Quotes columns are placed in a shared memory block and only block descriptors
+    are sent to workers. Result series are returned through shared memory as well:
+    the returned IndicatorResult arrays are views of a block that is freed when
+    they are dropped.
+
+    Example:
+        >>> with ta.ProcessPoolRunner(max_workers=4) as runner:
+        ...     results = runner.map('rsi', quotes_list, period=14)
+        ...     shared = runner.share(quotes)
+        ...     ema = runner.submit('ema', shared, period=20).result()
+    """
+
+    def __init__(self, max_workers=None, mp_context=None):
+        """Initialize ProcessPoolRunner.
+
+        Args:
+            max_workers: Number of worker processes (default: number of processors)
+            mp_context: multiprocessing context (default: platform default)
+        """
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context)
+        self._shared = []
+
+    def share(self, quotes):
+        """Place quotes in shared memory for reuse in several calculations.
+
+        Args:
+            quotes: Quotes object
+
+        Returns:
+            SharedQuotes object, released when the runner is closed
+        """
+        shared = SharedQuotes(quotes)
+        self._shared.append(shared)
+        return shared
+
+    def submit(self, indicator_name, quotes, **params):
+        """Schedule indicator calculation.
+
+        Args:
+            indicator_name: Name of the indicator (e.g. 'rsi', 'supertrend')
+            quotes: Quotes or SharedQuotes object. Quotes are placed in shared memory
+                for the time of the calculation.
+            **params: Indicator parameters
+
+        Returns:
+            concurrent.futures.Future with IndicatorResult
+        """
+        if isinstance(quotes, SharedQuotes):
+            shared = quotes
+            temporary = False
+        else:
+            shared = SharedQuotes(quotes)
+            temporary = True
+
+        result_future = Future()
+
+        def on_done(future):
+            # Errors raised by a done-callback are only logged, so they are passed to result_future
+            try:
+                try:
+                    result = IndicatorResult._from_arrays(attach_block(future.result(), unlink=True))
+                finally:
+                    if temporary:
+                        shared.release()
+            except Exception as e:
+                result_future.set_exception(e)
+            else:
+                result_future.set_result(result)
+
+        self._executor.submit(run_indicator, indicator_name, shared.descriptor, params).add_done_callback(on_done)
+
+        return result_future
+
+    def map(self, indicator_name, quotes_list, **params):
+        """Calculate indicator for several quotes in parallel.
+
+        Args:
+            indicator_name: Name of the indicator
+            quotes_list: Iterable of Quotes or SharedQuotes objects
+            **params: Indicator parameters
+
+        Returns:
+            list: IndicatorResult objects in the order of quotes_list
+        """
+        futures = [self.submit(indicator_name, quotes, **params) for quotes in quotes_list]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Shut down workers and release shared quotes."""
+        self._executor.shutdown(wait=True)
+        for shared in self._shared:
+            shared.release()
+        self._shared = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,6 +1,8 @@
 """Quotes class for OHLCV data."""
 from .data_series import DataSeries
 from .constants import PRICE_TYPE, VOLUME_TYPE, TIME_TYPE
+from .resample import resample_data, OHLCV_COLUMNS
+from . import transforms
 
 
 class Quotes(DataSeries):
@@ -33,6 +35,8 @@ class Quotes(DataSeries):
         [102 103 101]
     """
     
+    __slots__ = ()
+    
     # Column validation
     REQUIRED_COLUMNS = ['open', 'high', 'low', 'close']
     ALLOWED_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'time']
@@ -69,4 +73,129 @@ class Quotes(DataSeries):
         """
         # Call parent constructor to process args and kwargs
         super().__init__(*args, **kwargs)
-
+    
+    def resample(self, timeframe, origin='epoch'):
+        """Aggregate quotes to a higher timeframe.
+        
+        Bars are grouped by the time column into periods of the given timeframe:
+        open is the first open, high is the maximum, low is the minimum, close is
+        the last close and volume is the sum. Daily bars start at midnight UTC,
+        weekly bars start on Monday, monthly bars follow the calendar. Periods
+        without source bars (gaps) produce no bars. The time of a resulting bar
+        is the start of its period.
+        
+        Args:
+            timeframe: Target timeframe in CCXT notation ('5m', '15m', '1h', '4h', '1d', '1w', '1M')
+                or numpy.timedelta64
+            origin: Alignment of fixed timeframes - 'epoch' (default), 'start' (time of the
+                first bar) or datetime-like value. Ignored for monthly timeframes.
+        
+        Returns:
+            Quotes object with higher timeframe bars
+            
+        Raises:
+            PyTAExceptionDataSeriesNonFound: If time series is not found
+            PyTAExceptionBadParameterValue: If timeframe or origin is invalid
+            PyTAExceptionBadSeriesData: If time is not sorted in ascending order
+            
+        Example:
+            >>> quotes_1h = quotes_1m.resample('1h')
+            >>> quotes_1d = quotes_1m.resample('1d')
+        """
+        data = {name: self._data[name] for name in OHLCV_COLUMNS if name in self._data}
+        data['time'] = self['time']
+        
+        return self._create_from_dict(resample_data(data, timeframe, origin))
+    
+    def heikin_ashi(self):
+        """Transform quotes to Heikin-Ashi bars.
+        
+        Close is the average of open, high, low and close, open is the middle of
+        the open and close of the previous Heikin-Ashi bar, high and low include
+        them. Bars correspond to the source bars (volume and time are kept).
+        
+        Returns:
+            Quotes object with Heikin-Ashi bars
+            
+        Example:
+            >>> supertrend = ta.supertrend(quotes.heikin_ashi())
+        """
+        return self._create_from_dict(transforms.heikin_ashi(self._data))
+    
+    def renko(self, box_size=None, atr_period=14, return_index=False):
+        """Transform quotes to Renko bricks by close prices.
+        
+        A brick is added when the close moves by box_size beyond the last brick,
+        a reversal needs a move by two boxes. Each brick has the time of the
+        source bar that formed it and the volume of source bars since the
+        previous brick.
+        
+        Args:
+            box_size: Brick size (default: the last ATR value)
+            atr_period: ATR period for the brick size if box_size is None (default: 14)
+            return_index: If True, also return indexes of source bars of bricks
+        
+        Returns:
+            Quotes object with bricks, or tuple (Quotes, indexes) if return_index
+            
+        Raises:
+            PyTAExceptionBadParameterValue: If box_size or atr_period is invalid
+            
+        Example:
+            >>> bricks, indexes = quotes.renko(box_size=100, return_index=True)
+        """
+        data, indexes = transforms.renko(self, box_size, atr_period)
+        return self._movement_result(data, indexes, return_index)
+    
+    def kagi(self, reversal=None, atr_period=14, return_index=False):
+        """Transform quotes to Kagi lines by close prices.
+        
+        A line is extended while the close moves in its direction and reverses
+        when the close moves back from its extreme by reversal or more. Each line
+        is a bar from its start to its extreme with the time of the source bar of
+        the extreme. The last line is not finished.
+        
+        Args:
+            reversal: Reversal amount (default: the last ATR value)
+            atr_period: ATR period for the reversal amount if reversal is None (default: 14)
+            return_index: If True, also return indexes of source bars of lines
+        
+        Returns:
+            Quotes object with lines, or tuple (Quotes, indexes) if return_index
+            
+        Raises:
+            PyTAExceptionBadParameterValue: If reversal or atr_period is invalid
+            
+        Example:
+            >>> lines = quotes.kagi(reversal=50)
+        """
+        data, indexes = transforms.kagi(self, reversal, atr_period)
+        return self._movement_result(data, indexes, return_index)
+    
+    def line_break(self, n_lines=3, return_index=False):
+        """Transform quotes to a line break chart by close prices.
+        
+        A line is added when the close exceeds the close of the last line, a
+        reversal line when the close breaks the extreme of the last n_lines lines.
+        Each line has the time of the source bar that formed it.
+        
+        Args:
+            n_lines: Number of lines broken by a reversal (default: 3, three line break)
+            return_index: If True, also return indexes of source bars of lines
+        
+        Returns:
+            Quotes object with lines, or tuple (Quotes, indexes) if return_index
+            
+        Raises:
+            PyTAExceptionBadParameterValue: If n_lines is invalid
+            
+        Example:
+            >>> lines = quotes.line_break(n_lines=3)
+        """
+        data, indexes = transforms.line_break(self, n_lines)
+        return self._movement_result(data, indexes, return_index)
+    
+    def _movement_result(self, data, indexes, return_index):
+        
+        quotes = self._create_from_dict(data)
+        return (quotes, indexes) if return_index else quotes
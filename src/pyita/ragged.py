@@ -0,0 +1,266 @@
+"""Calculation over many series of different lengths in one compiled call.
+
+Ragged layout: values of all series are concatenated into one array and
+offsets (n_series + 1 positions, from 0 to the total length) mark the
+segments of series, like an Arrow ListArray. There is no padding, so series
+with different history lengths cost their own length only. Each segment is
+calculated independently, optionally in parallel over segments, and results
+have the same layout (same offsets).
+
+Segments shorter than the warm-up give NaN instead of an exception.
+
+Kernels are available for moving averages (ma), RSI and ATR. Other
+indicators are calculated for each series by indicator functions (see
+to_arrays); segment kernels of them can be built on the compiled moving
+average (move_average.ma_calculate_code) like rsi and atr.
+
+Example:
+    >>> from pyita import ragged
+    >>> values, offsets = ragged.from_arrays([quotes_btc.close, quotes_eth.close])
+    >>> rsi = ragged.rsi(values, offsets, period=14, parallel=True)
+    >>> rsi_btc, rsi_eth = ragged.to_arrays(rsi, offsets)
+"""
+import numpy as np
+import numba as nb
+
+from .move_average import MA_Type, ma_calculate_code
+from .indicators.atr import true_range
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+
+def from_arrays(arrays):
+    """Concatenate series into the ragged layout.
+
+    Args:
+        arrays: Sequence of 1-D arrays
+
+    Returns:
+        tuple: (float64 array of values, int64 array of offsets)
+    """
+    lengths = [len(values) for values in arrays]
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.concatenate(arrays).astype(np.float64, copy=False) if arrays else np.empty(0, dtype=np.float64)
+    return values, offsets
+
+
+def to_arrays(values, offsets):
+    """Split values of the ragged layout into series.
+
+    Returns:
+        list: Views of values for each segment
+    """
+    return [values[offsets[i]: offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def offsets_from_keys(keys):
+    """Get offsets of a long-format table grouped by keys (e.g., symbols).
+
+    Args:
+        keys: Array of keys of rows, rows of each key are contiguous
+
+    Returns:
+        tuple: (int64 array of offsets, array of keys of segments)
+
+    Raises:
+        PyTAExceptionBadSeriesData: If rows of a key are not contiguous
+
+    Example:
+        >>> offsets, symbols = ragged.offsets_from_keys(table['symbol'])
+        >>> ema = ragged.ma(table['close'], offsets, 20, 'ema')
+    """
+    keys = np.asarray(keys)
+    if len(keys) == 0:
+        return np.zeros(1, dtype=np.int64), keys[:0]
+
+    starts = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    offsets = np.concatenate(([0], starts, [len(keys)])).astype(np.int64)
+    segment_keys = keys[offsets[:-1]]
+    if len(np.unique(segment_keys)) != len(segment_keys):
+        raise PyTAExceptionBadSeriesData('rows of each key must be contiguous')
+    return offsets, segment_keys
+
+
+def prepare_ragged(offsets, *arrays):
+    """Validate offsets and convert arrays to float64."""
+    offsets = np.asarray(offsets, dtype=np.int64)
+    arrays = [np.asarray(values, dtype=np.float64) for values in arrays]
+    for values in arrays:
+        if values.ndim != 1:
+            raise PyTAExceptionBadParameterValue(f'values must be 1-D array, got {values.ndim}-D')
+        if len(values) != len(arrays[0]):
+            raise PyTAExceptionBadSeriesData('arrays of the ragged layout must have the same length')
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(arrays[0]):
+        raise PyTAExceptionBadSeriesData(f'offsets must start with 0 and end with the length of values {len(arrays[0])}')
+    if np.any(np.diff(offsets) < 0):
+        raise PyTAExceptionBadSeriesData('offsets must be non-decreasing')
+    return (offsets, *arrays)
+
+
+def check_ma(period, ma_type):
+    """Validate moving average parameters and return the code of ma_type."""
+    if period <= 0:
+        raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
+    try:
+        return MA_Type.cast(ma_type).value
+    except ValueError as e:
+        raise PyTAExceptionBadParameterValue(str(e))
+
+
+@nb.njit(cache=True, inline='always')
+def rsi_segment(close, period, ma_code, result):
+    """RSI of one segment (see indicators.rsi)."""
+    n = len(close)
+    result[:] = np.nan
+    if n < 2:
+        return
+
+    up = close[1:] - close[:-1]
+    down = -up
+    up[up < 0] = 0
+    down[down < 0] = 0
+
+    up_ma = ma_calculate_code(up, period, ma_code)
+    down_ma = ma_calculate_code(down, period, ma_code)
+
+    for i in range(n - 1):
+        divider = up_ma[i] + down_ma[i]
+        result[i + 1] = 100.0 if divider == 0 else up_ma[i] / divider * 100
+
+
+@nb.njit(cache=True, inline='always')
+def atr_segment(high, low, close, smooth, ma_code, result):
+    """ATR of one segment (see indicators.atr)."""
+    n = len(close)
+    if n == 0:
+        return
+
+    tr = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        tr[i] = true_range(high[i], low[i], close[i - 1], i == 0)
+    result[:] = ma_calculate_code(tr, smooth, ma_code)
+
+
+@nb.njit(cache=True)
+def calc_ma(values, offsets, period, ma_code):
+    result = np.empty(len(values), dtype=np.float64)
+    for k in range(len(offsets) - 1):
+        first, last = offsets[k], offsets[k + 1]
+        result[first: last] = ma_calculate_code(values[first: last], period, ma_code)
+    return result
+
+
+@nb.njit(cache=True, parallel=True)
+def calc_ma_parallel(values, offsets, period, ma_code):
+    result = np.empty(len(values), dtype=np.float64)
+    for k in nb.prange(len(offsets) - 1):
+        first, last = offsets[k], offsets[k + 1]
+        result[first: last] = ma_calculate_code(values[first: last], period, ma_code)
+    return result
+
+
+@nb.njit(cache=True)
+def calc_rsi(close, offsets, period, ma_code):
+    result = np.empty(len(close), dtype=np.float64)
+    for k in range(len(offsets) - 1):
+        first, last = offsets[k], offsets[k + 1]
+        rsi_segment(close[first: last], period, ma_code, result[first: last])
+    return result
+
+
+@nb.njit(cache=True, parallel=True)
+def calc_rsi_parallel(close, offsets, period, ma_code):
+    result = np.empty(len(close), dtype=np.float64)
+    for k in nb.prange(len(offsets) - 1):
+        first, last = offsets[k], offsets[k + 1]
+        rsi_segment(close[first: last], period, ma_code, result[first: last])
+    return result
+
+
+@nb.njit(cache=True)
+def calc_atr(high, low, close, offsets, smooth, ma_code):
+    result = np.empty(len(close), dtype=np.float64)
+    for k in range(len(offsets) - 1):
+        first, last = offsets[k], offsets[k + 1]
+        atr_segment(high[first: last], low[first: last], close[first: last], smooth, ma_code, result[first: last])
+    return result
+
+
+@nb.njit(cache=True, parallel=True)
+def calc_atr_parallel(high, low, close, offsets, smooth, ma_code):
+    result = np.empty(len(close), dtype=np.float64)
+    for k in nb.prange(len(offsets) - 1):
+        first, last = offsets[k], offsets[k + 1]
+        atr_segment(high[first: last], low[first: last], close[first: last], smooth, ma_code, result[first: last])
+    return result
+
+
+def ma(values, offsets, period, ma_type='sma', parallel=False):
+    """Moving average of each segment (see move_average.ma_calculate).
+
+    Args:
+        values: Array of values of all series
+        offsets: Array of n_series + 1 positions of segments
+        period: Period of moving average
+        ma_type: Type of moving average - 'sma', 'ema', 'mma', 'ema0', 'mma0', 'emaw', 'mmaw' (default: 'sma')
+        parallel: If True, segments are calculated in parallel threads
+
+    Returns:
+        numpy.ndarray: Moving averages in the ragged layout of values
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period or ma_type is invalid
+        PyTAExceptionBadSeriesData: If offsets do not fit values
+    """
+    ma_code = check_ma(period, ma_type)
+    offsets, values = prepare_ragged(offsets, values)
+    kernel = calc_ma_parallel if parallel else calc_ma
+    return kernel(values, offsets, period, ma_code)
+
+
+def rsi(close, offsets, period, ma_type='mma', parallel=False):
+    """Relative Strength Index of each segment (equal to indicator rsi).
+
+    Args:
+        close: Array of prices of all series
+        offsets: Array of n_series + 1 positions of segments
+        period: Period for RSI calculation
+        ma_type: Type of moving average (default: 'mma')
+        parallel: If True, segments are calculated in parallel threads
+
+    Returns:
+        numpy.ndarray: RSI values in the ragged layout of close
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period or ma_type is invalid
+        PyTAExceptionBadSeriesData: If offsets do not fit values
+    """
+    ma_code = check_ma(period, ma_type)
+    offsets, close = prepare_ragged(offsets, close)
+    kernel = calc_rsi_parallel if parallel else calc_rsi
+    return kernel(close, offsets, period, ma_code)
+
+
+def atr(high, low, close, offsets, smooth=14, ma_type='mma', parallel=False):
+    """Average True Range of each segment (equal to series atr of indicator atr).
+
+    Args:
+        high: Array of high prices of all series
+        low: Array of low prices of all series
+        close: Array of close prices of all series
+        offsets: Array of n_series + 1 positions of segments
+        smooth: Period for moving average calculation (default: 14)
+        ma_type: Type of moving average (default: 'mma')
+        parallel: If True, segments are calculated in parallel threads
+
+    Returns:
+        numpy.ndarray: ATR values in the ragged layout of prices
+
+    Raises:
+        PyTAExceptionBadParameterValue: If smooth or ma_type is invalid
+        PyTAExceptionBadSeriesData: If offsets do not fit values
+    """
+    ma_code = check_ma(smooth, ma_type)
+    offsets, high, low, close = prepare_ragged(offsets, high, low, close)
+    kernel = calc_atr_parallel if parallel else calc_atr
+    return kernel(high, low, close, offsets, smooth, ma_code)
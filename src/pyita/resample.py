@@ -0,0 +1,389 @@
+"""Multi-timeframe resampling of quotes (OHLCV aggregation)."""
+import re
+
+import numpy as np
+import numba as nb
+
+from .constants import TIME_TYPE, TIME_UNITS_IN_ONE_SECOND, TIME_UNITS_IN_ONE_DAY
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+TIMEFRAME_UNITS = {
+    's': TIME_UNITS_IN_ONE_SECOND,
+    'm': 60 * TIME_UNITS_IN_ONE_SECOND,
+    'h': 60 * 60 * TIME_UNITS_IN_ONE_SECOND,
+    'd': TIME_UNITS_IN_ONE_DAY,
+    'w': 7 * TIME_UNITS_IN_ONE_DAY,
+}
+
+# 1970-01-01 is Thursday, weekly bars start on Monday
+WEEK_EPOCH_OFFSET = 4 * TIME_UNITS_IN_ONE_DAY
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def parse_timeframe(timeframe):
+    """Parse timeframe string in CCXT notation.
+
+    Args:
+        timeframe: Timeframe string ('1m', '5m', '1h', '4h', '1d', '1w', '1M', ...)
+            or numpy.timedelta64
+
+    Returns:
+        tuple: (count, unit), unit is one of 's', 'm', 'h', 'd', 'w', 'M'
+
+    Raises:
+        PyTAExceptionBadParameterValue: If timeframe cannot be parsed
+    """
+    if isinstance(timeframe, np.timedelta64):
+        step = int(timeframe.astype('timedelta64[ms]').astype(np.int64))
+        if step <= 0:
+            raise PyTAExceptionBadParameterValue(f'timeframe must be positive, got {timeframe}')
+        return step, 'ms'
+
+    match = re.match(r'^(\d+)([smhdwM])$', str(timeframe))
+    if match is None:
+        raise PyTAExceptionBadParameterValue(f'unknown timeframe: {timeframe}')
+
+    count = int(match.group(1))
+    if count <= 0:
+        raise PyTAExceptionBadParameterValue(f'timeframe must be positive, got {timeframe}')
+
+    return count, match.group(2)
+
+
+def timeframe_step(count, unit):
+    """Return fixed timeframe length in time units (ms), None for calendar months."""
+    if unit == 'ms':
+        return count
+    if unit == 'M':
+        return None
+    return count * TIMEFRAME_UNITS[unit]
+
+
+def get_origin(origin, unit, time_ms):
+    """Convert origin parameter to time units (ms).
+
+    Args:
+        origin: 'epoch', 'start' or datetime-like value
+        unit: Timeframe unit
+        time_ms: Source time as int64 milliseconds
+
+    Returns:
+        int: Origin in milliseconds since epoch
+    """
+    if isinstance(origin, str) and origin == 'epoch':
+        return WEEK_EPOCH_OFFSET if unit == 'w' else 0
+    if isinstance(origin, str) and origin == 'start':
+        return int(time_ms[0]) if len(time_ms) else 0
+    try:
+        return int(np.datetime64(origin, 'ms').astype(np.int64))
+    except (ValueError, TypeError) as e:
+        raise PyTAExceptionBadParameterValue(f'bad origin: {origin}') from e
+
+
+def calc_buckets(time_ms, count, unit, origin_ms):
+    """Calculate higher timeframe bucket number for each bar.
+
+    Args:
+        time_ms: Bar times as int64 milliseconds
+        count: Timeframe count
+        unit: Timeframe unit
+        origin_ms: Origin of fixed timeframes in milliseconds
+
+    Returns:
+        numpy.ndarray: int64 bucket numbers
+    """
+    if unit == 'M':
+        months = time_ms.view(TIME_TYPE).astype('datetime64[M]').view(np.int64)
+        return months // count
+    return (time_ms - origin_ms) // timeframe_step(count, unit)
+
+
+def bucket_start_time(buckets, count, unit, origin_ms):
+    """Calculate start time of buckets.
+
+    Returns:
+        numpy.ndarray: Bucket start times as datetime64[ms]
+    """
+    if unit == 'M':
+        return (buckets * count).astype('datetime64[M]').astype(TIME_TYPE)
+    return (origin_ms + buckets * timeframe_step(count, unit)).view(TIME_TYPE)
+
+
+@nb.njit(cache=True)
+def calc_ohlcv_groups(buckets, open_, high, low, close, volume):
+    """Aggregate consecutive bars with the same bucket number.
+
+    Args:
+        buckets: Array of bucket numbers (non-decreasing)
+        open_: Array of open prices
+        high: Array of high prices
+        low: Array of low prices
+        close: Array of close prices
+        volume: Array of volumes (empty array if there is no volume)
+
+    Returns:
+        Tuple of (first_indexes, open, high, low, close, volume) arrays
+    """
+    n_bars = len(buckets)
+    has_volume = len(volume) > 0
+
+    n_groups = 0
+    for i in range(n_bars):
+        if i == 0 or buckets[i] != buckets[i - 1]:
+            n_groups += 1
+
+    first_indexes = np.empty(n_groups, dtype=np.int64)
+    out_open = np.empty(n_groups, dtype=np.float64)
+    out_high = np.empty(n_groups, dtype=np.float64)
+    out_low = np.empty(n_groups, dtype=np.float64)
+    out_close = np.empty(n_groups, dtype=np.float64)
+    out_volume = np.empty(n_groups if has_volume else 0, dtype=np.float64)
+
+    i_group = -1
+    for i in range(n_bars):
+        if i == 0 or buckets[i] != buckets[i - 1]:
+            i_group += 1
+            first_indexes[i_group] = i
+            out_open[i_group] = open_[i]
+            out_high[i_group] = high[i]
+            out_low[i_group] = low[i]
+            if has_volume:
+                out_volume[i_group] = volume[i]
+        else:
+            if high[i] > out_high[i_group] or np.isnan(out_high[i_group]):
+                out_high[i_group] = high[i]
+            if low[i] < out_low[i_group] or np.isnan(out_low[i_group]):
+                out_low[i_group] = low[i]
+            if has_volume:
+                out_volume[i_group] += volume[i]
+        out_close[i_group] = close[i]
+
+    return first_indexes, out_open, out_high, out_low, out_close, out_volume
+
+
+def check_sorted(buckets):
+    """Raise if bucket numbers (and therefore times) are decreasing somewhere."""
+    if len(buckets) > 1 and np.any(buckets[1:] < buckets[:-1]):
+        raise PyTAExceptionBadSeriesData('time must be sorted in ascending order')
+
+
+def aggregate(data, buckets, count, unit, origin_ms):
+    """Aggregate OHLCV arrays by bucket numbers.
+
+    Args:
+        data: Dictionary with 'open', 'high', 'low', 'close' and optional 'volume' arrays
+        buckets: Array of bucket numbers
+        count: Timeframe count
+        unit: Timeframe unit
+        origin_ms: Origin in milliseconds
+
+    Returns:
+        tuple: (dictionary of aggregated arrays with 'time', bucket numbers of groups)
+    """
+    volume = data.get('volume')
+    has_volume = volume is not None
+    first_indexes, out_open, out_high, out_low, out_close, out_volume = calc_ohlcv_groups(
+        buckets, data['open'], data['high'], data['low'], data['close'],
+        volume if has_volume else np.empty(0, dtype=np.float64)
+    )
+
+    group_buckets = buckets[first_indexes]
+    result = {
+        'open': out_open,
+        'high': out_high,
+        'low': out_low,
+        'close': out_close,
+    }
+    if has_volume:
+        result['volume'] = out_volume
+    result['time'] = bucket_start_time(group_buckets, count, unit, origin_ms)
+
+    return result, group_buckets
+
+
+def resample_data(data, timeframe, origin='epoch'):
+    """Resample OHLCV arrays to a higher timeframe.
+
+    Args:
+        data: Dictionary with 'open', 'high', 'low', 'close', 'time' and optional 'volume' arrays
+        timeframe: Target timeframe ('5m', '1h', '1d', '1w', '1M', ...)
+        origin: 'epoch' (default), 'start' (first bar) or datetime-like value
+
+    Returns:
+        dict: Dictionary of aggregated arrays
+    """
+    count, unit = parse_timeframe(timeframe)
+    time_ms = data['time'].astype(TIME_TYPE).view(np.int64)
+    origin_ms = get_origin(origin, unit, time_ms)
+
+    buckets = calc_buckets(time_ms, count, unit, origin_ms)
+    check_sorted(buckets)
+
+    result, _ = aggregate(data, buckets, count, unit, origin_ms)
+    return result
+
+
+class Resampler:
+    """Streaming resampler for partially formed higher timeframe bars.
+
+    Bars of the source timeframe are fed in chunks. A higher timeframe bar is
+    considered closed when a bar of a later period arrives. The bar being formed
+    is available through the partial property.
+
+    Example:
+        >>> resampler = Resampler('1h')
+        >>> closed = resampler.update(quotes_1m_chunk)
+        >>> print(closed.close, resampler.partial.close)
+    """
+
+    def __init__(self, timeframe, origin='epoch'):
+        """Initialize Resampler.
+
+        Args:
+            timeframe: Target timeframe ('5m', '1h', '1d', '1w', '1M', ...)
+            origin: 'epoch' (default), 'start' (first bar) or datetime-like value
+        """
+        self._count, self._unit = parse_timeframe(timeframe)
+        self._origin = origin
+        self._origin_ms = None
+        self._template = None
+        self._pending = None
+        self._pending_bucket = None
+
+    def update(self, quotes):
+        """Add source bars.
+
+        Args:
+            quotes: Quotes object with time column (source timeframe bars)
+
+        Returns:
+            Quotes object with higher timeframe bars closed by this chunk (may be empty)
+
+        Raises:
+            PyTAExceptionDataSeriesNonFound: If quotes has no time column
+            PyTAExceptionBadSeriesData: If time is not sorted or precedes already processed bars
+        """
+        time_ms = quotes['time'].view(np.int64)
+        if self._origin_ms is None and len(time_ms):
+            self._origin_ms = get_origin(self._origin, self._unit, time_ms)
+        self._template = quotes
+
+        buckets = calc_buckets(time_ms, self._count, self._unit, self._origin_ms or 0)
+        columns = [name for name in OHLCV_COLUMNS if name in quotes._data]
+        data = {name: quotes[name] for name in columns}
+
+        if self._pending is not None:
+            buckets = np.hstack((self._pending_bucket, buckets))
+            data = {name: np.hstack((self._pending[name], data[name])) for name in columns}
+        check_sorted(buckets)
+
+        if len(buckets) == 0:
+            return self._create_quotes(self._empty(columns))
+
+        result, group_buckets = aggregate(data, buckets, self._count, self._unit, self._origin_ms)
+
+        self._pending = {name: values[-1:] for name, values in result.items()}
+        self._pending_bucket = group_buckets[-1:]
+
+        return self._create_quotes({name: values[:-1] for name, values in result.items()})
+
+    @property
+    def partial(self):
+        """Quotes object with the bar being formed (None if there is no bar)."""
+        if self._pending is None:
+            return None
+        return self._create_quotes(dict(self._pending))
+
+    def flush(self):
+        """Close the bar being formed and return it.
+
+        Returns:
+            Quotes object with the last bar (None if there is no bar)
+        """
+        partial = self.partial
+        self._pending = None
+        self._pending_bucket = None
+        return partial
+
+    def _empty(self, columns):
+        result = {name: np.empty(0, dtype=np.float64) for name in columns}
+        result['time'] = np.empty(0, dtype=TIME_TYPE)
+        return result
+
+    def _create_quotes(self, data):
+        return self._template._create_from_dict(data)
+
+
+@nb.njit(cache=True)
+def calc_align_indexes(available_times, base_times):
+    """Find the last source bar available at each base bar.
+
+    Args:
+        available_times: Times (int64) when source bars become available, non-decreasing
+        base_times: Base bar times (int64), non-decreasing
+
+    Returns:
+        Array of source bar indexes (-1 if no source bar is available)
+    """
+    n_source = len(available_times)
+    indexes = np.empty(len(base_times), dtype=np.int64)
+
+    j = -1
+    for i in range(len(base_times)):
+        while j + 1 < n_source and available_times[j + 1] <= base_times[i]:
+            j += 1
+        indexes[i] = j
+
+    return indexes
+
+
+def bar_close_times(time_ms, timeframe=None):
+    """Calculate times when bars are closed.
+
+    Args:
+        time_ms: Bar start times as int64 milliseconds
+        timeframe: Timeframe of bars. If None, a bar is closed at the start of the next bar
+            and the last bar is never closed.
+
+    Returns:
+        numpy.ndarray: int64 close times
+    """
+    if timeframe is None:
+        return np.hstack((time_ms[1:], np.iinfo(np.int64).max))
+
+    count, unit = parse_timeframe(timeframe)
+    if unit == 'M':
+        months = time_ms.view(TIME_TYPE).astype('datetime64[M]')
+        return (months + count).astype(TIME_TYPE).view(np.int64)
+    return time_ms + timeframe_step(count, unit)
+
+
+def align_indexes(time, base_time, method='last_closed', timeframe=None):
+    """Map base bars to source (higher timeframe) bars.
+
+    Args:
+        time: Source bar times (datetime64)
+        base_time: Base bar times (datetime64)
+        method: 'last_closed' - last source bar closed at the start of the base bar (no lookahead),
+            'current' - source bar containing the base bar (lookahead)
+        timeframe: Timeframe of source bars (used to find close time of the last bar)
+
+    Returns:
+        numpy.ndarray: int64 source indexes for each base bar (-1 if there is no source bar)
+    """
+    time_ms = np.asarray(time).astype(TIME_TYPE).view(np.int64)
+    base_ms = np.asarray(base_time).astype(TIME_TYPE).view(np.int64)
+
+    if method == 'last_closed':
+        available_times = bar_close_times(time_ms, timeframe)
+    elif method == 'current':
+        available_times = time_ms
+    else:
+        raise PyTAExceptionBadParameterValue(f"method must be 'last_closed' or 'current', got {method}")
+
+    for times in (available_times, base_ms):
+        if len(times) > 1 and np.any(times[1:] < times[:-1]):
+            raise PyTAExceptionBadSeriesData('time must be sorted in ascending order')
+
+    return calc_align_indexes(available_times, base_ms)
@@ -0,0 +1,367 @@
+"""Resumable calculation of indicators.
+
+Indicators are calculated with a Calculation object. Its steps (moving
+averages, running sums, windows of the last values, shifts, cumulative sums)
+keep their terminal state, which is saved on the result. When bars are
+appended to quotes, calculation continues from this state over the new bars
+only and gives the same values as calculation over all bars.
+
+Indicators with other series of bars among parameters (e.g. the second
+quotes of pair indicators) list them in SERIES_PARAMS of the module: such
+parameters are sliced together with quotes and are not compared with the
+parameters of the previous calculation.
+
+Example:
+    >>> result = ta.ema(quotes, period=20)
+    >>> result = ta.ema(quotes_with_new_bars, period=20, resume_from=result)
+"""
+import numpy as np
+
+from .indicator_result import IndicatorResult, Deferred
+from .move_average import MA_Type, ma_calculate, ma_alpha, ema_continue, get_first_index_not_nan
+from .rolling import calc_sum_state, calc_var_state, calc_comoments_state
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData, PyTAExceptionTooLittleData
+
+
+class ResumeNotPossible(Exception):
+    """Raised by calculation steps when the state does not allow to continue (full calculation is needed)."""
+
+
+class SeriesBuffer:
+    """Over-allocated array of a series continued by resumed calculations.
+
+    Results of consecutive calculations share the buffer: values of new bars are
+    written after values of the previous result, if no other calculation was
+    continued from it. So continuing a series costs O(new bars) (amortized).
+    """
+
+    __slots__ = ('values', 'length')
+
+    def __init__(self, n_values, dtype):
+        """Initialize SeriesBuffer with capacity for appending n_values more values."""
+        self.values = np.empty(n_values * 2, dtype=dtype)
+        self.length = 0
+
+
+class Calculation:
+    """Calculation of an indicator over all bars or over new bars from the previous state.
+
+    Steps get values of the calculated part of bars (all bars, or new bars when
+    resumed) and return results for the same bars. The state of each step is
+    saved under its key.
+
+    A provisional calculation is a calculation of a bar that is not closed yet
+    (see stream.IndicatorStream.update): steps may give its values by a cheaper
+    method, within rounding, but save the same state.
+    """
+
+    __slots__ = ('prev', 'prev_result', 'state', 'buffers', 'start', 'n_bars', 'prefix', 'indicator', '_params', '_bind',
+                 'provisional')
+
+    def __init__(self, n_bars, prev=None, prev_result=None):
+        """Initialize Calculation.
+
+        Args:
+            n_bars: Number of all bars
+            prev: Calculation with the state after the previous bars
+                (None for calculation over all bars)
+            prev_result: IndicatorResult of the previous calculation, its series
+                are continued by result()
+        """
+        self.prev_result = prev_result
+        self.prev = prev
+        self.state = {}
+        self.buffers = {}
+        self.start = prev.n_bars if prev is not None else 0
+        self.n_bars = n_bars
+        self.prefix = ''
+        self.indicator = None
+        self._params = None
+        self._bind = None
+        self.provisional = False
+
+    @property
+    def params(self):
+        """Indicator parameters without series parameters (None for nested calculations).
+
+        Parameters set with bind_later are bound on first use, so calculations
+        that are never continued do not bind the arguments of their calls.
+        """
+        if self._bind is not None:
+            self._params = self._bind()
+            self._bind = None
+        return self._params
+
+    @params.setter
+    def params(self, params):
+        self._params = params
+        self._bind = None
+
+    def bind_later(self, bind):
+        """Set parameters to the result of bind() called on first use of params."""
+        self._params = None
+        self._bind = bind
+
+    @property
+    def resumed(self):
+        """True if calculation continues from the previous state."""
+        return self.prev is not None
+
+    def child(self, prefix):
+        """Calculation for a nested indicator with keys under prefix."""
+        child = Calculation.__new__(Calculation)
+        child.prev_result = self.prev_result
+        child.prev = self.prev
+        child.state = self.state
+        child.buffers = self.buffers
+        child.start = self.start
+        child.n_bars = self.n_bars
+        child.prefix = f'{self.prefix}{prefix}.'
+        child.indicator = None
+        child._params = None
+        child._bind = None
+        child.provisional = self.provisional
+        return child
+
+    def load(self, key):
+        """Get state value saved by the previous calculation."""
+        try:
+            return self.prev.state[self.prefix + key]
+        except KeyError:
+            raise ResumeNotPossible(key)
+
+    def save(self, key, value):
+        """Save state value for the next calculation."""
+        self.state[self.prefix + key] = value
+
+    def head(self, n):
+        """Number of calculated bars that are among the first n bars of the series."""
+        return max(0, min(n, self.n_bars) - self.start)
+
+    def extend(self, key, values, n_last):
+        """Prepend the last values of the previous calculation and save the last n_last values.
+
+        Returns:
+            values of the calculated part, preceded by up to n_last previous values when resumed
+        """
+        if self.resumed:
+            values = np.concatenate((self.load(key), values))
+        self.save(key, values[max(len(values) - n_last, 0):].copy())
+        return values
+
+    def window(self, key, func, arrays, length):
+        """Calculate a function of windows of length last values (func(*arrays) -> array or tuple)."""
+        n_values = len(arrays[0])
+        extended = [self.extend(f'{key}.{i}', values, length - 1) for i, values in enumerate(arrays)]
+        out = func(*extended)
+        if not self.resumed:
+            return out
+        if isinstance(out, tuple):
+            return tuple(values[max(len(values) - n_values, 0):] for values in out)
+        return out[max(len(out) - n_values, 0):]
+
+    def previous(self, key, values, first_value=np.nan):
+        """Values shifted by one bar (first_value for the first bar of the series)."""
+        out = np.empty(len(values), dtype=np.result_type(values.dtype, np.float64))
+        if len(values) == 0:
+            return out
+        out[0] = self.load(key) if self.resumed else first_value
+        out[1:] = values[:-1]
+        self.save(key, values[-1])
+        return out
+
+    def cumsum(self, key, values):
+        """Cumulative sum over all bars."""
+        if self.resumed:
+            out = np.cumsum(np.concatenate(([self.load(key)], values)))[1:]
+        else:
+            out = np.cumsum(values)
+        if len(out):
+            self.save(key, out[-1])
+        elif not self.resumed:
+            self.save(key, np.zeros(1, dtype=out.dtype)[0])
+        return out
+
+    def count(self, key, values):
+        """Number of values of the series before values, saving the number after them.
+
+        Series of derived values can start after the first bar (e.g. price changes),
+        so rolling steps count their own values.
+        """
+        n_before = self.load(f'{key}.n') if self.resumed else 0
+        self.save(f'{key}.n', n_before + len(values))
+        return n_before
+
+    def sum(self, key, values, period):
+        """Rolling sum (see rolling.calc_sum_state)."""
+        if self.resumed:
+            window_sum, n_nans = self.load(f'{key}.sum'), self.load(f'{key}.n_nans')
+        else:
+            window_sum, n_nans = 0.0, 0
+        n_before = self.count(key, values)
+        extended = self.extend(f'{key}.window', values, period)
+        start = len(extended) - len(values)
+        out, window_sum, n_nans = calc_sum_state(extended, period, start, n_before - start, window_sum, n_nans)
+        self.save(f'{key}.sum', window_sum)
+        self.save(f'{key}.n_nans', n_nans)
+        return out
+
+    def mean(self, key, values, period):
+        """Rolling mean."""
+        return self.sum(key, values, period) / period
+
+    def var(self, key, values, period, ddof=0):
+        """Rolling variance (see rolling.calc_var_state)."""
+        names = ('count', 'mean', 'm2', 'n_nans', 'n_equal')
+        if self.resumed:
+            state = [self.load(f'{key}.{name}') for name in names]
+        else:
+            state = [0, 0.0, 0.0, 0, 0]
+        n_before = self.count(key, values)
+        extended = self.extend(f'{key}.window', values, period)
+        start = len(extended) - len(values)
+        out, *state = calc_var_state(extended, period, ddof, start, n_before - start, *state)
+        for name, value in zip(names, state):
+            self.save(f'{key}.{name}', value)
+        return out
+
+    def std(self, key, values, period, ddof=0):
+        """Rolling standard deviation."""
+        return np.sqrt(self.var(key, values, period, ddof))
+
+    def comoments(self, key, x, y, period):
+        """Rolling co-moments of two series (see rolling.calc_comoments_state).
+
+        Returns:
+            Tuple of (c_xy, m2_x, m2_y)
+        """
+        names = ('count', 'mean_x', 'mean_y', 'sum_xy', 'sum_xx', 'sum_yy', 'n_nans', 'n_equal_x', 'n_equal_y')
+        if self.resumed:
+            state = [self.load(f'{key}.{name}') for name in names]
+        else:
+            state = [0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0, 0]
+        n_before = self.count(key, x)
+        extended_x = self.extend(f'{key}.window_x', x, period)
+        extended_y = self.extend(f'{key}.window_y', y, period)
+        start = len(extended_x) - len(x)
+        c_xy, m2_x, m2_y, *state = calc_comoments_state(extended_x, extended_y, period, start, n_before - start, *state)
+        for name, value in zip(names, state):
+            self.save(f'{key}.{name}', value)
+        return c_xy, m2_x, m2_y
+
+    def ma(self, key, values, period, ma_type):
+        """Moving average of ma_type (see move_average.ma_calculate)."""
+        if ma_type == MA_Type.sma:
+            if period == 1:
+                return values
+            if not self.resumed and len(values) < period:
+                raise PyTAExceptionTooLittleData(f'data length {len(values)} < {period}')
+            return self.mean(key, values.astype(np.float64, copy=False), period)
+
+        # Exponential averages: the state is the last value after the start of the average
+        started = self.resumed and self.load(f'{key}.started')
+        if started:
+            out = ema_continue(values, ma_alpha(period, ma_type), self.load(f'{key}.value'))
+        else:
+            out = ma_calculate(values, period, ma_type)
+            started = get_first_index_not_nan(values) < len(values)
+
+        self.save(f'{key}.started', started)
+        self.save(f'{key}.value', out[-1] if len(out) else np.nan)
+        return out
+
+    def result(self, series, outputs=None, eager=()):
+        """Create the result with this calculation as its state.
+
+        When resumed, series of new bars are appended to series of the previous
+        result (see SeriesBuffer). A series longer than new bars replaces the last
+        values of the previous series (indicators that revise recent values, like
+        zigzag), such series are copied.
+        """
+        if not self.resumed:
+            result = IndicatorResult._from_series(series, outputs, eager)
+            result._state = self
+            return result
+
+        n_new = self.n_bars - self.start
+        data = {}
+        for name in self.prev_result.series_names():
+            values = series[name]
+            if isinstance(values, Deferred):
+                values = values()
+            n_revised = min(len(values) - n_new, self.start)
+            n_kept = self.start - n_revised
+            prev_values = self.prev_result[name]
+
+            buffer = self.prev.buffers.get(name)
+            if buffer is None or n_revised or buffer.length != self.start or prev_values.base is not buffer.values \
+                    or len(buffer.values) < self.n_bars:
+                buffer = SeriesBuffer(self.n_bars, prev_values.dtype)
+                buffer.values[:n_kept] = prev_values[:n_kept]
+
+            buffer.values[n_kept: self.n_bars] = values[len(values) - n_new - n_revised:]
+            buffer.length = self.n_bars
+            self.buffers[name] = buffer
+            data[name] = buffer.values[:self.n_bars]
+
+        # The previous state and result are not needed to continue from this one
+        self.prev = None
+        self.prev_result = None
+
+        result = IndicatorResult._from_arrays(data)
+        result._state = self
+        return result
+
+
+def state_params(module, params):
+    """Parameters saved in the calculation state (without series parameters of the module)."""
+    series_params = getattr(module, 'SERIES_PARAMS', ())
+    return {name: value for name, value in params.items() if name not in series_params}
+
+
+def slice_series_params(module, params, key):
+    """Parameters with series parameters of the module sliced by key."""
+    series_params = getattr(module, 'SERIES_PARAMS', ())
+    return {name: value[key] if name in series_params else value for name, value in params.items()}
+
+
+def calculate_resumed(module, quotes, args, kwargs, params, prev_result):
+    """Continue calculation of the indicator over new bars of quotes.
+
+    Args:
+        module: Indicator module
+        quotes: Quotes with all bars (bars of prev_result followed by new bars)
+        args, kwargs: Arguments of the indicator call
+        params: Dictionary of all indicator parameters
+        prev_result: Result of the indicator for the first bars of quotes
+
+    Returns:
+        IndicatorResult for all bars of quotes
+    """
+    prev = prev_result._state if isinstance(prev_result, IndicatorResult) else None
+    if prev is None or prev.indicator is not module:
+        raise PyTAExceptionBadParameterValue('resume_from must be a result of the same indicator with calculation state')
+    if prev.params != state_params(module, params):
+        raise PyTAExceptionBadParameterValue(f'resume_from was calculated with other parameters: {prev.params}')
+
+    n_bars = len(quotes.close)
+    if n_bars < prev.n_bars:
+        raise PyTAExceptionBadSeriesData(f'quotes length {n_bars} < length of resume_from {prev.n_bars}')
+    if n_bars == prev.n_bars:
+        return prev_result
+
+    # Deferred series save the state of their steps when calculated
+    prev_result._materialize()
+
+    calc = Calculation(n_bars, prev, prev_result)
+    calc.indicator = module
+    calc.params = state_params(module, params)
+    try:
+        new_bars = slice(prev.n_bars, None)
+        series = module.calculate(calc, quotes[new_bars], **slice_series_params(module, params, new_bars))
+        return calc.result(series)
+    except ResumeNotPossible:
+        result = module.get_indicator_out(quotes, *args, **kwargs)
+        result._state.indicator = module
+        result._state.params = calc.params
+        return result
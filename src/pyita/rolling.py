@@ -0,0 +1,1019 @@
+"""Rolling window primitives.
+
+All functions calculate values over a window of the last period elements in O(n).
+Positions before the first full window (the first period-1 elements) are warm-up:
+NaN for float outputs and -1 for integer outputs. A window containing NaN gives
+NaN (-1 for indexes), except count, which counts non-NaN values.
+
+Sums, variances and extremums are updated in O(1) amortized per element;
+quantiles, medians and percentile ranks use an order statistic window
+(Fenwick tree over value ranks) with O(log period) per element.
+
+Kernels (calc_*) are compiled with numba and can be called from other kernels;
+functions without prefix validate parameters and convert values to float64.
+
+Example:
+    >>> from pyita import rolling
+    >>> highest = rolling.max(quotes.high, 20)
+    >>> deviation = rolling.std(quotes.close, 20, ddof=1)
+"""
+import numpy as np
+import numba as nb
+
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
+
+# Length of chunks with common value ranks for order statistics (in periods)
+QUANTILE_CHUNK_PERIODS = 4
+QUANTILE_MIN_CHUNK = 1024
+
+
+@nb.njit(cache=True, inline='always')
+def sum_step(window, last, old_value, position, period, window_sum, n_nans):
+    """Add window[last] to the rolling sum and remove old_value leaving the window.
+
+    The step of calc_sum_state, also used by streaming states (multi_stream)
+    on a circular buffer of the last period values.
+
+    Args:
+        window: Array of values, window[last - period + 1: last + 1] are the
+            values of the window (read only when the sum is recalculated)
+        last: Index of the new value in window
+        old_value: Value leaving the window (used if position >= period)
+        position: Position of the new value in the whole series
+        period: Window length
+        window_sum, n_nans: State after the previous value
+
+    Returns:
+        Tuple of (ready, window_sum, n_nans), ready is False if the window
+        is not full or contains NaN
+    """
+    value = window[last]
+    if np.isnan(value):
+        n_nans += 1
+    else:
+        window_sum += value
+
+    if position >= period:
+        if np.isnan(old_value):
+            n_nans -= 1
+        else:
+            window_sum -= old_value
+
+    if position < period - 1 or n_nans > 0:
+        return False, window_sum, n_nans
+
+    if (position + 1) % period == 0:
+        window_sum = 0.0
+        for j in range(last - period + 1, last + 1):
+            window_sum += window[j]
+
+    return True, window_sum, n_nans
+
+
+@nb.njit(cache=True)
+def calc_sum_state(values, period, start, index, window_sum, n_nans):
+    """Calculate rolling sum from a saved state.
+
+    The running sum is recalculated from the window every period elements,
+    so the rounding error does not accumulate over long series.
+
+    Values before start are the last values of the previous calculation (the
+    last period of them, or all), index is the position of values[0] in the
+    whole series. Calculation from start = 0, index = 0 and zero state gives
+    the sums of the whole series.
+
+    Args:
+        values: Array of values
+        period: Window length
+        start: Index of the first value to calculate
+        index: Position of values[0] in the whole series
+        window_sum: Running sum of the window after the previous calculation
+        n_nans: Number of NaN values in the window after the previous calculation
+
+    Returns:
+        Tuple of (sums of values from start, window_sum, n_nans)
+    """
+    n = len(values)
+    result = np.empty(n - start, dtype=np.float64)
+
+    for i in range(start, n):
+        old_value = values[i - period] if index + i >= period else np.nan
+        ready, window_sum, n_nans = sum_step(values, i, old_value, index + i, period, window_sum, n_nans)
+        result[i - start] = window_sum if ready else np.nan
+
+    return result, window_sum, n_nans
+
+
+@nb.njit(cache=True)
+def calc_sum(values, period):
+    """Calculate rolling sum.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        Array of sums
+    """
+    return calc_sum_state(values, period, 0, 0, 0.0, 0)[0]
+
+
+@nb.njit(cache=True)
+def calc_mean(values, period):
+    """Calculate rolling mean.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        Array of means
+    """
+    return calc_sum(values, period) / period
+
+
+@nb.njit(cache=True, inline='always')
+def var_add(value, old_value, full, count, mean, m2, n_nans):
+    """Welford update of the window moments: add value and remove old_value if the window is full.
+
+    The update step of calc_var_state, also used by streaming states (multi_stream).
+
+    Returns:
+        Tuple of (count, mean, m2, n_nans)
+    """
+    if np.isnan(value):
+        n_nans += 1
+    else:
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+
+    if full:
+        if np.isnan(old_value):
+            n_nans -= 1
+        elif count == 1:
+            count = 0
+            mean = 0.0
+            m2 = 0.0
+        else:
+            count -= 1
+            delta = old_value - mean
+            mean -= delta / count
+            m2 -= delta * (old_value - mean)
+
+    return count, mean, m2, n_nans
+
+
+@nb.njit(cache=True, inline='always')
+def window_moments(window, last, period):
+    """Mean and sum of squared deviations of window[last - period + 1: last + 1].
+
+    Returns:
+        Tuple of (mean, m2)
+    """
+    mean = 0.0
+    for j in range(last - period + 1, last + 1):
+        mean += window[j]
+    mean /= period
+    m2 = 0.0
+    for j in range(last - period + 1, last + 1):
+        m2 += (window[j] - mean) ** 2
+    return mean, m2
+
+
+@nb.njit(cache=True)
+def calc_var_state(values, period, ddof, start, index, count, mean, m2, n_nans, n_equal):
+    """Calculate rolling variance with Welford updates from a saved state.
+
+    Mean and sum of squared deviations are updated when a value enters and
+    leaves the window and are recalculated every period elements. A window of
+    equal values gives exactly 0.
+
+    Values before start and index have the same meaning as in calc_sum_state.
+
+    Args:
+        values: Array of values
+        period: Window length
+        ddof: Delta degrees of freedom (divisor is period - ddof)
+        start: Index of the first value to calculate
+        index: Position of values[0] in the whole series
+        count, mean, m2, n_nans, n_equal: State after the previous calculation
+
+    Returns:
+        Tuple of (variances of values from start, count, mean, m2, n_nans, n_equal)
+    """
+    n = len(values)
+    result = np.empty(n - start, dtype=np.float64)
+
+    divisor = period - ddof
+    for i in range(start, n):
+        value = values[i]
+        # Length of the run of equal values: variance of a constant window is exactly 0
+        n_equal = n_equal + 1 if index + i > 0 and value == values[i - 1] else 1
+        full = index + i >= period
+        count, mean, m2, n_nans = var_add(value, values[i - period] if full else np.nan, full, count, mean, m2, n_nans)
+
+        if index + i < period - 1 or n_nans > 0 or divisor <= 0:
+            result[i - start] = np.nan
+            continue
+
+        if n_equal >= period:
+            count = period
+            mean = value
+            m2 = 0.0
+        elif (index + i + 1) % period == 0:
+            mean, m2 = window_moments(values, i, period)
+
+        result[i - start] = (m2 if m2 > 0.0 else 0.0) / divisor
+
+    return result, count, mean, m2, n_nans, n_equal
+
+
+@nb.njit(cache=True)
+def calc_var(values, period, ddof=0):
+    """Calculate rolling variance.
+
+    Args:
+        values: Array of values
+        period: Window length
+        ddof: Delta degrees of freedom (divisor is period - ddof)
+
+    Returns:
+        Array of variances (NaN if period <= ddof)
+    """
+    return calc_var_state(values, period, ddof, 0, 0, 0, 0.0, 0.0, 0, 0)[0]
+
+
+@nb.njit(cache=True)
+def calc_std(values, period, ddof=0):
+    """Calculate rolling standard deviation.
+
+    Args:
+        values: Array of values
+        period: Window length
+        ddof: Delta degrees of freedom (divisor is period - ddof)
+
+    Returns:
+        Array of standard deviations
+    """
+    return np.sqrt(calc_var(values, period, ddof))
+
+
+@nb.njit(cache=True)
+def calc_comoments_state(x, y, period, start, index, count, mean_x, mean_y, sum_xy, sum_xx, sum_yy,
+                         n_nans, n_equal_x, n_equal_y):
+    """Calculate rolling co-moments of two series with Welford updates from a saved state.
+
+    Means and sums of products of deviations are updated when a pair of values
+    enters and leaves the window and are recalculated every period elements.
+    A window of equal values of a series gives exactly 0 for its sums. A pair
+    with NaN makes windows containing it NaN.
+
+    Values before start and index have the same meaning as in calc_sum_state.
+
+    Args:
+        x: Array of values of the first series
+        y: Array of values of the second series (the same length)
+        period: Window length
+        start: Index of the first value to calculate
+        index: Position of x[0] in the whole series
+        count, mean_x, mean_y, sum_xy, sum_xx, sum_yy, n_nans, n_equal_x, n_equal_y:
+            State after the previous calculation
+
+    Returns:
+        Tuple of (c_xy, m2_x, m2_y, *state): sums of products of deviations from the window
+        means for values from start, and the state after them
+    """
+    n = len(x)
+    c_xy = np.empty(n - start, dtype=np.float64)
+    m2_x = np.empty(n - start, dtype=np.float64)
+    m2_y = np.empty(n - start, dtype=np.float64)
+
+    for i in range(start, n):
+        value_x, value_y = x[i], y[i]
+        n_equal_x = n_equal_x + 1 if index + i > 0 and value_x == x[i - 1] else 1
+        n_equal_y = n_equal_y + 1 if index + i > 0 and value_y == y[i - 1] else 1
+        if np.isnan(value_x) or np.isnan(value_y):
+            n_nans += 1
+        else:
+            count += 1
+            delta_x = value_x - mean_x
+            delta_y = value_y - mean_y
+            mean_x += delta_x / count
+            mean_y += delta_y / count
+            sum_xy += delta_x * (value_y - mean_y)
+            sum_xx += delta_x * (value_x - mean_x)
+            sum_yy += delta_y * (value_y - mean_y)
+
+        if index + i >= period:
+            old_x, old_y = x[i - period], y[i - period]
+            if np.isnan(old_x) or np.isnan(old_y):
+                n_nans -= 1
+            elif count == 1:
+                count = 0
+                mean_x = mean_y = 0.0
+                sum_xy = sum_xx = sum_yy = 0.0
+            else:
+                count -= 1
+                delta_x = old_x - mean_x
+                delta_y = old_y - mean_y
+                mean_x -= delta_x / count
+                mean_y -= delta_y / count
+                sum_xy -= delta_x * (old_y - mean_y)
+                sum_xx -= delta_x * (old_x - mean_x)
+                sum_yy -= delta_y * (old_y - mean_y)
+
+        k = i - start
+        if index + i < period - 1 or n_nans > 0:
+            c_xy[k] = m2_x[k] = m2_y[k] = np.nan
+            continue
+
+        if (index + i + 1) % period == 0:
+            mean_x = mean_y = 0.0
+            for j in range(i - period + 1, i + 1):
+                mean_x += x[j]
+                mean_y += y[j]
+            mean_x /= period
+            mean_y /= period
+            sum_xy = sum_xx = sum_yy = 0.0
+            for j in range(i - period + 1, i + 1):
+                sum_xy += (x[j] - mean_x) * (y[j] - mean_y)
+                sum_xx += (x[j] - mean_x) ** 2
+                sum_yy += (y[j] - mean_y) ** 2
+
+        c_xy[k] = sum_xy
+        m2_x[k] = sum_xx if sum_xx > 0.0 else 0.0
+        m2_y[k] = sum_yy if sum_yy > 0.0 else 0.0
+        if n_equal_x >= period:
+            c_xy[k] = m2_x[k] = 0.0
+        if n_equal_y >= period:
+            c_xy[k] = m2_y[k] = 0.0
+
+    return c_xy, m2_x, m2_y, count, mean_x, mean_y, sum_xy, sum_xx, sum_yy, n_nans, n_equal_x, n_equal_y
+
+
+@nb.njit(cache=True)
+def calc_comoments(x, y, period):
+    """Calculate rolling co-moments of two series.
+
+    Args:
+        x: Array of values of the first series
+        y: Array of values of the second series (the same length)
+        period: Window length
+
+    Returns:
+        Tuple of arrays (c_xy, m2_x, m2_y): sums of products of deviations from the
+        window means (NaN for the first period-1 elements and windows with NaN)
+    """
+    c_xy, m2_x, m2_y = calc_comoments_state(x, y, period, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0, 0)[:3]
+    return c_xy, m2_x, m2_y
+
+
+@nb.njit(cache=True)
+def calc_arg_extremum(values, period, is_max):
+    """Calculate indexes of rolling extremums with a monotonic deque.
+
+    The deque holds indexes of values that can still become the extremum of
+    a window. Equal values do not push out older ones, so the oldest of equal
+    extremums is returned (like np.argmax).
+
+    Args:
+        values: Array of values
+        period: Window length
+        is_max: True for maximums, False for minimums
+
+    Returns:
+        Array of absolute indexes of extremums (int64)
+    """
+    n = len(values)
+    result = np.empty(n, dtype=np.int64)
+    result[:period - 1] = -1
+
+    # Ring buffer of indexes, head is the extremum of the window
+    deque = np.empty(period, dtype=np.int64)
+    head = 0
+    size = 0
+    i_last_nan = -period
+    for i in range(n):
+        value = values[i]
+
+        if size > 0 and deque[head] <= i - period:
+            head = (head + 1) % period
+            size -= 1
+
+        if np.isnan(value):
+            i_last_nan = i
+        else:
+            while size > 0:
+                back_value = values[deque[(head + size - 1) % period]]
+                if (back_value < value) if is_max else (back_value > value):
+                    size -= 1
+                else:
+                    break
+            deque[(head + size) % period] = i
+            size += 1
+
+        if i < period - 1:
+            continue
+
+        result[i] = -1 if i - i_last_nan < period else deque[head]
+
+    return result
+
+
+@nb.njit(cache=True)
+def calc_argmax(values, period):
+    """Calculate absolute indexes of rolling maximums.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        Array of indexes (int64)
+    """
+    return calc_arg_extremum(values, period, True)
+
+
+@nb.njit(cache=True)
+def calc_argmin(values, period):
+    """Calculate absolute indexes of rolling minimums.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        Array of indexes (int64)
+    """
+    return calc_arg_extremum(values, period, False)
+
+
+@nb.njit(cache=True)
+def take_by_indexes(values, indexes):
+    """Get values by indexes, NaN for negative indexes.
+
+    Args:
+        values: Array of values
+        indexes: Array of indexes
+
+    Returns:
+        Array of values
+    """
+    result = np.empty(len(indexes), dtype=np.float64)
+    for i in range(len(indexes)):
+        result[i] = np.nan if indexes[i] < 0 else values[indexes[i]]
+    return result
+
+
+@nb.njit(cache=True)
+def calc_max(values, period):
+    """Calculate rolling maximum.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        Array of maximums
+    """
+    return take_by_indexes(values, calc_arg_extremum(values, period, True))
+
+
+@nb.njit(cache=True)
+def calc_min(values, period):
+    """Calculate rolling minimum.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        Array of minimums
+    """
+    return take_by_indexes(values, calc_arg_extremum(values, period, False))
+
+
+@nb.njit(cache=True)
+def calc_count(values, period):
+    """Calculate rolling count of non-NaN values.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        Array of counts (int64)
+    """
+    n = len(values)
+    result = np.empty(n, dtype=np.int64)
+    result[:period - 1] = -1
+
+    count = 0
+    for i in range(n):
+        if not np.isnan(values[i]):
+            count += 1
+        if i >= period and not np.isnan(values[i - period]):
+            count -= 1
+        if i >= period - 1:
+            result[i] = count
+
+    return result
+
+
+@nb.njit(cache=True)
+def rank_segment(segment):
+    """Sort a segment of values and get value ranks.
+
+    Args:
+        segment: Array of values
+
+    Returns:
+        tuple: (sorted_values, ranks), ranks are 1-based positions in sorted_values
+    """
+    order = np.argsort(segment)
+    ranks = np.empty(len(segment), dtype=np.int64)
+    ranks[order] = np.arange(1, len(segment) + 1)
+    return segment[order], ranks
+
+
+@nb.njit(cache=True)
+def chunk_length(period):
+    """Number of windows of a chunk with common value ranks (see rank_chunk)."""
+    # Built-in max and min are shadowed by rolling functions of this module
+    chunk_len = QUANTILE_CHUNK_PERIODS * period
+    if chunk_len < QUANTILE_MIN_CHUNK:
+        chunk_len = QUANTILE_MIN_CHUNK
+    return chunk_len
+
+
+@nb.njit(cache=True)
+def rank_chunk(values, period, chunk_start):
+    """Sort values of a chunk of windows and get value ranks.
+
+    Windows ending at bars chunk_start..chunk_start + chunk_length(period) - 1
+    share ranks of their values, so Fenwick trees indexed by rank stay small
+    (O(log period) per value).
+
+    Args:
+        values: Array of values
+        period: Window length
+        chunk_start: Index of the last value of the first window of the chunk
+
+    Returns:
+        tuple: (first, segment, sorted_values, ranks), segment is values of the
+        chunk from index first (period - 1 values before chunk_start)
+    """
+    first = chunk_start - period + 1
+    segment = values[first: chunk_start + chunk_length(period)]
+    sorted_values, ranks = rank_segment(segment)
+    return first, segment, sorted_values, ranks
+
+
+@nb.njit(cache=True)
+def tree_add(tree, j, value):
+    """Add value (count or sum) to position j of a Fenwick tree (1-based)."""
+    size = len(tree) - 1
+    while j <= size:
+        tree[j] += value
+        j += j & -j
+
+
+@nb.njit(cache=True)
+def tree_prefix(tree, j):
+    """Get sum of positions 1..j of a Fenwick tree."""
+    # Position 0 is not used, it is zero of the type of the tree
+    total = tree[0]
+    while j > 0:
+        total += tree[j]
+        j -= j & -j
+    return total
+
+
+@nb.njit(cache=True)
+def tree_find(tree, k):
+    """Find the smallest position with prefix sum >= k (k-th value in order)."""
+    size = len(tree) - 1
+    step = 1
+    while step * 2 <= size:
+        step *= 2
+
+    position = 0
+    while step > 0:
+        if position + step <= size and tree[position + step] < k:
+            position += step
+            k -= tree[position]
+        step //= 2
+
+    return position + 1
+
+
+@nb.njit(cache=True)
+def calc_quantiles(values, period, quantiles):
+    """Calculate rolling quantiles with an order statistic window.
+
+    Window values are counted in a Fenwick tree indexed by value rank, a k-th
+    value is found by descent of the tree. Ranks are calculated for chunks of
+    several periods, so the tree stays small: O(log period) per value and
+    quantile. Quantiles are interpolated linearly (like np.quantile).
+
+    Args:
+        values: Array of values
+        period: Window length
+        quantiles: Array of quantiles in [0, 1]
+
+    Returns:
+        2-D array (len(quantiles), len(values)) of quantile values
+    """
+    n = len(values)
+    result = np.empty((len(quantiles), n), dtype=np.float64)
+    result[:] = np.nan
+
+    for chunk_start in range(period - 1, n, chunk_length(period)):
+        first, segment, sorted_values, ranks = rank_chunk(values, period, chunk_start)
+
+        tree = np.zeros(len(segment) + 1, dtype=np.int64)
+        k_last_nan = -period
+        for k in range(len(segment)):
+            if np.isnan(segment[k]):
+                k_last_nan = k
+            tree_add(tree, ranks[k], 1)
+            if k >= period:
+                tree_add(tree, ranks[k - period], -1)
+
+            if k < period - 1 or k - k_last_nan < period:
+                continue
+
+            for i_quantile in range(len(quantiles)):
+                position = quantiles[i_quantile] * (period - 1)
+                i_low = int(position)
+                fraction = position - i_low
+                value = sorted_values[tree_find(tree, i_low + 1) - 1]
+                if fraction > 0:
+                    value_high = sorted_values[tree_find(tree, i_low + 2) - 1]
+                    value += (value_high - value) * fraction
+                result[i_quantile, first + k] = value
+
+    return result
+
+
+@nb.njit(cache=True)
+def calc_quantile(values, period, quantile):
+    """Calculate rolling quantile.
+
+    Args:
+        values: Array of values
+        period: Window length
+        quantile: Quantile in [0, 1]
+
+    Returns:
+        Array of quantile values
+    """
+    return calc_quantiles(values, period, np.array([quantile]))[0]
+
+
+@nb.njit(cache=True)
+def calc_median(values, period):
+    """Calculate rolling median.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        Array of medians
+    """
+    return calc_quantiles(values, period, np.array([0.5]))[0]
+
+
+@nb.njit(cache=True)
+def calc_percentile_rank(values, period):
+    """Calculate rolling percentile rank of the last value of each window.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        Array of percentages (0, 100] of window values that are <= the last value
+    """
+    n = len(values)
+    result = np.empty(n, dtype=np.float64)
+    result[:] = np.nan
+
+    for chunk_start in range(period - 1, n, chunk_length(period)):
+        first, segment, sorted_values, ranks = rank_chunk(values, period, chunk_start)
+
+        tree = np.zeros(len(segment) + 1, dtype=np.int64)
+        k_last_nan = -period
+        for k in range(len(segment)):
+            if np.isnan(segment[k]):
+                k_last_nan = k
+            tree_add(tree, ranks[k], 1)
+            if k >= period:
+                tree_add(tree, ranks[k - period], -1)
+
+            if k < period - 1 or k - k_last_nan < period:
+                continue
+
+            count = tree_prefix(tree, np.searchsorted(sorted_values, segment[k], side='right'))
+            result[first + k] = count / period * 100
+
+    return result
+
+
+def prepare_values(values, period):
+    """Validate window parameters and convert values to float64 array.
+
+    Args:
+        values: Array-like of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: float64 array (without copying if possible)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    if period <= 0:
+        raise PyTAExceptionBadParameterValue(f'period must be greater than 0, got {period}')
+
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 1:
+        raise PyTAExceptionBadParameterValue(f'values must be 1-D array, got {values.ndim}-D')
+
+    data_len = len(values)
+    if data_len < period:
+        raise PyTAExceptionTooLittleData(f'data length {data_len} < {period}')
+
+    return values
+
+
+def sum(values, period):
+    """Rolling sum over period elements.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: Sums (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return calc_sum(prepare_values(values, period), period)
+
+
+def mean(values, period):
+    """Rolling mean over period elements.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: Means (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return calc_mean(prepare_values(values, period), period)
+
+
+def var(values, period, ddof=0):
+    """Rolling variance over period elements.
+
+    Args:
+        values: Array of values
+        period: Window length
+        ddof: Delta degrees of freedom, 0 - population, 1 - sample variance (default: 0)
+
+    Returns:
+        numpy.ndarray: Variances (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0 or ddof is not in [0, period)
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    values = prepare_values(values, period)
+    if ddof < 0 or ddof >= period:
+        raise PyTAExceptionBadParameterValue(f'ddof must be in [0, {period}), got {ddof}')
+    return calc_var(values, period, ddof)
+
+
+def std(values, period, ddof=0):
+    """Rolling standard deviation over period elements.
+
+    Args:
+        values: Array of values
+        period: Window length
+        ddof: Delta degrees of freedom, 0 - population, 1 - sample deviation (default: 0)
+
+    Returns:
+        numpy.ndarray: Standard deviations (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0 or ddof is not in [0, period)
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return np.sqrt(var(values, period, ddof))
+
+
+def prepare_pair(x, y, period):
+    """Validate window parameters and convert two series to float64 arrays of the same length."""
+    x = prepare_values(x, period)
+    y = prepare_values(y, period)
+    if len(x) != len(y):
+        raise PyTAExceptionBadParameterValue(f'series must have the same length, got {len(x)} and {len(y)}')
+    return x, y
+
+
+def cov(x, y, period, ddof=0):
+    """Rolling covariance of two series over period elements.
+
+    Args:
+        x: Array of values of the first series
+        y: Array of values of the second series (the same length)
+        period: Window length
+        ddof: Delta degrees of freedom, 0 - population, 1 - sample covariance (default: 0)
+
+    Returns:
+        numpy.ndarray: Covariances (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0, ddof is not in [0, period)
+            or lengths of series differ
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    x, y = prepare_pair(x, y, period)
+    if ddof < 0 or ddof >= period:
+        raise PyTAExceptionBadParameterValue(f'ddof must be in [0, {period}), got {ddof}')
+    return calc_comoments(x, y, period)[0] / (period - ddof)
+
+
+def corr(x, y, period):
+    """Rolling Pearson correlation of two series over period elements.
+
+    Args:
+        x: Array of values of the first series
+        y: Array of values of the second series (the same length)
+        period: Window length
+
+    Returns:
+        numpy.ndarray: Correlations in [-1, 1] (first period-1 elements and windows
+            where a series is constant are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0 or lengths of series differ
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    c_xy, m2_x, m2_y = calc_comoments(*prepare_pair(x, y, period), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = c_xy / np.sqrt(m2_x * m2_y)
+    result[(m2_x == 0) | (m2_y == 0)] = np.nan
+    return np.clip(result, -1.0, 1.0)
+
+
+def max(values, period):
+    """Rolling maximum over period elements.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: Maximums (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return calc_max(prepare_values(values, period), period)
+
+
+def min(values, period):
+    """Rolling minimum over period elements.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: Minimums (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return calc_min(prepare_values(values, period), period)
+
+
+def argmax(values, period):
+    """Absolute indexes of rolling maximums (the oldest of equal maximums).
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: int64 indexes (first period-1 elements are -1)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return calc_argmax(prepare_values(values, period), period)
+
+
+def argmin(values, period):
+    """Absolute indexes of rolling minimums (the oldest of equal minimums).
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: int64 indexes (first period-1 elements are -1)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return calc_argmin(prepare_values(values, period), period)
+
+
+def count(values, period):
+    """Rolling count of non-NaN values over period elements.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: int64 counts (first period-1 elements are -1)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return calc_count(prepare_values(values, period), period)
+
+
+def quantile(values, period, q):
+    """Rolling quantile over period elements (linear interpolation like np.quantile).
+
+    Args:
+        values: Array of values
+        period: Window length
+        q: Quantile in [0, 1]
+
+    Returns:
+        numpy.ndarray: Quantiles (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0 or q is not in [0, 1]
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    values = prepare_values(values, period)
+    if not 0 <= q <= 1:
+        raise PyTAExceptionBadParameterValue(f'q must be in [0, 1], got {q}')
+    return calc_quantile(values, period, q)
+
+
+def median(values, period):
+    """Rolling median over period elements.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: Medians (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return calc_median(prepare_values(values, period), period)
+
+
+def percentile_rank(values, period):
+    """Rolling percentile rank: percentage of window values <= the last value of the window.
+
+    Args:
+        values: Array of values
+        period: Window length
+
+    Returns:
+        numpy.ndarray: Percentages in (0, 100] (first period-1 elements are NaN)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If period <= 0
+        PyTAExceptionTooLittleData: If data length is less than period
+    """
+    return calc_percentile_rank(prepare_values(values, period), period)
@@ -0,0 +1,252 @@
+"""Signal primitives on series and a screener of symbols by the last bar.
+
+Primitives are compiled kernels producing one output array per call, instead
+of numpy expressions with several temporary boolean arrays. They take 1-D
+series (e.g. series of IndicatorResult) or 2-D arrays (n_symbols, n_bars),
+calculated along bars. NaN values never give signals.
+
+Example:
+    >>> from pyita import signals
+    >>> macd = ta.macd(quotes, 12, 26, 9)
+    >>> buy = signals.cross_above(macd.macd, macd.signal)
+    >>> oversold = signals.hysteresis(ta.rsi(quotes, period=14).rsi, 30, 50)
+    >>> symbols = signals.screen(universe, lambda quotes: ta.rsi(quotes, period=14, tail=1).rsi < 30)
+"""
+import numpy as np
+import numba as nb
+
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
+
+
+@nb.njit(cache=True)
+def calc_cross(a, b, above):
+    """Find bars where a crosses b.
+
+    Args:
+        a, b: Arrays (n_rows, n_bars)
+        above: If True, crosses of a above b (a > b after a <= b), else below (a < b after a >= b)
+
+    Returns:
+        Boolean array (n_rows, n_bars)
+    """
+    n_rows, n_bars = a.shape
+    result = np.zeros((n_rows, n_bars), dtype=np.bool_)
+    for r in range(n_rows):
+        for i in range(1, n_bars):
+            if above:
+                result[r, i] = a[r, i] > b[r, i] and a[r, i - 1] <= b[r, i - 1]
+            else:
+                result[r, i] = a[r, i] < b[r, i] and a[r, i - 1] >= b[r, i - 1]
+    return result
+
+
+@nb.njit(cache=True)
+def calc_bars_since(condition):
+    """Count bars since the last bar with condition (0 at such bars, -1 before the first one)."""
+    n_rows, n_bars = condition.shape
+    result = np.empty((n_rows, n_bars), dtype=np.int64)
+    for r in range(n_rows):
+        count = -1
+        for i in range(n_bars):
+            if condition[r, i]:
+                count = 0
+            elif count >= 0:
+                count += 1
+            result[r, i] = count
+    return result
+
+
+@nb.njit(cache=True)
+def calc_first_after(condition, start):
+    """Find the first bar with condition at or after each bar with start."""
+    n_rows, n_bars = condition.shape
+    result = np.zeros((n_rows, n_bars), dtype=np.bool_)
+    for r in range(n_rows):
+        waiting = False
+        for i in range(n_bars):
+            if start[r, i]:
+                waiting = True
+            if waiting and condition[r, i]:
+                result[r, i] = True
+                waiting = False
+    return result
+
+
+@nb.njit(cache=True)
+def calc_hysteresis(values, enter, exit):
+    """Calculate the state of a threshold with hysteresis.
+
+    For enter > exit the state is set when a value is >= enter and reset when
+    a value is <= exit, for enter < exit it is set when a value is <= enter and
+    reset when a value is >= exit. NaN values keep the state.
+
+    Returns:
+        Boolean array (n_rows, n_bars) of states
+    """
+    n_rows, n_bars = values.shape
+    result = np.zeros((n_rows, n_bars), dtype=np.bool_)
+    sign = 1.0 if enter > exit else -1.0
+    for r in range(n_rows):
+        state = False
+        for i in range(n_bars):
+            value = values[r, i] * sign
+            if state:
+                state = not value <= exit * sign
+            else:
+                state = value >= enter * sign
+            result[r, i] = state
+    return result
+
+
+def prepare_series(*arrays, dtype=np.float64):
+    """Broadcast arrays to one 1-D or 2-D shape.
+
+    Arrays are converted to contiguous arrays of dtype, so numbers and
+    broadcast rows are materialized instead of passed to kernels as views.
+
+    Returns:
+        tuple: (arrays as 2-D (n_rows, n_bars) of dtype, shape of the result)
+
+    Raises:
+        PyTAExceptionBadParameterValue: If arrays have more than 2 dimensions or cannot be broadcast
+    """
+    try:
+        arrays = np.broadcast_arrays(*[np.asarray(values) for values in arrays])
+    except ValueError as e:
+        raise PyTAExceptionBadParameterValue(f'series cannot be broadcast: {e}') from e
+    shape = arrays[0].shape
+    if len(shape) not in (1, 2):
+        raise PyTAExceptionBadParameterValue(f'series must be 1-D or 2-D arrays, got {len(shape)}-D')
+    return [np.ascontiguousarray(values, dtype=dtype).reshape((-1, shape[-1])) for values in arrays], shape
+
+
+def cross_above(a, b):
+    """Find bars where a crosses above b: a > b and a <= b at the previous bar.
+
+    Args:
+        a: Series (1-D array or 2-D array (n_symbols, n_bars))
+        b: Series of the same shape or a number
+
+    Returns:
+        numpy.ndarray: Boolean array of the shape of a
+
+    Example:
+        >>> st = ta.supertrend(quotes)
+        >>> long_entries = signals.cross_above(quotes.close, st.supertrend)
+    """
+    (a, b), shape = prepare_series(a, b)
+    return calc_cross(a, b, True).reshape(shape)
+
+
+def cross_below(a, b):
+    """Find bars where a crosses below b: a < b and a >= b at the previous bar.
+
+    Args:
+        a: Series (1-D array or 2-D array (n_symbols, n_bars))
+        b: Series of the same shape or a number
+
+    Returns:
+        numpy.ndarray: Boolean array of the shape of a
+    """
+    (a, b), shape = prepare_series(a, b)
+    return calc_cross(a, b, False).reshape(shape)
+
+
+def bars_since(condition):
+    """Count bars since the last bar where condition is True.
+
+    Args:
+        condition: Boolean series (1-D array or 2-D array (n_symbols, n_bars))
+
+    Returns:
+        numpy.ndarray: int64 counts (0 at bars with condition, -1 before the first one)
+
+    Example:
+        >>> since_cross = signals.bars_since(signals.cross_above(adx.p_di, adx.m_di))
+    """
+    (condition,), shape = prepare_series(condition, dtype=np.bool_)
+    return calc_bars_since(condition).reshape(shape)
+
+
+def first_after(condition, start):
+    """Find the first bar where condition is True at or after each bar where start is True.
+
+    A start bar arms the signal, the first bar with condition fires it once,
+    later bars with condition are ignored until the next start bar.
+
+    Args:
+        condition: Boolean series (1-D array or 2-D array (n_symbols, n_bars))
+        start: Boolean series of the same shape
+
+    Returns:
+        numpy.ndarray: Boolean array of the shape of condition
+
+    Example:
+        >>> crossed = signals.cross_above(macd.macd, macd.signal)
+        >>> entries = signals.first_after(rsi.rsi > 50, crossed)
+    """
+    (condition, start), shape = prepare_series(condition, start, dtype=np.bool_)
+    return calc_first_after(condition, start).reshape(shape)
+
+
+def hysteresis(values, enter, exit):
+    """State of a threshold with hysteresis.
+
+    If enter > exit, the state is set when the value reaches enter from below
+    (value >= enter) and reset when it falls to exit (value <= exit). If
+    enter < exit, the state is set when the value falls to enter and reset when
+    it rises to exit. NaN values keep the state, it is False before the first set.
+
+    Args:
+        values: Series (1-D array or 2-D array (n_symbols, n_bars))
+        enter: Value setting the state
+        exit: Value resetting the state
+
+    Returns:
+        numpy.ndarray: Boolean array of states of the shape of values
+
+    Raises:
+        PyTAExceptionBadParameterValue: If enter is equal to exit
+
+    Example:
+        >>> oversold = signals.hysteresis(rsi.rsi, 30, 50)  # from RSI <= 30 until RSI >= 50
+    """
+    if not enter != exit:
+        raise PyTAExceptionBadParameterValue(f'enter must differ from exit, got {enter} and {exit}')
+    (values,), shape = prepare_series(values)
+    return calc_hysteresis(values, float(enter), float(exit)).reshape(shape)
+
+
+def screen(quotes, condition):
+    """Find symbols for which condition is True at the last bar.
+
+    Condition is called with quotes of each symbol and returns a boolean
+    series or a boolean; only the last value is used, so indicators in
+    the condition are best calculated with tail= (on the last lookback bars only).
+    Symbols with too short history for the condition (PyTAExceptionTooLittleData)
+    do not match.
+
+    Args:
+        quotes: Universe or dictionary of symbols to Quotes objects
+        condition: Function of Quotes returning a boolean series or a boolean
+
+    Returns:
+        list: Matching symbols in the order of quotes
+
+    Example:
+        >>> def macd_buy(quotes):
+        ...     macd = ta.macd(quotes, 12, 26, 9, tail=2)
+        ...     return signals.cross_above(macd.macd, macd.signal)
+        >>> symbols = signals.screen(universe, macd_buy)
+    """
+    matching = []
+    for symbol in quotes:
+        try:
+            result = np.asarray(condition(quotes[symbol]))
+        except PyTAExceptionTooLittleData:
+            continue
+        if result.ndim > 1:
+            raise PyTAExceptionBadParameterValue(f'condition must return a 1-D series or a boolean, got {result.ndim}-D')
+        if result.size and result.reshape(-1)[-1]:
+            matching.append(symbol)
+    return matching
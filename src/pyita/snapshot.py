@@ -0,0 +1,219 @@
+"""Binary snapshots of streaming indicator states.
+
+A snapshot is an uncompressed npz file (loaded without pickle): a JSON header
+with the format version and the structure of the states, and one buffer per
+data type with all arrays and numpy scalars of the states. Restoring does not
+recalculate anything, so a service restores its states in milliseconds instead
+of recalculating indicators on history.
+
+Supported states: IndicatorStream (committed bars) and multi_stream states of
+many symbols, single or in a dictionary with string keys.
+
+Example:
+    >>> ta.save_state({'BTC/USDT': stream_btc, 'ETH/USDT': stream_eth}, 'states.npz')
+    >>> streams = ta.load_state('states.npz')
+"""
+import json
+import math
+import os
+
+import numpy as np
+
+from . import multi_stream
+from .lookback import import_indicator
+from .multi_stream import SymbolsState
+from .resume import Calculation
+from .stream import IndicatorStream
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+STATE_FORMAT = 'pyita.state'
+STATE_VERSION = 1
+
+
+class StateEncoder:
+    """Encoder of state values to JSON values and buffers of arrays by data type."""
+
+    def __init__(self):
+        """Initialize StateEncoder."""
+        self.parts = {}
+        self.sizes = {}
+
+    def encode(self, value):
+        """Encode a value: arrays and numpy scalars are placed to buffers, others to JSON."""
+        if value is None or isinstance(value, (bool, str, int)):
+            return value
+        if isinstance(value, float):
+            return value if math.isfinite(value) else {'$float': repr(value)}
+        if isinstance(value, (np.ndarray, np.generic)):
+            return self.encode_array(value)
+        if isinstance(value, tuple):
+            return {'$tuple': [self.encode(item) for item in value]}
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+        if isinstance(value, dict):
+            if not all(isinstance(key, str) for key in value):
+                raise PyTAExceptionBadParameterValue('state dictionaries must have string keys')
+            return {'$dict': {key: self.encode(item) for key, item in value.items()}}
+        raise PyTAExceptionBadParameterValue(f'unsupported state value of type {type(value).__name__}')
+
+    def encode_array(self, value):
+
+        array = np.asarray(value)
+        if array.dtype.hasobject:
+            raise PyTAExceptionBadParameterValue('state arrays of objects are not supported')
+
+        dtype = array.dtype.str
+        offset = self.sizes.get(dtype, 0)
+        self.parts.setdefault(dtype, []).append(array.ravel())
+        self.sizes[dtype] = offset + array.size
+        return {'$array': [dtype, offset, list(array.shape), isinstance(value, np.generic)]}
+
+    def buffers(self):
+        """Dictionary of data types to buffers of all encoded arrays."""
+        return {dtype: np.concatenate(parts) for dtype, parts in self.parts.items()}
+
+
+def decode(value, buffers):
+    """Decode a value encoded by StateEncoder (arrays are views of buffers)."""
+    if isinstance(value, list):
+        return [decode(item, buffers) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    if '$array' in value:
+        dtype, offset, shape, is_scalar = value['$array']
+        size = math.prod(shape)
+        array = buffers[dtype][offset: offset + size].reshape(shape)
+        return array[()] if is_scalar else array
+    if '$float' in value:
+        return float(value['$float'])
+    if '$tuple' in value:
+        return tuple(decode(item, buffers) for item in value['$tuple'])
+    if '$dict' in value:
+        return {key: decode(item, buffers) for key, item in value['$dict'].items()}
+    raise PyTAExceptionBadSeriesData(f'bad state value: {value}')
+
+
+def encode_state(state, encoder):
+    """Encode one streaming state object."""
+    if isinstance(state, IndicatorStream):
+        calc = state._state
+        return {
+            'type': 'stream',
+            'indicator': state._module.__name__.rsplit('.', 1)[-1],
+            'params': encoder.encode(state._params),
+            'outputs': list(state._names),
+            'n_bars': calc.n_bars,
+            'state': encoder.encode(calc.state),
+        }
+    if isinstance(state, SymbolsState):
+        return {
+            'type': 'symbols',
+            'class': type(state).__name__,
+            'attributes': encoder.encode(vars(state)),
+        }
+    raise PyTAExceptionBadParameterValue(
+        f'state must be IndicatorStream or a multi_stream state, got {type(state).__name__}'
+    )
+
+
+def decode_state(header, buffers):
+    """Create a streaming state object from its header."""
+    if header['type'] == 'stream':
+        module = import_indicator(header['indicator'])
+        calc = Calculation(header['n_bars'])
+        calc.state = decode(header['state'], buffers)
+        calc.indicator = module
+        calc.params = decode(header['params'], buffers)
+
+        stream = IndicatorStream.__new__(IndicatorStream)
+        stream._set_state(module, calc.params, header['outputs'], calc)
+        return stream
+
+    if header['type'] == 'symbols':
+        cls = getattr(multi_stream, header['class'], None)
+        if not (isinstance(cls, type) and issubclass(cls, SymbolsState)):
+            raise PyTAExceptionBadSeriesData(f'unknown state class {header["class"]}')
+        state = cls.__new__(cls)
+        vars(state).update(decode(header['attributes'], buffers))
+        return state
+
+    raise PyTAExceptionBadSeriesData(f'unknown state type {header["type"]}')
+
+
+def save_state(states, file):
+    """Save streaming states to a binary snapshot.
+
+    Uncommitted bars of streams are not saved.
+
+    Args:
+        states: IndicatorStream or multi_stream state, or dictionary of string keys
+            (e.g., symbols) to them
+        file: File name or binary file object
+
+    Raises:
+        PyTAExceptionBadParameterValue: If states contain unsupported objects
+
+    Example:
+        >>> ta.save_state(streams, 'states.npz')
+    """
+    encoder = StateEncoder()
+    if isinstance(states, dict):
+        encoded = {'$dict': {}}
+        for key, state in states.items():
+            if not isinstance(key, str):
+                raise PyTAExceptionBadParameterValue(f'keys of states must be strings, got {type(key).__name__}')
+            encoded['$dict'][key] = encode_state(state, encoder)
+    else:
+        encoded = encode_state(states, encoder)
+
+    buffers = encoder.buffers()
+    dtypes = list(buffers)
+    header = {
+        'format': STATE_FORMAT,
+        'version': STATE_VERSION,
+        'dtypes': dtypes,
+        'states': encoded,
+    }
+    arrays = {f'buffer_{i}': buffers[dtype] for i, dtype in enumerate(dtypes)}
+    arrays['header'] = np.frombuffer(json.dumps(header).encode('utf-8'), dtype=np.uint8)
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'wb') as f:
+            np.savez(f, **arrays)
+    else:
+        np.savez(file, **arrays)
+
+
+def load_state(file):
+    """Load streaming states from a binary snapshot.
+
+    Args:
+        file: File name or binary file object written by save_state
+
+    Returns:
+        State object or dictionary of them, as it was saved
+
+    Raises:
+        PyTAExceptionBadSeriesData: If the file is not a snapshot of states or has
+            an unsupported version
+
+    Example:
+        >>> streams = ta.load_state('states.npz')
+        >>> values = streams['BTC/USDT'].update(bar)
+    """
+    try:
+        with np.load(file, allow_pickle=False) as data:
+            header = json.loads(bytes(data['header']).decode('utf-8'))
+            if header.get('format') != STATE_FORMAT:
+                raise PyTAExceptionBadSeriesData('file is not a snapshot of pyita states')
+            if header.get('version') != STATE_VERSION:
+                raise PyTAExceptionBadSeriesData(f'unsupported version of states snapshot {header.get("version")}')
+            buffers = {dtype: data[f'buffer_{i}'] for i, dtype in enumerate(header['dtypes'])}
+    except (OSError, ValueError, KeyError) as e:
+        raise PyTAExceptionBadSeriesData(f'cannot read states snapshot: {e}') from e
+
+    states = header['states']
+    if '$dict' in states:
+        return {key: decode_state(state, buffers) for key, state in states['$dict'].items()}
+    return decode_state(states, buffers)
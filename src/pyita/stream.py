@@ -0,0 +1,188 @@
+"""Streaming calculation of indicators bar by bar.
+
+IndicatorStream keeps the calculation state after the closed (committed) bars
+(see resume.Calculation). Updates of the bar being formed are calculated from
+this state over one bar only, so each update costs O(1) regardless of the
+history length, and commit() makes the state after the bar the committed one.
+
+Example:
+    >>> stream = IndicatorStream('supertrend', quotes, period=10, multipler=3)
+    >>> values = stream.update({'open': 1.0, 'high': 1.2, 'low': 0.9, 'close': 1.1})
+    >>> stream.commit()
+"""
+import numpy as np
+
+from .quotes import Quotes
+from .indicator_result import IndicatorResult, Deferred
+from .lookback import import_indicator, wrap_indicator
+from .resume import Calculation, ResumeNotPossible
+from .constants import PRICE_TYPE, VOLUME_TYPE, TIME_TYPE
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+BAR_TYPES = {
+    'open': PRICE_TYPE,
+    'high': PRICE_TYPE,
+    'low': PRICE_TYPE,
+    'close': PRICE_TYPE,
+    'volume': VOLUME_TYPE,
+    'time': TIME_TYPE,
+}
+
+
+def bar_quotes(bar):
+    """Quotes object with one bar from a mapping of column values or Quotes."""
+    if isinstance(bar, Quotes):
+        if len(bar.close) != 1:
+            raise PyTAExceptionBadSeriesData(f'bar must contain one bar, got {len(bar.close)}')
+        return bar
+
+    unknown = [name for name in bar if name not in BAR_TYPES]
+    if unknown:
+        raise PyTAExceptionBadSeriesData(f'Unknown bar columns {unknown}, allowed: {list(BAR_TYPES)}')
+
+    return Quotes._from_arrays({name: np.array([value], dtype=BAR_TYPES[name]) for name, value in bar.items()})
+
+
+class IndicatorStream:
+    """Indicator calculated bar by bar with a revisable last bar.
+
+    The stream is started from the history of closed bars. The bar being formed
+    is passed to update(bar, final=False) any number of times: its values are
+    calculated from the committed state, which is not changed. commit() (or
+    update with final=True) closes the bar.
+
+    Example:
+        >>> stream = IndicatorStream('zigzag', quotes, delta=0.02)
+        >>> for bar in exchange_updates():
+        ...     values = stream.update(bar, final=bar_closed)
+        >>> stream.n_bars
+    """
+
+    def __init__(self, name, quotes, outputs=None, **params):
+        """Initialize IndicatorStream with the indicator calculated on history.
+
+        Args:
+            name: Name of the indicator (e.g., 'ema', 'supertrend')
+            quotes: Quotes object with closed bars
+            outputs: List of series names to calculate, for indicators with the outputs
+                parameter (default: all series)
+            **params: Parameters of the indicator
+
+        Raises:
+            PyTAExceptionIndicatorNotFound: If the indicator is not found
+            PyTAExceptionBadParameterValue: If parameters are invalid or the indicator
+                depends on other series (pair indicators, see resume module)
+            PyTAExceptionTooLittleData: If there is too little history for the indicator
+        """
+        indicator = wrap_indicator(import_indicator(name))
+        if outputs is not None:
+            params['outputs'] = outputs
+        self._init_state(indicator(quotes, **params))
+
+    @classmethod
+    def from_result(cls, result):
+        """Create IndicatorStream continuing an indicator result.
+
+        Args:
+            result: IndicatorResult returned by an indicator call (not sliced)
+
+        Returns:
+            IndicatorStream with the bars of result committed
+
+        Raises:
+            PyTAExceptionBadParameterValue: If result has no calculation state or is
+                a result of a pair indicator
+        """
+        stream = cls.__new__(cls)
+        stream._init_state(result)
+        return stream
+
+    def _init_state(self, result):
+
+        state = result._state if isinstance(result, IndicatorResult) else None
+        if state is None or state.indicator is None:
+            raise PyTAExceptionBadParameterValue('result must be an indicator result with calculation state')
+        if getattr(state.indicator, 'SERIES_PARAMS', ()):
+            # Bars of the other series of pair indicators are not passed to update
+            raise PyTAExceptionBadParameterValue(
+                f'{state.indicator.__name__.rsplit(".", 1)[-1]} depends on other series and cannot be streamed'
+            )
+
+        # Deferred series save the state of their steps when calculated
+        result._materialize()
+        self._set_state(state.indicator, state.params, result.series_names(), state)
+
+    def _set_state(self, module, params, names, state):
+
+        self._module = module
+        self._params = params
+        self._names = names
+        self._state = state
+        self._pending = None
+
+    @property
+    def n_bars(self):
+        """Number of committed bars."""
+        return self._state.n_bars
+
+    @property
+    def pending(self):
+        """True if there is an updated bar that is not committed."""
+        return self._pending is not None
+
+    def update(self, bar, final=False):
+        """Calculate values of the bar being formed.
+
+        Each call replaces the previous uncommitted bar: values are calculated
+        from the state after the committed bars.
+
+        Args:
+            bar: Mapping of column values ({'open': ..., 'high': ..., 'low': ...,
+                'close': ..., 'volume': ...}) or Quotes object with one bar
+            final: If True, commit the bar after calculation
+
+        Returns:
+            Dictionary of series names to arrays ending with the value of the bar.
+            Arrays of indicators that revise recent values (zigzag pivots, ichimoku
+            chikou, cci with a sorted window on final updates) are longer and replace
+            the values of the previous bars.
+
+        Raises:
+            PyTAExceptionBadSeriesData: If bar is invalid or the indicator cannot be
+                continued from the state (see resume.ResumeNotPossible)
+        """
+        calc = Calculation(self._state.n_bars + 1, self._state)
+        calc.indicator = self._module
+        calc.params = self._params
+        calc.provisional = not final
+        try:
+            series = self._module.calculate(calc, bar_quotes(bar), **self._params)
+            values = {}
+            for name in self._names:
+                values[name] = series[name]() if isinstance(series[name], Deferred) else series[name]
+        except ResumeNotPossible as e:
+            raise PyTAExceptionBadSeriesData(
+                f'{self._module.__name__.rsplit(".", 1)[-1]} cannot be continued bar by bar from the state ({e})'
+            ) from e
+
+        self._pending = calc
+        if final:
+            self.commit()
+        return values
+
+    def commit(self):
+        """Close the updated bar: the state after it becomes the committed state.
+
+        Does nothing if there is no uncommitted bar.
+        """
+        if self._pending is None:
+            return
+
+        # The previous state is not needed to continue from this one
+        self._pending.prev = None
+        self._state = self._pending
+        self._pending = None
+
+    def rollback(self):
+        """Discard the uncommitted bar."""
+        self._pending = None
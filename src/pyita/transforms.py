@@ -0,0 +1,313 @@
+"""Price transforms of quotes: Heikin-Ashi, Renko, Kagi and line break charts.
+
+Transforms return dictionaries of columns for new Quotes objects (see
+Quotes.heikin_ashi(), Quotes.renko(), Quotes.kagi() and Quotes.line_break()).
+Heikin-Ashi bars correspond to source bars one to one. Bars of Renko, Kagi and
+line break charts are formed by price movement: each bar has the index of the
+source bar at which its close was set, the time of this bar and the volume of
+source bars after the previous bar up to this bar (several bars formed at
+one source bar get the volume in the first of them). Kernels run in O(n):
+charts formed by price movement count their bars in a first pass, so each
+output column is allocated once.
+"""
+import numpy as np
+import numba as nb
+
+from .indicators import atr
+from .exceptions import PyTAExceptionBadParameterValue
+
+
+@nb.njit(cache=True)
+def calc_heikin_ashi(open_, high, low, close):
+    """Calculate Heikin-Ashi bars.
+
+    The open of a bar is the middle of the open and close of the previous
+    Heikin-Ashi bar (the middle of open and close of the source bar for the
+    first bar and after NaN bars). Bars with NaN prices are NaN.
+
+    Returns:
+        Tuple of (open, high, low, close) arrays
+    """
+    n_bars = len(close)
+    out_open = np.empty(n_bars, dtype=np.float64)
+    out_high = np.empty(n_bars, dtype=np.float64)
+    out_low = np.empty(n_bars, dtype=np.float64)
+    out_close = np.empty(n_bars, dtype=np.float64)
+
+    for i in range(n_bars):
+        bar_close = (open_[i] + high[i] + low[i] + close[i]) / 4
+        if np.isnan(bar_close):
+            bar_open = np.nan
+        elif i == 0 or np.isnan(out_open[i - 1]) or np.isnan(out_close[i - 1]):
+            bar_open = (open_[i] + close[i]) / 2
+        else:
+            bar_open = (out_open[i - 1] + out_close[i - 1]) / 2
+        out_open[i] = bar_open
+        out_close[i] = bar_close
+        out_high[i] = max(high[i], max(bar_open, bar_close))
+        out_low[i] = min(low[i], min(bar_open, bar_close))
+
+    return out_open, out_high, out_low, out_close
+
+
+@nb.njit(cache=True)
+def calc_renko(close, box_size, n_bricks, indexes, out_open, out_close):
+    """Form Renko bricks by close prices.
+
+    A brick is added when the close moves by box_size beyond the last brick
+    (so a reversal brick needs a move by two boxes from the close of the last
+    brick). The first brick is based on the first close.
+
+    Args:
+        close: Array of close prices
+        box_size: Brick size
+        n_bricks: Size of outputs, 0 to count bricks only
+        indexes, out_open, out_close: Output arrays of n_bricks size
+
+    Returns:
+        Number of bricks
+    """
+    count = 0
+    top = np.nan
+    bottom = np.nan
+    for i in range(len(close)):
+        price = close[i]
+        if np.isnan(price):
+            continue
+        if np.isnan(top):
+            top = bottom = price
+            continue
+
+        while True:
+            if price >= top + box_size:
+                brick_open, brick_close = top, top + box_size
+            elif price <= bottom - box_size:
+                brick_open, brick_close = bottom, bottom - box_size
+            else:
+                break
+            if n_bricks:
+                indexes[count] = i
+                out_open[count] = brick_open
+                out_close[count] = brick_close
+            count += 1
+            top = max(brick_open, brick_close)
+            bottom = min(brick_open, brick_close)
+
+    return count
+
+
+@nb.njit(cache=True)
+def calc_kagi(close, reversal, n_lines, indexes, out_open, out_close):
+    """Form Kagi lines by close prices.
+
+    A line is extended while the close moves in its direction and a new line
+    in the opposite direction is started when the close moves back from the
+    extreme of the line by reversal or more. The first line starts at the first
+    close, the last line is not finished.
+
+    Args:
+        close: Array of close prices
+        reversal: Reversal amount
+        n_lines: Size of outputs, 0 to count lines only
+        indexes, out_open, out_close: Output arrays of n_lines size
+
+    Returns:
+        Number of lines
+    """
+    count = 0
+    line_open = np.nan
+    line_close = np.nan
+    line_index = 0
+    direction = 0
+    for i in range(len(close)):
+        price = close[i]
+        if np.isnan(price):
+            continue
+        if np.isnan(line_open):
+            line_open = line_close = price
+            continue
+
+        if direction == 0:
+            if abs(price - line_open) >= reversal:
+                direction = 1 if price > line_open else -1
+                line_close = price
+                line_index = i
+        elif (price - line_close) * direction > 0:
+            line_close = price
+            line_index = i
+        elif (line_close - price) * direction >= reversal:
+            if n_lines:
+                indexes[count] = line_index
+                out_open[count] = line_open
+                out_close[count] = line_close
+            count += 1
+            line_open = line_close
+            line_close = price
+            line_index = i
+            direction = -direction
+
+    if direction != 0:
+        if n_lines:
+            indexes[count] = line_index
+            out_open[count] = line_open
+            out_close[count] = line_close
+        count += 1
+
+    return count
+
+
+@nb.njit(cache=True)
+def calc_line_break(close, n_break, n_lines, indexes, out_open, out_close):
+    """Form line break chart lines by close prices.
+
+    A line in the direction of the last line is added when the close exceeds
+    its close, a reversal line when the close breaks the extreme of the last
+    n_break lines. The first line is added when the close differs from the
+    first close.
+
+    Args:
+        close: Array of close prices
+        n_break: Number of lines broken by a reversal (3 for the three line break chart)
+        n_lines: Size of outputs, 0 to count lines only
+        indexes, out_open, out_close: Output arrays of n_lines size
+
+    Returns:
+        Number of lines
+    """
+    # Opens and closes of the last n_break lines (ring buffer)
+    last_open = np.empty(n_break, dtype=np.float64)
+    last_close = np.empty(n_break, dtype=np.float64)
+
+    count = 0
+    first = np.nan
+    for i in range(len(close)):
+        price = close[i]
+        if np.isnan(price):
+            continue
+
+        if count == 0:
+            if np.isnan(first):
+                first = price
+                continue
+            if price == first:
+                continue
+            line_open = first
+        else:
+            j = (count - 1) % n_break
+            direction = 1 if last_close[j] > last_open[j] else -1
+            if (price - last_close[j]) * direction > 0:
+                line_open = last_close[j]
+            else:
+                # Extreme of the last lines opposite to the direction
+                extreme = last_open[j]
+                for k in range(1, min(count, n_break)):
+                    jk = (count - 1 - k) % n_break
+                    if direction > 0:
+                        extreme = min(extreme, min(last_open[jk], last_close[jk]))
+                    else:
+                        extreme = max(extreme, max(last_open[jk], last_close[jk]))
+                if (extreme - price) * direction <= 0:
+                    continue
+                line_open = last_open[j]
+
+        j = count % n_break
+        last_open[j] = line_open
+        last_close[j] = price
+        if n_lines:
+            indexes[count] = i
+            out_open[count] = line_open
+            out_close[count] = price
+        count += 1
+
+    return count
+
+
+def check_positive(name, value):
+
+    if isinstance(value, bool) or not isinstance(value, (int, float, np.floating, np.integer)) or not value > 0:
+        raise PyTAExceptionBadParameterValue(f'{name} must be a positive number, got {value}')
+
+
+def atr_size(quotes, size, atr_period, name):
+    """Fixed size, or the last ATR value if size is None."""
+    if size is not None:
+        check_positive(name, size)
+        return float(size)
+
+    if isinstance(atr_period, bool) or not isinstance(atr_period, int) or atr_period <= 0:
+        raise PyTAExceptionBadParameterValue(f'atr_period must be a positive integer, got {atr_period}')
+    values = atr.get_indicator_out(quotes, smooth=atr_period, outputs=['atr']).atr
+    values = values[~np.isnan(values)]
+    if len(values) == 0 or not values[-1] > 0:
+        raise PyTAExceptionBadParameterValue(f'cannot calculate {name} from ATR({atr_period})')
+    return float(values[-1])
+
+
+def movement_bars(data, kernel, *args):
+    """Dictionary of columns of bars formed by price movement and indexes of source bars.
+
+    The kernel is called twice: to count bars and to fill outputs.
+    """
+    close = data['close']
+    n_bars = kernel(close, *args, 0, np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+
+    indexes = np.empty(n_bars, dtype=np.int64)
+    out_open = np.empty(n_bars, dtype=np.float64)
+    out_close = np.empty(n_bars, dtype=np.float64)
+    if n_bars:
+        kernel(close, *args, n_bars, indexes, out_open, out_close)
+
+    result = {
+        'open': out_open,
+        'high': np.maximum(out_open, out_close),
+        'low': np.minimum(out_open, out_close),
+        'close': out_close,
+    }
+    if 'volume' in data:
+        # Volume of source bars after the previous bar up to the bar of the close
+        total = np.nancumsum(data['volume'], dtype=np.float64)[indexes]
+        result['volume'] = np.diff(total, prepend=0.0).astype(data['volume'].dtype, copy=False)
+    if 'time' in data:
+        result['time'] = data['time'][indexes]
+    return result, indexes
+
+
+def heikin_ashi(data):
+    """Heikin-Ashi bars of quote columns (volume and time are kept)."""
+    out_open, out_high, out_low, out_close = calc_heikin_ashi(data['open'], data['high'], data['low'], data['close'])
+    result = {'open': out_open, 'high': out_high, 'low': out_low, 'close': out_close}
+    for name in ('volume', 'time'):
+        if name in data:
+            result[name] = data[name]
+    return result
+
+
+def renko(quotes, box_size, atr_period):
+    """Renko bricks of quotes.
+
+    Returns:
+        tuple: (dictionary of columns, indexes of source bars)
+    """
+    box_size = atr_size(quotes, box_size, atr_period, 'box_size')
+    return movement_bars(quotes._data, calc_renko, box_size)
+
+
+def kagi(quotes, reversal, atr_period):
+    """Kagi lines of quotes.
+
+    Returns:
+        tuple: (dictionary of columns, indexes of source bars)
+    """
+    reversal = atr_size(quotes, reversal, atr_period, 'reversal')
+    return movement_bars(quotes._data, calc_kagi, reversal)
+
+
+def line_break(quotes, n_lines):
+    """Line break chart lines of quotes.
+
+    Returns:
+        tuple: (dictionary of columns, indexes of source bars)
+    """
+    if isinstance(n_lines, bool) or not isinstance(n_lines, int) or n_lines <= 0:
+        raise PyTAExceptionBadParameterValue(f'n_lines must be a positive integer, got {n_lines}')
+    return movement_bars(quotes._data, calc_line_break, n_lines)
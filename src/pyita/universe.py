@@ -0,0 +1,303 @@
+"""Store of quotes of many symbols in one packed block.
+
+All bars of all symbols are kept in one (n_columns, n_bars) block of 8-byte
+items (the packed layout of DataSeries), symbol after symbol, with an index of
+symbol offsets and time ranges. Quotes of a symbol are views of the block, so
+a universe saved to a directory is opened with a memory-mapped block and
+thousands of symbols cost one file mapping instead of thousands of arrays.
+
+Example:
+    >>> universe = Universe.from_quotes({'BTC/USDT': quotes_btc, 'ETH/USDT': quotes_eth})
+    >>> universe.save('universe')
+    >>> universe = Universe.load('universe')
+    >>> march = universe['BTC/USDT'].between('2025-03-01', '2025-04-01')
+"""
+import json
+import os
+
+import numpy as np
+
+from .quotes import Quotes
+from .data_series import PACKED_TYPE
+from .exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+UNIVERSE_FORMAT = 'pyita.universe'
+UNIVERSE_VERSION = 1
+BLOCK_FILENAME = 'block.npy'
+INDEX_FILENAME = 'index.json'
+
+
+class Universe:
+    """Quotes of many symbols in one packed block with an index.
+
+    Attributes:
+        symbols: List of symbols in the order of the block
+        columns: List of columns of quotes (the same for all symbols)
+        offsets: Array of n_symbols + 1 positions of symbols in the block
+        block: Block (n_columns, n_bars) with the bars of all symbols
+    """
+
+    def __init__(self, block, columns, dtypes, symbols, offsets, time_ranges=None):
+        """Initialize Universe on a block (see from_quotes and load).
+
+        Args:
+            block: 2-D array (n_columns, n_bars) of 8-byte items
+            columns: Column names in the order of rows
+            dtypes: Column data types in the order of rows
+            symbols: Symbols in the order of the block
+            offsets: Positions of symbols in the block (n_symbols + 1 values, from 0 to n_bars)
+            time_ranges: Tuple of arrays of the first and the last time of symbols in
+                milliseconds (default: taken from the block)
+
+        Raises:
+            PyTAExceptionBadSeriesData: If the block does not fit columns or offsets
+        """
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if block.ndim != 2 or block.shape[0] != len(columns) or block.dtype.itemsize != PACKED_TYPE.itemsize:
+            raise PyTAExceptionBadSeriesData(f'block of shape {block.shape} and type {block.dtype} does not fit columns')
+        if (len(offsets) != len(symbols) + 1 or offsets[0] != 0 or offsets[-1] != block.shape[1]
+                or np.any(np.diff(offsets) < 0)):
+            raise PyTAExceptionBadSeriesData('offsets do not fit symbols and the block')
+        if len(set(symbols)) != len(symbols):
+            raise PyTAExceptionBadSeriesData('symbols must be unique')
+        if 'time' not in columns:
+            raise PyTAExceptionBadSeriesData('quotes of a universe must have time')
+
+        self.block = block
+        self.columns = list(columns)
+        self.dtypes = [np.dtype(dtype) for dtype in dtypes]
+        self.symbols = list(symbols)
+        self.offsets = offsets
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._quotes = {}
+
+        if time_ranges is None:
+            time_ranges = self._block_time_ranges()
+        self._first_time, self._last_time = (np.asarray(values, dtype=np.int64) for values in time_ranges)
+
+    def _block_time_ranges(self):
+        """First and last times of symbols in milliseconds (0 for symbols without bars)."""
+        time = self.block[self.columns.index('time')].view(np.int64)
+        has_bars = np.diff(self.offsets) > 0
+        first = np.zeros(len(self.symbols), dtype=np.int64)
+        last = np.zeros(len(self.symbols), dtype=np.int64)
+        first[has_bars] = time[self.offsets[:-1][has_bars]]
+        last[has_bars] = time[self.offsets[1:][has_bars] - 1]
+        return first, last
+
+    @classmethod
+    def from_quotes(cls, quotes_by_symbol):
+        """Create Universe from quotes of symbols.
+
+        Args:
+            quotes_by_symbol: Dictionary of symbols to Quotes objects with the same
+                columns, including time sorted in ascending order
+
+        Returns:
+            Universe with copies of the bars in one block
+
+        Raises:
+            PyTAExceptionBadParameterValue: If there are no symbols
+            PyTAExceptionBadSeriesData: If columns differ or time is missing or not sorted
+        """
+        if not quotes_by_symbol:
+            raise PyTAExceptionBadParameterValue('universe must contain at least one symbol')
+
+        symbols = list(quotes_by_symbol)
+        first = quotes_by_symbol[symbols[0]]
+        columns = list(first._data)
+        if 'time' not in columns:
+            raise PyTAExceptionBadSeriesData('quotes of a universe must have time')
+        dtypes = [first._data[name].dtype for name in columns]
+        for name, dtype in zip(columns, dtypes):
+            if dtype.itemsize != PACKED_TYPE.itemsize:
+                raise PyTAExceptionBadSeriesData(f"Series '{name}' of type {dtype} cannot be packed")
+
+        lengths = []
+        for symbol, quotes in quotes_by_symbol.items():
+            if list(quotes._data) != columns:
+                raise PyTAExceptionBadSeriesData(
+                    f'quotes of {symbol} have columns {list(quotes._data)}, expected {columns}'
+                )
+            quotes._sorted_time()
+            lengths.append(len(quotes.close))
+
+        offsets = np.zeros(len(symbols) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        block = np.empty((len(columns), offsets[-1]), dtype=PACKED_TYPE)
+        for i, quotes in enumerate(quotes_by_symbol.values()):
+            for j, (name, dtype) in enumerate(zip(columns, dtypes)):
+                block[j, offsets[i]: offsets[i + 1]].view(dtype)[:] = quotes._data[name]
+
+        universe = cls(block, columns, dtypes, symbols, offsets)
+        for symbol in symbols:
+            universe[symbol]._time_sorted = universe[symbol].time
+        return universe
+
+    def save(self, path):
+        """Save the universe to a directory (block.npy and index.json).
+
+        Args:
+            path: Directory name (created if it does not exist)
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, BLOCK_FILENAME), self.block)
+
+        index = {
+            'format': UNIVERSE_FORMAT,
+            'version': UNIVERSE_VERSION,
+            'columns': self.columns,
+            'dtypes': [dtype.str for dtype in self.dtypes],
+            'symbols': self.symbols,
+            'offsets': self.offsets.tolist(),
+            'first_time': self._first_time.tolist(),
+            'last_time': self._last_time.tolist(),
+        }
+        with open(os.path.join(path, INDEX_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open a universe saved by save().
+
+        Args:
+            path: Directory name
+            mmap: If True (default), the block is memory-mapped read-only, else loaded to memory
+
+        Returns:
+            Universe
+
+        Raises:
+            PyTAExceptionBadSeriesData: If the directory does not contain a universe
+                or it has an unsupported version
+        """
+        try:
+            with open(os.path.join(path, INDEX_FILENAME), encoding='utf-8') as f:
+                index = json.load(f)
+            block = np.load(os.path.join(path, BLOCK_FILENAME), mmap_mode='r' if mmap else None, allow_pickle=False)
+        except (OSError, ValueError) as e:
+            raise PyTAExceptionBadSeriesData(f'cannot read universe: {e}') from e
+
+        if index.get('format') != UNIVERSE_FORMAT:
+            raise PyTAExceptionBadSeriesData(f'{path} is not a universe')
+        if index.get('version') != UNIVERSE_VERSION:
+            raise PyTAExceptionBadSeriesData(f'unsupported version of universe {index.get("version")}')
+
+        return cls(
+            block, index['columns'], index['dtypes'], index['symbols'], index['offsets'],
+            (index['first_time'], index['last_time']),
+        )
+
+    def __len__(self):
+        """Number of symbols."""
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._positions
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+    def __getitem__(self, symbol):
+        """Get quotes of a symbol.
+
+        Args:
+            symbol: Symbol name
+
+        Returns:
+            Quotes object with views of the block (packed layout)
+
+        Raises:
+            KeyError: If there is no such symbol
+        """
+        quotes = self._quotes.get(symbol)
+        if quotes is None:
+            i = self._positions[symbol]
+            block = self.block[:, self.offsets[i]: self.offsets[i + 1]]
+            quotes = Quotes._from_packed_rows(block, self.columns, self.dtypes)
+            self._quotes[symbol] = quotes
+        return quotes
+
+    def time_range(self, symbol):
+        """Get the time of the first and the last bar of a symbol.
+
+        Returns:
+            tuple: (first time, last time) as datetime64[ms], (None, None) if there are no bars
+        """
+        i = self._positions[symbol]
+        if self.offsets[i + 1] == self.offsets[i]:
+            return None, None
+        return self._first_time[i].astype('datetime64[ms]'), self._last_time[i].astype('datetime64[ms]')
+
+    def symbols_between(self, start=None, end=None):
+        """Get symbols with bars in start <= time < end (by the index, without reading bars).
+
+        Args:
+            start: First time (datetime64, string, ...), None for no limit
+            end: Time after the last bar, None for no limit
+
+        Returns:
+            list: Symbols in the order of the universe
+        """
+        selected = np.diff(self.offsets) > 0
+        if start is not None:
+            selected &= self._last_time >= np.datetime64(start, 'ms').astype(np.int64)
+        if end is not None:
+            selected &= self._first_time < np.datetime64(end, 'ms').astype(np.int64)
+        return [symbol for symbol, is_selected in zip(self.symbols, selected) if is_selected]
+
+    def block_of(self, column, symbols=None, start=None, end=None):
+        """Get a 2-D array (n_symbols, n_bars) of a column of symbols with the same time.
+
+        Bars of symbols in start <= time < end must have the same times. The
+        array is a read-only view of the block when the selected bars are
+        equally spaced in it (e.g., symbols with the same history stored in a
+        row), otherwise a copy.
+
+        Args:
+            column: Column name ('close', 'volume', ...)
+            symbols: List of symbols (default: all)
+            start: First time, None for the first bar
+            end: Time after the last bar, None for the last bar
+
+        Returns:
+            numpy.ndarray: Values of the column, a row per symbol
+
+        Raises:
+            PyTAExceptionBadParameterValue: If there are no symbols or the column is unknown
+            PyTAExceptionBadSeriesData: If times of the symbols differ
+
+        Example:
+            >>> close = universe.block_of('close', start='2025-01-01')
+        """
+        symbols = self.symbols if symbols is None else list(symbols)
+        if not symbols:
+            raise PyTAExceptionBadParameterValue('symbols must not be empty')
+        if column not in self.columns:
+            raise PyTAExceptionBadParameterValue(f'unknown column {column}, universe has {self.columns}')
+
+        # Windows of the symbols: positions in the block and times
+        positions, times = [], []
+        for symbol in symbols:
+            quotes = self[symbol]
+            time = quotes._sorted_time()
+            i_start = 0 if start is None else int(np.searchsorted(time, quotes._time_value(start, time), 'left'))
+            i_end = len(time) if end is None else int(np.searchsorted(time, quotes._time_value(end, time), 'left'))
+            positions.append(self.offsets[self._positions[symbol]] + i_start)
+            times.append(time[i_start: max(i_start, i_end)])
+        for symbol, time in zip(symbols[1:], times[1:]):
+            if not np.array_equal(time, times[0]):
+                raise PyTAExceptionBadSeriesData(f'time of {symbol} differs from time of {symbols[0]}')
+
+        row = self.columns.index(column)
+        values = self.block[row].view(self.dtypes[row])
+        n_bars = len(times[0])
+        steps = np.diff(positions)
+        if len(steps) == 0 or (np.all(steps == steps[0]) and steps[0] >= n_bars):
+            # Rows are equally spaced in the block
+            step = int(steps[0]) if len(steps) else n_bars
+            return np.lib.stride_tricks.as_strided(
+                values[positions[0]:], shape=(len(symbols), n_bars),
+                strides=(step * values.itemsize, values.itemsize), writeable=False,
+            )
+        return np.stack([values[position: position + n_bars] for position in positions])
@@ -6,6 +6,8 @@ from pathlib import Path
 import numpy as np
 import pytest
 
+import pyita as ta
+
 
 def pytest_configure(config):
     """Configure pytest environment variables for stock-indicators."""
@@ -103,3 +105,8 @@ def test_ohlcv_data():
     
     return data_dict
 
+
+@pytest.fixture
+def quotes(test_ohlcv_data):
+    """Hourly quotes with time and volume (test_ohlcv_data)."""
+    return ta.Quotes(**test_ohlcv_data)
@@ -0,0 +1,103 @@
+"""Tests for alignment of quotes of many symbols on a common time grid."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData, PyTAExceptionDataSeriesNonFound
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@pytest.fixture
+def quotes_list(quotes):
+    """Quotes with different histories and a gapped symbol."""
+    return [quotes[100:], quotes[:5000], quotes[::3], quotes[50:9000]]
+
+
+def expected_bars(source, grid, fill):
+    """Bars of source at grid times by a Python loop over the grid."""
+    positions = {t: i for i, t in enumerate(source.time)}
+    expected = {name: np.full(len(grid), np.nan) for name in COLUMNS}
+    last = -1
+    for j, t in enumerate(grid):
+        if t in positions:
+            last = positions[t]
+            for name in COLUMNS:
+                expected[name][j] = source[name][last]
+        elif fill == 'ffill' and last >= 0:
+            for name in ('open', 'high', 'low', 'close'):
+                expected[name][j] = source.close[last]
+            expected['volume'][j] = 0
+    return expected
+
+
+@pytest.mark.parametrize('fill', ['ffill', 'nan'])
+@pytest.mark.parametrize('how', ['inner', 'outer'])
+def test_align(quotes_list, how, fill):
+    """Aligned quotes have bars of the sources at times of the grid."""
+    times = [set(item.time.tolist()) for item in quotes_list]
+    grid = set.intersection(*times) if how == 'inner' else set.union(*times)
+    grid = np.array(sorted(grid), dtype='datetime64[ms]')
+
+    result = ta.align(quotes_list, how=how, fill=fill)
+    assert len(result) == len(quotes_list)
+    for source, aligned in zip(quotes_list, result):
+        assert isinstance(aligned, ta.Quotes)
+        np.testing.assert_array_equal(aligned.time, grid)
+        expected = expected_bars(source, grid, fill)
+        for name in COLUMNS:
+            np.testing.assert_array_equal(aligned[name], expected[name])
+
+
+def test_align_batch_and_dict(quotes_list):
+    """Batch output has a row per symbol, dictionaries keep their keys."""
+    by_symbol = dict(zip(['BTC', 'ETH', 'SOL', 'XRP'], quotes_list))
+    aligned = ta.align(by_symbol, how='outer')
+    assert list(aligned) == list(by_symbol)
+
+    time, batch = ta.align(by_symbol, how='outer', batch=True)
+    np.testing.assert_array_equal(time, aligned['BTC'].time)
+    assert set(batch) == set(COLUMNS)
+    for k, symbol in enumerate(by_symbol):
+        for name in COLUMNS:
+            assert batch[name].shape == (4, len(time))
+            np.testing.assert_array_equal(batch[name][k], aligned[symbol][name])
+
+    # Indicators of aligned quotes are calculated as usual
+    assert len(ta.rsi(aligned['SOL'], period=14).rsi) == len(time)
+
+
+def test_align_disjoint_and_empty(quotes):
+    """Quotes without common times give an empty inner grid."""
+    result = ta.align([quotes[:100], quotes[200:300]])
+    assert all(len(item.close) == 0 for item in result)
+
+    result = ta.align([quotes[:100], quotes[:0]], how='outer')
+    assert len(result[1].close) == 100 and np.all(np.isnan(result[1].close))
+
+
+def test_align_errors(quotes, test_ohlcv_data):
+    """Bad parameters and bad time series raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.align([quotes], how='left')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.align([quotes], fill='bfill')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.align([])
+
+    data = dict(test_ohlcv_data)
+    data['time'] = data['time'][::-1].copy()
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.align([quotes, ta.Quotes(**data)])
+
+    data['time'] = np.repeat(test_ohlcv_data['time'][:10], 2)
+    duplicated = ta.Quotes(**{name: np.resize(values, 20) for name, values in data.items()})
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.align([quotes, duplicated])
+
+    without_time = ta.Quotes(open=quotes.open, high=quotes.high, low=quotes.low, close=quotes.close)
+    with pytest.raises(PyTAExceptionDataSeriesNonFound):
+        ta.align([quotes, without_time])
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.align([quotes, ta.Quotes(open=quotes.open, high=quotes.high, low=quotes.low,
+                                    close=quotes.close, time=quotes.time)], batch=True)
@@ -1,4 +1,5 @@
 """Tests for Aroon indicator."""
+import numpy as np
 import pytest
 import pyita as ta
 
@@ -50,3 +51,22 @@ def test_aroon_oscillator_vs_si(test_ohlcv_data, period):
     assert arrays_equal_with_nan(
         aroon_result.oscillator, ref.oscillator
     ), f"Aroon Oscillator (period={period}) does not match stock-indicators"
+
+
+def test_aroon_nan_windows(test_ohlcv_data):
+    """Lines are NaN for windows with NaN, other windows are not affected."""
+    period = 14
+    data = {name: values[:300].copy() for name, values in test_ohlcv_data.items()}
+    expected = ta.aroon(ta.Quotes(**data), period=period)
+    data['high'][100] = np.nan
+    data['low'][200] = np.nan
+    result = ta.aroon(ta.Quotes(**data), period=period)
+
+    nan_up = np.zeros(300, dtype=bool)
+    nan_up[100: 100 + period + 1] = True
+    nan_down = np.zeros(300, dtype=bool)
+    nan_down[200: 200 + period + 1] = True
+    assert np.all(np.isnan(result.up[nan_up])) and np.all(np.isnan(result.down[nan_down]))
+    assert arrays_equal_with_nan(result.up[~nan_up], expected.up[~nan_up])
+    assert arrays_equal_with_nan(result.down[~nan_down], expected.down[~nan_down])
+    assert arrays_equal_with_nan(result.oscillator, result.up - result.down)
@@ -0,0 +1,240 @@
+"""Tests for bars built from trades."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita import bars
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'time')
+
+
+@pytest.fixture
+def trades():
+    """Random trades over several days (integer milliseconds, prices and sizes)."""
+    rng = np.random.default_rng(7)
+    n_trades = 200000
+    time = 1704067200000 + np.cumsum(rng.integers(0, 3000, n_trades))
+    price = 100 + np.cumsum(rng.normal(0, 0.01, n_trades))
+    size = rng.random(n_trades)
+    return time, price, size
+
+
+def expected_bars(time, price, size, step_ms):
+    """Bars by direct computation over groups."""
+    buckets = time // step_ms
+    result = {name: [] for name in COLUMNS}
+    for bucket in np.unique(buckets):
+        bx = buckets == bucket
+        result['open'].append(price[bx][0])
+        result['high'].append(price[bx].max())
+        result['low'].append(price[bx].min())
+        result['close'].append(price[bx][-1])
+        result['volume'].append(size[bx].sum())
+        result['time'].append(bucket * step_ms)
+    result['time'] = np.array(result['time']).astype('datetime64[ms]')
+    return result
+
+
+def assert_bars_equal(quotes, expected):
+    for name in COLUMNS:
+        if name == 'volume':
+            np.testing.assert_allclose(quotes[name], expected[name], rtol=1e-12)
+        else:
+            np.testing.assert_array_equal(quotes[name], expected[name])
+
+
+@pytest.mark.parametrize('timeframe, step_ms', [('1m', 60000), ('15m', 900000), ('1h', 3600000)])
+def test_time_bars(trades, timeframe, step_ms):
+    """Time bars are equal to bars computed over groups of trades."""
+    time, price, size = trades
+    quotes = bars.time_bars(time, price, size, timeframe)
+    assert isinstance(quotes, ta.Quotes)
+    assert_bars_equal(quotes, expected_bars(time, price, size, step_ms))
+
+
+def test_time_bars_datetime(trades):
+    """Times may be datetime64 of any unit, bars are equal to resampled trades."""
+    time, price, size = trades
+    quotes = bars.time_bars(time.astype('datetime64[ms]').astype('datetime64[us]'), price, size, '1d')
+
+    trade_quotes = ta.Quotes(open=price, high=price, low=price, close=price, volume=size,
+                             time=time.astype('datetime64[ms]'))
+    assert_bars_equal(quotes, trade_quotes.resample('1d'))
+
+
+def test_time_bars_indicator(trades):
+    """Bars are consumed by indicators."""
+    quotes = bars.time_bars(*trades, '5m')
+    assert len(ta.ema(quotes, period=20).ema) == len(quotes.close)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 777, 50000])
+def test_trade_aggregator(trades, chunk_size):
+    """Bars of incremental aggregation are equal to batch bars."""
+    time, price, size = trades
+    time, price, size = time[:20000], price[:20000], size[:20000]
+    expected = bars.time_bars(time, price, size, '1m')
+
+    aggregator = bars.TradeAggregator('1m')
+    parts = []
+    for i in range(0, len(time), chunk_size):
+        closed = aggregator.update(time[i: i + chunk_size], price[i: i + chunk_size], size[i: i + chunk_size])
+        parts.append(closed)
+        assert aggregator.partial.close[-1] == price[min(i + chunk_size, len(time)) - 1]
+    parts.append(aggregator.flush())
+    assert aggregator.partial is None
+
+    result = {name: np.hstack([part[name] for part in parts]) for name in COLUMNS}
+    assert_bars_equal(ta.Quotes._from_arrays(result), expected)
+
+
+def test_trade_aggregator_empty_chunks():
+    """Empty chunks do not close bars."""
+    aggregator = bars.TradeAggregator('1h')
+    assert len(aggregator.update([], [], []).close) == 0
+    assert aggregator.partial is None
+
+    closed = aggregator.update(np.array(['2024-01-01T00:10', '2024-01-01T01:10'], dtype='datetime64[s]'), [1, 2], [1, 1])
+    assert closed.time[0] == np.datetime64('2024-01-01T00:00')
+    assert len(aggregator.update([], [], []).close) == 0
+    assert aggregator.flush().close[0] == 2
+
+
+def test_bars_errors(trades):
+    """Unsorted trades, bad arrays and timeframes raise exceptions."""
+    time, price, size = trades
+
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        bars.time_bars(time[::-1], price, size, '1m')
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        bars.time_bars(time, price[:-1], size, '1m')
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        bars.time_bars(time.astype(float), price, size, '1m')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        bars.time_bars(time, price, size, '1x')
+
+    aggregator = bars.TradeAggregator('1m')
+    aggregator.update(time[1000:1010], price[1000:1010], size[1000:1010])
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        aggregator.update(time[:10], price[:10], size[:10])
+
+
+def expected_threshold_ids(value, threshold):
+    """Bar numbers of volume or dollar bars by a Python loop."""
+    bar_ids, i_bar, total = [], 0, 0.0
+    for item in value:
+        bar_ids.append(i_bar)
+        total += item
+        if total >= threshold:
+            i_bar, total = i_bar + 1, 0.0
+    return np.array(bar_ids)
+
+
+def expected_imbalance_ids(price, weight, expected_ticks, alpha, min_ticks, max_ticks):
+    """Bar numbers of imbalance bars by a Python loop."""
+    bar_ids, i_bar, imbalance, n_ticks = [], 0, 0.0, 0
+    mean_ticks, mean_imbalance, sign = expected_ticks, None, 0.0
+    for i, value in enumerate(price):
+        bar_ids.append(i_bar)
+        if i > 0 and value != price[i - 1]:
+            sign = 1.0 if value > price[i - 1] else -1.0
+        imbalance += sign * weight[i]
+        n_ticks += 1
+        if mean_imbalance is None:
+            if n_ticks < expected_ticks:
+                continue
+            mean_imbalance = imbalance / n_ticks
+        else:
+            if abs(imbalance) < mean_ticks * abs(mean_imbalance):
+                continue
+            mean_ticks = min(max(mean_ticks + alpha * (n_ticks - mean_ticks), min_ticks), max_ticks)
+            mean_imbalance += alpha * (imbalance / n_ticks - mean_imbalance)
+        i_bar, imbalance, n_ticks = i_bar + 1, 0.0, 0
+    return np.array(bar_ids)
+
+
+def expected_grouped(time, price, size, bar_ids):
+    """Bars of trades with the same bar number."""
+    result = {name: [] for name in COLUMNS}
+    for i_bar in np.unique(bar_ids):
+        bx = bar_ids == i_bar
+        result['open'].append(price[bx][0])
+        result['high'].append(price[bx].max())
+        result['low'].append(price[bx].min())
+        result['close'].append(price[bx][-1])
+        result['volume'].append(size[bx].sum())
+        result['time'].append(time[bx][0])
+    result['time'] = np.array(result['time']).astype('datetime64[ms]')
+    return result
+
+
+def test_volume_and_dollar_bars(trades):
+    """Volume and dollar bars close when the traded amount reaches the threshold."""
+    time, price, size = (values[:30000] for values in trades)
+
+    quotes = bars.volume_bars(time, price, size, threshold=100)
+    assert_bars_equal(quotes, expected_grouped(time, price, size, expected_threshold_ids(size, 100)))
+    assert np.all(quotes.volume[:-1] >= 100)
+
+    quotes = bars.dollar_bars(time, price, size, threshold=25000)
+    assert_bars_equal(quotes, expected_grouped(time, price, size, expected_threshold_ids(price * size, 25000)))
+
+
+@pytest.mark.parametrize('expected_ticks, span, max_ratio', [(100, 20, 2), (50, 10, 3), (30, 5, None)])
+def test_imbalance_bars(trades, expected_ticks, span, max_ratio):
+    """Tick and volume imbalance bars are equal to bars by a Python loop."""
+    time, price, size = (values[:30000] for values in trades)
+    price = np.round(price, 2)  # unchanged prices keep the previous sign
+    alpha = 2 / (span + 1)
+    bounds = (1, np.inf) if max_ratio is None else (expected_ticks / max_ratio, expected_ticks * max_ratio)
+
+    quotes = bars.tick_imbalance_bars(time, price, size, expected_ticks=expected_ticks, span=span, max_ratio=max_ratio)
+    bar_ids = expected_imbalance_ids(price, np.ones(len(price)), expected_ticks, alpha, *bounds)
+    assert_bars_equal(quotes, expected_grouped(time, price, size, bar_ids))
+
+    quotes = bars.volume_imbalance_bars(time, price, size, expected_ticks=expected_ticks, span=span, max_ratio=max_ratio)
+    bar_ids = expected_imbalance_ids(price, size, expected_ticks, alpha, *bounds)
+    assert_bars_equal(quotes, expected_grouped(time, price, size, bar_ids))
+
+
+def test_bars_from_quotes(test_ohlcv_data):
+    """Builders accept fine-grained quotes keeping high and low of bars."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    volume = quotes.volume.astype(np.float64)
+    time_ms = quotes.time.view(np.int64)
+
+    bar_ids = expected_threshold_ids(volume, 20000)
+    result = bars.volume_bars(quotes, threshold=20000)
+    np.testing.assert_array_equal(result.time, quotes.time[np.unique(bar_ids, return_index=True)[1]])
+    np.testing.assert_array_equal(result.high, [quotes.high[bar_ids == i].max() for i in np.unique(bar_ids)])
+    np.testing.assert_array_equal(result.low, [quotes.low[bar_ids == i].min() for i in np.unique(bar_ids)])
+    expected = expected_grouped(time_ms, quotes.close, volume, bar_ids)
+    np.testing.assert_array_equal(result.close, expected['close'])
+    np.testing.assert_allclose(result.volume, expected['volume'], rtol=1e-12)
+
+    for builder, params in [(bars.dollar_bars, dict(threshold=1e8)), (bars.tick_imbalance_bars, dict(expected_ticks=24)),
+                            (bars.volume_imbalance_bars, dict(expected_ticks=24))]:
+        result = builder(quotes, **params)
+        assert 1 < len(result.close) < len(quotes.close)
+        assert len(ta.rsi(result, period=14).rsi) == len(result.close)
+
+
+def test_information_bars_errors(trades, test_ohlcv_data):
+    """Bad thresholds and parameters raise exceptions."""
+    time, price, size = trades
+    quotes = ta.Quotes(**test_ohlcv_data)
+
+    for threshold in (None, 0, -1, 'big'):
+        with pytest.raises(PyTAExceptionBadParameterValue):
+            bars.volume_bars(time, price, size, threshold=threshold)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        bars.dollar_bars(time, price, threshold=100)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        bars.volume_bars(quotes, price, threshold=100)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        bars.tick_imbalance_bars(time, price, size, expected_ticks=0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        bars.tick_imbalance_bars(time, price, size, span=0.5)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        bars.volume_imbalance_bars(time, price, size, max_ratio=0.5)
@@ -7,7 +7,7 @@ import talib
 from conftest import arrays_equal_with_nan
 
 
-@pytest.mark.parametrize('period', [2, 20])
+@pytest.mark.parametrize('period', [2, 20, 200, 500])
 def test_cci_vs_talib(test_ohlcv_data, period):
     """Test CCI calculation against TA-Lib reference implementation.
     
@@ -47,3 +47,30 @@ def test_cci_vs_talib(test_ohlcv_data, period):
         talib_cci
     ), f"CCI (period={period}) does not match TA-Lib"
 
+
+
+@pytest.mark.parametrize('period', [1, 2, 20, 160, 1000])
+def test_cci_mad_sorted_window(test_ohlcv_data, period):
+    """MAD with the sorted window matches direct summation over windows."""
+    from pyita.indicators.cci import calc_mad, calc_mad_sorted
+    from pyita.move_average import ma_calculate, MA_Type
+    
+    typical_price = (test_ohlcv_data['high'] + test_ohlcv_data['low'] + test_ohlcv_data['close']) / 3
+    sma_typical_price = ma_calculate(typical_price, period, MA_Type.sma)
+    
+    expected = calc_mad(typical_price, sma_typical_price, period)
+    mad = calc_mad_sorted(typical_price, sma_typical_price, period)
+    
+    np.testing.assert_allclose(mad, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_cci_with_nan(test_ohlcv_data):
+    """Windows with NaN give NaN for long periods as well."""
+    close = test_ohlcv_data['close'].copy()
+    close[1000] = np.nan
+    quotes = ta.Quotes(test_ohlcv_data['open'], test_ohlcv_data['high'], test_ohlcv_data['low'], close)
+    
+    cci = ta.cci(quotes, period=200).cci
+    
+    assert np.all(np.isnan(cci[1000: 1200]))
+    assert not np.any(np.isnan(cci[1200:]))
@@ -0,0 +1,93 @@
+"""Tests for Correlation (correlation, covariance and beta of two instruments) indicator."""
+import numpy as np
+import pytest
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+
+@pytest.fixture
+def other(test_ohlcv_data):
+    """Quotes of a second instrument partly following the first one."""
+    rng = np.random.default_rng(0)
+    noise = rng.normal(scale=20, size=len(test_ohlcv_data['close'])).cumsum()
+    data = {name: values * 0.03 + noise if name in ('open', 'high', 'low', 'close') else values
+            for name, values in test_ohlcv_data.items()}
+    return ta.Quotes(**data)
+
+
+def window_comoments(x, y, period):
+    """Covariances and variances of windows by numpy."""
+    windows_x = np.lib.stride_tricks.sliding_window_view(x, period)
+    windows_y = np.lib.stride_tricks.sliding_window_view(y, period)
+    deviations_x = windows_x - windows_x.mean(axis=1, keepdims=True)
+    deviations_y = windows_y - windows_y.mean(axis=1, keepdims=True)
+    return ((deviations_x * deviations_y).mean(axis=1), (deviations_x ** 2).mean(axis=1),
+            (deviations_y ** 2).mean(axis=1))
+
+
+@pytest.mark.parametrize('period, returns', [(2, True), (20, True), (100, False)])
+def test_correlation(quotes, other, period, returns):
+    """Test Correlation, Covariance and Beta against numpy over windows."""
+    result = ta.correlation(quotes, other, period=period, returns=returns)
+
+    x, y = quotes.close, other.close
+    if returns:
+        x, y = x[1:] / x[:-1] - 1, y[1:] / y[:-1] - 1
+    covariance, var_x, var_y = window_comoments(x, y, period)
+    n_warmup = len(quotes.close) - len(covariance)
+
+    for name in ('correlation', 'covariance', 'beta'):
+        assert np.all(np.isnan(result[name][:n_warmup]))
+    np.testing.assert_allclose(result.covariance[n_warmup:], covariance, rtol=1e-7, atol=1e-12 * np.max(np.abs(covariance)))
+    np.testing.assert_allclose(result.beta[n_warmup:], covariance / var_y, rtol=1e-6)
+    np.testing.assert_allclose(result.correlation[n_warmup:], covariance / np.sqrt(var_x * var_y), rtol=1e-6, atol=1e-9)
+
+
+def test_correlation_same_series(quotes):
+    """Series is fully correlated with itself and with its multiple, beta is the multiplier."""
+    result = ta.correlation(quotes, quotes.close * 3, period=20, returns=False)
+    np.testing.assert_allclose(result.correlation[19:], 1, rtol=1e-9)
+    np.testing.assert_allclose(result.beta[19:], 1 / 3, rtol=1e-9)
+
+    constant = np.full(len(quotes.close), 100.0)
+    result = ta.correlation(quotes, constant, period=20)
+    assert np.all(np.isnan(result.correlation)) and np.all(np.isnan(result.beta))
+    assert np.all(result.covariance[20:] == 0)
+
+
+def test_correlation_aligned(quotes, other):
+    """Quotes of different histories are aligned with ta.align, unaligned raise an exception."""
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.correlation(quotes[100:], other, period=20)
+
+    first, second = ta.align([quotes[100:], other])
+    result = ta.correlation(first, second, period=20)
+    expected = ta.correlation(quotes[100:], other[100:], period=20)
+    np.testing.assert_array_equal(result.beta, expected.beta)
+
+
+def test_correlation_resume_and_tail(quotes, other):
+    """Resumed and tail calculations slice other together with quotes."""
+    full = ta.correlation(quotes, other, period=50)
+    result = ta.correlation(quotes[:3000], other[:3000], period=50)
+    for n_bars in (3001, 5000, len(quotes.close)):
+        result = ta.correlation(quotes[:n_bars], other[:n_bars], period=50, resume_from=result)
+        assert result._state.start > 0
+    for name in ('correlation', 'covariance', 'beta'):
+        np.testing.assert_array_equal(result[name], full[name])
+
+    assert ta.lookback('correlation', period=50) == 51
+    tail = ta.correlation(quotes, other, period=50, tail=5)
+    np.testing.assert_allclose(tail.beta, full.beta[-5:], rtol=1e-12)
+
+
+def test_correlation_errors(quotes, other):
+    """Bad parameters raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.correlation(quotes, other, period=0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.correlation(quotes, other, value='median')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.correlation(quotes, np.ones((2, 10)))
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.correlation(quotes, other.close[:-1])
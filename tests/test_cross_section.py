@@ -0,0 +1,99 @@
+"""Tests for cross-sectional operators over symbols at every bar."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita import cross_section
+from pyita.exceptions import PyTAExceptionBadParameterValue
+
+
+@pytest.fixture
+def values():
+    """Values of 30 symbols with ties, NaN values and bars without valid values."""
+    rng = np.random.default_rng(1)
+    values = np.round(rng.normal(size=(30, 200)), 1)
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[:, 5] = np.nan
+    values[1:, 7] = np.nan
+    return values
+
+
+def valid_column(values, j):
+    return [i for i in range(values.shape[0]) if not np.isnan(values[i, j])]
+
+
+@pytest.mark.parametrize('ascending', [True, False])
+def test_rank_and_percentile(values, ascending):
+    """Average ranks and percentile ranks of valid symbols."""
+    ranks = cross_section.rank(values, ascending=ascending)
+    percents = cross_section.percentile(values, ascending=ascending)
+    sign = 1 if ascending else -1
+    for j in range(values.shape[1]):
+        valid = valid_column(values, j)
+        column = values[valid, j] * sign
+        for i, value in zip(valid, column):
+            assert ranks[i, j] == np.sum(column < value) + (np.sum(column == value) + 1) / 2
+            assert percents[i, j] == pytest.approx(np.sum(column <= value) / len(valid) * 100, rel=1e-12)
+    assert np.array_equal(np.isnan(ranks), np.isnan(values))
+    assert np.array_equal(np.isnan(percents), np.isnan(values))
+
+
+@pytest.mark.parametrize('ddof', [0, 1])
+def test_zscore_and_demean(values, ddof):
+    """Deviations from the mean of valid symbols."""
+    zscore = cross_section.zscore(values, ddof=ddof)
+    demeaned = cross_section.demean(values)
+    for j in range(values.shape[1]):
+        valid = valid_column(values, j)
+        column = values[valid, j]
+        if not valid:
+            continue
+        np.testing.assert_allclose(demeaned[valid, j], column - column.mean(), rtol=1e-12, atol=1e-15)
+        if len(valid) >= 2:
+            np.testing.assert_allclose(zscore[valid, j], (column - column.mean()) / column.std(ddof=ddof),
+                                       rtol=1e-12, atol=1e-15)
+    assert np.all(np.isnan(zscore[:, 7])) and demeaned[0, 7] == 0
+    assert np.all(np.isnan(cross_section.zscore(np.ones((5, 3)))))
+
+
+@pytest.mark.parametrize('largest', [True, False])
+def test_top_k(values, largest):
+    """The k largest (smallest) valid values, ties in the order of symbols."""
+    selected = cross_section.top_k(values, 5, largest=largest)
+    assert selected.dtype == bool
+    for j in range(values.shape[1]):
+        valid = valid_column(values, j)
+        sign = -1 if largest else 1
+        expected = sorted(valid, key=lambda i: (sign * values[i, j], i))[:5]
+        assert sorted(np.flatnonzero(selected[:, j])) == sorted(expected)
+
+
+def test_min_count(values):
+    """Bars with fewer valid symbols than min_count are NaN."""
+    counts = np.sum(~np.isnan(values), axis=0)
+    ranks = cross_section.rank(values, min_count=25)
+    assert np.all(np.isnan(ranks[:, counts < 25]))
+    np.testing.assert_array_equal(ranks[:, counts >= 25], cross_section.rank(values)[:, counts >= 25])
+    assert not np.any(cross_section.top_k(values, 3, min_count=25)[:, counts < 25])
+
+
+def test_aligned_indicators(test_ohlcv_data):
+    """RSI of aligned quotes ranked at every bar, warm-up values are excluded."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    aligned = ta.align([quotes[100:], quotes[:5000], quotes[::3]], how='outer')
+    rsi = np.array([ta.rsi(item, period=14).rsi for item in aligned])
+    ranks = cross_section.rank(rsi)
+    assert np.array_equal(np.isnan(ranks), np.isnan(rsi))
+    assert set(np.nansum(ranks, axis=0)) <= {0, 1, 3, 6}
+
+
+def test_cross_section_errors(values):
+    """Bad parameters raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        cross_section.rank(values[0])
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        cross_section.percentile(values, min_count=0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        cross_section.zscore(values, ddof=-1)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        cross_section.top_k(values, 0)
@@ -3,7 +3,7 @@ import numpy as np
 import pytest
 
 import pyita as ta
-from pyita.exceptions import PyTAExceptionDataSeriesNonFound
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionDataSeriesNonFound
 from pyita.indicator_result import IndicatorResult
 
 
@@ -266,3 +266,50 @@ class TestChainedSlicing:
         assert len(second_slice.close) == 5
         np.testing.assert_array_equal(second_slice.close, sample_quotes.close[::2][:5])
 
+
+
+class TestTail:
+    """Tests for tail views."""
+    
+    def test_tail_quotes(self, sample_quotes):
+        """Test quotes.tail(3) returns views of last values."""
+        last = sample_quotes.tail(3)
+        
+        assert isinstance(last, dict)
+        assert set(last) == {'open', 'high', 'low', 'close', 'volume'}
+        np.testing.assert_array_equal(last['close'], sample_quotes.close[-3:])
+        assert np.shares_memory(last['close'], sample_quotes.close)
+    
+    def test_tail_result(self, sample_result):
+        """Test result.tail(k) with k larger than length and k = 0."""
+        np.testing.assert_array_equal(sample_result.tail(100)['ema'], sample_result.ema)
+        assert len(sample_result.tail(0)['ema']) == 0
+    
+    def test_tail_negative(self, sample_result):
+        """Test that negative k raises exception."""
+        with pytest.raises(PyTAExceptionBadParameterValue):
+            sample_result.tail(-1)
+
+
+class TestStorage:
+    """Tests for storage of series."""
+    
+    def test_slice_is_view(self, sample_quotes):
+        """Test that sliced series share memory with source."""
+        sliced = sample_quotes[2:5]
+        
+        assert np.shares_memory(sliced.close, sample_quotes.close)
+    
+    def test_from_arrays_without_copy(self):
+        """Test that internal constructor does not copy arrays."""
+        values = np.array([1.0, 2.0, 3.0])
+        result = IndicatorResult._from_arrays({'value': values})
+        
+        assert result.value is values
+    
+    def test_no_instance_dict(self, sample_quotes, sample_result):
+        """Test that objects use slots storage."""
+        for obj in (sample_quotes, sample_result):
+            assert not hasattr(obj, '__dict__')
+            with pytest.raises(AttributeError):
+                obj.new_attribute = 1
@@ -0,0 +1,110 @@
+"""Tests for sparse events of zigzag, parabolic_sar and supertrend."""
+import os
+import time
+
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita import events
+from pyita.exceptions import PyTAExceptionBadParameterValue
+
+
+@pytest.mark.parametrize('end_points', [False, True])
+def test_zigzag_events(test_ohlcv_data, end_points):
+    """Events are the pivots of the dense series."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    dense = ta.zigzag(quotes, delta=0.03, end_points=end_points)
+    pivots = events.zigzag(quotes, delta=0.03, end_points=end_points)
+    index = np.flatnonzero(dense.pivot_types)
+    assert len(pivots) == len(index) > 0 and pivots.result is None
+    assert np.array_equal(pivots.index, index)
+    assert np.array_equal(pivots.price, dense.pivots[index])
+    assert np.array_equal(pivots.type, dense.pivot_types[index])
+    assert np.array_equal(pivots.time, quotes.time[index])
+
+
+def test_parabolic_sar_events(test_ohlcv_data):
+    """Events are the non-zero signals with SAR values after the flips."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    dense = ta.parabolic_sar(quotes, start=0.02, maximum=0.2, increment=0.02)
+    flips = events.parabolic_sar(quotes, start=0.02, maximum=0.2, increment=0.02)
+    index = np.flatnonzero(dense.signal)
+    assert np.array_equal(flips.index, index)
+    assert np.array_equal(flips.type, dense.signal[index])
+    assert np.array_equal(flips.price, dense.sar[index])
+
+    flips = events.parabolic_sar(quotes, dense=True)
+    assert np.array_equal(flips.result.sar, dense.sar, equal_nan=True)
+    assert np.array_equal(flips.result.signal, dense.signal)
+
+
+def test_supertrend_events(test_ohlcv_data):
+    """Events are the changes of the side of close to the supertrend line."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    dense = ta.supertrend(quotes, period=10, multipler=3)
+    flips = events.supertrend(quotes, period=10, multipler=3)
+    trend_up = quotes.close > dense.supertrend
+    index = np.flatnonzero(trend_up[10:] != trend_up[9:-1]) + 10
+    assert np.array_equal(flips.index, index)
+    assert np.array_equal(flips.type, np.where(trend_up[index], 1, -1))
+    assert np.array_equal(flips.price, dense.supertrend[index])
+    assert np.all(flips.type[1:] != flips.type[:-1])
+
+    flips = events.supertrend(quotes, period=10, multipler=3, dense=True)
+    assert np.array_equal(flips.result.supertrend, dense.supertrend, equal_nan=True)
+
+
+def test_growing_buffers(test_ohlcv_data, monkeypatch):
+    """Kernels of flips continue from their state when buffers are full."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    expected_sar = events.parabolic_sar(quotes)
+    expected_supertrend = events.supertrend(quotes)
+
+    monkeypatch.setattr(events, 'EVENTS_INITIAL_SIZE', 1)
+    monkeypatch.setattr(events, 'EVENTS_BARS_PER_EVENT', len(quotes.close) + 1)
+    for flips, expected in [(events.parabolic_sar(quotes), expected_sar),
+                            (events.supertrend(quotes), expected_supertrend)]:
+        assert len(flips) == len(expected) > 100
+        assert np.array_equal(flips.index, expected.index)
+        assert np.array_equal(flips.price, expected.price)
+        assert np.array_equal(flips.type, expected.type)
+
+
+def best_time(func, *args, **kwargs):
+    """The best time of several calls after a warm-up call."""
+    func(*args, **kwargs)
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.skipif(not os.environ.get('PYITA_TIMING_TESTS'), reason='timing test, set PYITA_TIMING_TESTS=1 to run')
+def test_kernels_speed(test_ohlcv_data):
+    """Dense series and flips take a few times of a moving average (regression check).
+    
+    Kernels of parabolic_sar and supertrend are single loops over bars, keeping
+    events in them must not slow down the dense calculation.
+    """
+    quotes = ta.Quotes(**{name: np.tile(values, 20) for name, values in test_ohlcv_data.items() if name != 'time'})
+    ema_time = best_time(ta.ema, quotes, period=20)
+    atr_time = best_time(ta.atr, quotes, smooth=10)
+
+    assert best_time(ta.parabolic_sar, quotes) < 6 * ema_time
+    assert best_time(events.parabolic_sar, quotes) < 6 * ema_time
+    assert best_time(ta.supertrend, quotes) < 3 * atr_time
+    assert best_time(events.supertrend, quotes) < 3 * atr_time
+
+
+def test_events_errors(test_ohlcv_data):
+    """Bad parameters raise exceptions as in indicators."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        events.zigzag(quotes, delta=0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        events.parabolic_sar(quotes, start=0.3, maximum=0.2)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        events.supertrend(quotes, period=0)
@@ -0,0 +1,128 @@
+"""Tests for indicator lookback and tail calculation."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionIndicatorNotFound
+
+
+WINDOW_INDICATORS = [
+    ('sma', dict(period=20)),
+    ('ma', dict(period=20, ma_type='sma')),
+    ('rsi', dict(period=14, ma_type='sma')),
+    ('roc', dict(period=10, ma_period=5)),
+    ('atr', dict(smooth=14, ma_type='sma')),
+    ('adx', dict(period=14, smooth=10, ma_type='sma')),
+    ('bollinger_bands', dict(period=20)),
+    ('cci', dict(period=20)),
+    ('median_bands', dict(period=20)),
+    ('percentile_rank', dict(period=50)),
+    ('robust_zscore', dict(period=20)),
+    ('williams_r', dict(period=14)),
+    ('vwma', dict(period=10)),
+    ('mfi', dict(period=14)),
+    ('aroon', dict(period=14)),
+    ('stochastic', dict(period=14, period_d=3, smooth=3)),
+    ('ichimoku', dict()),
+]
+
+EMA_INDICATORS = [
+    ('ema', dict(period=20)),
+    ('ma', dict(period=20, ma_type='mma0')),
+    ('ma', dict(period=20, ma_type='emaw')),
+    ('tema', dict(period=10)),
+    ('trix', dict(period=10)),
+    ('macd', dict(period_short=12, period_long=26, period_signal=9, ma_type_signal='ema')),
+    ('rsi', dict(period=14)),
+    ('atr', dict(smooth=14)),
+    ('adx', dict(period=14, smooth=14)),
+    ('volume_osc', dict()),
+    ('chandelier', dict()),
+    ('keltner', dict()),
+    ('awesome', dict(ma_type_fast='ema', ma_type_slow='ema')),
+]
+
+# Indicators with values in percents, others are in price units
+PERCENT_INDICATORS = ('trix', 'rsi', 'adx', 'volume_osc')
+
+
+def last_values(result, k):
+    result._materialize()
+    return {name: values[-k:] for name, values in result._data.items()}
+
+
+@pytest.mark.parametrize('name, params', WINDOW_INDICATORS)
+def test_lookback_window_exact(quotes, name, params):
+    """Last value of window indicators is calculated on lookback bars."""
+    n_bars = ta.lookback(name, **params)
+    full = last_values(getattr(ta, name)(quotes, **params), 1)
+    short = last_values(getattr(ta, name)(quotes[-n_bars:], **params), 1)
+
+    for series, values in full.items():
+        np.testing.assert_allclose(short[series], values, rtol=1e-12)
+
+
+@pytest.mark.parametrize('name, params', EMA_INDICATORS)
+def test_lookback_converged(quotes, name, params):
+    """Last values of exponential indicators converge within tolerance."""
+    close = quotes.close[-1]
+    for tolerance in (1e-4, 1e-8):
+        n_bars = ta.lookback(name, tolerance=tolerance, **params)
+        full = last_values(getattr(ta, name)(quotes, **params), 1)
+        short = last_values(getattr(ta, name)(quotes[-n_bars:], **params), 1)
+
+        for series, values in full.items():
+            scale = 100 if name in PERCENT_INDICATORS else close
+            assert np.abs(short[series] - values) <= tolerance * scale
+
+
+def test_lookback_values():
+    """Lookback of simple cases and cascades."""
+    assert ta.lookback('sma', period=20) == 20
+    assert ta.lookback('ema', period=1) == 1
+    assert ta.lookback('aroon', period=25) == 26
+    assert ta.lookback('ichimoku', period_long=60, offset_senkou=30) == 90
+
+    ema = ta.lookback('ema', period=20)
+    assert ta.lookback('ma', period=20, ma_type='ema') == ema
+    assert ta.lookback('ema', period=20, tolerance=1e-10) > ema
+    assert ta.lookback('macd', period_short=12, period_long=20, period_signal=9) == ema + 8
+    assert ta.lookback('tema', period=20) == ema + 2 * (ta.lookback('ma', period=20, ma_type='ema0') - 1)
+
+    for name in ('obv', 'adl', 'vwap', 'zigzag', 'parabolic_sar', 'supertrend'):
+        assert ta.lookback(name) is None
+
+
+@pytest.mark.parametrize('name, params', WINDOW_INDICATORS[:5] + EMA_INDICATORS[:5] + [('supertrend', {})])
+def test_tail(quotes, name, params):
+    """tail=k returns last k values calculated on lookback part of quotes."""
+    full = last_values(getattr(ta, name)(quotes, **params), 5)
+    tail = getattr(ta, name)(quotes, tail=5, **params)
+
+    assert list(tail._data) == list(full)
+    for series, values in full.items():
+        np.testing.assert_allclose(tail[series], values, rtol=1e-5)
+
+
+def test_tail_short_quotes(quotes):
+    """tail larger than quotes returns all values."""
+    result = ta.sma(quotes[:30], period=10, tail=100)
+    np.testing.assert_array_equal(result.sma, ta.sma(quotes[:30], period=10).sma)
+
+
+def test_lookback_errors(quotes):
+    """Bad indicator name, parameters and tail raise exceptions."""
+    with pytest.raises(PyTAExceptionIndicatorNotFound):
+        ta.lookback('unknown_indicator', period=10)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.lookback('sma')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.lookback('sma', period=10, unknown=1)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.lookback('ema', period=0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.lookback('ema', period=10, tolerance=0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.lookback('macd', period_short=12, period_long=26, period_signal=9, ma_type='bad')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.sma(quotes, period=10, tail=0)
@@ -88,7 +88,7 @@ def test_ma_ema_direct_calculation(test_ohlcv_data, period):
     ma_result = ta.ma(quotes, period=period, value='close', ma_type='ema')
     
     # Calculate expected EMA by direct computation
-    # EMA uses iema_calculate: initialization via SMA of first period elements starting from first non-NaN
+    # EMA: initialization via SMA of first period elements starting from first non-NaN
     source_values = close_data
     expected_ema = np.full(len(source_values), np.nan, dtype=np.float64)
     
@@ -253,7 +253,7 @@ def test_ma_mma_direct_calculation(test_ohlcv_data, period):
     ma_result = ta.ma(quotes, period=period, value='close', ma_type='mma')
     
     # Calculate expected MMA by direct computation
-    # MMA uses iema_calculate: initialization via SMA of first period elements starting from first non-NaN
+    # MMA: initialization via SMA of first period elements starting from first non-NaN
     source_values = close_data
     expected_mma = np.full(len(source_values), np.nan, dtype=np.float64)
     
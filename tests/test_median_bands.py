@@ -0,0 +1,37 @@
+"""Tests for Median Bands indicator."""
+import numpy as np
+import pytest
+import pyita as ta
+
+from pyita.exceptions import PyTAExceptionBadParameterValue
+
+
+def rolling_quantile(values, period, q):
+    """Rolling quantile by direct computation over windows."""
+    windows = np.lib.stride_tricks.sliding_window_view(values, period)
+    return np.hstack((np.full(period - 1, np.nan), np.quantile(windows, q, axis=1)))
+
+
+@pytest.mark.parametrize('period, quantile', [(1, 0.25), (2, 0.25), (20, 0.25), (55, 0.1), (300, 0)])
+def test_median_bands(test_ohlcv_data, period, quantile):
+    """Test Median Bands against np.quantile over windows."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+
+    bands = ta.median_bands(quotes, period=period, quantile=quantile)
+
+    close = test_ohlcv_data['close']
+    np.testing.assert_allclose(bands.mid_line, rolling_quantile(close, period, 0.5), rtol=1e-14)
+    np.testing.assert_allclose(bands.up_line, rolling_quantile(close, period, 1 - quantile), rtol=1e-14)
+    np.testing.assert_allclose(bands.down_line, rolling_quantile(close, period, quantile), rtol=1e-14)
+
+
+def test_median_bands_errors(test_ohlcv_data):
+    """Test bad parameters."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.median_bands(quotes, period=0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.median_bands(quotes, quantile=0.6)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.median_bands(quotes, value='volume')
@@ -0,0 +1,105 @@
+"""Tests for streaming indicators of many symbols."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita import multi_stream
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+N_SYMBOLS = 4
+N_BARS = 1500
+
+
+@pytest.fixture
+def symbols(test_ohlcv_data):
+    """Quotes data of symbols with leading NaN, gaps and flat segments."""
+    symbols = []
+    for k in range(N_SYMBOLS):
+        symbols.append({name: test_ohlcv_data[name][k * 500: k * 500 + N_BARS].copy()
+                        for name in ('open', 'high', 'low', 'close', 'volume')})
+    for name in ('high', 'low', 'close'):
+        symbols[1][name][:5] = np.nan
+        symbols[2][name][700] = np.nan
+        symbols[3][name][800:820] = symbols[3]['close'][800]
+    return symbols
+
+
+@pytest.fixture
+def masks():
+    """Masks of symbols with a new bar."""
+    return np.random.default_rng(1).random((N_BARS, N_SYMBOLS)) < 0.8
+
+
+def stream_symbols(state, symbols, masks, columns):
+    """Feed bars of symbols to the state, return values of each symbol and numbers of bars."""
+    n_bars = np.zeros(N_SYMBOLS, dtype=int)
+    collected = [{} for _ in range(N_SYMBOLS)]
+    for mask in masks:
+        i_bars = np.minimum(n_bars, N_BARS - 1)
+        vectors = [np.array([symbols[k][name][i_bars[k]] for k in range(N_SYMBOLS)]) for name in columns]
+        values = state.update(*vectors, mask=mask)
+        for k in np.nonzero(mask)[0]:
+            for name, last_values in values.items():
+                collected[k].setdefault(name, []).append(last_values[k])
+        n_bars += mask
+    return collected, n_bars
+
+
+STATES = [
+    (multi_stream.EMAState, dict(period=20), 'ema', dict(period=20), ('close',)),
+    (multi_stream.RSIState, dict(period=14), 'rsi', dict(period=14), ('close',)),
+    (multi_stream.RSIState, dict(period=14, ma_type='sma'), 'rsi', dict(period=14, ma_type='sma'), ('close',)),
+    (multi_stream.RSIState, dict(period=14, ma_type='emaw'), 'rsi', dict(period=14, ma_type='emaw'), ('close',)),
+    (multi_stream.RSIState, dict(period=14, ma_type='mma0'), 'rsi', dict(period=14, ma_type='mma0'), ('close',)),
+    (multi_stream.ATRState, dict(), 'atr', dict(), ('high', 'low', 'close')),
+    (multi_stream.ATRState, dict(smooth=10, ma_type='sma'), 'atr', dict(smooth=10, ma_type='sma'),
+     ('high', 'low', 'close')),
+    (multi_stream.ADXState, dict(period=14, smooth=10), 'adx', dict(period=14, smooth=10), ('high', 'low', 'close')),
+    (multi_stream.ADXState, dict(ma_type='ema'), 'adx', dict(ma_type='ema'), ('high', 'low', 'close')),
+    (multi_stream.SupertrendState, dict(), 'supertrend', dict(), ('high', 'low', 'close')),
+    (multi_stream.SupertrendState, dict(period=7, multipler=2, ma_type='sma'), 'supertrend',
+     dict(period=7, multipler=2, ma_type='sma'), ('high', 'low', 'close')),
+    (multi_stream.BollingerState, dict(), 'bollinger_bands', dict(), ('close',)),
+    (multi_stream.BollingerState, dict(period=10, ma_type='ema'), 'bollinger_bands',
+     dict(period=10, ma_type='ema'), ('close',)),
+]
+
+
+@pytest.mark.parametrize('state_class, state_params, name, params, columns', STATES)
+def test_multi_stream_equals_indicator(symbols, masks, state_class, state_params, name, params, columns):
+    """Values of each symbol are equal to the indicator calculated on its bars."""
+    state = state_class(N_SYMBOLS, **state_params)
+    collected, n_bars = stream_symbols(state, symbols, masks, columns)
+
+    for k in range(N_SYMBOLS):
+        quotes = ta.Quotes(**{column: values[:n_bars[k]] for column, values in symbols[k].items()})
+        expected = getattr(ta, name)(quotes, **params)
+        for series_name in expected.series_names():
+            np.testing.assert_allclose(collected[k][series_name], expected[series_name], rtol=1e-9, atol=1e-9)
+
+
+def test_multi_stream_mask(symbols):
+    """Symbols excluded by the mask keep their state and values."""
+    state = multi_stream.EMAState(2, period=3)
+    close = np.array([1.0, 10.0])
+    for _ in range(3):
+        state.update(close)
+    values = state.update(np.array([4.0, 40.0]), mask=np.array([True, False]))['ema']
+    np.testing.assert_allclose(values, [2.5, 10.0])
+    np.testing.assert_allclose(state.values['ema'], values)
+
+
+def test_multi_stream_errors():
+    """Invalid parameters and vectors raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        multi_stream.EMAState(0, period=10)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        multi_stream.RSIState(3, period=14, ma_type='xma')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        multi_stream.SupertrendState(3, period=1)
+
+    state = multi_stream.ATRState(3)
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        state.update(np.ones(3), np.ones(3), np.ones(2))
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        state.update(np.ones(3), np.ones(3), np.ones(3), mask=np.ones(4, dtype=bool))
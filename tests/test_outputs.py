@@ -0,0 +1,110 @@
+"""Tests for deferred series and selection of outputs."""
+import pickle
+
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue
+from pyita.indicator_result import Deferred, IndicatorResult
+
+
+INDICATORS = [
+    ('atr', {}, ['atr']),
+    ('bollinger_bands', {}, ['mid_line', 'z_score']),
+    ('ichimoku', {}, ['kijun', 'senkou_b']),
+    ('keltner', {}, ['mid_line']),
+    ('aroon', {}, ['up']),
+]
+
+
+@pytest.mark.parametrize('name, params, outputs', INDICATORS)
+def test_outputs_match_full_result(quotes, name, params, outputs):
+    """Selected outputs are equal to series of the full result."""
+    indicator = getattr(ta, name)
+    full = indicator(quotes, **params)
+    selected = indicator(quotes, outputs=outputs, **params)
+
+    assert selected.series_names() == outputs
+    for series_name in outputs:
+        np.testing.assert_array_equal(selected[series_name], full[series_name])
+    for series_name in full.series_names():
+        if series_name not in outputs:
+            with pytest.raises(AttributeError):
+                getattr(selected, series_name)
+
+
+@pytest.mark.parametrize('name, deferred_name', [
+    ('atr', 'atrp'),
+    ('bollinger_bands', 'z_score'),
+    ('ichimoku', 'chikou'),
+    ('keltner', 'width'),
+    ('aroon', 'oscillator'),
+])
+def test_deferred_series(quotes, name, deferred_name):
+    """Secondary series are calculated on first access only."""
+    result = getattr(ta, name)(quotes)
+
+    assert deferred_name in result.series_names()
+    assert deferred_name not in result._data
+
+    values = getattr(result, deferred_name)
+    assert result._data[deferred_name] is values
+    assert result[deferred_name] is values
+
+
+@pytest.mark.parametrize('name, outputs', [
+    ('atr', None),
+    ('bollinger_bands', ['z_score']),
+    ('ichimoku', ['senkou_a', 'senkou_b', 'chikou']),
+    ('keltner', ['width']),
+    ('aroon', ['oscillator']),
+])
+def test_deferred_changed_quotes(test_ohlcv_data, name, outputs):
+    """Deferred series do not depend on changes of quotes after the call."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    indicator = getattr(ta, name)
+    expected = indicator(ta.Quotes(**test_ohlcv_data), outputs=outputs)
+
+    result = indicator(quotes, outputs=outputs)
+    for column in ('high', 'low', 'close'):
+        quotes[column][:] = 1.0
+    for series_name in expected.series_names():
+        np.testing.assert_array_equal(result[series_name], expected[series_name])
+
+
+def test_deferred_values(quotes):
+    """Deferred series have the same values as direct calculations."""
+    atr = ta.atr(quotes)
+    np.testing.assert_allclose(atr.atrp, atr.atr / quotes.close * 100)
+
+    aroon = ta.aroon(quotes)
+    np.testing.assert_array_equal(aroon.oscillator, aroon.up - aroon.down)
+
+
+def test_deferred_bulk_operations(quotes):
+    """Slicing, tail, pack and pickling calculate deferred series."""
+    result = ta.bollinger_bands(quotes)
+    expected = ta.bollinger_bands(quotes).z_score
+
+    np.testing.assert_array_equal(result[100:200].z_score, expected[100:200])
+    np.testing.assert_array_equal(result.tail(5)['z_score'], expected[-5:])
+    np.testing.assert_array_equal(pickle.loads(pickle.dumps(ta.bollinger_bands(quotes))).z_score, expected)
+    np.testing.assert_array_equal(ta.bollinger_bands(quotes).pack().z_score, expected)
+
+
+def test_deferred_called_once():
+    """Deferred value is calculated once."""
+    calls = []
+    value = Deferred(lambda: calls.append(1) or np.arange(3.0))
+
+    result = IndicatorResult._from_series({'a': np.zeros(3), 'b': value})
+    assert result.b is result.b
+    assert value() is result.b
+    assert len(calls) == 1
+
+
+def test_outputs_errors(quotes):
+    """Unknown output names raise exception."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.atr(quotes, outputs=['atr', 'unknown'])
@@ -0,0 +1,108 @@
+"""Tests for packed storage of DataSeries."""
+import pickle
+
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadSeriesData
+from pyita.indicator_result import IndicatorResult
+
+
+def assert_same_series(obj, expected):
+    assert list(obj._data) == list(expected._data)
+    for name, values in expected._data.items():
+        assert obj[name].dtype == values.dtype
+        np.testing.assert_array_equal(obj[name], values)
+
+
+def test_pack_layout(quotes):
+    """Series are rows of one contiguous block."""
+    packed = quotes.pack()
+
+    block = packed.packed
+    assert isinstance(packed, ta.Quotes)
+    assert quotes.packed is None
+    assert block.shape == (len(quotes._data), len(quotes.close))
+    assert block.flags.c_contiguous
+    assert_same_series(packed, quotes)
+    for i, name in enumerate(quotes._data):
+        assert np.shares_memory(packed[name], block[i])
+
+
+def test_packed_slicing(quotes):
+    """Slices of packed objects are views of the block and keep the layout."""
+    packed = quotes.pack()
+
+    for key in (slice(10, 100), slice(None, None, 3), -1):
+        sliced = packed[key]
+        assert sliced.packed is not None
+        assert np.shares_memory(sliced.packed, packed.packed)
+        assert_same_series(sliced, quotes[key])
+
+    empty = packed[50:10]
+    assert empty.packed.shape == (len(quotes._data), 0)
+    assert_same_series(empty, quotes[50:10])
+
+
+def test_packed_indicator(quotes):
+    """Indicators give identical results on packed quotes."""
+    packed = quotes.pack()
+
+    np.testing.assert_array_equal(ta.atr(packed, smooth=14).atr, ta.atr(quotes, smooth=14).atr)
+    np.testing.assert_array_equal(ta.supertrend(packed[100:]).supertrend, ta.supertrend(quotes[100:]).supertrend)
+
+
+def test_packed_pickle_and_copy(quotes):
+    """Packed objects are pickled and copied as a single block."""
+    packed = quotes[:1000].pack()
+
+    restored = pickle.loads(pickle.dumps(packed))
+    assert restored.packed is not None
+    assert_same_series(restored, quotes[:1000])
+    for i, name in enumerate(restored._data):
+        assert np.shares_memory(restored[name], restored.packed[i])
+
+    copied = packed.copy()
+    assert not np.shares_memory(copied.packed, packed.packed)
+    assert_same_series(copied, packed)
+
+    # Not packed objects are pickled as dictionary of series
+    assert_same_series(pickle.loads(pickle.dumps(quotes[:10])), quotes[:10])
+
+
+def test_from_packed_memory_map(quotes, tmp_path):
+    """Quotes are created on a memory mapped block without copying."""
+    filename = tmp_path / 'quotes.npy'
+    np.save(filename, quotes.pack().packed)
+
+    block = np.load(filename, mmap_mode='r')
+    mapped = ta.Quotes.from_packed(block, list(quotes._data))
+
+    assert mapped.time.dtype == np.dtype('datetime64[ms]')
+    assert np.shares_memory(mapped.close, block)
+    assert not mapped.writeable
+    assert_same_series(mapped, quotes)
+
+
+def test_result_pack(quotes):
+    """Results with 8-byte series are packed, other types raise exception."""
+    result = ta.sma(quotes, period=10)
+    packed = result.pack()
+    assert isinstance(packed, IndicatorResult)
+    assert_same_series(packed, result)
+
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.parabolic_sar(quotes).pack()
+
+
+def test_from_packed_errors(quotes):
+    """Bad block shape, item size and missing columns raise exceptions."""
+    block = quotes.pack().packed
+
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.Quotes.from_packed(block, ['open', 'high'])
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.Quotes.from_packed(block.astype(np.float32), list(quotes._data))
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.Quotes.from_packed(block[:2], ['open', 'high'])
@@ -0,0 +1,18 @@
+"""Tests for Percentile Rank indicator."""
+import numpy as np
+import pytest
+import pyita as ta
+
+
+@pytest.mark.parametrize('period, value', [(1, 'close'), (14, 'close'), (100, 'volume'), (500, 'high')])
+def test_percentile_rank(test_ohlcv_data, period, value):
+    """Test Percentile Rank against direct computation over windows."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+
+    rank = ta.percentile_rank(quotes, period=period, value=value)
+
+    values = test_ohlcv_data[value]
+    windows = np.lib.stride_tricks.sliding_window_view(values, period)
+    expected = (windows <= windows[:, -1:]).sum(axis=1) / period * 100
+    assert np.all(np.isnan(rank.percentile_rank[:period - 1]))
+    np.testing.assert_allclose(rank.percentile_rank[period - 1:], expected, rtol=1e-14)
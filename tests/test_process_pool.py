@@ -0,0 +1,120 @@
+"""Tests for ProcessPoolRunner."""
+import os
+
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita import process_pool
+from pyita.exceptions import PyTAExceptionBadParameterValue
+from pyita.process_pool import SharedQuotes
+
+from conftest import arrays_equal_with_nan
+
+
+@pytest.fixture(scope='module')
+def runner():
+    """Runner with two workers."""
+    with ta.ProcessPoolRunner(max_workers=2) as runner:
+        yield runner
+
+
+def shm_exists(name):
+    """Check that shared memory block exists (POSIX)."""
+    return os.path.exists(f'/dev/shm/{name.lstrip("/")}')
+
+
+def test_map(runner, quotes):
+    """Results calculated in workers match direct calculation."""
+    quotes_list = [quotes, quotes[100:], quotes[:5000]]
+
+    results = runner.map('rsi', quotes_list, period=14)
+
+    assert len(results) == len(quotes_list)
+    for result, source in zip(results, quotes_list):
+        assert isinstance(result, ta.IndicatorResult)
+        assert arrays_equal_with_nan(result.rsi, ta.rsi(source, period=14).rsi, atol=0)
+
+
+def test_submit_multiple_outputs(runner, quotes):
+    """All series of the result are returned, including integer ones."""
+    result = runner.submit('parabolic_sar', quotes).result()
+    expected = ta.parabolic_sar(quotes)
+
+    assert arrays_equal_with_nan(result.sar, expected.sar, atol=0)
+    assert result.signal.dtype == expected.signal.dtype
+    np.testing.assert_array_equal(result.signal, expected.signal)
+
+
+def test_shared_quotes_reuse(runner, quotes):
+    """Shared quotes are used by several calculations and released on request."""
+    shared = runner.share(quotes)
+
+    np.testing.assert_array_equal(shared.quotes.close, quotes.close)
+    np.testing.assert_array_equal(shared.quotes.time, quotes.time)
+
+    ema = runner.submit('ema', shared, period=20).result()
+    sma = runner.submit('sma', shared, period=20).result()
+
+    assert arrays_equal_with_nan(ema.ema, ta.ema(quotes, period=20).ema, atol=0)
+    assert arrays_equal_with_nan(sma.sma, ta.sma(quotes, period=20).sma, atol=0)
+
+    name = shared.descriptor[0]
+    assert not shared.released
+    shared.release()
+    assert shared.released
+    if os.path.isdir('/dev/shm'):
+        assert not shm_exists(name)
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason='POSIX shared memory is required')
+def test_blocks_released(runner, quotes):
+    """Temporary quotes blocks and result blocks do not stay in shared memory."""
+    before = set(os.listdir('/dev/shm'))
+
+    result = runner.submit('sma', quotes, period=10).result()
+
+    assert arrays_equal_with_nan(result.sma, ta.sma(quotes, period=10).sma, atol=0)
+    assert set(os.listdir('/dev/shm')) - before == set()
+
+
+def test_worker_exception(runner, quotes):
+    """Exceptions in workers are raised by result()."""
+    with pytest.raises(PyTAExceptionBadParameterValue) as exc_info:
+        runner.submit('sma', quotes, period=0).result()
+    assert exc_info.value.reason == 'period must be greater than 0, got 0'
+
+
+def test_shared_quotes_without_runner(quotes):
+    """SharedQuotes keeps data available after release while views are alive."""
+    shared = SharedQuotes(quotes)
+    view = shared.quotes
+    shared.release()
+
+    np.testing.assert_array_equal(view.close, quotes.close)
+
+
+def test_shared_quotes_closed_with_views(quotes):
+    """Block handle is closed when the last view of the released quotes is dropped."""
+    shared = SharedQuotes(quotes)
+    shm = shared._shm
+    close = shared.quotes.close
+    shared.release()
+
+    assert shm.buf is not None
+    del close
+    assert shm.buf is None
+
+
+def test_result_attach_error(runner, quotes, monkeypatch):
+    """Errors in receiving the result are raised by result() instead of hanging."""
+    attach_result = process_pool.attach_block
+
+    def attach_block(descriptor, unlink=False):
+        attach_result(descriptor, unlink=unlink)
+        raise MemoryError('no memory for the result')
+
+    monkeypatch.setattr(process_pool, 'attach_block', attach_block)
+
+    with pytest.raises(MemoryError, match='no memory for the result'):
+        runner.submit('sma', quotes, period=10).result(timeout=60)
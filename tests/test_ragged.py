@@ -0,0 +1,82 @@
+"""Tests for calculation over concatenated series with offsets."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita import ragged
+from pyita.move_average import MA_Type, ma_calculate
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+
+@pytest.fixture
+def segments(quotes):
+    """Quotes of different lengths, including short and empty ones."""
+    return [quotes, quotes[100:3000], quotes[:5], quotes[:0], quotes[5000:], quotes[7000:7001]]
+
+
+def concatenate(segments, name):
+    return ragged.from_arrays([quotes[name] for quotes in segments])
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+@pytest.mark.parametrize('ma_type', ['sma', 'ema', 'mma', 'ema0', 'mma0', 'emaw', 'mmaw'])
+def test_ragged_ma(segments, ma_type, parallel):
+    """Moving averages of segments are equal to ma_calculate of each series."""
+    close = [quotes.close.copy() for quotes in segments]
+    close[1][:10] = np.nan
+    values, offsets = ragged.from_arrays(close)
+
+    result = ragged.ma(values, offsets, 20, ma_type, parallel=parallel)
+    assert len(result) == len(values)
+    for series, segment in zip(close, ragged.to_arrays(result, offsets)):
+        if len(series) - np.isnan(series).sum() >= 20:
+            np.testing.assert_allclose(segment, ma_calculate(series, 20, MA_Type.cast(ma_type)), rtol=1e-12)
+        elif len(series) and ma_type not in ('ema0', 'mma0'):
+            assert np.all(np.isnan(segment))
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_ragged_rsi_atr(segments, parallel):
+    """RSI and ATR of segments are equal to the indicators, short segments give NaN."""
+    close, offsets = concatenate(segments, 'close')
+    high, _ = concatenate(segments, 'high')
+    low, _ = concatenate(segments, 'low')
+
+    rsi = ragged.to_arrays(ragged.rsi(close, offsets, 14, parallel=parallel), offsets)
+    atr = ragged.to_arrays(ragged.atr(high, low, close, offsets, smooth=20, parallel=parallel), offsets)
+    for quotes, rsi_segment, atr_segment in zip(segments, rsi, atr):
+        if len(quotes.close) > 20:
+            np.testing.assert_array_equal(rsi_segment, ta.rsi(quotes, period=14).rsi)
+            np.testing.assert_array_equal(atr_segment, ta.atr(quotes, smooth=20).atr)
+        else:
+            assert np.all(np.isnan(rsi_segment)) and np.all(np.isnan(atr_segment))
+
+
+def test_offsets_from_keys(quotes):
+    """Offsets of a long-format table grouped by symbols."""
+    keys = np.array(['BTC'] * 3 + ['ETH'] * 2 + ['SOL'])
+    offsets, symbols = ragged.offsets_from_keys(keys)
+    np.testing.assert_array_equal(offsets, [0, 3, 5, 6])
+    np.testing.assert_array_equal(symbols, ['BTC', 'ETH', 'SOL'])
+
+    offsets, symbols = ragged.offsets_from_keys(np.array([], dtype=np.int64))
+    np.testing.assert_array_equal(offsets, [0])
+    assert len(symbols) == 0
+
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ragged.offsets_from_keys(['BTC', 'ETH', 'BTC'])
+
+
+def test_ragged_errors(quotes):
+    """Offsets not fitting values and bad parameters raise exceptions."""
+    values, offsets = ragged.from_arrays([quotes.close, quotes.close[:100]])
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ragged.ma(values, offsets[:-1], 10)
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ragged.ma(values, [0, 200, 100, len(values)], 10)
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ragged.atr(values, values[:-1], values, offsets)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ragged.ma(values, offsets, 0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ragged.rsi(values, offsets, 14, ma_type='wma')
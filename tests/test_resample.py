@@ -0,0 +1,252 @@
+"""Tests for Quotes resampling."""
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData, PyTAExceptionDataSeriesNonFound
+
+
+TEST_DATA_1D_FILENAME = "BINANCE_BTC_USDT_1d_2025.pkl"
+
+
+@pytest.fixture
+def quotes_1h(test_ohlcv_data):
+    """Hourly quotes with time and volume."""
+    return ta.Quotes(**test_ohlcv_data)
+
+
+@pytest.fixture
+def test_data_1d():
+    """Daily test data (reference for resampling of hourly data)."""
+    filepath = Path(__file__).parent / "test_data" / TEST_DATA_1D_FILENAME
+    with open(filepath, 'rb') as f:
+        return pickle.load(f)
+
+
+def expected_resample(quotes, step_ms, origin_ms=0):
+    """Resample by direct computation over groups."""
+    time_ms = quotes.time.astype(np.int64)
+    buckets = (time_ms - origin_ms) // step_ms
+    result = {name: [] for name in ('open', 'high', 'low', 'close', 'volume', 'time')}
+    for bucket in np.unique(buckets):
+        bx = buckets == bucket
+        result['open'].append(quotes.open[bx][0])
+        result['high'].append(quotes.high[bx].max())
+        result['low'].append(quotes.low[bx].min())
+        result['close'].append(quotes.close[bx][-1])
+        result['volume'].append(quotes.volume[bx].sum())
+        result['time'].append(origin_ms + bucket * step_ms)
+    result = {name: np.array(values) for name, values in result.items()}
+    result['time'] = result['time'].astype('datetime64[ms]')
+    return result
+
+
+def assert_resampled(resampled, expected):
+    np.testing.assert_array_equal(resampled.time, expected['time'])
+    for name in ('open', 'high', 'low', 'close'):
+        np.testing.assert_array_equal(resampled[name], expected[name])
+    np.testing.assert_allclose(resampled.volume, expected['volume'], rtol=1e-12)
+
+
+def test_resample_1d_matches_daily_data(quotes_1h, test_data_1d):
+    """Hourly data resampled to 1d matches daily exchange data (except the last unfinished day)."""
+    resampled = quotes_1h.resample('1d')
+
+    assert isinstance(resampled, ta.Quotes)
+    assert len(resampled.time) == len(test_data_1d['time'])
+    np.testing.assert_array_equal(resampled.time, test_data_1d['time'])
+    for name in ('open', 'high', 'low', 'close'):
+        np.testing.assert_array_equal(resampled[name][:-1], test_data_1d[name][:-1])
+    np.testing.assert_allclose(resampled.volume[:-1], test_data_1d['volume'][:-1], rtol=1e-9)
+
+
+@pytest.mark.parametrize('timeframe, step_hours', [('1h', 1), ('2h', 2), ('4h', 4), ('12h', 12), ('3d', 72)])
+def test_resample_fixed_timeframes(quotes_1h, timeframe, step_hours):
+    """Fixed timeframes are aligned to the epoch."""
+    resampled = quotes_1h.resample(timeframe)
+    assert_resampled(resampled, expected_resample(quotes_1h, step_hours * 3600 * 1000))
+
+
+def test_resample_weekly_starts_on_monday(quotes_1h):
+    """Weekly bars start on Monday 00:00 UTC."""
+    resampled = quotes_1h.resample('1w')
+
+    weekdays = (resampled.time.astype('datetime64[D]').astype(np.int64) + 3) % 7
+    assert np.all(weekdays == 0)
+    assert_resampled(resampled, expected_resample(quotes_1h, 7 * 24 * 3600 * 1000, 4 * 24 * 3600 * 1000))
+
+
+def test_resample_monthly(quotes_1h):
+    """Monthly bars follow calendar months."""
+    resampled = quotes_1h.resample('1M')
+
+    months = quotes_1h.time.astype('datetime64[M]')
+    expected_time = np.unique(months).astype('datetime64[ms]')
+    np.testing.assert_array_equal(resampled.time, expected_time)
+    for i, month in enumerate(np.unique(months)):
+        bx = months == month
+        assert resampled.open[i] == quotes_1h.open[bx][0]
+        assert resampled.high[i] == quotes_1h.high[bx].max()
+        assert resampled.low[i] == quotes_1h.low[bx].min()
+        assert resampled.close[i] == quotes_1h.close[bx][-1]
+
+
+def test_resample_origin_start(quotes_1h):
+    """origin='start' aligns bars to the first source bar."""
+    quotes = quotes_1h[5:]
+    origin_ms = int(quotes.time[0].astype(np.int64))
+    resampled = quotes.resample('1d', origin='start')
+
+    assert resampled.time[0] == quotes.time[0]
+    assert_resampled(resampled, expected_resample(quotes, 24 * 3600 * 1000, origin_ms))
+
+
+def test_resample_gaps(quotes_1h):
+    """Periods without source bars produce no bars."""
+    bx = np.ones(len(quotes_1h.time), dtype=bool)
+    bx[30:100] = False
+    quotes = ta.Quotes(**{name: quotes_1h[name][bx] for name in ('open', 'high', 'low', 'close', 'volume', 'time')})
+
+    resampled = quotes.resample('4h')
+
+    assert_resampled(resampled, expected_resample(quotes, 4 * 3600 * 1000))
+    assert np.diff(resampled.time).max() > np.timedelta64(4, 'h')
+
+
+def test_resample_without_volume(quotes_1h):
+    """Volume is optional."""
+    quotes = ta.Quotes(quotes_1h.open, quotes_1h.high, quotes_1h.low, quotes_1h.close, time=quotes_1h.time)
+    resampled = quotes.resample('1d')
+
+    assert 'volume' not in resampled._data
+    np.testing.assert_array_equal(resampled.close, quotes_1h.resample('1d').close)
+
+
+def test_resample_errors(quotes_1h):
+    """Bad timeframe, unsorted time and missing time raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes_1h.resample('1x')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes_1h.resample('0h')
+
+    quotes = ta.Quotes(quotes_1h.open, quotes_1h.high, quotes_1h.low, quotes_1h.close, time=quotes_1h.time[::-1])
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        quotes.resample('1d')
+
+    quotes = ta.Quotes(quotes_1h.open, quotes_1h.high, quotes_1h.low, quotes_1h.close)
+    with pytest.raises(PyTAExceptionDataSeriesNonFound):
+        quotes.resample('1d')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 100, 5000])
+def test_resampler_streaming(quotes_1h, chunk_size):
+    """Streaming resampler produces the same bars as batch resampling."""
+    expected = quotes_1h.resample('4h')
+    resampler = ta.Resampler('4h')
+
+    closed = []
+    n_bars = len(quotes_1h.time)
+    for i in range(0, n_bars, chunk_size):
+        closed.append(resampler.update(quotes_1h[i: i + chunk_size]))
+
+    partial = resampler.partial
+    assert len(partial.time) == 1
+    assert partial.time[0] == expected.time[-1]
+    assert partial.close[0] == expected.close[-1]
+
+    last = resampler.flush()
+    assert resampler.partial is None
+    closed.append(last)
+
+    for name in ('open', 'high', 'low', 'close', 'time'):
+        np.testing.assert_array_equal(np.hstack([quotes[name] for quotes in closed]), expected[name])
+    np.testing.assert_allclose(np.hstack([quotes.volume for quotes in closed]), expected.volume, rtol=1e-12)
+
+
+def expected_align(time, base_time, values, close_times):
+    """Align by direct search of the last closed bar."""
+    out = np.full(len(base_time), np.nan)
+    for i, t in enumerate(base_time):
+        closed = np.nonzero(close_times <= t)[0]
+        if len(closed):
+            out[i] = values[closed[-1]]
+    return out
+
+
+def test_align_to_last_closed(quotes_1h):
+    """Daily values appear on hourly bars of the next day only."""
+    quotes_1d = quotes_1h.resample('1d')
+    result = ta.sma(quotes_1d, period=3)
+
+    aligned = result.align_to(quotes_1h, quotes_1d)
+
+    assert isinstance(aligned, ta.IndicatorResult)
+    close_times = np.hstack((quotes_1d.time[1:], np.datetime64('2100-01-01', 'ms')))
+    expected = expected_align(quotes_1d.time, quotes_1h.time, result.sma, close_times)
+    np.testing.assert_array_equal(aligned.sma, expected)
+
+    # First day has no closed daily bar
+    assert np.all(np.isnan(aligned.sma[:24]))
+    day = quotes_1h.time.astype('datetime64[D]')
+    i_day = np.nonzero(quotes_1d.time == np.datetime64('2025-03-10', 'ms'))[0][0]
+    assert np.all(aligned.sma[day == np.datetime64('2025-03-11')] == result.sma[i_day])
+
+
+def test_align_to_timeframe_closes_last_bar(quotes_1h):
+    """With timeframe the last higher timeframe bar is closed after its period."""
+    quotes_1d = quotes_1h[:24 * 10].resample('1d')
+    result = ta.sma(quotes_1d, period=1)
+
+    aligned = result.align_to(quotes_1h, quotes_1d, timeframe='1d')
+    aligned_open = result.align_to(quotes_1h, quotes_1d)
+
+    assert np.all(aligned.sma[24 * 10:] == result.sma[-1])
+    assert np.all(aligned_open.sma[24 * 10:] == result.sma[-2])
+
+
+def test_align_to_current(quotes_1h):
+    """method='current' takes the bar containing the base bar."""
+    quotes_4h = quotes_1h.resample('4h')
+    result = ta.sma(quotes_4h, period=1)
+
+    aligned = result.align_to(quotes_1h, quotes_4h, method='current')
+
+    np.testing.assert_array_equal(aligned.sma, np.repeat(quotes_4h.close, 4)[:len(quotes_1h.time)])
+
+
+def test_align_to_integer_series(quotes_1h):
+    """Integer series are filled with 0 where no bar is closed."""
+    quotes_1d = quotes_1h.resample('1d')
+    result = ta.parabolic_sar(quotes_1d)
+
+    aligned = result.align_to(quotes_1h, quotes_1d)
+
+    assert aligned.signal.dtype == result.signal.dtype
+    assert np.all(aligned.signal[:24] == 0)
+
+
+def test_align_to_empty(quotes_1h):
+    """An empty higher timeframe result gives NaN (0 for integer series) on all base bars."""
+    quotes_1d = quotes_1h.resample('1d')
+    result = ta.parabolic_sar(quotes_1d)[:0]
+
+    aligned = result.align_to(quotes_1h, quotes_1d.time[:0])
+
+    assert len(aligned.sar) == len(quotes_1h.time)
+    assert np.all(np.isnan(aligned.sar))
+    assert aligned.signal.dtype == result.signal.dtype
+    assert np.all(aligned.signal == 0)
+
+
+def test_align_to_errors(quotes_1h):
+    """Bad method and length mismatch raise exceptions."""
+    quotes_1d = quotes_1h.resample('1d')
+    result = ta.sma(quotes_1d, period=3)
+
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        result.align_to(quotes_1h, quotes_1d, method='next')
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        result.align_to(quotes_1h, quotes_1h)
@@ -0,0 +1,188 @@
+"""Tests for resuming calculation of indicators on appended bars."""
+import importlib
+
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+
+@pytest.fixture
+def quotes_nan(test_ohlcv_data):
+    """Hourly quotes with gaps (NaN prices)."""
+    data = {name: values.copy() for name, values in test_ohlcv_data.items()}
+    for name in ('open', 'high', 'low', 'close'):
+        data[name][[100, 2000, 2001]] = np.nan
+    return ta.Quotes(**data)
+
+
+INDICATORS = [
+    ('sma', dict(period=20)),
+    ('ema', dict(period=20)),
+    ('ma', dict(period=15, ma_type='mma')),
+    ('ma', dict(period=15, ma_type='ema0')),
+    ('ma', dict(period=15, ma_type='emaw')),
+    ('tema', dict(period=10)),
+    ('trix', dict(period=10)),
+    ('macd', dict(period_short=12, period_long=26, period_signal=9)),
+    ('rsi', dict(period=14)),
+    ('rsi', dict(period=14, ma_type='sma')),
+    ('roc', dict(period=10, ma_period=5)),
+    ('awesome', dict(normalized=True)),
+    ('volume_osc', dict()),
+    ('atr', dict()),
+    ('adx', dict(ma_type='sma')),
+    ('bollinger_bands', dict()),
+    ('keltner', dict()),
+    ('chandelier', dict()),
+    ('supertrend', dict()),
+    ('cci', dict()),
+    ('cci', dict(period=200)),
+    ('mfi', dict()),
+    ('vwma', dict(period=10)),
+    ('stochastic', dict(ma_type='ema')),
+    ('williams_r', dict()),
+    ('aroon', dict()),
+    ('ichimoku', dict()),
+    ('median_bands', dict()),
+    ('percentile_rank', dict()),
+    ('robust_zscore', dict()),
+    ('obv', dict()),
+    ('adl', dict(ma_period=10)),
+    ('vwap', dict()),
+    ('parabolic_sar', dict()),
+    ('zigzag', dict()),
+    ('zigzag', dict(depth=3, end_points=True)),
+]
+
+SPLITS = [1000, 1001, 1008, 3000, 9545]
+
+
+def assert_results_equal(result, expected):
+    result._materialize()
+    expected._materialize()
+    assert list(result._data) == list(expected._data)
+    for name, values in expected._data.items():
+        assert result[name].dtype == values.dtype
+        np.testing.assert_array_equal(result[name], values)
+
+
+def resume_over_splits(indicator, quotes, params, splits):
+    result = indicator(quotes[:splits[0]], **params)
+    for n_bars in splits[1:]:
+        result = indicator(quotes[:n_bars], resume_from=result, **params)
+        assert result._state.start > 0  # calculation was continued, not repeated
+    return result
+
+
+@pytest.mark.parametrize('name, params', INDICATORS)
+def test_resume_equals_full(quotes, name, params):
+    """Values calculated by parts are equal to values calculated on all bars."""
+    indicator = getattr(ta, name)
+    result = resume_over_splits(indicator, quotes, params, SPLITS)
+    assert_results_equal(result, indicator(quotes, **params))
+
+
+@pytest.mark.parametrize('name, params', INDICATORS)
+def test_resume_with_nan(quotes_nan, name, params):
+    """Calculation by parts over data with gaps."""
+    indicator = getattr(ta, name)
+    result = indicator(quotes_nan[:300], **params)
+    for n_bars in (1999, 2000, 2002, 2100, 9545):
+        result = indicator(quotes_nan[:n_bars], resume_from=result, **params)
+    assert_results_equal(result, indicator(quotes_nan, **params))
+
+
+@pytest.mark.parametrize('params', [dict(), dict(end_points=True), dict(depth=4, delta=0.005)])
+def test_resume_zigzag_by_bar(quotes, params):
+    """Pivots revised on each appended bar are equal to pivots of full calculation."""
+    result = ta.zigzag(quotes[:300], **params)
+    for n_bars in range(301, 700):
+        result = ta.zigzag(quotes[:n_bars], resume_from=result, **params)
+        assert_results_equal(result, ta.zigzag(quotes[:n_bars], **params))
+
+
+def test_resume_revised_values(quotes):
+    """Indicators with values depending on next bars revise the last values."""
+    cci = ta.cci(quotes[:2000], period=200)
+    ichimoku = ta.ichimoku(quotes[:2000])
+    for n_bars in (2001, 2500, 4000):
+        cci = ta.cci(quotes[:n_bars], period=200, resume_from=cci)
+        ichimoku = ta.ichimoku(quotes[:n_bars], resume_from=ichimoku)
+        assert_results_equal(cci, ta.cci(quotes[:n_bars], period=200))
+        assert_results_equal(ichimoku, ta.ichimoku(quotes[:n_bars]))
+
+
+def test_resume_keeps_previous_result(quotes):
+    """Previous results are not changed by calculations continued from them."""
+    first = ta.ema(quotes[:1000], period=20)
+    second = ta.ema(quotes[:1100], period=20, resume_from=first)
+    third = ta.ema(quotes[:1200], period=20, resume_from=second)
+    other = ta.ema(quotes[:1150], period=20, resume_from=second)
+
+    expected = ta.ema(quotes[:1200], period=20).ema
+    np.testing.assert_array_equal(second.ema, expected[:1100])
+    np.testing.assert_array_equal(third.ema, expected)
+    np.testing.assert_array_equal(other.ema, expected[:1150])
+
+    zigzag = ta.zigzag(quotes[:1000])
+    pivots = zigzag.pivots.copy()
+    ta.zigzag(quotes[:1500], resume_from=zigzag)
+    np.testing.assert_array_equal(zigzag.pivots, pivots)
+
+
+def test_resume_outputs(quotes):
+    """Only series of the previous result are continued."""
+    result = ta.atr(quotes[:1000], outputs=['atrp'])
+    result = ta.atr(quotes, outputs=['atrp'], resume_from=result)
+    assert result.series_names() == ['atrp']
+    np.testing.assert_array_equal(result.atrp, ta.atr(quotes).atrp)
+
+    result = ta.keltner(quotes[:1000], outputs=['mid_line'])
+    result = ta.keltner(quotes, outputs=['mid_line'], resume_from=result)
+    np.testing.assert_array_equal(result.mid_line, ta.keltner(quotes).mid_line)
+
+
+def test_resume_full_calculation(quotes):
+    """Indicators that cannot continue from the state are calculated on all bars."""
+    result = ta.supertrend(quotes[:1000], period=1)
+    result = ta.supertrend(quotes, period=1, resume_from=result)
+    assert_results_equal(result, ta.supertrend(quotes, period=1))
+
+
+def test_resume_same_length(quotes):
+    """Result for the same bars is returned as is."""
+    result = ta.rsi(quotes, period=14)
+    assert ta.rsi(quotes, period=14, resume_from=result) is result
+
+
+def test_params_bound_on_use(quotes, monkeypatch):
+    """Parameters of plain calls are bound only when the state is used."""
+    lookback = importlib.import_module('pyita.lookback')
+    calls = []
+    bind_params = lookback.bind_params
+    monkeypatch.setattr(lookback, 'bind_params', lambda *args: calls.append(args) or bind_params(*args))
+
+    result = ta.bollinger_bands(quotes[:1000], 20, deviation=2.5)
+    assert not calls
+    assert result._state.params == {'period': 20, 'deviation': 2.5, 'ma_type': 'sma', 'value': 'close'}
+    assert len(calls) == 1
+    resumed = ta.bollinger_bands(quotes, 20, deviation=2.5, resume_from=result)
+    assert_results_equal(resumed, ta.bollinger_bands(quotes, 20, deviation=2.5))
+
+
+def test_resume_errors(quotes):
+    """Results of other indicators or parameters, and shorter quotes raise exceptions."""
+    result = ta.ema(quotes[:1000], period=20)
+
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.ema(quotes, period=10, resume_from=result)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.sma(quotes, period=20, resume_from=result)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.ema(quotes, period=20, resume_from=result[-100:])
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.ema(quotes, period=20, resume_from=result, tail=10)
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.ema(quotes[:500], period=20, resume_from=result)
@@ -0,0 +1,38 @@
+"""Tests for Robust Z-Score indicator."""
+import numpy as np
+import pytest
+import pyita as ta
+
+
+@pytest.mark.parametrize('period, value', [(4, 'close'), (20, 'close'), (50, 'volume')])
+def test_robust_zscore(test_ohlcv_data, period, value):
+    """Test Robust Z-Score against np.quantile over windows."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+
+    z_score = ta.robust_zscore(quotes, period=period, value=value).z_score
+
+    values = test_ohlcv_data[value]
+    windows = np.lib.stride_tricks.sliding_window_view(values, period)
+    q1, median, q3 = np.quantile(windows, [0.25, 0.5, 0.75], axis=1)
+    expected = (values[period - 1:] - median) / ((q3 - q1) / 1.3489795003921634)
+    expected[q3 == q1] = 0
+
+    assert np.all(np.isnan(z_score[:period - 1]))
+    np.testing.assert_allclose(z_score[period - 1:], expected, rtol=1e-9)
+
+
+def test_robust_zscore_outlier(test_ohlcv_data):
+    """A single outlier changes scores of next values much less than the usual z-score."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    close = test_ohlcv_data['close'].copy()
+    close[1000] *= 10
+    quotes_outlier = ta.Quotes(**{**test_ohlcv_data, 'close': close})
+
+    z_score = ta.robust_zscore(quotes_outlier, period=21).z_score
+    robust_change = np.abs(z_score - ta.robust_zscore(quotes, period=21).z_score)[1001: 1021]
+    usual_change = np.abs(
+        ta.bollinger_bands(quotes_outlier, period=21).z_score - ta.bollinger_bands(quotes, period=21).z_score
+    )[1001: 1021]
+
+    assert z_score[1000] > 100
+    assert robust_change.mean() < usual_change.mean() / 3
@@ -0,0 +1,124 @@
+"""Tests for rolling window primitives."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita import rolling
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionTooLittleData
+
+
+@pytest.fixture
+def values():
+    """Random prices with repeated values and NaN gaps."""
+    rng = np.random.default_rng(0)
+    values = 1e5 + rng.integers(-20, 20, 3000) * 10.0
+    values[[50, 51, 300]] = np.nan
+    values[1000: 1100] = 1e5
+    return values
+
+
+def expected_rolling(values, period, func, fill=np.nan, dtype=np.float64):
+    """Calculate rolling values by direct computation over windows."""
+    out = np.full(len(values), fill, dtype=dtype)
+    for i in range(period - 1, len(values)):
+        out[i] = func(values[i - period + 1: i + 1], i - period + 1)
+    return out
+
+
+def with_nan(func, fill=np.nan):
+    return lambda window, start: fill if np.isnan(window).any() else func(window, start)
+
+
+@pytest.mark.parametrize('period', [1, 2, 5, 20, 201])
+def test_rolling_against_windows(values, period):
+    """All primitives match direct computation over windows."""
+    np.testing.assert_allclose(
+        rolling.sum(values, period), expected_rolling(values, period, with_nan(lambda w, s: w.sum())), rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        rolling.mean(values, period), expected_rolling(values, period, with_nan(lambda w, s: w.mean())), rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        rolling.var(values, period), expected_rolling(values, period, with_nan(lambda w, s: w.var())),
+        rtol=1e-6, atol=1e-6
+    )
+    if period > 1:
+        np.testing.assert_allclose(
+            rolling.std(values, period, ddof=1), expected_rolling(values, period, with_nan(lambda w, s: w.std(ddof=1))),
+            rtol=1e-6, atol=1e-6
+        )
+    np.testing.assert_array_equal(
+        rolling.max(values, period), expected_rolling(values, period, with_nan(lambda w, s: w.max()))
+    )
+    np.testing.assert_array_equal(
+        rolling.min(values, period), expected_rolling(values, period, with_nan(lambda w, s: w.min()))
+    )
+    np.testing.assert_array_equal(
+        rolling.argmax(values, period),
+        expected_rolling(values, period, with_nan(lambda w, s: s + w.argmax(), -1), -1, np.int64)
+    )
+    np.testing.assert_array_equal(
+        rolling.argmin(values, period),
+        expected_rolling(values, period, with_nan(lambda w, s: s + w.argmin(), -1), -1, np.int64)
+    )
+    np.testing.assert_array_equal(
+        rolling.count(values, period),
+        expected_rolling(values, period, lambda w, s: np.count_nonzero(~np.isnan(w)), -1, np.int64)
+    )
+
+
+def test_rolling_constant_window(values):
+    """Variance of a window of equal values is exactly 0."""
+    std = rolling.std(values, 20)
+
+    assert np.all(std[1019: 1100] == 0)
+    assert np.all(std[1100: 1119] > 0)
+
+
+def test_rolling_long_series_precision():
+    """Running sums do not accumulate rounding error."""
+    rng = np.random.default_rng(1)
+    values = rng.normal(1e6, 1e3, 1_000_000)
+
+    period = 50
+    result = rolling.mean(values, period)
+    last = values[-period:].mean()
+
+    assert abs(result[-1] - last) / last < 1e-14
+
+
+@pytest.mark.parametrize('period', [2, 5, 20, 201])
+def test_rolling_cov_corr(values, period):
+    """Covariance and correlation of two series match direct computation over windows."""
+    other = np.roll(values, 7) * 0.5 + np.arange(len(values))
+    expected_cov = expected_rolling(
+        values, period, lambda w, s: np.cov(w, other[s: s + period], ddof=1)[0, 1]
+        if not np.isnan(w).any() and not np.isnan(other[s: s + period]).any() else np.nan
+    )
+    np.testing.assert_allclose(rolling.cov(values, other, period, ddof=1), expected_cov, rtol=1e-6, atol=1e-6)
+
+    corr = rolling.corr(values, other, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected_corr = expected_rolling(values, period, lambda w, s: np.corrcoef(w, other[s: s + period])[0, 1])
+    np.testing.assert_allclose(corr, expected_corr, rtol=1e-6, atol=1e-9)
+    if period <= 100:
+        assert np.all(np.isnan(corr[1000 + period - 1: 1100]))  # constant windows of values
+
+
+def test_rolling_errors(values):
+    """Bad parameters raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        rolling.sum(values, 0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        rolling.var(values, 5, ddof=5)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        rolling.max(values.reshape(2, -1), 5)
+    with pytest.raises(PyTAExceptionTooLittleData):
+        rolling.min(values[:3], 5)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        rolling.corr(values, values[:-1], 5)
+
+
+def test_rolling_is_public():
+    """Module is available as ta.rolling."""
+    assert ta.rolling is rolling
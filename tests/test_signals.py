@@ -0,0 +1,89 @@
+"""Tests for signal primitives and the screener of symbols."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita import signals
+from pyita.exceptions import PyTAExceptionBadParameterValue
+
+
+def test_crosses(test_ohlcv_data):
+    """Crosses of MACD and its signal line, and of RSI and a level."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    macd = ta.macd(quotes, 12, 26, 9)
+    above = signals.cross_above(macd.macd, macd.signal)
+    below = signals.cross_below(macd.macd, macd.signal)
+    expected_above = (macd.macd[1:] > macd.signal[1:]) & (macd.macd[:-1] <= macd.signal[:-1])
+    expected_below = (macd.macd[1:] < macd.signal[1:]) & (macd.macd[:-1] >= macd.signal[:-1])
+    assert above.dtype == bool and not above[0] and not below[0]
+    assert np.array_equal(above[1:], expected_above)
+    assert np.array_equal(below[1:], expected_below)
+    assert not np.any(above & below) and above.sum() > 0
+
+    rsi = ta.rsi(quotes, period=14).rsi
+    assert np.array_equal(signals.cross_below(rsi, 30)[1:], (rsi[1:] < 30) & (rsi[:-1] >= 30))
+
+
+@pytest.mark.filterwarnings('error')
+def test_numbers_and_broadcast_rows():
+    """Numbers and 1-D series are broadcast to 2-D rows without warnings."""
+    values = np.array([1.0, 3.0, 1.0, 3.0])
+    batch = np.array([values, values[::-1]])
+    assert signals.cross_above(values, 2.0).tolist() == [False, True, False, True]
+    assert signals.cross_below(2.0, values).tolist() == [False, True, False, True]
+    assert np.array_equal(signals.cross_above(batch, values)[1], signals.cross_above(values[::-1], values))
+    assert signals.first_after(values > 2, True).tolist() == [False, True, False, True]
+
+
+def test_bars_since_and_first_after():
+    """Counts of bars since events and the first condition after a start."""
+    condition = np.array([0, 1, 0, 0, 1, 1, 0], dtype=bool)
+    assert signals.bars_since(condition).tolist() == [-1, 0, 1, 2, 0, 0, 1]
+
+    start = np.array([1, 0, 0, 1, 0, 0, 1], dtype=bool)
+    fired = np.array([0, 1, 1, 1, 1, 1, 0], dtype=bool)
+    assert signals.first_after(fired, start).tolist() == [False, True, False, True, False, False, False]
+
+
+def test_hysteresis():
+    """States set at the enter value and reset at the exit value."""
+    values = np.array([20, 35, 30, 40, np.nan, 49, 50, 45, 29, 60])
+    assert signals.hysteresis(values, 30, 50).tolist() == [1, 1, 1, 1, 1, 1, 0, 0, 1, 0]
+    assert np.array_equal(signals.hysteresis(-values, -30, -50), signals.hysteresis(values, 30, 50))
+    assert signals.hysteresis(values, 50, 30).tolist() == [0, 0, 0, 0, 0, 0, 1, 1, 0, 1]
+
+
+def test_batch_rows(test_ohlcv_data):
+    """2-D arrays are calculated by rows."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    rsi = ta.rsi(quotes, period=14).rsi
+    batch = np.array([rsi, rsi[::-1]])
+    assert np.array_equal(signals.cross_above(batch, 70)[1], signals.cross_above(rsi[::-1], 70))
+    assert np.array_equal(signals.hysteresis(batch, 70, 50)[0], signals.hysteresis(rsi, 70, 50))
+    assert np.array_equal(signals.bars_since(batch > 70)[1], signals.bars_since(rsi[::-1] > 70))
+
+
+def test_screen(test_ohlcv_data):
+    """Symbols matching at the last bar, too short histories do not match."""
+    quotes = ta.Quotes(**test_ohlcv_data)
+    universe = ta.Universe.from_quotes({'A': quotes, 'B': quotes[:5000], 'C': quotes[:3000], 'D': quotes[:5]})
+
+    def rsi_above(quotes):
+        return ta.rsi(quotes, period=14, tail=1).rsi > 50
+
+    expected = [symbol for symbol in ['A', 'B', 'C'] if ta.rsi(universe[symbol], period=14).rsi[-1] > 50]
+    assert signals.screen(universe, rsi_above) == expected
+    assert signals.screen({'A': quotes}, lambda quotes: True) == ['A']
+
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        signals.screen({'A': quotes}, lambda quotes: np.ones((2, 2)))
+
+
+def test_signals_errors():
+    """Bad parameters raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        signals.hysteresis(np.ones(5), 30, 30)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        signals.cross_above(np.ones(5), np.ones(4))
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        signals.bars_since(np.ones((2, 2, 2), dtype=bool))
@@ -0,0 +1,87 @@
+"""Tests for binary snapshots of streaming states."""
+import io
+
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita import multi_stream
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+from test_resume import INDICATORS
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'time')
+
+
+def get_bar(quotes, i):
+    return {name: quotes[name][i] for name in BAR_COLUMNS}
+
+
+def test_snapshot_streams(quotes, tmp_path):
+    """Restored streams continue with the same values as the saved ones."""
+    streams = {f'{i}:{name}': ta.IndicatorStream(name, quotes[:2000], **params)
+               for i, (name, params) in enumerate(INDICATORS)}
+    path = tmp_path / 'states.npz'
+    ta.save_state(streams, path)
+    restored = ta.load_state(path)
+
+    assert list(restored) == list(streams)
+    for key, stream in streams.items():
+        assert restored[key].n_bars == stream.n_bars
+        for i in range(2000, 2050):
+            values = stream.update(get_bar(quotes, i), final=True)
+            restored_values = restored[key].update(get_bar(quotes, i), final=True)
+            assert list(restored_values) == list(values)
+            for name in values:
+                np.testing.assert_array_equal(restored_values[name], values[name])
+
+
+def test_snapshot_multi_stream(test_ohlcv_data):
+    """Restored states of many symbols continue with the same values."""
+    high, low, close = (test_ohlcv_data[name][:3000].reshape(-1, 3) for name in ('high', 'low', 'close'))
+    state = multi_stream.ADXState(3, period=10)
+    for i in range(500):
+        state.update(high[i], low[i], close[i])
+
+    file = io.BytesIO()
+    ta.save_state(state, file)
+    file.seek(0)
+    restored = ta.load_state(file)
+
+    assert isinstance(restored, multi_stream.ADXState)
+    for name, values in state.values.items():
+        np.testing.assert_array_equal(restored.values[name], values)
+    for i in range(500, 1000):
+        values = state.update(high[i], low[i], close[i])
+        restored_values = restored.update(high[i], low[i], close[i])
+        for name in values:
+            np.testing.assert_array_equal(restored_values[name], values[name])
+
+
+def test_snapshot_errors(quotes, tmp_path):
+    """Unsupported objects and files raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.save_state(ta.ema(quotes, period=10), tmp_path / 'result.npz')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.save_state({1: ta.IndicatorStream('ema', quotes, period=10)}, tmp_path / 'keys.npz')
+
+    path = tmp_path / 'other.npz'
+    np.savez(path, values=np.arange(3))
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.load_state(path)
+
+    file = io.BytesIO()
+    ta.save_state(ta.IndicatorStream('ema', quotes, period=10), file)
+    file.seek(0)
+    with np.load(file) as data:
+        arrays = dict(data)
+    arrays['header'] = np.frombuffer(bytes(arrays['header']).replace(b'"version": 1', b'"version": 99'), dtype=np.uint8)
+    path = tmp_path / 'version.npz'
+    np.savez(path, **arrays)
+    with pytest.raises(PyTAExceptionBadSeriesData, match='version'):
+        ta.load_state(path)
+
+    path = tmp_path / 'text.npz'
+    path.write_text('not a snapshot')
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.load_state(path)
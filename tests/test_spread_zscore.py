@@ -0,0 +1,47 @@
+"""Tests for Spread Z-Score indicator."""
+import numpy as np
+import pytest
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue
+
+
+@pytest.fixture
+def other(test_ohlcv_data):
+    """Quotes of a second instrument partly following the first one."""
+    rng = np.random.default_rng(0)
+    noise = rng.normal(scale=20, size=len(test_ohlcv_data['close'])).cumsum()
+    data = {name: values * 0.03 + noise + 5000 if name in ('open', 'high', 'low', 'close') else values
+            for name, values in test_ohlcv_data.items()}
+    return ta.Quotes(**data)
+
+
+@pytest.mark.parametrize('method, period', [('ratio', 20), ('log_ratio', 50), ('spread', 30)])
+def test_spread_zscore(quotes, other, method, period):
+    """Test Spread Z-Score against numpy over windows."""
+    result = ta.spread_zscore(quotes, other, period=period, method=method, hedge_ratio=2.5)
+
+    x, y = quotes.close, other.close
+    spread = {'ratio': x / y, 'log_ratio': np.log(x / y), 'spread': x - 2.5 * y}[method]
+    windows = np.lib.stride_tricks.sliding_window_view(spread, period)
+    expected = (spread[period - 1:] - windows.mean(axis=1)) / windows.std(axis=1)
+
+    np.testing.assert_allclose(result.spread, spread, rtol=1e-12)
+    assert np.all(np.isnan(result.z_score[:period - 1]))
+    np.testing.assert_allclose(result.z_score[period - 1:], expected, rtol=1e-6, atol=1e-9)
+
+
+def test_spread_zscore_resume(quotes, other):
+    """Resumed calculation is equal to calculation over all bars."""
+    full = ta.spread_zscore(quotes, other, period=30)
+    result = ta.spread_zscore(quotes[:4000], other[:4000], period=30)
+    result = ta.spread_zscore(quotes, other, period=30, resume_from=result)
+    assert result._state.start == 4000
+    np.testing.assert_array_equal(result.z_score, full.z_score)
+
+
+def test_spread_zscore_errors(quotes, other):
+    """Bad parameters raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.spread_zscore(quotes, other, method='difference')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.spread_zscore(quotes, other, value='volume')
@@ -0,0 +1,133 @@
+"""Tests for streaming calculation of indicators with a revisable last bar."""
+import importlib
+
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+from test_resume import INDICATORS
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'time')
+
+
+def get_bar(quotes, i):
+    return {name: quotes[name][i] for name in BAR_COLUMNS}
+
+
+def forming_bar(bar):
+    """Bar being formed with another close (update before the bar is closed)."""
+    forming = dict(bar)
+    forming['close'] = bar['close'] * 1.01
+    forming['high'] = max(bar['high'], forming['close'])
+    return forming
+
+
+def stream_values(stream, quotes, start, n_bars):
+    """Feed bars of quotes to the stream and collect the last n_bars - start values."""
+    collected = {}
+    for i in range(start, n_bars):
+        bar = get_bar(quotes, i)
+        stream.update(forming_bar(bar))
+        values = stream.update(bar, final=True)
+        for name, last_values in values.items():
+            kept = collected.get(name, [])
+            collected[name] = kept[:max(len(kept) - len(last_values) + 1, 0)] + list(last_values)
+    return collected
+
+
+@pytest.mark.parametrize('name, params', INDICATORS)
+def test_stream_equals_full(quotes, name, params):
+    """Values of bars fed to the stream are equal to values calculated on all bars."""
+    stream = ta.IndicatorStream(name, quotes[:2000], **params)
+    collected = stream_values(stream, quotes, 2000, 2200)
+    assert stream.n_bars == 2200
+
+    full = getattr(ta, name)(quotes[:2200], **params)
+    for series_name in full.series_names():
+        values = collected[series_name]
+        np.testing.assert_array_equal(values, full[series_name][-len(values):])
+
+
+def test_stream_revised_values(quotes):
+    """Zigzag pivots of previous bars are revised by updates."""
+    stream = ta.IndicatorStream('zigzag', quotes[:1000])
+    revised = [len(stream.update(get_bar(quotes, i), final=True)['pivots']) for i in range(1000, 1500)]
+    assert max(revised) > 1
+
+
+def test_stream_forming_bar(quotes):
+    """Updates of the forming bar do not change the committed state."""
+    stream = ta.IndicatorStream('supertrend', quotes[:1000])
+    bar = get_bar(quotes, 1000)
+    expected = ta.supertrend(quotes[:1001]).supertrend[-1]
+
+    for _ in range(3):
+        stream.update(forming_bar(bar))
+        assert stream.pending
+        assert stream.n_bars == 1000
+    stream.rollback()
+    assert not stream.pending
+
+    assert stream.update(bar)['supertrend'][-1] == expected
+    stream.commit()
+    stream.commit()
+    assert stream.n_bars == 1001
+
+
+def test_stream_cci_forming_bar(quotes, monkeypatch):
+    """Updates of the forming bar of cci with a sorted window do not rank the window."""
+    cci = importlib.import_module('pyita.indicators.cci')
+    stream = ta.IndicatorStream('cci', quotes[:2000], period=200)
+    expected = [ta.cci(quotes[:i + 1], period=200).cci[-1] for i in range(2000, 2010)]
+    full = ta.cci(quotes[:2011], period=200).cci
+
+    calc_mad_sorted = cci.calc_mad_sorted
+    monkeypatch.setattr(cci, 'calc_mad_sorted', None)
+    for i in range(2000, 2010):
+        values = stream.update(get_bar(quotes, i))
+        assert len(values['cci']) == 1
+        np.testing.assert_allclose(values['cci'][0], expected[i - 2000], rtol=1e-9)
+        stream.commit()
+
+    # Final updates revise values of the last chunk as the calculation on all bars
+    monkeypatch.setattr(cci, 'calc_mad_sorted', calc_mad_sorted)
+    values = stream.update(get_bar(quotes, 2010), final=True)
+    assert len(values['cci']) > 1
+    np.testing.assert_array_equal(values['cci'], full[-len(values['cci']):])
+
+
+def test_stream_from_result(quotes):
+    """Stream continues a result of the indicator call with its parameters and outputs."""
+    result = ta.atr(quotes[:1000], smooth=10, outputs=['atrp'])
+    stream = ta.IndicatorStream.from_result(result)
+    values = stream.update(get_bar(quotes, 1000))
+    assert list(values) == ['atrp']
+    assert values['atrp'][-1] == ta.atr(quotes[:1001], smooth=10).atrp[-1]
+
+    bar = ta.Quotes(**{name: quotes[name][1000:1001] for name in BAR_COLUMNS})
+    assert stream.update(bar)['atrp'][-1] == values['atrp'][-1]
+
+
+def test_stream_errors(quotes):
+    """Invalid bars, results without state and states that cannot be continued raise exceptions."""
+    stream = ta.IndicatorStream('ema', quotes[:100], period=10)
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        stream.update({'close': 1.0, 'price': 1.0})
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        stream.update(quotes[:2])
+
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.IndicatorStream.from_result(ta.ema(quotes, period=10)[-10:])
+
+    stream = ta.IndicatorStream('supertrend', quotes[:100], period=1)
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        stream.update(get_bar(quotes, 100))
+
+    # Pair indicators need bars of the other series
+    for name in ('correlation', 'spread_zscore'):
+        with pytest.raises(PyTAExceptionBadParameterValue):
+            ta.IndicatorStream(name, quotes[:100], other=quotes.close[:100], period=10)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.IndicatorStream.from_result(ta.correlation(quotes[:100], quotes.close[:100], period=10))
@@ -0,0 +1,94 @@
+"""Tests for time-based lookups of quotes (between, at, asof, loc)."""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData, PyTAExceptionDataSeriesNonFound
+
+
+def assert_bars(result, quotes, mask):
+    for name in ('open', 'high', 'low', 'close', 'volume', 'time'):
+        np.testing.assert_array_equal(result[name], quotes[name][mask])
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2025-03-01', '2025-03-02'),
+    ('2025-03-01T05:30', '2025-03-01T07:00'),
+    ('2024-01-01', '2025-01-02'),
+    ('2026-02-01', '2030-01-01'),
+    ('2025-03-02', '2025-03-01'),
+])
+def test_between(quotes, start, end):
+    """Bars with start <= time < end are views of the quotes."""
+    result = quotes.between(start, end)
+    mask = (quotes.time >= np.datetime64(start)) & (quotes.time < np.datetime64(end))
+    assert isinstance(result, ta.Quotes)
+    assert_bars(result, quotes, mask)
+    if len(result.close):
+        assert np.shares_memory(result.close, quotes.close)
+
+
+def test_between_open_ends_and_time_types(quotes):
+    """Open ends and different types of time values."""
+    start = np.datetime64('2025-06-01T00:00', 'ms')
+    assert_bars(quotes.between(start), quotes, quotes.time >= start)
+    assert_bars(quotes.between(end=start), quotes, quotes.time < start)
+    assert_bars(quotes.between(datetime(2025, 6, 1), int(start.astype(np.int64)) + 3600000), quotes,
+                quotes.time == start)
+
+
+def test_at_and_asof(quotes):
+    """Bar at time and the last bar at or before time."""
+    bar = quotes.at('2025-03-01T05:00')
+    assert len(bar.close) == 1
+    assert bar.time[0] == np.datetime64('2025-03-01T05:00')
+
+    bar = quotes.asof('2025-03-01T05:59:59')
+    assert bar.time[0] == np.datetime64('2025-03-01T05:00')
+    assert quotes.asof('2030-01-01').time[0] == quotes.time[-1]
+
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes.at('2025-03-01T05:30')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes.asof('2020-01-01')
+
+
+def test_loc(quotes):
+    """Time slices include both ends, a single time selects one bar."""
+    result = quotes.loc['2025-03-01':'2025-03-02']
+    mask = (quotes.time >= np.datetime64('2025-03-01')) & (quotes.time <= np.datetime64('2025-03-02'))
+    assert_bars(result, quotes, mask)
+    assert len(result.close) == 25
+
+    assert_bars(quotes.loc[:'2025-01-01T05:00'], quotes, slice(0, 6))
+    assert quotes.loc['2025-03-01T05:00'].time[0] == np.datetime64('2025-03-01T05:00')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes.loc['2025-03-01':'2025-03-02':2]
+
+
+def test_sorted_check_cached(quotes):
+    """Sorting is checked once for the time array and kept by slices."""
+    assert getattr(quotes, '_time_sorted', None) is None
+    window = quotes.between('2025-03-01', '2025-04-01')
+    assert quotes._time_sorted is quotes.time
+    assert window._time_sorted is window.time
+    assert quotes[100:200]._time_sorted is not None
+
+    packed = quotes.pack()
+    result = packed.between('2025-03-01', '2025-03-02')
+    assert_bars(result, quotes, (quotes.time >= np.datetime64('2025-03-01')) & (quotes.time < np.datetime64('2025-03-02')))
+
+
+def test_time_lookup_errors(quotes, test_ohlcv_data):
+    """Unsorted time, missing time series and bad time values raise exceptions."""
+    data = dict(test_ohlcv_data)
+    data['time'] = data['time'][::-1].copy()
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.Quotes(**data).between('2025-03-01', '2025-03-02')
+
+    with pytest.raises(PyTAExceptionDataSeriesNonFound):
+        ta.ema(quotes, period=10).between('2025-03-01', '2025-03-02')
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes.between('not a time', None)
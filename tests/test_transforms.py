@@ -0,0 +1,165 @@
+"""Tests for price transforms of quotes (Heikin-Ashi, Renko, Kagi, line break)."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue
+
+
+def expected_heikin_ashi(quotes):
+    """Heikin-Ashi bars by a Python loop."""
+    ha_open, ha_close = [], []
+    for i in range(len(quotes.close)):
+        ha_close.append((quotes.open[i] + quotes.high[i] + quotes.low[i] + quotes.close[i]) / 4)
+        ha_open.append((quotes.open[i] + quotes.close[i]) / 2 if i == 0 else (ha_open[-1] + ha_close[-2]) / 2)
+    ha_open, ha_close = np.array(ha_open), np.array(ha_close)
+    high = np.maximum(quotes.high, np.maximum(ha_open, ha_close))
+    low = np.minimum(quotes.low, np.minimum(ha_open, ha_close))
+    return ha_open, high, low, ha_close
+
+
+def expected_renko(close, box_size):
+    """Renko bricks (index, open, close) by a Python loop."""
+    bricks = []
+    top = bottom = close[0]
+    for i, price in enumerate(close):
+        while price >= top + box_size or price <= bottom - box_size:
+            if price >= top + box_size:
+                bricks.append((i, top, top + box_size))
+            else:
+                bricks.append((i, bottom, bottom - box_size))
+            top, bottom = max(bricks[-1][1:]), min(bricks[-1][1:])
+    return bricks
+
+
+def expected_kagi(close, reversal):
+    """Kagi lines (index, open, close) by a Python loop."""
+    lines = []
+    start, extreme, index, direction = close[0], close[0], 0, 0
+    for i, price in enumerate(close):
+        if direction == 0:
+            if abs(price - start) >= reversal:
+                extreme, index, direction = price, i, np.sign(price - start)
+        elif (price - extreme) * direction > 0:
+            extreme, index = price, i
+        elif (extreme - price) * direction >= reversal:
+            lines.append((index, start, extreme))
+            start, extreme, index, direction = extreme, price, i, -direction
+    if direction:
+        lines.append((index, start, extreme))
+    return lines
+
+
+def expected_line_break(close, n_lines):
+    """Line break lines (index, open, close) by a Python loop."""
+    lines = []
+    for i, price in enumerate(close):
+        if not lines:
+            if price != close[0]:
+                lines.append((i, close[0], price))
+            continue
+        _, line_open, line_close = lines[-1]
+        up = line_close > line_open
+        last = lines[-n_lines:]
+        if (price > line_close) if up else (price < line_close):
+            lines.append((i, line_close, price))
+        elif up and price < min(min(line[1:]) for line in last):
+            lines.append((i, line_open, price))
+        elif not up and price > max(max(line[1:]) for line in last):
+            lines.append((i, line_open, price))
+    return lines
+
+
+def assert_movement_bars(quotes, result, indexes, expected):
+    expected_indexes = np.array([item[0] for item in expected], dtype=np.int64)
+    np.testing.assert_array_equal(indexes, expected_indexes)
+    np.testing.assert_array_equal(result.open, [item[1] for item in expected])
+    np.testing.assert_array_equal(result.close, [item[2] for item in expected])
+    np.testing.assert_array_equal(result.high, np.maximum(result.open, result.close))
+    np.testing.assert_array_equal(result.low, np.minimum(result.open, result.close))
+    np.testing.assert_array_equal(result.time, quotes.time[expected_indexes])
+
+    # Volume of source bars is distributed over bars up to the last one
+    volume = np.cumsum(quotes.volume.astype(np.float64))
+    np.testing.assert_allclose(np.cumsum(result.volume), volume[expected_indexes], rtol=1e-9)
+
+
+def test_heikin_ashi(quotes):
+    """Heikin-Ashi bars are equal to the recurrence, volume and time are kept."""
+    result = quotes.heikin_ashi()
+    for name, values in zip(('open', 'high', 'low', 'close'), expected_heikin_ashi(quotes)):
+        np.testing.assert_allclose(result[name], values, rtol=1e-12)
+    np.testing.assert_array_equal(result.time, quotes.time)
+    np.testing.assert_array_equal(result.volume, quotes.volume)
+    assert len(ta.supertrend(result).supertrend) == len(quotes.close)
+
+
+def test_heikin_ashi_nan(quotes):
+    """Heikin-Ashi bars restart after NaN bars."""
+    data = {name: quotes[name].copy() for name in ('open', 'high', 'low', 'close')}
+    for values in data.values():
+        values[100] = np.nan
+    result = ta.Quotes(**data).heikin_ashi()
+    assert all(np.isnan(result[name][100]) for name in ('open', 'high', 'low', 'close'))
+    assert result.open[101] == (data['open'][101] + data['close'][101]) / 2
+    assert not np.any(np.isnan(result.close[101:]))
+
+
+@pytest.mark.parametrize('box_size', [100, 500, 2000])
+def test_renko(quotes, box_size):
+    """Renko bricks are equal to bricks by a Python loop."""
+    result, indexes = quotes.renko(box_size=box_size, return_index=True)
+    assert_movement_bars(quotes, result, indexes, expected_renko(quotes.close, box_size))
+    assert np.all(np.abs(result.close - result.open) == box_size)
+
+
+def test_renko_atr(quotes):
+    """Brick size defaults to the last ATR value."""
+    box_size = ta.atr(quotes, smooth=20).atr[-1]
+    result, indexes = quotes.renko(atr_period=20, return_index=True)
+    assert_movement_bars(quotes, result, indexes, expected_renko(quotes.close, box_size))
+    assert isinstance(quotes.renko(), ta.Quotes)
+
+
+@pytest.mark.parametrize('reversal', [200, 1000, 3000])
+def test_kagi(quotes, reversal):
+    """Kagi lines are equal to lines by a Python loop."""
+    result, indexes = quotes.kagi(reversal=reversal, return_index=True)
+    assert_movement_bars(quotes, result, indexes, expected_kagi(quotes.close, reversal))
+    np.testing.assert_array_equal(result.open[1:], result.close[:-1])
+
+
+@pytest.mark.parametrize('n_lines', [1, 2, 3, 5])
+def test_line_break(quotes, n_lines):
+    """Line break lines are equal to lines by a Python loop."""
+    result, indexes = quotes.line_break(n_lines=n_lines, return_index=True)
+    assert_movement_bars(quotes, result, indexes, expected_line_break(quotes.close, n_lines))
+    assert len(ta.ema(result, period=5).ema) == len(result.close)
+
+
+def test_transforms_nan_and_without_time(quotes):
+    """NaN closes are skipped, quotes without time and volume are transformed."""
+    close = quotes.close.copy()
+    close[[10, 500, 501]] = np.nan
+    source = ta.Quotes(open=quotes.open, high=quotes.high, low=quotes.low, close=close)
+
+    result, indexes = source.renko(box_size=500, return_index=True)
+    expected = expected_renko(close[~np.isnan(close)], 500)
+    valid_indexes = np.flatnonzero(~np.isnan(close))
+    np.testing.assert_array_equal(indexes, valid_indexes[[item[0] for item in expected]])
+    assert 'time' not in result._data and 'volume' not in result._data
+
+    assert len(source.kagi(reversal=500).close) == len(expected_kagi(close[~np.isnan(close)], 500))
+    assert len(source.line_break().close) == len(expected_line_break(close[~np.isnan(close)], 3))
+
+
+def test_transforms_errors(quotes):
+    """Bad parameters raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes.renko(box_size=0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes.renko(atr_period=0)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes.kagi(reversal=-1)
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        quotes.line_break(n_lines=0)
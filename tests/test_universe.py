@@ -0,0 +1,92 @@
+"""Tests for the universe store of quotes of many symbols."""
+import numpy as np
+import pytest
+
+import pyita as ta
+from pyita.exceptions import PyTAExceptionBadParameterValue, PyTAExceptionBadSeriesData
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'time')
+
+
+@pytest.fixture
+def quotes_by_symbol(quotes):
+    """Quotes of symbols with different histories."""
+    return {'BTC/USDT': quotes, 'ETH/USDT': quotes[100:], 'SOL/USDT': quotes[:5000], 'XRP/USDT': quotes[200:]}
+
+
+def assert_quotes_equal(result, expected):
+    for name in COLUMNS:
+        np.testing.assert_array_equal(result[name], expected[name])
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_universe_save_load(quotes_by_symbol, tmp_path, mmap):
+    """Quotes of symbols are restored from a saved universe as views of the block."""
+    universe = ta.Universe.from_quotes(quotes_by_symbol)
+    universe.save(tmp_path / 'universe')
+    loaded = ta.Universe.load(tmp_path / 'universe', mmap=mmap)
+
+    assert loaded.symbols == list(quotes_by_symbol)
+    assert isinstance(loaded.block, np.memmap) == mmap
+    for symbol, expected in quotes_by_symbol.items():
+        result = loaded[symbol]
+        assert isinstance(result, ta.Quotes)
+        assert np.shares_memory(result.close, loaded.block)
+        assert_quotes_equal(result, expected)
+        assert loaded.time_range(symbol) == (expected.time[0], expected.time[-1])
+
+    np.testing.assert_array_equal(ta.rsi(loaded['ETH/USDT'], period=14).rsi,
+                                  ta.rsi(quotes_by_symbol['ETH/USDT'], period=14).rsi)
+
+
+def test_universe_between(quotes_by_symbol):
+    """Time windows of symbols are views of the block."""
+    universe = ta.Universe.from_quotes(quotes_by_symbol)
+    window = universe['XRP/USDT'].between('2025-03-01', '2025-04-01')
+    assert_quotes_equal(window, quotes_by_symbol['XRP/USDT'].between('2025-03-01', '2025-04-01'))
+    assert np.shares_memory(window.close, universe.block)
+
+    assert universe.symbols_between('2025-10-01') == ['BTC/USDT', 'ETH/USDT', 'XRP/USDT']
+    assert universe.symbols_between(end='2025-01-02') == ['BTC/USDT', 'SOL/USDT']
+    assert len(universe) == 4 and 'SOL/USDT' in universe and list(universe) == universe.symbols
+
+
+def test_universe_block_of(quotes_by_symbol):
+    """Aligned columns of symbols are 2-D views of the block when possible."""
+    universe = ta.Universe.from_quotes(quotes_by_symbol)
+    start, end = '2025-03-01', '2025-04-01'
+    expected = quotes_by_symbol['BTC/USDT'].between(start, end).close
+
+    block = universe.block_of('close', symbols=['BTC/USDT', 'SOL/USDT'], start=start, end=end)
+    assert block.shape == (2, len(expected))
+    assert np.shares_memory(block, universe.block) and not block.flags.writeable
+    np.testing.assert_array_equal(block, [expected, expected])
+
+    # Unequally spaced rows are copied
+    block = universe.block_of('close', start=start, end=end)
+    assert block.shape == (4, len(expected))
+    np.testing.assert_array_equal(block, [expected] * 4)
+
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        universe.block_of('close', symbols=['BTC/USDT', 'ETH/USDT'])
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        universe.block_of('vwap')
+
+
+def test_universe_errors(quotes, tmp_path, test_ohlcv_data):
+    """Bad quotes and directories raise exceptions."""
+    with pytest.raises(PyTAExceptionBadParameterValue):
+        ta.Universe.from_quotes({})
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.Universe.from_quotes({'A': quotes, 'B': ta.Quotes(open=quotes.open, high=quotes.high,
+                                                             low=quotes.low, close=quotes.close)})
+
+    data = dict(test_ohlcv_data)
+    data['time'] = data['time'][::-1].copy()
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.Universe.from_quotes({'A': ta.Quotes(**data)})
+
+    with pytest.raises(PyTAExceptionBadSeriesData):
+        ta.Universe.load(tmp_path / 'missing')
+    with pytest.raises(KeyError):
+        ta.Universe.from_quotes({'A': quotes})['B']